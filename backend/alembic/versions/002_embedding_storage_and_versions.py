@@ -0,0 +1,34 @@
+"""Add binary embedding storage, embedding versions and the embedding_versions table
+
+Revision ID: 002_embedding_storage_versions
+Revises: 001_add_pgvector
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+
+from app.db.schema_upgrades import upgrade_embedding_schema
+
+# revision identifiers, used by Alembic.
+revision = '002_embedding_storage_versions'
+down_revision = '001_add_pgvector'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Same idempotent step as `python -m app.scripts.upgrade_schema`, so databases
+    # already upgraded by the scripts are left as they are
+    upgrade_embedding_schema(op.get_bind())
+
+
+def downgrade() -> None:
+    op.drop_table('embedding_versions')
+    op.drop_index('ix_text_embeddings_next_embedding_model', table_name='text_embeddings')
+    op.drop_index('ix_text_embeddings_embedding_model', table_name='text_embeddings')
+    op.drop_column('text_embeddings', 'next_embedding_model')
+    op.drop_column('text_embeddings', 'next_embedding_blob')
+    op.drop_column('text_embeddings', 'embedding_model')
+    # embedding stays nullable. Vectors that only exist in binary form (after
+    # migrate_embedding_storage --clear-json or a cutover) are lost with this column
+    op.drop_column('text_embeddings', 'embedding_blob')
@@ -9,10 +9,12 @@ from app.models import (
     User, Session as SessionModel, Participant,
     Insight, Action, ProcessedFile, Organization
 )
+from app.services.response_cache import cached_response, response_cache
 
 router = APIRouter()
 
 @router.get("/overview")
+@cached_response(["analytics"])
 def get_analytics_overview(db: Session = Depends(get_db)):
     """
     Get dashboard overview metrics
@@ -127,6 +129,7 @@ def get_analytics_overview(db: Session = Depends(get_db)):
         return error_response(str(e))
 
 @router.get("/sentiment")
+@cached_response(["analytics"])
 def get_sentiment_data(
     date_from: Optional[str] = Query(None),
     date_to: Optional[str] = Query(None),
@@ -154,6 +157,7 @@ def get_sentiment_data(
         return error_response(str(e))
 
 @router.get("/topics")
+@cached_response(["analytics"])
 def get_topics_data(
     pillar: Optional[str] = Query(None),
     limit: Optional[int] = Query(10),
@@ -196,6 +200,7 @@ def get_topics_data(
         return error_response(str(e))
 
 @router.get("/network")
+@cached_response(["analytics"])
 def get_network_data(db: Session = Depends(get_db)):
     """Get network graph data for stakeholder relationships"""
     try:
@@ -223,6 +228,7 @@ def get_network_data(db: Session = Depends(get_db)):
         return error_response(str(e))
 
 @router.get("/engagement")
+@cached_response(["analytics"])
 def get_engagement_metrics(
     shaper_id: Optional[List[str]] = Query(None, alias="shaperId"),
     date_from: Optional[str] = Query(None, alias="dateFrom"),
@@ -249,4 +255,15 @@ def get_engagement_metrics(
 
         return success_response(data=engagement_data)
     except Exception as e:
-        return error_response(str(e))
\ No newline at end of file
+        return error_response(str(e))
+
+
+@router.get("/cache")
+def get_response_cache_stats():
+    """
+    Get hit rates of the response cache serving the dashboard endpoints
+    """
+    try:
+        return success_response(data=response_cache.stats())
+    except Exception as e:
+        return error_response(str(e))
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, or_, desc
 from datetime import datetime
 from app.db.session import get_db
+from app.db.pagination import paginate, count_rows
 from app.schemas.response import success_response, error_response
 from app.schemas.document import DocumentCreate, DocumentUpdate, DocumentResponse
 from app.models import ProcessedFile, Session as SessionModel, Participant
@@ -18,6 +19,8 @@ def get_documents(
     date_from: Optional[str] = Query(None, alias="dateFrom"),
     date_to: Optional[str] = Query(None, alias="dateTo"),
     uploader: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="pagination.next_cursor of the previous page (replaces skip)"),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db)
 ):
     """
@@ -34,11 +37,13 @@ def get_documents(
         if date_to:
             query = query.filter(ProcessedFile.created_at <= date_to)
 
-        # Get total count
-        total = query.count()
-
         # Get paginated results
-        documents = query.order_by(desc(ProcessedFile.created_at)).offset(skip).limit(limit).all()
+        documents, pagination = paginate(
+            query, "created_at", ProcessedFile.created_at, ProcessedFile.id,
+            limit, skip=skip, cursor=cursor
+        )
+        if include_total:
+            pagination.update(count_rows(query))
 
         # Format response - combine ProcessedFile data with session information
         document_list = []
@@ -98,7 +103,8 @@ def get_documents(
 
         return success_response(
             data=document_list,
-            message=f"Retrieved {len(document_list)} documents"
+            message=f"Retrieved {len(document_list)} documents",
+            pagination=pagination
         )
 
     except Exception as e:
@@ -10,6 +10,7 @@ from sqlalchemy import desc, func
 from datetime import datetime
 
 from app.db.session import get_db
+from app.db.pagination import paginate, count_rows
 from app.schemas.response import success_response, error_response
 from app.schemas.global_insights import (
     GlobalInsightCreate,
@@ -22,17 +23,30 @@ from app.schemas.global_insights import (
     PillarType
 )
 from app.models.global_insight import GlobalInsight
+from app.services.response_cache import cached_response, global_insights_tags
+from app.utils.langraph.llm_usage import get_llm_usage_totals
 
 router = APIRouter()
 
 
+# Sort options of the insight list and the column each one orders by (then by id)
+SORT_COLUMNS = {
+    "weighted_count": GlobalInsight.weighted_count,
+    "count": GlobalInsight.count,
+    "last_seen": GlobalInsight.last_seen,
+}
+
+
 @router.get("/", response_model=dict)
+@cached_response(lambda pillar=None, **_: global_insights_tags(pillar))
 def get_global_insights(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     pillar: Optional[PillarType] = Query(None),
     type: Optional[InsightType] = Query(None),
     sort_by: str = Query("weighted_count", regex="^(weighted_count|count|last_seen)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (replaces skip)"),
+    include_total: bool = Query(False, description="Count the total on cursor pages"),
     db: Session = Depends(get_db)
 ):
     """
@@ -50,36 +64,26 @@ def get_global_insights(
         if type:
             query = query.filter(GlobalInsight.type == type)
 
-        # Get total count
-        total = query.count()
-
-        # Apply sorting
-        if sort_by == "weighted_count":
-            query = query.order_by(desc(GlobalInsight.weighted_count))
-        elif sort_by == "count":
-            query = query.order_by(desc(GlobalInsight.count))
-        elif sort_by == "last_seen":
-            query = query.order_by(desc(GlobalInsight.last_seen))
+        # Offset pages keep their total for existing clients; cursor pages count on request
+        counted = count_rows(query) if include_total or not cursor else None
 
-        # Get paginated results
-        insights = query.offset(skip).limit(limit).all()
+        # Get the sorted page
+        insights, pagination = paginate(
+            query, sort_by, SORT_COLUMNS[sort_by], GlobalInsight.id,
+            limit, skip=skip, cursor=cursor
+        )
 
         # Convert to response format
         insight_responses = [GlobalInsightResponse(**insight.to_dict()) for insight in insights]
 
-        # Create pagination info
-        page = (skip // limit) + 1
-        per_page = limit
-        has_next = total > skip + limit
-        has_prev = skip > 0
-
         result = GlobalInsightList(
             insights=insight_responses,
-            total=total,
-            page=page,
-            per_page=per_page,
-            has_next=has_next,
-            has_prev=has_prev
+            total=counted["total"] if counted else None,
+            page=None if cursor else (skip // limit) + 1,
+            per_page=limit,
+            has_next=pagination["has_next"],
+            has_prev=pagination["has_prev"],
+            next_cursor=pagination["next_cursor"]
         )
 
         return success_response(
@@ -92,6 +96,7 @@ def get_global_insights(
 
 
 @router.get("/by-pillar", response_model=dict)
+@cached_response(global_insights_tags())
 def get_insights_by_pillar(
     limit_per_type: int = Query(10, ge=1, le=50, description="Max insights per type (problems/proposals)"),
     db: Session = Depends(get_db)
@@ -143,6 +148,7 @@ def get_insights_by_pillar(
 
 
 @router.get("/{insight_id}", response_model=dict)
+@cached_response(global_insights_tags())
 def get_global_insight(insight_id: int, db: Session = Depends(get_db)):
     """
     Get a specific global insight by ID
@@ -282,6 +288,7 @@ def delete_global_insight(insight_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/stats/summary", response_model=dict)
+@cached_response(global_insights_tags())
 def get_insights_statistics(db: Session = Depends(get_db)):
     """
     Get summary statistics about global insights
@@ -330,3 +337,31 @@ def get_insights_statistics(db: Session = Depends(get_db)):
 
     except Exception as e:
         return error_response(f"Error retrieving statistics: {str(e)}")
+
+
+@router.get("/stats/routing", response_model=dict)
+def get_routing_statistics():
+    """
+    Get per-tier hit rates of the insight comparison router, LLM usage totals,
+    connection reuse of the shared model provider pools and the background job loop
+    """
+    # The router pulls in numpy and the pools httpx, which API startup does not otherwise need
+    from app.services.background_loop import background_loop
+    from app.services.llm_http import llm_http_pool
+    from app.utils.langraph.model_router import get_routing_stats
+
+    try:
+        stats = {
+            "routing": get_routing_stats(),
+            "llm_usage": get_llm_usage_totals(),
+            "http_pool": llm_http_pool.stats(),
+            "background_loop": background_loop.stats()
+        }
+
+        return success_response(
+            data=stats,
+            message="Routing statistics retrieved successfully"
+        )
+
+    except Exception as e:
+        return error_response(f"Error retrieving routing statistics: {str(e)}")
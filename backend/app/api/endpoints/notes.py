@@ -1,9 +1,12 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 from datetime import datetime
 from app.db.session import get_db
+from app.db.pagination import paginate, count_rows
 from app.schemas.response import success_response, error_response
 from app.schemas.note import (
     NoteCreate, NoteUpdate, NoteResponse, NoteProcessRequest, NoteProcessResponse,
@@ -13,9 +16,10 @@ from app.schemas.note import (
 )
 from app.models import Session as SessionModel, ProcessedFile, TextProcessingJob, ChangeLog
 from app.enums import ProcessingStatus
+from app.core.config import settings
+from app.services.job_events import job_event_broker, JobPhase, iter_with_keepalive, format_sse
+from app.services.background_loop import background_loop
 import json
-import asyncio
-import threading
 
 router = APIRouter()
 
@@ -40,8 +44,10 @@ def create_processing_job(
         db.commit()
         db.refresh(new_job)
 
+        job_event_broker.publish(new_job.id, JobPhase.QUEUED)
+
         # Start background processing
-        threading.Thread(target=process_job_async, args=(new_job.id,), daemon=True).start()
+        process_job_async(new_job.id)
 
         # Return job info
         job_response = TextProcessingJobResponse.model_validate(new_job)
@@ -59,6 +65,7 @@ def create_processing_job(
 def process_job_async(job_id: int):
     """
     Background function to process the text processing job using LangGraph
+    Runs on the shared background loop; returns a future that completes with the job
     """
     import asyncio
     import logging
@@ -68,36 +75,66 @@ def process_job_async(job_id: int):
 
     logger = logging.getLogger(__name__)
 
+    def publish_progress(phase: str, data: dict):
+        job_event_broker.publish(job_id, phase, data)
+
     async def async_process():
         db = SessionLocal()
-        try:
-            # Get the job
+        job = None
+
+        # The session is only used from worker threads, one call at a time, so its
+        # queries and commits never block the other jobs on the shared loop
+        def start_job():
+            nonlocal job
             job = db.query(TextProcessingJob).filter(TextProcessingJob.id == job_id).first()
             if not job:
-                return
+                return None
 
             # Update status to processing
             job.status = ProcessingStatus.PROCESSING
             job.started_at = datetime.now()
             db.commit()
+            return job.input_text, job.context or ""
+
+        def complete_job(result: dict) -> datetime:
+            completed_at = datetime.now()
+            job.result = result
+            job.status = ProcessingStatus.COMPLETED
+            job.completed_at = completed_at
+            db.commit()
+            return completed_at
+
+        def fail_job(error_message: str):
+            db.rollback()
+            if job is None:
+                return
+            job.status = ProcessingStatus.ERROR
+            job.error_message = error_message
+            job.completed_at = datetime.now()
+            db.commit()
+
+        try:
+            # Get the job
+            loaded = await asyncio.to_thread(start_job)
+            if loaded is None:
+                return
+            publish_progress(JobPhase.STARTED, {})
 
             # Extract insights using LangGraph
-            text = job.input_text
-            context = job.context or ""
+            text, context = loaded
 
             # Use the new extraction task with fallback
             processed_insights = await extract_insights_task(
                 text=text,
                 context=context,
                 job_id=job_id,
-                use_fallback=True
+                use_fallback=True,
+                progress_callback=publish_progress
             )
 
             # Update job with results
-            job.result = processed_insights
-            job.status = ProcessingStatus.COMPLETED
-            job.completed_at = datetime.now()
-            db.commit()
+            completed_at = await asyncio.to_thread(complete_job, processed_insights)
+            publish_progress(JobPhase.EXTRACTED, {"result": processed_insights})
 
             # Trigger global insights aggregation if pillar analysis exists
             pillar_analysis = processed_insights.get("ysi_pillar_analysis", {})
@@ -107,7 +144,7 @@ def process_job_async(job_id: int):
                 # Prepare document metadata
                 doc_metadata = {
                     "title": processed_insights.get("themes_identified", [None])[0] or f"Document {job_id}",
-                    "date": job.completed_at.isoformat() if job.completed_at else datetime.now().isoformat(),
+                    "date": completed_at.isoformat(),
                     "uploader": "System",
                     "region": None,  # Could be extracted from context in the future
                     "stakeholder": None  # Could be extracted from key actors
@@ -119,29 +156,25 @@ def process_job_async(job_id: int):
                         job_id=job_id,
                         pillar_analysis=pillar_analysis,
                         doc_metadata=doc_metadata,
-                        db=db
+                        db=db,
+                        progress_callback=publish_progress
                     )
                     logger.info(f"Global insights aggregation completed for job {job_id}")
                 except Exception as agg_error:
                     logger.error(f"Error during global insights aggregation for job {job_id}: {str(agg_error)}")
                     # Don't fail the whole job if aggregation fails
 
+            publish_progress(JobPhase.COMPLETED, {})
+
         except Exception as e:
             # Mark job as error
-            job.status = ProcessingStatus.ERROR
-            job.error_message = str(e)
-            job.completed_at = datetime.now()
-            db.commit()
+            await asyncio.to_thread(fail_job, str(e))
+            publish_progress(JobPhase.ERROR, {"error_message": str(e)})
         finally:
-            db.close()
+            await asyncio.to_thread(db.close)
 
-    # Run the async function
-    try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(async_process())
-    finally:
-        loop.close()
+    # Jobs share one long-lived loop, so its model connections and chat models are reused across jobs
+    return background_loop.submit(async_process())
 
 @router.post("/save")
 def save_notes(
@@ -193,6 +226,8 @@ def get_notes(
     author: Optional[str] = Query(None),
     date_from: Optional[str] = Query(None, alias="dateFrom"),
     date_to: Optional[str] = Query(None, alias="dateTo"),
+    cursor: Optional[str] = Query(None, description="pagination.next_cursor of the previous page (replaces skip)"),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db)
 ):
     """
@@ -221,11 +256,13 @@ def get_notes(
             # For now, we'll search in notes content for author name
             query = query.filter(SessionModel.notes.ilike(f"%{author}%"))
 
-        # Get total count
-        total = query.count()
-
         # Get paginated results
-        notes = query.order_by(desc(SessionModel.created_at)).offset(skip).limit(limit).all()
+        notes, pagination = paginate(
+            query, "created_at", SessionModel.created_at, SessionModel.id,
+            limit, skip=skip, cursor=cursor
+        )
+        if include_total:
+            pagination.update(count_rows(query))
 
         # Format response
         notes_list = []
@@ -244,7 +281,8 @@ def get_notes(
 
         return success_response(
             data=notes_list,
-            message=f"Retrieved {len(notes_list)} notes"
+            message=f"Retrieved {len(notes_list)} notes",
+            pagination=pagination
         )
 
     except Exception as e:
@@ -254,17 +292,149 @@ def get_notes(
 # TEXT PROCESSING JOB ENDPOINTS
 # =============================================================================
 
+# List views: "summary" projects only the columns list pages render (no input text, no
+# result JSON); "full" returns everything. `fields` narrows either view to named fields
+VIEW_PATTERN = "^(summary|full)$"
+
+# Characters of the input text returned as input_preview
+JOB_PREVIEW_CHARS = 200
+
+JOB_COLUMNS = {
+    "id": TextProcessingJob.id,
+    "input_text": TextProcessingJob.input_text,
+    "input_preview": func.substr(TextProcessingJob.input_text, 1, JOB_PREVIEW_CHARS),
+    "context": TextProcessingJob.context,
+    "status": TextProcessingJob.status,
+    "result": TextProcessingJob.result,
+    "error_message": TextProcessingJob.error_message,
+    "started_at": TextProcessingJob.started_at,
+    "completed_at": TextProcessingJob.completed_at,
+    "cancelled_at": TextProcessingJob.cancelled_at,
+    "created_by_id": TextProcessingJob.created_by_id,
+    "session_id": TextProcessingJob.session_id,
+    "created_at": TextProcessingJob.created_at,
+    "updated_at": TextProcessingJob.updated_at,
+}
+
+JOB_VIEWS = {
+    "summary": [
+        "id", "input_preview", "context", "status", "error_message", "started_at", "completed_at",
+        "cancelled_at", "created_by_id", "session_id", "created_at", "updated_at"
+    ],
+    "full": [name for name in JOB_COLUMNS if name != "input_preview"],
+}
+
+# Fields of the documents built from completed jobs (the full view)
+DOCUMENT_FIELDS = ["id", "title", "date", "uploader", "mainTheme", "sentiment", "insights", "relatedShapers"]
+
+# Values the summary document view reads from the result JSON in SQL
+DOCUMENT_THEMES = TextProcessingJob.result["themes_identified"]
+DOCUMENT_SENTIMENT = TextProcessingJob.result[("sentiment_analysis", "overall_sentiment")].as_string()
+DOCUMENT_PARTICIPANTS = TextProcessingJob.result["participants_mentioned"]
+
+
+def _requested_fields(fields: Optional[str], available: List[str]) -> List[str]:
+    """Parse a comma separated `fields` parameter (id is always included)"""
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)} (available: {', '.join(available)})")
+    return ["id"] + [name for name in names if name != "id"]
+
+
+def _job_document(row, view: str) -> dict:
+    """
+    ProcessedDocument built from a job row: the summary view carries what document lists
+    render, the full view adds the extracted insights, raw text and analyses
+    """
+    date = (row.completed_at or row.created_at).isoformat()
+
+    if view == "summary":
+        themes = row.themes or []
+        job_sentiment = row.sentiment or "neutral"
+        related_shapers = row.participants or []
+        insights = {
+            "id": str(row.id),
+            "mainTheme": themes[0] if themes else "text_analysis",
+            "subthemes": themes[1:],
+            "generalPerception": job_sentiment,
+            "extractedAt": date
+        }
+    else:
+        result = row.result or {}
+        themes = result.get("themes_identified") or []
+        job_sentiment = result.get("sentiment_analysis", {}).get("overall_sentiment", "neutral")
+        related_shapers = result.get("participants_mentioned", [])
+        # Pillar and network analyses are sent once (not again inside structuredInsights)
+        structured_insights = {
+            key: value for key, value in result.get("structured_insights", {}).items()
+            if key not in ("pillar_analysis", "network_analysis")
+        }
+        insights = {
+            "id": str(row.id),
+            "mainTheme": themes[0] if themes else "text_analysis",
+            "subthemes": themes[1:],
+            "keyActors": related_shapers,
+            "generalPerception": job_sentiment,
+            "proposedActions": result.get("action_items", []),
+            "challenges": result.get("challenges", []),
+            "opportunities": result.get("opportunities", []),
+            "rawText": getattr(row, "input_text", None),
+            "extractedAt": date,
+            # Enhanced YSI pillar analysis
+            "pillarAnalysis": result.get("ysi_pillar_analysis", {}),
+            "structuredInsights": structured_insights,
+            # Network analysis from specialized agent
+            "networkAnalysis": result.get("network_analysis", {})
+        }
+
+    main_theme = insights["mainTheme"]
+    return {
+        "id": str(row.id),
+        "title": main_theme,
+        "date": date,
+        "uploader": "System",  # Could be enhanced with user tracking
+        "mainTheme": main_theme,
+        "sentiment": job_sentiment,
+        "insights": insights,
+        "relatedShapers": related_shapers
+    }
+
+
+def _document_columns(view: str, requested: Optional[List[str]]) -> list:
+    columns = [TextProcessingJob.id, TextProcessingJob.completed_at, TextProcessingJob.created_at]
+    if view == "summary":
+        return columns + [
+            DOCUMENT_THEMES.label("themes"),
+            DOCUMENT_SENTIMENT.label("sentiment"),
+            DOCUMENT_PARTICIPANTS.label("participants")
+        ]
+    columns.append(TextProcessingJob.result)
+    # The raw text is only part of the insights
+    if not requested or "insights" in requested:
+        columns.append(TextProcessingJob.input_text)
+    return columns
+
+
 @router.get("/jobs", response_model=dict)
 def get_processing_jobs(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     status: Optional[ProcessingStatusEnum] = Query(None),
+    view: str = Query("summary", regex=VIEW_PATTERN),
+    fields: Optional[str] = Query(None, description="Comma separated job fields to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (replaces skip)"),
+    include_total: bool = Query(False, description="Count the total on cursor pages"),
     db: Session = Depends(get_db)
 ):
     """
     Get list of text processing jobs with optional filtering
+    The summary view leaves out input_text and result (input_preview holds the start of
+    the text); view=full returns every field
     """
     try:
+        names = _requested_fields(fields, list(JOB_COLUMNS)) if fields else JOB_VIEWS[view]
+
         # Build query
         query = db.query(TextProcessingJob)
 
@@ -272,28 +442,26 @@ def get_processing_jobs(
         if status:
             query = query.filter(TextProcessingJob.status == status.value)
 
-        # Get total count
-        total = query.count()
-
-        # Get paginated results
-        jobs = query.order_by(desc(TextProcessingJob.created_at)).offset(skip).limit(limit).all()
-
-        # Convert to response format
-        job_responses = [TextProcessingJobResponse.model_validate(job) for job in jobs]
+        # Offset pages keep their total for existing clients; cursor pages count on request
+        counted = count_rows(query) if include_total or not cursor else None
 
-        # Create pagination info
-        page = (skip // limit) + 1
-        per_page = limit
-        has_next = total > skip + limit
-        has_prev = skip > 0
+        # Get the page, loading only the requested columns (plus the sort key for the cursor)
+        selected = names if "created_at" in names else names + ["created_at"]
+        rows, pagination = paginate(
+            query.with_entities(*(JOB_COLUMNS[name].label(name) for name in selected)),
+            "created_at", TextProcessingJob.created_at, TextProcessingJob.id,
+            limit, skip=skip, cursor=cursor
+        )
+        job_responses = [{name: row._mapping[name] for name in names} for row in rows]
 
         result = TextProcessingJobList(
             jobs=job_responses,
-            total=total,
-            page=page,
-            per_page=per_page,
-            has_next=has_next,
-            has_prev=has_prev
+            total=counted["total"] if counted else None,
+            page=None if cursor else (skip // limit) + 1,
+            per_page=limit,
+            has_next=pagination["has_next"],
+            has_prev=pagination["has_prev"],
+            next_cursor=pagination["next_cursor"]
         )
 
         return success_response(
@@ -313,13 +481,19 @@ def get_processing_jobs_as_documents(
     date_from: Optional[str] = Query(None, alias="dateFrom"),
     date_to: Optional[str] = Query(None, alias="dateTo"),
     uploader: Optional[str] = Query(None),
+    view: str = Query("summary", regex=VIEW_PATTERN),
+    fields: Optional[str] = Query(None, description="Comma separated document fields to return"),
     db: Session = Depends(get_db)
 ):
     """
     Get completed text processing jobs formatted as ProcessedDocument objects
-    This unifies the Notes and Documents systems
+    This unifies the Notes and Documents systems. The summary view reads only the theme,
+    sentiment and participants out of each result; view=full (or GET /jobs/documents/{job_id})
+    adds the insights, raw text and analyses
     """
     try:
+        requested = _requested_fields(fields, DOCUMENT_FIELDS) if fields else None
+
         # Query only completed jobs with results
         query = db.query(TextProcessingJob).filter(
             TextProcessingJob.status == ProcessingStatus.COMPLETED,
@@ -341,75 +515,33 @@ def get_processing_jobs_as_documents(
             except:
                 pass
 
+        # Sentiment filter in SQL, so pages are not thinned out after pagination
+        if sentiment:
+            query = query.filter(func.coalesce(DOCUMENT_SENTIMENT, "neutral") == sentiment)
+
         # Get total count
         total = query.count()
 
         # Get paginated results
-        jobs = query.order_by(desc(TextProcessingJob.completed_at)).offset(skip).limit(limit).all()
+        rows = (
+            query.with_entities(*_document_columns(view, requested))
+            .order_by(desc(TextProcessingJob.completed_at))
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
 
         # Convert jobs to ProcessedDocument format
         document_list = []
-        for job in jobs:
-            if not job.result:
-                continue
-
-            result = job.result
-
-            # Extract sentiment from LangGraph result
-            job_sentiment = "neutral"
-            if "sentiment_analysis" in result:
-                job_sentiment = result["sentiment_analysis"].get("overall_sentiment", "neutral")
-
-            # Apply sentiment filter
-            if sentiment and sentiment != job_sentiment:
-                continue
-
-            # Extract main theme
-            main_theme = "text_analysis"
-            if "themes_identified" in result and result["themes_identified"]:
-                main_theme = result["themes_identified"][0]
-
-            # Extract related shapers
-            related_shapers = []
-            if "participants_mentioned" in result:
-                related_shapers = result["participants_mentioned"]
-
-            # Create ExtractedInsight object
-            insights = {
-                "id": str(job.id),
-                "mainTheme": main_theme,
-                "subthemes": result.get("themes_identified", [])[1:] if "themes_identified" in result and len(result["themes_identified"]) > 1 else [],
-                "keyActors": result.get("participants_mentioned", []),
-                "generalPerception": job_sentiment,
-                "proposedActions": result.get("action_items", []),
-                "challenges": result.get("challenges", []),
-                "opportunities": result.get("opportunities", []),
-                "rawText": job.input_text,
-                "extractedAt": job.completed_at.isoformat() if job.completed_at else job.created_at.isoformat(),
-                # Enhanced YSI pillar analysis
-                "pillarAnalysis": result.get("ysi_pillar_analysis", {}),
-                "ysiPillarAnalysis": result.get("ysi_pillar_analysis", {}),
-                "structuredInsights": result.get("structured_insights", {}),
-                # Network analysis from specialized agent
-                "networkAnalysis": result.get("network_analysis", {})
-            }
-
-            # Create ProcessedDocument
-            document_data = {
-                "id": str(job.id),
-                "title": main_theme,
-                "date": job.completed_at.isoformat() if job.completed_at else job.created_at.isoformat(),
-                "uploader": "System",  # Could be enhanced with user tracking
-                "mainTheme": main_theme,
-                "sentiment": job_sentiment,
-                "insights": insights,
-                "relatedShapers": related_shapers
-            }
+        for row in rows:
+            document_data = _job_document(row, view)
 
             # Apply uploader filter (though currently all are "System")
             if uploader and uploader.lower() not in document_data["uploader"].lower():
                 continue
 
+            if requested:
+                document_data = {name: document_data[name] for name in requested}
             document_list.append(document_data)
 
         return success_response(
@@ -421,6 +553,34 @@ def get_processing_jobs_as_documents(
         return error_response(f"Error retrieving processed documents: {str(e)}")
 
 
+@router.get("/jobs/documents/{job_id}", response_model=dict)
+def get_processing_job_as_document(
+    job_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get one completed text processing job as a full ProcessedDocument
+    (what a document list entry expands to when it is opened)
+    """
+    try:
+        row = db.query(TextProcessingJob).filter(
+            TextProcessingJob.id == job_id,
+            TextProcessingJob.status == ProcessingStatus.COMPLETED,
+            TextProcessingJob.result.isnot(None)
+        ).with_entities(*_document_columns("full", None)).first()
+
+        if not row:
+            return error_response("Processed document not found")
+
+        return success_response(
+            data=_job_document(row, "full"),
+            message="Processed document retrieved successfully"
+        )
+
+    except Exception as e:
+        return error_response(f"Error retrieving processed document: {str(e)}")
+
+
 @router.get("/jobs/{job_id}", response_model=dict)
 def get_processing_job(job_id: int, db: Session = Depends(get_db)):
     """
@@ -443,6 +603,110 @@ def get_processing_job(job_id: int, db: Session = Depends(get_db)):
         return error_response(f"Error retrieving processing job: {str(e)}")
 
 
+# Phase reported for jobs that have no recorded events in this process
+STATUS_TO_PHASE = {
+    ProcessingStatus.RECEIVED: JobPhase.QUEUED,
+    ProcessingStatus.PROCESSING: JobPhase.STARTED,
+    ProcessingStatus.COMPLETED: JobPhase.COMPLETED,
+    ProcessingStatus.ERROR: JobPhase.ERROR,
+    ProcessingStatus.CANCELLED: JobPhase.CANCELLED,
+}
+
+
+def _get_job_status_snapshot(job_id: int):
+    """Load only the status columns of a job (no input_text/result)"""
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return db.query(
+            TextProcessingJob.id,
+            TextProcessingJob.status,
+            TextProcessingJob.error_message
+        ).filter(TextProcessingJob.id == job_id).first()
+    finally:
+        db.close()
+
+
+async def _job_event_stream(job_id: int, snapshot):
+    """
+    Progress events for a job: recorded history and live events from the broker,
+    or a status snapshot from the database when this process has seen no events
+    """
+    if not job_event_broker.history(job_id):
+        phase = STATUS_TO_PHASE.get(snapshot.status, JobPhase.QUEUED)
+        data = {"error_message": snapshot.error_message} if snapshot.error_message else {}
+        yield {
+            "job_id": job_id,
+            "sequence": 0,
+            "event": phase,
+            "data": data,
+            "timestamp": datetime.now().timestamp()
+        }
+        if phase in JobPhase.TERMINAL:
+            return
+
+    async for event in job_event_broker.subscribe(job_id):
+        yield event
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_processing_job_events(job_id: int):
+    """
+    Stream progress of a text processing job as Server-Sent Events
+    Emits phase transitions and partial results until the job finishes
+    """
+    snapshot = await run_in_threadpool(_get_job_status_snapshot, job_id)
+    if not snapshot:
+        return error_response("Processing job not found")
+
+    async def event_source():
+        events = iter_with_keepalive(
+            _job_event_stream(job_id, snapshot),
+            settings.JOB_EVENTS_KEEPALIVE_SECONDS
+        )
+        async for event in events:
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield format_sse(event)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/jobs/{job_id}/ws")
+async def processing_job_events_websocket(websocket: WebSocket, job_id: int):
+    """
+    WebSocket variant of the job progress stream
+    Sends each event as a JSON message and closes once the job finishes
+    """
+    await websocket.accept()
+
+    snapshot = await run_in_threadpool(_get_job_status_snapshot, job_id)
+    if not snapshot:
+        await websocket.send_json(error_response("Processing job not found"))
+        await websocket.close(code=4404)
+        return
+
+    try:
+        events = iter_with_keepalive(
+            _job_event_stream(job_id, snapshot),
+            settings.JOB_EVENTS_KEEPALIVE_SECONDS
+        )
+        async for event in events:
+            if event is None:
+                await websocket.send_json({"job_id": job_id, "event": "keepalive"})
+            else:
+                await websocket.send_text(json.dumps(event, default=str))
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
 @router.put("/jobs/{job_id}/cancel", response_model=dict)
 def cancel_processing_job(job_id: int, db: Session = Depends(get_db)):
     """
@@ -462,6 +726,7 @@ def cancel_processing_job(job_id: int, db: Session = Depends(get_db)):
         job.status = ProcessingStatus.CANCELLED
         job.cancelled_at = datetime.now()
         db.commit()
+        job_event_broker.publish(job_id, JobPhase.CANCELLED)
 
         job_response = TextProcessingJobResponse.model_validate(job)
 
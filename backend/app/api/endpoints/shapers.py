@@ -3,18 +3,23 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.db.session import get_db
+from app.db.pagination import paginate, count_rows
 from app.schemas.response import success_response, error_response
 from app.schemas.shaper import ShaperCreate, ShaperUpdate, ShaperResponse
 from app.models import Participant, Organization
+from app.services.response_cache import cached_response
 
 router = APIRouter()
 
 @router.get("/")
+@cached_response(["shapers"])
 def get_shapers(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     region: Optional[str] = Query(None),
     focus_area: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="pagination.next_cursor of the previous page (replaces skip)"),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db)
 ):
     """
@@ -32,11 +37,13 @@ def get_shapers(
         if focus_area:
             query = query.filter(Participant.expertise == focus_area)
 
-        # Get total count
-        total = query.count()
-
-        # Get paginated results
-        shapers = query.offset(skip).limit(limit).all()
+        # Get paginated results (in id order)
+        shapers, pagination = paginate(
+            query, "id", Participant.id, Participant.id,
+            limit, skip=skip, cursor=cursor, descending=False
+        )
+        if include_total:
+            pagination.update(count_rows(query))
 
         # Format response
         shaper_list = []
@@ -62,13 +69,15 @@ def get_shapers(
 
         return success_response(
             data=shaper_list,
-            message=f"Retrieved {len(shaper_list)} shapers"
+            message=f"Retrieved {len(shaper_list)} shapers",
+            pagination=pagination
         )
 
     except Exception as e:
         return error_response(str(e))
 
 @router.get("/{shaper_id}")
+@cached_response(["shapers"])
 def get_shaper(shaper_id: int, db: Session = Depends(get_db)):
     """
     Get a specific Global Shaper by ID
@@ -277,6 +286,7 @@ def delete_shaper(shaper_id: int, db: Session = Depends(get_db)):
         return error_response(str(e))
 
 @router.get("/region/{region}")
+@cached_response(["shapers"])
 def get_shapers_by_region(
     region: str,
     skip: int = Query(0, ge=0),
@@ -320,6 +330,7 @@ def get_shapers_by_region(
         return error_response(str(e))
 
 @router.get("/focus/{focus_area}")
+@cached_response(["shapers"])
 def get_shapers_by_focus_area(
     focus_area: str,
     skip: int = Query(0, ge=0),
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, func
 from app.db.session import get_db
+from app.db.pagination import paginate, count_rows
 from app.schemas.response import success_response, error_response
 from app.schemas.stakeholder import (
     StakeholderCreate,
@@ -15,6 +16,7 @@ from app.schemas.stakeholder import (
 )
 from app.models.stakeholder import Stakeholder
 from app.models.stakeholder_note import StakeholderNote
+from app.services.response_cache import cached_response
 
 router = APIRouter()
 
@@ -23,12 +25,15 @@ router = APIRouter()
 # =============================================================================
 
 @router.get("/", response_model=dict)
+@cached_response(["stakeholders"])
 def get_stakeholders(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     type: Optional[str] = Query(None),
     region: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="pagination.next_cursor of the previous page (replaces skip)"),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db)
 ):
     """
@@ -52,18 +57,21 @@ def get_stakeholders(
                 (Stakeholder.bio.ilike(f"%{search}%"))
             )
 
-        # Get total count
-        total = query.count()
-
         # Get paginated results
-        stakeholders = query.order_by(desc(Stakeholder.created_at)).offset(skip).limit(limit).all()
+        stakeholders, pagination = paginate(
+            query, "created_at", Stakeholder.created_at, Stakeholder.id,
+            limit, skip=skip, cursor=cursor
+        )
+        if include_total:
+            pagination.update(count_rows(query))
 
         # Format response
         stakeholder_list = [StakeholderResponse.from_orm(s) for s in stakeholders]
 
         return success_response(
             data=stakeholder_list,
-            message=f"Retrieved {len(stakeholder_list)} stakeholders"
+            message=f"Retrieved {len(stakeholder_list)} stakeholders",
+            pagination=pagination
         )
 
     except Exception as e:
@@ -112,6 +120,7 @@ def create_stakeholder(
         return error_response(f"Error creating stakeholder: {str(e)}")
 
 @router.get("/{stakeholder_id}", response_model=dict)
+@cached_response(["stakeholders"])
 def get_stakeholder(stakeholder_id: int, db: Session = Depends(get_db)):
     """
     Get specific stakeholder by ID with notes
@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import List, Optional, Union
 from pydantic_settings import BaseSettings
 from pydantic import AnyHttpUrl, validator
 import os
@@ -48,7 +48,126 @@ class Settings(BaseSettings):
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
-    
+
+    # Job progress stream ("memory" or "redis" for multiple replicas)
+    JOB_EVENTS_BACKEND: str = os.getenv("JOB_EVENTS_BACKEND", "memory")
+    JOB_EVENTS_KEEPALIVE_SECONDS: int = int(os.getenv("JOB_EVENTS_KEEPALIVE_SECONDS", "15"))
+
+    # Stream extraction completions and parse them incrementally
+    EXTRACTION_STREAMING: bool = os.getenv("EXTRACTION_STREAMING", "true").lower() == "true"
+
+    # LLM structured outputs: "json_schema" (native response_format) or "parser" (format instructions in prompt)
+    LLM_STRUCTURED_OUTPUT: str = os.getenv("LLM_STRUCTURED_OUTPUT", "json_schema")
+
+    # Model provider: "openai", or "local" for deterministic offline embeddings and canned
+    # schema-valid completions (benchmarks, load tests) with simulated latency and errors
+    LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "openai")
+    LOCAL_PROVIDER_LATENCY_MS: float = float(os.getenv("LOCAL_PROVIDER_LATENCY_MS", "0"))
+    LOCAL_PROVIDER_JITTER_MS: float = float(os.getenv("LOCAL_PROVIDER_JITTER_MS", "0"))
+    LOCAL_PROVIDER_ERROR_RATE: float = float(os.getenv("LOCAL_PROVIDER_ERROR_RATE", "0"))
+    LOCAL_PROVIDER_ERROR: str = os.getenv("LOCAL_PROVIDER_ERROR", "rate_limit")
+    LOCAL_PROVIDER_SEED: int = int(os.getenv("LOCAL_PROVIDER_SEED", "0"))
+
+    # Keep-alive connection pools shared by the OpenAI clients (one per process for sync calls, one
+    # per event loop for async calls); a job makes up to six concurrent calls in fan-out mode
+    LLM_HTTP_MAX_CONNECTIONS: int = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "32"))
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "16"))
+    LLM_HTTP_KEEPALIVE_SECONDS: float = float(os.getenv("LLM_HTTP_KEEPALIVE_SECONDS", "60"))
+    LLM_HTTP_TIMEOUT_SECONDS: float = float(os.getenv("LLM_HTTP_TIMEOUT_SECONDS", "120"))
+
+    # Insight extraction: "single" expanded call or "fanout" (core call + one call per YSI pillar)
+    EXTRACTION_MODE: str = os.getenv("EXTRACTION_MODE", "single")
+
+    # Tiered model routing for insight comparison (heuristics -> small model -> large model)
+    LLM_SMALL_MODEL: str = os.getenv("LLM_SMALL_MODEL", "gpt-4o-mini")
+    LLM_LARGE_MODEL: str = os.getenv("LLM_LARGE_MODEL", "gpt-4o")
+    ROUTING_USE_EMBEDDINGS: bool = os.getenv("ROUTING_USE_EMBEDDINGS", "true").lower() == "true"
+    ROUTING_EMBEDDING_MODEL: str = os.getenv("ROUTING_EMBEDDING_MODEL", "text-embedding-3-small")
+    ROUTING_EMBEDDING_SIMILAR_THRESHOLD: float = float(os.getenv("ROUTING_EMBEDDING_SIMILAR_THRESHOLD", "0.9"))
+    ROUTING_EMBEDDING_DIFFERENT_THRESHOLD: float = float(os.getenv("ROUTING_EMBEDDING_DIFFERENT_THRESHOLD", "0.4"))
+    # Content-word Jaccard that settles a pair without embeddings (1.0 = the same words)
+    ROUTING_LEXICAL_SIMILAR_THRESHOLD: float = float(os.getenv("ROUTING_LEXICAL_SIMILAR_THRESHOLD", "1.0"))
+    ROUTING_ESCALATION_CONFIDENCE: float = float(os.getenv("ROUTING_ESCALATION_CONFIDENCE", "0.75"))
+    ROUTING_MAX_MODEL_CANDIDATES: int = int(os.getenv("ROUTING_MAX_MODEL_CANDIDATES", "5"))
+
+    # Embedding chunker: boundary "sentence" or "speaker" (speaker turns first), overlap in tokens,
+    # process pool size for large batches (0 disables, unset picks from the CPU count)
+    EMBEDDING_CHUNK_BOUNDARY: str = os.getenv("EMBEDDING_CHUNK_BOUNDARY", "sentence")
+    EMBEDDING_CHUNK_OVERLAP: int = int(os.getenv("EMBEDDING_CHUNK_OVERLAP", "100"))
+    EMBEDDING_CHUNK_PROCESSES: Optional[int] = int(os.environ["EMBEDDING_CHUNK_PROCESSES"]) if os.getenv("EMBEDDING_CHUNK_PROCESSES") else None
+    # tiktoken BPE files, pre-seeded at image build (app/scripts/prefetch_tiktoken.py) so tokenizing works offline
+    TIKTOKEN_CACHE_DIR: str = os.getenv(
+        "TIKTOKEN_CACHE_DIR",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".tiktoken_cache")
+    )
+    # Embedding model for new rows and queries until a version is activated in embedding_versions
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002")
+    EMBEDDING_DIMENSIONS: Optional[int] = int(os.environ["EMBEDDING_DIMENSIONS"]) if os.getenv("EMBEDDING_DIMENSIONS") else None
+    EMBEDDING_VERSION_TTL_SECONDS: int = int(os.getenv("EMBEDDING_VERSION_TTL_SECONDS", "10"))
+    # Background re-embedding job (app/scripts/reembed.py) rate limits
+    REEMBED_BATCH_SIZE: int = int(os.getenv("REEMBED_BATCH_SIZE", "100"))
+    REEMBED_REQUESTS_PER_MINUTE: int = int(os.getenv("REEMBED_REQUESTS_PER_MINUTE", "300"))
+    REEMBED_TOKENS_PER_MINUTE: int = int(os.getenv("REEMBED_TOKENS_PER_MINUTE", "500000"))
+    # Embedding storage: "blob" (packed floats, float32 or float16) or legacy "json"
+    EMBEDDING_STORAGE: str = os.getenv("EMBEDDING_STORAGE", "blob")
+    EMBEDDING_BLOB_DTYPE: str = os.getenv("EMBEDDING_BLOB_DTYPE", "float32")
+
+    # Vector search precision: "exact" (every filtered row scored in NumPy) or an in-memory index of
+    # "int8" / "binary" codes whose top limit*VECTOR_RESCORE_FACTOR candidates are rescored exactly
+    VECTOR_SEARCH_PRECISION: str = os.getenv("VECTOR_SEARCH_PRECISION", "exact")
+    VECTOR_RESCORE_FACTOR: int = int(os.getenv("VECTOR_RESCORE_FACTOR", "10"))
+    VECTOR_INDEX_REFRESH_SECONDS: int = int(os.getenv("VECTOR_INDEX_REFRESH_SECONDS", "60"))
+
+    # Query embedding cache for search ("memory" or "redis" to share across replicas)
+    QUERY_EMBEDDING_CACHE_BACKEND: str = os.getenv("QUERY_EMBEDDING_CACHE_BACKEND", "memory")
+    QUERY_EMBEDDING_CACHE_SIZE: int = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "2048"))
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: int = int(os.getenv("QUERY_EMBEDDING_CACHE_TTL_SECONDS", "86400"))
+
+    # Search result cache in knowledge_query, refreshed in the background when the corpus changes
+    SEARCH_CACHE_ENABLED: bool = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+    SEARCH_CACHE_VERSION_TTL_SECONDS: int = int(os.getenv("SEARCH_CACHE_VERSION_TTL_SECONDS", "10"))
+    SEARCH_CACHE_REFRESH_INTERVAL_SECONDS: int = int(os.getenv("SEARCH_CACHE_REFRESH_INTERVAL_SECONDS", "300"))
+    SEARCH_CACHE_REFRESH_TOP_N: int = int(os.getenv("SEARCH_CACHE_REFRESH_TOP_N", "50"))
+    # Cache hits are counted in memory and written to knowledge_query this often
+    SEARCH_CACHE_FLUSH_SECONDS: int = int(os.getenv("SEARCH_CACHE_FLUSH_SECONDS", "30"))
+
+    # Filtered search planning: pre-filter in SQL up to this many matching rows, cap on widened candidates
+    SEARCH_PREFILTER_MAX_ROWS: int = int(os.getenv("SEARCH_PREFILTER_MAX_ROWS", "5000"))
+    SEARCH_MAX_CANDIDATES: int = int(os.getenv("SEARCH_MAX_CANDIDATES", "1000"))
+
+    # Search re-ranking: recency decay and MMR diversification (lambda 1.0 disables MMR)
+    SEARCH_RECENCY_HALF_LIFE_DAYS: float = float(os.getenv("SEARCH_RECENCY_HALF_LIFE_DAYS", "7"))
+    SEARCH_RECENCY_BOOST: float = float(os.getenv("SEARCH_RECENCY_BOOST", "0.1"))
+    SEARCH_MMR_LAMBDA: float = float(os.getenv("SEARCH_MMR_LAMBDA", "0.7"))
+    SEARCH_MMR_POOL_FACTOR: int = int(os.getenv("SEARCH_MMR_POOL_FACTOR", "3"))
+
+    # Response compression: gzip bodies of at least this many bytes (event streams are never compressed)
+    GZIP_MINIMUM_SIZE: int = int(os.getenv("GZIP_MINIMUM_SIZE", "1000"))
+    GZIP_COMPRESS_LEVEL: int = int(os.getenv("GZIP_COMPRESS_LEVEL", "6"))
+
+    # List totals: cached for this long, and estimated from table statistics above this many rows
+    PAGINATION_COUNT_CACHE_SECONDS: int = int(os.getenv("PAGINATION_COUNT_CACHE_SECONDS", "30"))
+    PAGINATION_EXACT_COUNT_MAX: int = int(os.getenv("PAGINATION_EXACT_COUNT_MAX", "100000"))
+
+    # Response cache of read-heavy GET endpoints ("redis" shares it across replicas, falls back to
+    # "memory" without the redis package); stale responses are served while being refreshed
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "redis")
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+    RESPONSE_CACHE_STALE_SECONDS: int = int(os.getenv("RESPONSE_CACHE_STALE_SECONDS", "600"))
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+
+    # Startup warm-up, reported by /ready: pre-opened DB connections, tokenizer encodings, LangGraph
+    # graphs to compile (names in app/utils/LangGraph/graphs, "*" for all) and optional cache priming
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    WARMUP_DB_CONNECTIONS: int = int(os.getenv("WARMUP_DB_CONNECTIONS", "5"))
+    WARMUP_ENCODINGS: str = os.getenv("WARMUP_ENCODINGS", "cl100k_base")
+    WARMUP_GRAPHS: str = os.getenv("WARMUP_GRAPHS", "")
+    WARMUP_PRIME_CACHES: bool = os.getenv("WARMUP_PRIME_CACHES", "false").lower() == "true"
+    WARMUP_PRIME_PATHS: str = os.getenv(
+        "WARMUP_PRIME_PATHS", "/api/v1/global-insights/by-pillar,/api/v1/analytics/overview"
+    )
+
     # MinIO Configuration
     MINIO_HOST: str = os.getenv("MINIO_HOST", "localhost")
     MINIO_PORT: int = int(os.getenv("MINIO_PORT", "9000"))
@@ -20,4 +20,5 @@ from app.models.knowledge_query import KnowledgeQuery
 from app.models.processed_file import ProcessedFile
 from app.models.activity_log import ActivityLog
 from app.models.metrics_snapshot import MetricsSnapshot
-from app.models.text_embedding import TextEmbedding
\ No newline at end of file
+from app.models.text_embedding import TextEmbedding
+from app.models.embedding_version import EmbeddingVersion
\ No newline at end of file
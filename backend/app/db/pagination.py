@@ -0,0 +1,177 @@
+"""
+List pagination
+Keyset (cursor) pagination on (sort key, id): a page continues after the last row of the
+previous one instead of skipping rows, so deep pages cost the same as the first (given a
+composite index on the two columns). Offset pagination stays available and returns a cursor
+as well, so clients can switch at any page. Totals are optional, cached for a short while
+and estimated from table statistics for large unfiltered tables
+"""
+
+import base64
+import json
+import logging
+import operator
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, and_, or_, text
+from sqlalchemy.orm import Query
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Distinct count queries kept in the cache
+COUNT_CACHE_SIZE = 256
+
+_count_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_count_lock = threading.Lock()
+
+
+def encode_cursor(sort: str, value: Any, row_id: int) -> str:
+    """Opaque cursor for the position after (value, row_id) in the `sort` ordering"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, column) -> Tuple[Any, int]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, row_id = json.loads(payload)
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        row_id = int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort:
+        raise ValueError(f"Cursor was issued for sort '{cursor_sort}', not '{sort}'")
+    return value, row_id
+
+
+def _segments(query: Query, column, id_column, value: Any, last_id: int, descending: bool) -> list:
+    """
+    Conditions of the rows after (value, last_id) in ORDER BY column, id (same direction),
+    in order. NULL keys are a segment of their own: folding them into one OR condition
+    would turn the index range into a full index scan
+    """
+    beyond, reaching = (operator.lt, operator.le) if descending else (operator.gt, operator.ge)
+    tie = beyond(id_column, last_id)
+    # NULL sorts below every value, except on PostgreSQL where it sorts above
+    nulls_first = (query.session.get_bind().dialect.name == "postgresql") == descending
+    if value is None:
+        segments = [and_(column.is_(None), tie)]
+        return segments + [column.isnot(None)] if nulls_first else segments
+    # The leading inequality on the sort key alone keeps it an index range on every backend
+    segments = [and_(reaching(column, value), or_(beyond(column, value), tie))]
+    return segments if nulls_first else segments + [column.is_(None)]
+
+
+def paginate(
+    query: Query,
+    sort: str,
+    column,
+    id_column,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    descending: bool = True
+) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    One page of `query` ordered by (column, id)
+
+    Args:
+        sort: Name of the ordering, recorded in cursors so they are not reused across sorts
+        cursor: Continue after this cursor (keyset); `skip` is ignored when given
+
+    Returns:
+        The rows and the pagination block (next_cursor is None on the last page)
+    """
+    direction = operator.methodcaller("desc" if descending else "asc")
+    ordered = query.order_by(direction(column), direction(id_column))
+
+    # One extra row tells whether there is a next page without counting
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort, column)
+        rows = []
+        for condition in _segments(query, column, id_column, value, last_id, descending):
+            rows += ordered.filter(condition).limit(limit + 1 - len(rows)).all()
+            if len(rows) > limit:
+                break
+    else:
+        rows = ordered.offset(skip or None).limit(limit + 1).all()
+
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_next:
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, getattr(last, column.key), getattr(last, id_column.key))
+
+    return rows, {
+        "next_cursor": next_cursor,
+        "has_next": has_next,
+        "has_prev": bool(cursor) or skip > 0
+    }
+
+
+def _estimated_table_rows(query: Query) -> Optional[int]:
+    entity = query.column_descriptions[0].get("entity")
+    table = getattr(entity, "__table__", None)
+    if table is None:
+        return None
+
+    dialect = query.session.get_bind().dialect.name
+    if dialect == "mysql":
+        sql = "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+    elif dialect == "postgresql":
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE relname = :table"
+    else:
+        return None
+
+    try:
+        estimate = query.session.execute(text(sql), {"table": table.name}).scalar()
+    except Exception as e:
+        logger.warning(f"Row estimate for {table.name} failed: {str(e)}")
+        return None
+    # reltuples is -1 for tables never analyzed
+    return int(estimate) if estimate is not None and estimate >= 0 else None
+
+
+def count_rows(query: Query) -> Dict[str, Any]:
+    """
+    Total rows of `query` as {"total", "total_estimated"}
+
+    Results are cached for PAGINATION_COUNT_CACHE_SECONDS. Unfiltered queries on tables
+    larger than PAGINATION_EXACT_COUNT_MAX rows use the table statistics instead of COUNT(*)
+    """
+    compiled = query.statement.compile()
+    key = f"{compiled}|{sorted(compiled.params.items())!r}"
+    now = time.monotonic()
+    with _count_lock:
+        cached = _count_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    result = None
+    if query.whereclause is None:
+        estimate = _estimated_table_rows(query)
+        if estimate is not None and estimate > settings.PAGINATION_EXACT_COUNT_MAX:
+            result = {"total": estimate, "total_estimated": True}
+    if result is None:
+        result = {"total": query.order_by(None).count(), "total_estimated": False}
+
+    with _count_lock:
+        if len(_count_cache) >= COUNT_CACHE_SIZE:
+            _count_cache.pop(next(iter(_count_cache)))
+        _count_cache[key] = (now + settings.PAGINATION_COUNT_CACHE_SECONDS, result)
+    return result
+
+
+def clear_count_cache():
+    with _count_lock:
+        _count_cache.clear()
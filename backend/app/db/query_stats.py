@@ -0,0 +1,84 @@
+"""
+SQL statement accounting
+Counts the statements (and their time) executed inside a block, per statement type,
+through engine events and a context variable, so concurrent jobs on other threads
+or tasks are not mixed in
+"""
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+_instrumented = set()
+
+
+class QueryStats:
+    """Statements executed while a count_queries() block was active"""
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.parent = parent
+        self.count = 0
+        self.duration_ms = 0.0
+        self.by_type: Counter = Counter()
+
+    def add(self, statement: str, duration_ms: float):
+        self.count += 1
+        self.duration_ms += duration_ms
+        self.by_type[statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"] += 1
+        if self.parent is not None:
+            self.parent.add(statement, duration_ms)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "queries": self.count,
+            "query_time_ms": round(self.duration_ms, 2),
+            "by_type": dict(self.by_type)
+        }
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started = conn.info.get("query_started_at")
+    if stats is None or not started:
+        return
+    stats.add(statement, (time.perf_counter() - started.pop()) * 1000)
+
+
+def instrument_engine(engine: Engine):
+    """Attach the counting hooks to an engine (idempotent)"""
+    if id(engine) in _instrumented:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    _instrumented.add(id(engine))
+
+
+@contextmanager
+def count_queries(engine: Optional[Engine] = None) -> Iterator[QueryStats]:
+    """
+    Count the statements executed inside the block (tasks created inside inherit it)
+
+    Args:
+        engine: Engine to instrument (defaults to the application engine)
+    """
+    if engine is None:
+        from app.db.session import engine
+    instrument_engine(engine)
+
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
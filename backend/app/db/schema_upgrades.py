@@ -0,0 +1,86 @@
+"""
+In-place schema upgrades for existing databases
+Columns and tables the models expect that create_all does not add to tables that
+already exist. Every step checks the live schema first, so running them again (or
+after the standalone migration scripts) changes nothing
+"""
+
+import logging
+from typing import List, Union
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.types import VectorBlob
+from app.models.embedding_version import EmbeddingVersion
+
+logger = logging.getLogger(__name__)
+
+TEXT_EMBEDDINGS = "text_embeddings"
+
+
+def _embedding_statements(bind: Union[Engine, Connection]) -> List[str]:
+    inspector = inspect(bind)
+    columns = {c["name"]: c for c in inspector.get_columns(TEXT_EMBEDDINGS)}
+    indexes = {i["name"] for i in inspector.get_indexes(TEXT_EMBEDDINGS)}
+    dialect = bind.dialect
+    blob_type = VectorBlob().compile(dialect=dialect)
+    statements = []
+
+    # Binary vector storage (app/scripts/migrate_embedding_storage.py moves the JSON vectors)
+    if "embedding_blob" not in columns:
+        statements.append(f"ALTER TABLE {TEXT_EMBEDDINGS} ADD COLUMN embedding_blob {blob_type} NULL")
+    if "embedding" in columns and not columns["embedding"]["nullable"]:
+        if dialect.name == "mysql":
+            statements.append(f"ALTER TABLE {TEXT_EMBEDDINGS} MODIFY embedding JSON NULL")
+        elif dialect.name == "postgresql":
+            statements.append(f"ALTER TABLE {TEXT_EMBEDDINGS} ALTER COLUMN embedding DROP NOT NULL")
+        else:
+            logger.warning(f"Cannot relax NOT NULL on embedding for dialect {dialect.name}")
+
+    # Embedding versions (app/scripts/reembed.py)
+    if "embedding_model" not in columns:
+        statements.append(f"ALTER TABLE {TEXT_EMBEDDINGS} ADD COLUMN embedding_model VARCHAR(120) NULL")
+    if "next_embedding_blob" not in columns:
+        statements.append(f"ALTER TABLE {TEXT_EMBEDDINGS} ADD COLUMN next_embedding_blob {blob_type} NULL")
+    if "next_embedding_model" not in columns:
+        statements.append(f"ALTER TABLE {TEXT_EMBEDDINGS} ADD COLUMN next_embedding_model VARCHAR(120) NULL")
+    for column in ("embedding_model", "next_embedding_model"):
+        index_name = f"ix_{TEXT_EMBEDDINGS}_{column}"
+        if index_name not in indexes:
+            statements.append(f"CREATE INDEX {index_name} ON {TEXT_EMBEDDINGS} ({column})")
+    return statements
+
+
+def upgrade_embedding_schema(bind: Union[Engine, Connection], dry_run: bool = False) -> List[str]:
+    """
+    Add the binary storage and version columns of text_embeddings, their indexes and
+    the embedding_versions table
+
+    Required before deploying code that reads these columns: the TextEmbedding model
+    selects them in every query.
+
+    Returns:
+        The statements run (or that would run with dry_run)
+    """
+    if not inspect(bind).has_table(TEXT_EMBEDDINGS):
+        logger.info(f"{TEXT_EMBEDDINGS} does not exist yet; create_all creates it with every column")
+        return []
+
+    statements = _embedding_statements(bind)
+    if not inspect(bind).has_table(EmbeddingVersion.__tablename__):
+        statements.append(f"CREATE TABLE {EmbeddingVersion.__tablename__}")
+
+    for statement in statements:
+        logger.info(f"{'[dry run] ' if dry_run else ''}{statement}")
+        if dry_run or statement.startswith("CREATE TABLE"):
+            continue
+        if isinstance(bind, Engine):
+            with bind.begin() as conn:
+                conn.execute(text(statement))
+        else:
+            bind.execute(text(statement))
+
+    if not dry_run:
+        EmbeddingVersion.__table__.create(bind=bind, checkfirst=True)
+    return statements
@@ -0,0 +1,56 @@
+"""
+Custom column types
+"""
+
+from typing import TYPE_CHECKING, Any, Optional
+
+from sqlalchemy.dialects import mysql
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# numpy dtype strings; numpy itself is imported on first use since the models load at API startup
+VECTOR_DTYPES = {
+    "float32": "<f4",
+    "float16": "<f2",
+}
+
+
+class VectorBlob(TypeDecorator):
+    """
+    Embedding vector stored as packed little-endian floats (float32 by default)
+
+    Binds lists or arrays; loads as a read-only np.frombuffer view over the
+    fetched bytes, so reading a vector costs no parsing and no copy. The dtype is a
+    property of the stored data: changing it requires rewriting existing rows.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, dtype: str = "float32", *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        self.dtype = dtype
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "mysql":
+            # BLOB caps at 64KB; MEDIUMBLOB leaves room for large-dimension models
+            return dialect.type_descriptor(mysql.MEDIUMBLOB())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return bytes(value)
+        import numpy as np
+        return np.asarray(value, dtype=VECTOR_DTYPES[self.dtype]).tobytes()
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Optional["np.ndarray"]:
+        if value is None:
+            return None
+        import numpy as np
+        return np.frombuffer(value, dtype=VECTOR_DTYPES[self.dtype])
@@ -1,9 +1,15 @@
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from app.core.config import settings
 from app.api.api import api_router
 from app.db.session import engine
 from app.db.base import Base
+from app.services.warmup import startup_warmup
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="YSI Catalyst API",
@@ -19,11 +25,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL,
+)
+
 @app.on_event("startup")
 async def startup_event():
     # Database tables should be created via Alembic migrations
     # Base.metadata.create_all(bind=engine)  # Commented out to avoid FK issues
-    pass
+
+    # Keep popular and saved searches warm when the corpus changes
+    if settings.SEARCH_CACHE_ENABLED:
+        try:
+            from app.services.search_cache import search_cache_refresher
+            search_cache_refresher.start()
+        except Exception as e:
+            logger.warning(f"Search cache refresher not started: {str(e)}")
+
+    # Warm connections, mappers, tokenizer and agents before /ready lets traffic in
+    if settings.WARMUP_ENABLED:
+        startup_warmup.start(app)
+    else:
+        startup_warmup.skip()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await startup_warmup.stop()
+
+    if settings.SEARCH_CACHE_ENABLED:
+        from app.services.search_cache import search_cache_refresher
+        await search_cache_refresher.stop()
+
+    # Closes the job loop's async model client before the shared sync pool
+    from app.services.background_loop import background_loop
+    background_loop.stop()
+
+    from app.services.llm_http import llm_http_pool
+    llm_http_pool.close()
 
 @app.get("/")
 async def root():
@@ -33,4 +73,11 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Ready once the startup warm-up has finished (liveness stays on /health)"""
+    if not startup_warmup.ready:
+        return JSONResponse(status_code=503, content=startup_warmup.stats())
+    return startup_warmup.stats()
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
\ No newline at end of file
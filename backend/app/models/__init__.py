@@ -8,6 +8,7 @@ from .capture_lane import CaptureLane
 from .change_log import ChangeLog
 from .charter_document import CharterDocument
 from .citation import Citation
+from .embedding_version import EmbeddingVersion
 from .global_insight import GlobalInsight
 from .insight import Insight
 from .interaction import Interaction
@@ -34,6 +35,7 @@ __all__ = [
     "ChangeLog",
     "CharterDocument",
     "Citation",
+    "EmbeddingVersion",
     "GlobalInsight",
     "Insight",
     "Interaction",
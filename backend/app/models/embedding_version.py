@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+
+class EmbeddingVersion(Base):
+    """
+    Embedding model versions known to the RAG store
+    Exactly one version is 'active' (used for new rows and queries); a 'building'
+    version is being backfilled by the re-embedding job until cutover
+    """
+    __tablename__ = "embedding_versions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String(120), unique=True, nullable=False)  # "<model>" or "<model>@<dimensions>"
+    model = Column(String(100), nullable=False)
+    dimensions = Column(Integer)  # None = model default
+    status = Column(String(20), nullable=False, default="building", index=True)  # building, active, retired
+    
+    rows_embedded = Column(Integer, default=0)
+    tokens_used = Column(Integer, default=0)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    activated_at = Column(DateTime(timezone=True))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON, Index
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 
@@ -60,3 +60,9 @@ class GlobalInsight(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+# Keyset pagination of the list endpoint: (sort key, id)
+Index('global_insights_weighted_count_idx', GlobalInsight.weighted_count, GlobalInsight.id)
+Index('global_insights_count_idx', GlobalInsight.count, GlobalInsight.id)
+Index('global_insights_last_seen_idx', GlobalInsight.last_seen, GlobalInsight.id)
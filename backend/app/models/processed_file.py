@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, Float, BigInteger
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, Float, BigInteger, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -51,4 +51,8 @@ class ProcessedFile(Base):
     def get_file_metadata(self) -> dict:
         """Get current file metadata from MinIO"""
         from app.utils.minio.storage import minio_service
-        return minio_service.get_object_info(self.minio_key)
\ No newline at end of file
+        return minio_service.get_object_info(self.minio_key)
+
+
+# Keyset pagination of the list endpoint: (sort key, id)
+Index('processed_file_created_idx', ProcessedFile.created_at, ProcessedFile.id)
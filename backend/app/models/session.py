@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -55,4 +55,8 @@ class Session(Base):
     capture_lanes = relationship("CaptureLane", back_populates="session")
     processed_files = relationship("ProcessedFile", back_populates="session")
     citations = relationship("Citation", back_populates="session")
-    
\ No newline at end of file
+    
+
+
+# Keyset pagination of the list endpoint: (sort key, id)
+Index('sessions_type_created_idx', Session.session_type, Session.created_at, Session.id)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -29,4 +29,8 @@ class Stakeholder(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    notes = relationship("StakeholderNote", back_populates="stakeholder", cascade="all, delete-orphan")
\ No newline at end of file
+    notes = relationship("StakeholderNote", back_populates="stakeholder", cascade="all, delete-orphan")
+
+
+# Keyset pagination of the list endpoint: (sort key, id)
+Index('stakeholder_created_idx', Stakeholder.created_at, Stakeholder.id)
@@ -1,9 +1,16 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, Index, func, JSON
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.db.base_class import Base
+from app.db.types import VectorBlob
+from app.core.config import settings
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence
 import uuid
 import hashlib
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class TextEmbedding(Base):
     """
@@ -29,8 +36,18 @@ class TextEmbedding(Base):
     title = Column(String(500))  # Optional title/summary
     
     # Vector embeddings (OpenAI ada-002 = 1536 dimensions)
-    # For MySQL, we'll store as JSON array
-    embedding = Column(JSON, nullable=False)
+    # Packed float32 bytes; the JSON array column only holds rows written before the
+    # binary format (see app/scripts/migrate_embedding_storage.py) and is deferred so
+    # loading a row never parses it
+    embedding_blob = Column(VectorBlob(settings.EMBEDDING_BLOB_DTYPE), nullable=True)
+    embedding = deferred(Column(JSON, nullable=True))
+    
+    # Embedding version (model[@dimensions]) that produced embedding_blob
+    embedding_model = Column(String(120), index=True)
+    
+    # Vector for the version being rolled out, filled by the re-embedding job until cutover
+    next_embedding_blob = deferred(Column(VectorBlob(settings.EMBEDDING_BLOB_DTYPE), nullable=True))
+    next_embedding_model = Column(String(120), index=True)
     
     # Full-text search support
     # Note: We'll handle TSVector in the migration
@@ -55,6 +72,26 @@ class TextEmbedding(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    @property
+    def vector(self) -> Optional["np.ndarray"]:
+        """Embedding as a NumPy array, from the binary column or the legacy JSON"""
+        if self.embedding_blob is not None:
+            return self.embedding_blob
+        if self.embedding is not None:
+            import numpy as np
+            return np.asarray(self.embedding, dtype=np.float32)
+        return None
+    
+    @staticmethod
+    def vector_columns(vector: Sequence[float], version_key: Optional[str] = None) -> Dict[str, Any]:
+        """Column values storing a new embedding in the configured format"""
+        columns: Dict[str, Any] = {'embedding_model': version_key} if version_key else {}
+        if settings.EMBEDDING_STORAGE == "json":
+            columns['embedding'] = list(vector)
+        else:
+            columns['embedding_blob'] = vector
+        return columns
+    
     @classmethod
     def generate_content_hash(cls, text: str) -> str:
         """Generate SHA256 hash for content deduplication"""
@@ -114,11 +114,12 @@ class GlobalInsightResponse(BaseModel):
 
 class GlobalInsightList(BaseModel):
     insights: List[GlobalInsightResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # Cursor pages only count on request
+    page: Optional[int] = None  # Offset pages only
     per_page: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
 
 
 # Pillar-grouped response for frontend
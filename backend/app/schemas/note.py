@@ -86,13 +86,14 @@ class TextProcessingJobResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 class TextProcessingJobList(BaseModel):
-    """Schema for paginated list of text processing jobs"""
-    jobs: List[TextProcessingJobResponse]
-    total: int
-    page: int
+    """Schema for paginated list of text processing jobs (each job holds the fields of the requested view)"""
+    jobs: List[Dict[str, Any]]
+    total: Optional[int] = None  # Cursor pages only count on request
+    page: Optional[int] = None  # Offset pages only
     per_page: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
 
 # =============================================================================
 # DOCUMENT EDITING SCHEMAS
@@ -1,4 +1,4 @@
-from typing import TypeVar, Generic, Optional, Any
+from typing import TypeVar, Generic, Optional, Any, Dict
 from pydantic import BaseModel
 
 T = TypeVar('T')
@@ -11,6 +11,7 @@ class ApiResponse(BaseModel, Generic[T]):
     data: Optional[T] = None
     error: Optional[str] = None
     message: Optional[str] = None
+    pagination: Optional[Dict[str, Any]] = None  # next_cursor, has_next, has_prev (and total when requested)
 
     class Config:
         schema_extra = {
@@ -22,14 +23,17 @@ class ApiResponse(BaseModel, Generic[T]):
             }
         }
 
-def success_response(data: Any = None, message: str = None) -> dict:
-    """Create a successful API response"""
-    return {
+def success_response(data: Any = None, message: str = None, pagination: dict = None) -> dict:
+    """Create a successful API response (list endpoints add their pagination block)"""
+    response = {
         "success": True,
         "data": data,
         "error": None,
         "message": message
     }
+    if pagination is not None:
+        response["pagination"] = pagination
+    return response
 
 def error_response(error: str, message: str = None) -> dict:
     """Create an error API response"""
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Extraction mode benchmark
+Compares end-to-end latency of the single expanded extraction call against the
+per-pillar fan-out mode on the same documents (requires OPENAI_API_KEY)
+"""
+
+import asyncio
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from app.utils.langraph.extraction_task import create_extraction_task
+from app.utils.langraph.llm_usage import collect_llm_usage
+
+import logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+MODES = ["single", "fanout"]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def benchmark_mode(mode: str, documents: List[str], runs: int, stream: bool) -> Dict[str, Any]:
+    """Run every document `runs` times in one extraction mode"""
+    task = create_extraction_task()
+    latencies: List[float] = []
+    first_partial: List[float] = []
+    failures = 0
+
+    with collect_llm_usage() as usage:
+        for _ in range(runs):
+            for text in documents:
+                started = time.perf_counter()
+                first_item_at: List[float] = []
+
+                def on_progress(phase: str, data: Dict[str, Any]):
+                    if phase == "partial_insight" and not first_item_at:
+                        first_item_at.append(time.perf_counter() - started)
+
+                try:
+                    await task.process_text(
+                        text,
+                        context="extraction mode benchmark",
+                        progress_callback=on_progress if stream else None,
+                        extraction_mode=mode
+                    )
+                    latencies.append(time.perf_counter() - started)
+                    if first_item_at:
+                        first_partial.append(first_item_at[0])
+                except Exception as e:
+                    failures += 1
+                    logger.warning(f"{mode} extraction failed: {str(e)}")
+
+    summary = usage.summary()
+    return {
+        "mode": mode,
+        "runs": len(latencies),
+        "failures": failures,
+        "latency_mean_s": round(statistics.mean(latencies), 3) if latencies else None,
+        "latency_p50_s": round(_percentile(latencies, 50), 3) if latencies else None,
+        "latency_p95_s": round(_percentile(latencies, 95), 3) if latencies else None,
+        "first_partial_mean_s": round(statistics.mean(first_partial), 3) if first_partial else None,
+        "llm_calls": summary["calls"],
+        "input_tokens": summary["input_tokens"],
+        "output_tokens": summary["output_tokens"],
+        "cached_tokens": summary["cached_tokens"]
+    }
+
+
+def load_documents(paths: List[str]) -> List[str]:
+    documents = []
+    for path in paths:
+        file_path = Path(path)
+        files = sorted(file_path.glob("*.txt")) if file_path.is_dir() else [file_path]
+        documents.extend(f.read_text(encoding="utf-8") for f in files)
+    return documents
+
+
+async def main():
+    """Command line interface for the extraction mode benchmark"""
+    parser = argparse.ArgumentParser(description="Compare single vs per-pillar fan-out extraction latency")
+    parser.add_argument("documents", nargs="+", help="Text files or directories of .txt files to extract")
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions per document and mode")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES, help="Modes to compare")
+    parser.add_argument("--no-stream", action="store_true", help="Disable streamed completions")
+    parser.add_argument("--output", type=str, help="Write the JSON report to this file")
+
+    args = parser.parse_args()
+
+    documents = load_documents(args.documents)
+    if not documents:
+        logger.error("No documents found")
+        exit(1)
+
+    from app.core.config import settings
+    settings.EXTRACTION_STREAMING = not args.no_stream
+
+    report = {
+        "documents": len(documents),
+        "runs_per_document": args.runs,
+        "streaming": settings.EXTRACTION_STREAMING,
+        "results": []
+    }
+    for mode in args.modes:
+        report["results"].append(await benchmark_mode(mode, documents, args.runs, settings.EXTRACTION_STREAMING))
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
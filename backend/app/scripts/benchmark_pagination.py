@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Pagination benchmark
+Latency of offset vs keyset (cursor) pages at increasing depths for the list endpoints'
+queries, plus exact vs cached totals; keyset pages should stay flat as depth grows
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.db.pagination import clear_count_cache, count_rows, encode_cursor, paginate
+from app.models import GlobalInsight, Participant, ProcessedFile, Session as SessionModel, Stakeholder, TextProcessingJob
+
+# name -> (base query, sort name, sort column, id column, descending), as the endpoints paginate
+LISTS: Dict[str, Any] = {
+    "notes/jobs": (lambda db: db.query(TextProcessingJob), "created_at",
+                   TextProcessingJob.created_at, TextProcessingJob.id, True),
+    "global-insights": (lambda db: db.query(GlobalInsight), "weighted_count",
+                        GlobalInsight.weighted_count, GlobalInsight.id, True),
+    "shapers": (lambda db: db.query(Participant).filter(Participant.role.ilike('%shaper%')), "id",
+                Participant.id, Participant.id, False),
+    "stakeholders": (lambda db: db.query(Stakeholder), "created_at", Stakeholder.created_at, Stakeholder.id, True),
+    "notes": (lambda db: db.query(SessionModel).filter(SessionModel.session_type == "notes"), "created_at",
+              SessionModel.created_at, SessionModel.id, True),
+    "documents": (lambda db: db.query(ProcessedFile), "created_at", ProcessedFile.created_at, ProcessedFile.id, True),
+}
+
+
+def _median_ms(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+def benchmark_list(db: Session, name: str, depths: List[int], limit: int, repeat: int) -> Dict[str, Any]:
+    make_query, sort, column, id_column, descending = LISTS[name]
+    total = make_query(db).count()
+    direction = (lambda c: c.desc()) if descending else (lambda c: c.asc())
+
+    pages = []
+    for depth in depths:
+        if depth >= total:
+            break
+        # Cursor positioned after row `depth` (looked up once, not timed)
+        if depth:
+            row = make_query(db).order_by(direction(column), direction(id_column)).offset(depth - 1).first()
+            cursor = encode_cursor(sort, getattr(row, column.key), row.id)
+        else:
+            cursor = None
+
+        offset_rows, _ = paginate(make_query(db), sort, column, id_column, limit, skip=depth, descending=descending)
+        keyset_rows, _ = paginate(make_query(db), sort, column, id_column, limit, cursor=cursor, descending=descending)
+        pages.append({
+            "depth": depth,
+            "offset_ms": _median_ms(
+                lambda: paginate(make_query(db), sort, column, id_column, limit, skip=depth, descending=descending),
+                repeat
+            ),
+            "keyset_ms": _median_ms(
+                lambda: paginate(make_query(db), sort, column, id_column, limit, cursor=cursor, descending=descending),
+                repeat
+            ),
+            "same_rows": [r.id for r in offset_rows] == [r.id for r in keyset_rows]
+        })
+
+    clear_count_cache()
+    return {
+        "rows": total,
+        "pages": pages,
+        "count_ms": _median_ms(lambda: make_query(db).count(), repeat),
+        "cached_count_ms": _median_ms(lambda: count_rows(make_query(db)), repeat)
+    }
+
+
+def main():
+    """Command line interface for the pagination benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark offset vs keyset pagination of the list endpoints")
+    parser.add_argument("--lists", type=str, default=",".join(LISTS), help=f"Comma separated ({', '.join(LISTS)})")
+    parser.add_argument("--depths", type=str, default="0,100,1000,10000,100000", help="Rows skipped before the page")
+    parser.add_argument("--limit", type=int, default=50, help="Page size")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement (median reported)")
+    parser.add_argument("--output", type=str, help="Write the JSON report to this file")
+
+    args = parser.parse_args()
+    names = [name.strip() for name in args.lists.split(",") if name.strip()]
+    unknown = [name for name in names if name not in LISTS]
+    if unknown:
+        parser.error(f"unknown lists: {', '.join(unknown)}")
+    depths = [int(depth) for depth in args.depths.split(",")]
+
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        report = {
+            "limit": args.limit,
+            "repeat": args.repeat,
+            "lists": {name: benchmark_list(db, name, depths, args.limit, args.repeat) for name in names}
+        }
+    finally:
+        db.close()
+
+    for name, result in report["lists"].items():
+        print(f"{name} ({result['rows']} rows, count {result['count_ms']} ms, cached {result['cached_count_ms']} ms)")
+        for page in result["pages"]:
+            print(f"  depth {page['depth']:>7}: offset {page['offset_ms']:>9} ms  keyset {page['keyset_ms']:>9} ms"
+                  f"{'' if page['same_rows'] else '  ROWS DIFFER'}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Processing pipeline throughput benchmark
+Drives the /notes/process job path (job row -> extraction -> global insights
+aggregation) over synthetic meeting notes at a fixed concurrency and reports jobs per
+minute, per-phase p50/p95, database statements and LLM calls per job
+
+By default the models are the offline local provider with a configurable latency, so
+the numbers measure our own overhead and concurrency limits rather than OpenAI's.
+Aggregation writes GlobalInsight rows: point DATABASE_URL at a scratch database.
+
+    python -m app.scripts.benchmark_pipeline --sizes small medium --jobs 20 --concurrency 4 \\
+        --output results/pipeline-$(git rev-parse --short HEAD).json --baseline results/pipeline-main.json
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.db.query_stats import count_queries
+from app.db.session import SessionLocal
+from app.enums import ProcessingStatus
+from app.models import TextProcessingJob
+from app.scripts.synthetic_notes import NOTE_SIZES, generate_notes
+from app.services.job_events import JobPhase, job_event_broker
+from app.services.llm_provider import PROVIDER_LOCAL, PROVIDER_OPENAI, local_provider
+from app.utils.langraph.llm_usage import collect_llm_usage
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# (name, start event, end event); "submitted" is recorded by the benchmark itself
+PHASES = [
+    ("submit", "submitted", JobPhase.QUEUED),
+    ("extraction", JobPhase.STARTED, JobPhase.EXTRACTED),
+    ("insights", JobPhase.STARTED, JobPhase.INSIGHTS_READY),
+    ("network", JobPhase.STARTED, JobPhase.NETWORK_READY),
+    ("aggregation", JobPhase.EXTRACTED, JobPhase.COMPLETED),
+    ("total", "submitted", JobPhase.COMPLETED),
+]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _distribution(values: List[float], digits: int = 1) -> Optional[Dict[str, float]]:
+    if not values:
+        return None
+    return {
+        "mean": round(statistics.mean(values), digits),
+        "p50": round(_percentile(values, 50), digits),
+        "p95": round(_percentile(values, 95), digits),
+        "max": round(max(values), digits)
+    }
+
+
+class EventTimeline:
+    """First timestamp of every phase per job, fed by the job event broker"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.events: Dict[int, Dict[str, float]] = defaultdict(dict)
+
+    def __call__(self, event: Dict[str, Any]):
+        with self._lock:
+            self.events[event["job_id"]].setdefault(event["event"], event["timestamp"])
+
+    def mark(self, job_id: int, phase: str, timestamp: float):
+        with self._lock:
+            self.events[job_id].setdefault(phase, timestamp)
+
+    def get(self, job_id: int) -> Dict[str, float]:
+        with self._lock:
+            return dict(self.events.get(job_id, {}))
+
+
+def run_job(text: str, timeline: EventTimeline) -> Dict[str, Any]:
+    """Submit and process one job exactly like POST /notes/process, waiting for it to finish"""
+    # Imported here: the endpoint module pulls in the whole API router
+    from app.api.endpoints.notes import process_job_async
+
+    with count_queries() as queries, collect_llm_usage() as llm_usage:
+        submitted = time.time()
+        db = SessionLocal()
+        try:
+            job = TextProcessingJob(
+                input_text=text,
+                context="pipeline benchmark",
+                status=ProcessingStatus.RECEIVED
+            )
+            db.add(job)
+            db.commit()
+            job_id = job.id
+        finally:
+            db.close()
+
+        timeline.mark(job_id, "submitted", submitted)
+        job_event_broker.publish(job_id, JobPhase.QUEUED)
+        process_job_async(job_id).result()
+
+    events = timeline.get(job_id)
+    usage = llm_usage.summary()
+    return {
+        "job_id": job_id,
+        "ok": JobPhase.COMPLETED in events and JobPhase.ERROR not in events,
+        "phases_ms": {
+            name: (events[end] - events[start]) * 1000
+            for name, start, end in PHASES
+            if start in events and end in events
+        },
+        "queries": queries.count,
+        "query_time_ms": queries.duration_ms,
+        "llm_calls": usage["calls"],
+        "llm_calls_by_agent": {agent: data["calls"] for agent, data in usage["by_agent"].items()},
+        "input_tokens": usage["input_tokens"],
+        "output_tokens": usage["output_tokens"]
+    }
+
+
+def benchmark_size(size: str, jobs: int, concurrency: int, seed: int, warmup: int) -> Dict[str, Any]:
+    """Process `jobs` notes of one size with `concurrency` jobs in flight"""
+    documents = generate_notes(size, jobs + warmup, seed=seed)
+    timeline = EventTimeline()
+    job_event_broker.add_listener(timeline)
+    try:
+        warmup_ids = [run_job(text, timeline)["job_id"] for text in documents[:warmup]]
+
+        calls_before, errors_before = local_provider.calls, local_provider.errors
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda text: run_job(text, timeline), documents[warmup:]))
+        wall_seconds = time.perf_counter() - started
+    finally:
+        job_event_broker.remove_listener(timeline)
+
+    completed = [r for r in results if r["ok"]]
+    agents = sorted({agent for r in results for agent in r["llm_calls_by_agent"]})
+    return {
+        "size": size,
+        "words_per_document": NOTE_SIZES[size],
+        "jobs": len(results),
+        "failed": len(results) - len(completed),
+        "wall_seconds": round(wall_seconds, 2),
+        "jobs_per_minute": round(len(completed) / wall_seconds * 60, 2) if wall_seconds else None,
+        "phases_ms": {
+            name: _distribution([r["phases_ms"][name] for r in completed if name in r["phases_ms"]])
+            for name, _, _ in PHASES
+        },
+        "db_queries_per_job": _distribution([r["queries"] for r in results]),
+        "db_query_time_ms_per_job": _distribution([r["query_time_ms"] for r in results]),
+        "llm_calls_per_job": _distribution([r["llm_calls"] for r in results], digits=2),
+        "llm_calls_per_job_by_agent": {
+            agent: round(statistics.mean(r["llm_calls_by_agent"].get(agent, 0) for r in results), 2)
+            for agent in agents
+        },
+        "tokens_per_job": {
+            "input": round(statistics.mean(r["input_tokens"] for r in results)) if results else 0,
+            "output": round(statistics.mean(r["output_tokens"] for r in results)) if results else 0
+        },
+        "provider_calls": local_provider.calls - calls_before,
+        "provider_errors_injected": local_provider.errors - errors_before,
+        "job_ids": warmup_ids + [r["job_id"] for r in results]
+    }
+
+
+def delete_jobs(job_ids: List[int]):
+    db = SessionLocal()
+    try:
+        db.query(TextProcessingJob).filter(TextProcessingJob.id.in_(job_ids)).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Throughput and p95 changes per size; lines ending in REGRESSION exceed the tolerance"""
+    lines = []
+    previous = {result["size"]: result for result in baseline.get("results", [])}
+    for result in report["results"]:
+        base = previous.get(result["size"])
+        if not base:
+            continue
+        metrics = [("jobs_per_minute", result["jobs_per_minute"], base["jobs_per_minute"], True)]
+        for phase in ("total", "extraction", "aggregation"):
+            current, old = result["phases_ms"].get(phase), base["phases_ms"].get(phase)
+            if current and old:
+                metrics.append((f"{phase}_p95_ms", current["p95"], old["p95"], False))
+        current, old = result["db_queries_per_job"], base["db_queries_per_job"]
+        if current and old:
+            metrics.append(("db_queries_per_job", current["mean"], old["mean"], False))
+
+        for name, current, old, higher_is_better in metrics:
+            if not old:
+                continue
+            change = (current - old) / old
+            worse = -change if higher_is_better else change
+            flag = "  REGRESSION" if worse > tolerance else ""
+            lines.append(f"{result['size']:>7} {name:<22} {old:>10} -> {current:<10} ({change:+.1%}){flag}")
+    return lines
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    """Command line interface for the pipeline throughput benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end job processing throughput")
+    parser.add_argument("--sizes", nargs="+", choices=list(NOTE_SIZES), default=["small", "medium"])
+    parser.add_argument("--jobs", type=int, default=20, help="Measured jobs per size")
+    parser.add_argument("--concurrency", type=int, default=4, help="Jobs in flight")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured jobs per size")
+    parser.add_argument("--provider", choices=[PROVIDER_LOCAL, PROVIDER_OPENAI], default=PROVIDER_LOCAL)
+    parser.add_argument("--latency-ms", type=float, default=800, help="Local provider latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=300, help="Local provider latency jitter (+/-)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Local provider injected error rate")
+    parser.add_argument("--extraction-mode", choices=["single", "fanout"], default=settings.EXTRACTION_MODE)
+    parser.add_argument("--no-stream", action="store_true", help="Disable streamed completions")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep-jobs", action="store_true", help="Keep the benchmark's job rows")
+    parser.add_argument("--output", type=str, help="Write the JSON report to this file")
+    parser.add_argument("--baseline", type=str, help="Earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Relative change reported as a regression")
+
+    args = parser.parse_args()
+
+    settings.LLM_PROVIDER = args.provider
+    settings.EXTRACTION_MODE = args.extraction_mode
+    settings.EXTRACTION_STREAMING = not args.no_stream
+    local_provider.latency_ms = args.latency_ms
+    local_provider.jitter_ms = args.jitter_ms
+    local_provider.error_rate = args.error_rate
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "config": {
+            "provider": args.provider,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "concurrency": args.concurrency,
+            "jobs_per_size": args.jobs,
+            "extraction_mode": args.extraction_mode,
+            "streaming": settings.EXTRACTION_STREAMING,
+            "structured_output": settings.LLM_STRUCTURED_OUTPUT,
+            "seed": args.seed
+        },
+        "results": []
+    }
+
+    for size in args.sizes:
+        logger.warning(f"Benchmarking {args.jobs} {size} jobs at concurrency {args.concurrency}")
+        result = benchmark_size(size, args.jobs, args.concurrency, args.seed, args.warmup)
+        job_ids = result.pop("job_ids")
+        if not args.keep_jobs:
+            delete_jobs(job_ids)
+        report["results"].append(result)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output)
+
+    if args.baseline:
+        lines = compare_with_baseline(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        print("\n".join(["", f"Compared with {args.baseline}:"] + lines))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Vector quantization benchmark
+Recall@k against exact search vs index memory for int8 and binary codes with
+full-precision rescoring of the top candidates
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from app.services.vector_index import (
+    PRECISION_BINARY, PRECISION_FLOAT32, PRECISION_INT8, QuantizedIndex, normalize_rows
+)
+
+
+def load_corpus(limit: int) -> np.ndarray:
+    """Stored embeddings (binary storage only), newest first"""
+    from app.db.session import SessionLocal
+    from app.models.text_embedding import TextEmbedding
+
+    db = SessionLocal()
+    try:
+        rows = db.query(TextEmbedding.embedding_blob).filter(
+            TextEmbedding.embedding_blob.isnot(None)
+        ).order_by(TextEmbedding.id.desc()).limit(limit).all()
+        return np.vstack([row[0] for row in rows]).astype(np.float32) if rows else np.zeros((0, 0), np.float32)
+    finally:
+        db.close()
+
+
+def synthetic_corpus(size: int, dims: int, clusters: int, seed: int) -> np.ndarray:
+    """Clustered vectors, closer to real topic structure than isotropic noise"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dims)).astype(np.float32)
+    assignment = rng.integers(0, clusters, size)
+    return centers[assignment] + 0.6 * rng.normal(size=(size, dims)).astype(np.float32)
+
+
+def make_queries(corpus: np.ndarray, count: int, noise: float, seed: int) -> np.ndarray:
+    """Perturbed corpus vectors, standing in for paraphrased questions"""
+    rng = np.random.default_rng(seed + 1)
+    picks = rng.choice(len(corpus), size=min(count, len(corpus)), replace=False)
+    base = normalize_rows(corpus[picks])
+    return normalize_rows(base + noise * rng.normal(size=base.shape).astype(np.float32) / np.sqrt(base.shape[1]))
+
+
+def evaluate(
+    precision: str,
+    corpus: np.ndarray,
+    unit_corpus: np.ndarray,
+    queries: np.ndarray,
+    truth: List[set],
+    k: int,
+    rescore_factors: List[int]
+) -> Dict[str, Any]:
+    index = QuantizedIndex(precision)
+    started = time.perf_counter()
+    index.build(np.arange(len(corpus)), corpus)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    report = {
+        "memory_bytes": index.memory_bytes(),
+        "bytes_per_vector": round(index.memory_bytes() / len(corpus), 1),
+        "build_ms": round(build_ms, 1),
+        "rescore": {}
+    }
+
+    for factor in rescore_factors:
+        recalls, candidate_ms, rescore_ms = [], [], []
+        for query, expected in zip(queries, truth):
+            started = time.perf_counter()
+            candidates = index.candidates(query, k * factor)
+            candidate_ms.append((time.perf_counter() - started) * 1000)
+
+            # Full-precision rescoring of the candidates only (the vectors the search loads from the database)
+            started = time.perf_counter()
+            exact = unit_corpus[candidates] @ query
+            top = candidates[np.argsort(-exact)[:k]]
+            rescore_ms.append((time.perf_counter() - started) * 1000)
+
+            recalls.append(len(expected & set(top.tolist())) / k)
+
+        report["rescore"][f"x{factor}"] = {
+            "candidates": k * factor,
+            f"recall@{k}": round(statistics.mean(recalls), 4),
+            "candidate_ms_p50": round(statistics.median(candidate_ms), 3),
+            "rescore_ms_p50": round(statistics.median(rescore_ms), 3)
+        }
+    return report
+
+
+def main():
+    """Command line interface for the quantization benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark int8/binary vector quantization recall and memory")
+    parser.add_argument("--source", choices=["db", "synthetic"], default="db",
+                        help="Stored embeddings or a synthetic clustered corpus")
+    parser.add_argument("--size", type=int, default=20000, help="Corpus size (max rows loaded from the database)")
+    parser.add_argument("--dims", type=int, default=1536, help="Synthetic vector dimensions")
+    parser.add_argument("--clusters", type=int, default=200, help="Synthetic topic clusters")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--noise", type=float, default=0.5, help="Query perturbation relative to a unit vector")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore-factors", type=str, default="1,2,5,10,20")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=str, help="Write the JSON report to this file")
+
+    args = parser.parse_args()
+    rescore_factors = [int(f) for f in args.rescore_factors.split(",")]
+
+    if args.source == "db":
+        corpus = load_corpus(args.size)
+        if len(corpus) == 0:
+            parser.error("no embeddings with binary storage; run migrate_embedding_storage or use --source synthetic")
+    else:
+        corpus = synthetic_corpus(args.size, args.dims, args.clusters, args.seed)
+
+    unit_corpus = normalize_rows(corpus)
+    queries = make_queries(corpus, args.queries, args.noise, args.seed)
+    exact_scores = queries @ unit_corpus.T
+    truth = [set(np.argsort(-row)[:args.k].tolist()) for row in exact_scores]
+
+    report = {
+        "source": args.source,
+        "corpus_size": int(len(corpus)),
+        "dimensions": int(corpus.shape[1]),
+        "queries": int(len(queries)),
+        "k": args.k,
+        "precisions": {
+            precision: evaluate(precision, corpus, unit_corpus, queries, truth, args.k, rescore_factors)
+            for precision in (PRECISION_FLOAT32, PRECISION_INT8, PRECISION_BINARY)
+        }
+    }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output)
+
+
+if __name__ == "__main__":
+    main()
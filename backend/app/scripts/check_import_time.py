@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Import time check
+Times importing the API (or any module) in fresh interpreters and ranks the slowest modules
+with -X importtime; fails when the median exceeds the budget or when a module that should
+only load on first use (LLM clients, tokenizers, numpy) is imported at startup
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Top-level packages API startup must not import (they load with the first job or search)
+DEFAULT_FORBIDDEN = ["langchain_core", "langchain_openai", "openai", "tiktoken", "numpy", "psutil", "httpx"]
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def _run(module: str, *flags: str) -> subprocess.CompletedProcess:
+    code = f"import time; started = time.perf_counter(); import {module}; " \
+           f"print((time.perf_counter() - started) * 1000)"
+    result = subprocess.run([sys.executable, *flags, "-c", code], capture_output=True, text=True, cwd=BACKEND_DIR)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return result
+
+
+def import_wall_ms(module: str) -> float:
+    """Time to import `module` in a fresh interpreter"""
+    return float(_run(module).stdout.strip().splitlines()[-1])
+
+
+def import_breakdown(module: str) -> List[Tuple[str, float, float]]:
+    """(name, self ms, cumulative ms) of every module imported with `module` (-X importtime)"""
+    modules = []
+    for line in _run(module, "-X", "importtime").stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            modules.append((match.group(4), int(match.group(1)) / 1000, int(match.group(2)) / 1000))
+    return modules
+
+
+def check(module: str, repeat: int, budget_ms: float, forbidden: List[str], top: int) -> Dict[str, Any]:
+    # The first import also compiles bytecode; it is not timed
+    modules = import_breakdown(module)
+    totals = [import_wall_ms(module) for _ in range(repeat)]
+
+    loaded = {name.split(".")[0] for name, _, _ in modules}
+    slowest = sorted(modules, key=lambda m: m[2], reverse=True)
+
+    median_ms = round(statistics.median(totals), 1)
+    unexpected = sorted(name for name in forbidden if name in loaded)
+    return {
+        "module": module,
+        "median_ms": median_ms,
+        "runs_ms": [round(total, 1) for total in totals],
+        "budget_ms": budget_ms,
+        "modules_imported": len(modules),
+        # -X importtime adds its own overhead, so these only rank the modules
+        "slowest": [
+            {"module": name, "self_ms": round(own, 1), "cumulative_ms": round(cumulative, 1)}
+            for name, own, cumulative in slowest[:top]
+        ],
+        "unexpected_imports": unexpected,
+        "passed": median_ms <= budget_ms and not unexpected
+    }
+
+
+def main():
+    """Command line interface for the import time check"""
+    parser = argparse.ArgumentParser(description="Measure import time of the API and enforce a startup budget")
+    parser.add_argument("--module", type=str, default="app.main", help="Module to import")
+    parser.add_argument("--budget-ms", type=float, default=1500, help="Maximum median import time")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed imports (median reported)")
+    parser.add_argument("--forbid", type=str, default=",".join(DEFAULT_FORBIDDEN),
+                        help="Comma separated top-level packages that must not be imported")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules listed")
+    parser.add_argument("--output", type=str, help="Write the JSON report to this file")
+
+    args = parser.parse_args()
+    forbidden = [name.strip() for name in args.forbid.split(",") if name.strip()]
+    report = check(args.module, args.repeat, args.budget_ms, forbidden, args.top)
+
+    print(f"import {report['module']}: {report['median_ms']} ms median (budget {report['budget_ms']} ms), "
+          f"{report['modules_imported']} modules")
+    for entry in report["slowest"]:
+        print(f"  {entry['cumulative_ms']:>9} ms  {entry['self_ms']:>8} ms self  {entry['module']}")
+    if report["unexpected_imports"]:
+        print(f"Imported at startup but should load on first use: {', '.join(report['unexpected_imports'])}")
+    print("PASSED" if report["passed"] else "FAILED")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    sys.exit(0 if report["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Model Index Creation
+Creates the indexes declared on the models that an existing database is missing
+(create_all only adds indexes together with new tables), such as the (sort key, id)
+indexes behind keyset pagination
+"""
+
+import argparse
+import logging
+from typing import List, Optional
+
+from sqlalchemy import Index, inspect
+from sqlalchemy.engine import Engine
+
+import app.models  # noqa: F401  (registers every table on the metadata)
+from app.db.base_class import Base
+from app.db.session import engine as default_engine
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def missing_indexes(engine: Engine, tables: Optional[List[str]] = None) -> List[Index]:
+    """Declared indexes of existing tables that the database does not have (by name)"""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables or (tables and table.name not in tables):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing.extend(
+            index for index in sorted(table.indexes, key=lambda index: index.name)
+            if index.name not in existing
+        )
+    return missing
+
+
+def create_indexes(engine: Engine, tables: Optional[List[str]] = None, dry_run: bool = False) -> List[str]:
+    created = []
+    for index in missing_indexes(engine, tables):
+        columns = ", ".join(column.name for column in index.columns)
+        if dry_run:
+            logger.info(f"Would create {index.name} on {index.table.name} ({columns})")
+        else:
+            logger.info(f"Creating {index.name} on {index.table.name} ({columns})")
+            index.create(bind=engine, checkfirst=True)
+        created.append(index.name)
+    return created
+
+
+def main():
+    """Command line interface for creating missing model indexes"""
+    parser = argparse.ArgumentParser(description="Create the model indexes missing from the database")
+    parser.add_argument("--table", action="append", dest="tables", help="Only this table (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="List the missing indexes without creating them")
+
+    args = parser.parse_args()
+
+    created = create_indexes(default_engine, tables=args.tables, dry_run=args.dry_run)
+    logger.info(f"{len(created)} indexes {'missing' if args.dry_run else 'created'}")
+
+
+if __name__ == "__main__":
+    main()
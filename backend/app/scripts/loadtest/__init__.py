@@ -0,0 +1,8 @@
+"""
+HTTP load testing
+Virtual users run realistic flows (dashboard, document browsing, search, job
+submission) against a running API while load ramps through stages; the report holds
+latency percentiles and error rates per endpoint and compares against earlier runs
+
+    python -m app.scripts.loadtest --help
+"""
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+API load test
+Ramps virtual users through --stages against a running server and reports latency
+percentiles, throughput and error rates per endpoint, flow and stage
+
+The submit_job flow runs the full extraction pipeline on the server: start the
+server with LLM_PROVIDER=local (or drop the flow with --flows) unless real model
+calls are intended.
+
+    python -m app.scripts.loadtest --base-url http://localhost:8000 --stages 10:30,50:60,50:120,0:10 \\
+        --output results/load-$(git rev-parse --short HEAD).json --baseline results/load-main.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+from app.core.config import settings
+from app.scripts.loadtest.flows import DEFAULT_WEIGHTS, FlowOptions
+from app.scripts.loadtest.report import build_report, compare_with_baseline, format_table
+from app.scripts.loadtest.runner import LoadTest, parse_stages, parse_weights
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+# One INFO line per request would drown the stage progress
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def main():
+    """Command line interface for the API load test"""
+    parser = argparse.ArgumentParser(description="Load test the API with ramping virtual users")
+    parser.add_argument("--base-url", type=str, default="http://localhost:8000")
+    parser.add_argument("--api-prefix", type=str, default=settings.API_V1_STR)
+    parser.add_argument("--stages", type=str, default="10:30,50:60,50:120,0:10",
+                        help="USERS:SECONDS ramps, reached linearly one after another")
+    parser.add_argument("--flows", type=str, default=",".join(f"{name}={weight}" for name, weight in DEFAULT_WEIGHTS.items()),
+                        help="FLOW=WEIGHT list; flows left out are not run")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean pause between a user's flows (seconds)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Request timeout (seconds)")
+    parser.add_argument("--note-words", type=int, default=FlowOptions.note_words, help="Length of submitted notes")
+    parser.add_argument("--poll-interval", type=float, default=FlowOptions.poll_interval,
+                        help="Seconds between job status polls")
+    parser.add_argument("--max-polls", type=int, default=FlowOptions.max_polls, help="Status polls per submitted job")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=str, help="Write the JSON report to this file")
+    parser.add_argument("--baseline", type=str, help="Earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Relative change reported as a regression")
+
+    args = parser.parse_args()
+
+    test = LoadTest(
+        base_url=args.base_url,
+        stages=parse_stages(args.stages),
+        api_prefix=args.api_prefix,
+        weights=parse_weights(args.flows),
+        think_time=args.think_time,
+        timeout=args.timeout,
+        seed=args.seed,
+        options=FlowOptions(note_words=args.note_words, poll_interval=args.poll_interval, max_polls=args.max_polls)
+    )
+    asyncio.run(test.run())
+    report = build_report(test)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output)
+    else:
+        print(output)
+    print(format_table(report))
+
+    if args.baseline:
+        lines = compare_with_baseline(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        print("\n".join(["", f"Compared with {args.baseline}:"] + lines))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+User flows
+Each flow is one thing a dashboard user does, issuing the requests the frontend
+makes for it (concurrently where the page does); virtual users pick flows by weight
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from app.scripts.loadtest.metrics import Recorder
+from app.scripts.synthetic_notes import NOTE_SIZES, generate_note
+
+SEARCH_TERMS = [
+    "funding", "grant", "mentor", "burnout", "recognition", "policy", "investors",
+    "wellbeing", "ecosystem", "Lagos", "Nairobi", "Foundation",
+]
+
+FINISHED_JOB_STATUSES = {"completed", "error", "cancelled"}
+
+
+@dataclass
+class FlowOptions:
+    """Knobs of the flows that submit work"""
+    note_words: int = NOTE_SIZES["small"]
+    poll_interval: float = 2.0
+    max_polls: int = 15
+
+
+class ApiClient:
+    """
+    httpx client bound to the API prefix that records every request under its
+    endpoint name (the route template, so /notes/jobs/17 and /notes/jobs/18 aggregate)
+    """
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, api_prefix: str):
+        self.client = client
+        self.recorder = recorder
+        self.api_prefix = api_prefix.rstrip("/")
+        self.failed = False
+
+    async def request(self, method: str, path: str, name: Optional[str] = None, **kwargs) -> Optional[Any]:
+        """
+        Issue one request
+
+        Returns:
+            The `data` of a successful response; None on transport errors, HTTP
+            errors and `success: false` bodies (all recorded as errors)
+        """
+        endpoint = name or f"{method} {path}"
+        stage = self.recorder.stage
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, self.api_prefix + path, **kwargs)
+            # Read the body inside the timing: the user waits for all of it
+            body = response.json() if response.headers.get("content-type", "").startswith("application/json") else None
+        except httpx.HTTPError as e:
+            self.recorder.record(endpoint, started, None, type(e).__name__, stage)
+            self.failed = True
+            return None
+
+        error = None
+        if response.status_code >= 400:
+            error = f"http_{response.status_code}"
+        elif isinstance(body, dict) and body.get("success") is False:
+            # Endpoints report most failures as 200 with success: false
+            error = "api_error"
+        self.recorder.record(endpoint, started, response.status_code, error, stage)
+        if error:
+            self.failed = True
+            return None
+        return body.get("data", body) if isinstance(body, dict) else body
+
+    async def get(self, path: str, name: Optional[str] = None, **kwargs) -> Optional[Any]:
+        return await self.request("GET", path, name, **kwargs)
+
+    async def post(self, path: str, name: Optional[str] = None, **kwargs) -> Optional[Any]:
+        return await self.request("POST", path, name, **kwargs)
+
+
+async def dashboard(api: ApiClient, rng: random.Random, options: FlowOptions):
+    """Landing page: overview metrics and the insights-by-pillar panel load together"""
+    await asyncio.gather(
+        api.get("/analytics/overview"),
+        api.get("/global-insights/by-pillar", params={"limit_per_type": 10})
+    )
+
+
+async def browse_documents(api: ApiClient, rng: random.Random, options: FlowOptions):
+    """Documents page (mostly the first pages), then one processed document opened"""
+    skip = rng.choices([0, 20, 40, 60], weights=[6, 2, 1, 1])[0]
+    documents, _ = await asyncio.gather(
+        api.get("/notes/jobs/documents", params={"skip": skip, "limit": 20}),
+        api.get("/documents/", params={"skip": skip, "limit": 20})
+    )
+    if documents:
+        document = rng.choice(documents)
+        await api.get(f"/notes/jobs/documents/{document['id']}", name="GET /notes/jobs/documents/{job_id}")
+
+
+async def search(api: ApiClient, rng: random.Random, options: FlowOptions):
+    """Search box: documents and stakeholders are searched side by side"""
+    term = rng.choice(SEARCH_TERMS)
+    await asyncio.gather(
+        api.get("/documents/search", params={"q": term, "limit": 20}),
+        api.get("/stakeholders/", params={"search": term, "limit": 20})
+    )
+
+
+async def submit_job(api: ApiClient, rng: random.Random, options: FlowOptions):
+    """Paste meeting notes, then poll the job until it finishes (or polling gives up)"""
+    text = generate_note(options.note_words, seed=rng.getrandbits(32))
+    job = await api.post("/notes/process", json={"text": text, "context": "load test"})
+    if not job:
+        return
+    for _ in range(options.max_polls):
+        await asyncio.sleep(options.poll_interval)
+        current = await api.get(f"/notes/jobs/{job['id']}", name="GET /notes/jobs/{job_id} (poll)")
+        if not current or current.get("status") in FINISHED_JOB_STATUSES:
+            return
+
+
+FLOWS: Dict[str, Callable[[ApiClient, random.Random, FlowOptions], Awaitable[None]]] = {
+    "dashboard": dashboard,
+    "browse_documents": browse_documents,
+    "search": search,
+    "submit_job": submit_job,
+}
+
+DEFAULT_WEIGHTS = {
+    "dashboard": 4,
+    "browse_documents": 3,
+    "search": 2,
+    "submit_job": 1,
+}
@@ -0,0 +1,86 @@
+"""
+Load test measurements
+Every request's latency, status and error, tagged with its endpoint (route template)
+and the load stage it was issued in, plus per-flow timings
+"""
+
+import math
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_summary(values: List[float]) -> Optional[Dict[str, float]]:
+    if not values:
+        return None
+    summary = {"mean": round(statistics.mean(values), 1)}
+    summary.update({f"p{pct}": round(percentile(values, pct), 1) for pct in PERCENTILES})
+    summary["max"] = round(max(values), 1)
+    return summary
+
+
+@dataclass
+class Sample:
+    """One request"""
+    endpoint: str
+    stage: int
+    offset_s: float  # Seconds after the run started
+    latency_ms: float
+    status: Optional[int]  # None when no response arrived
+    error: Optional[str]  # Error class: http_<status>, api_error or the transport exception name
+
+
+class Recorder:
+    """Collects samples and flow timings for one run"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stage = 0
+        self.samples: List[Sample] = []
+        self.flows: Dict[str, List[float]] = {}
+        self.flow_errors: Counter = Counter()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def record(self, endpoint: str, started: float, status: Optional[int], error: Optional[str], stage: int):
+        self.samples.append(Sample(
+            endpoint=endpoint,
+            stage=stage,
+            offset_s=round(started - self.started, 3),
+            latency_ms=(time.perf_counter() - started) * 1000,
+            status=status,
+            error=error
+        ))
+
+    def record_flow(self, flow: str, duration_ms: float, failed: bool):
+        self.flows.setdefault(flow, []).append(duration_ms)
+        if failed:
+            self.flow_errors[flow] += 1
+
+
+def summarize(samples: Iterable[Sample], seconds: float) -> Dict[str, Any]:
+    """Request count, throughput, error rate, error breakdown and latency percentiles"""
+    samples = list(samples)
+    errors = Counter(sample.error for sample in samples if sample.error)
+    total_errors = sum(errors.values())
+    return {
+        "requests": len(samples),
+        "requests_per_second": round(len(samples) / seconds, 2) if seconds else None,
+        "errors": total_errors,
+        "error_rate": round(total_errors / len(samples), 4) if samples else 0.0,
+        "errors_by_type": dict(errors.most_common()),
+        "status_codes": dict(Counter(str(sample.status) for sample in samples if sample.status is not None)),
+        "latency_ms": latency_summary([sample.latency_ms for sample in samples])
+    }
@@ -0,0 +1,116 @@
+"""
+Load test report
+JSON report per run (overall, per endpoint, per flow and per stage) and the
+comparison of two runs, so releases can be diffed endpoint by endpoint
+"""
+
+import subprocess
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.scripts.loadtest.metrics import latency_summary, summarize
+from app.scripts.loadtest.runner import LoadTest
+
+# Error rate increase (in absolute points) reported as a regression
+ERROR_RATE_TOLERANCE = 0.01
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def build_report(test: LoadTest) -> Dict[str, Any]:
+    recorder = test.recorder
+    seconds = recorder.elapsed()
+    samples = recorder.samples
+
+    endpoints = {}
+    for name in sorted({sample.endpoint for sample in samples}):
+        endpoints[name] = summarize((s for s in samples if s.endpoint == name), seconds)
+
+    stages = []
+    for index, stage in enumerate(test.stages):
+        stages.append({
+            "stage": index + 1,
+            "target_users": stage.users,
+            "peak_users": max((users for _, at, users in test.active_users if at == index), default=0),
+            **summarize((s for s in samples if s.stage == index), stage.seconds)
+        })
+
+    flows = {
+        name: {
+            "runs": len(durations),
+            "failed": recorder.flow_errors[name],
+            "duration_ms": latency_summary(durations)
+        }
+        for name, durations in sorted(recorder.flows.items())
+    }
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "config": {
+            "base_url": test.base_url,
+            "stages": [{"users": s.users, "seconds": s.seconds} for s in test.stages],
+            "weights": test.weights,
+            "think_time": test.think_time,
+            "timeout": test.timeout,
+            "seed": test.seed,
+            "note_words": test.options.note_words,
+            "poll_interval": test.options.poll_interval
+        },
+        "duration_seconds": round(seconds, 1),
+        "totals": summarize(samples, seconds),
+        "endpoints": endpoints,
+        "flows": flows,
+        "stages": stages
+    }
+
+
+def format_table(report: Dict[str, Any]) -> str:
+    """Per-endpoint summary for the terminal"""
+    lines = [f"{'endpoint':<44} {'requests':>8} {'rps':>7} {'errors':>7} {'p50':>8} {'p95':>8} {'p99':>8}"]
+    rows = list(report["endpoints"].items()) + [("TOTAL", report["totals"])]
+    for name, result in rows:
+        latency = result["latency_ms"] or {}
+        lines.append(
+            f"{name:<44} {result['requests']:>8} {result['requests_per_second'] or 0:>7} "
+            f"{result['error_rate']:>7.1%} {latency.get('p50', '-'):>8} {latency.get('p95', '-'):>8} "
+            f"{latency.get('p99', '-'):>8}"
+        )
+    return "\n".join(lines)
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """p95/p99 latency, throughput and error rate changes per endpoint; lines ending in REGRESSION exceed the tolerance"""
+    lines = []
+    previous = {**baseline.get("endpoints", {}), "TOTAL": baseline.get("totals", {})}
+    current_results = {**report["endpoints"], "TOTAL": report["totals"]}
+    for name, result in current_results.items():
+        base = previous.get(name)
+        if not base:
+            lines.append(f"{name:<44} new endpoint")
+            continue
+
+        # (metric, current, baseline, regressed)
+        metrics = []
+        for pct in ("p95", "p99"):
+            current, old = (result["latency_ms"] or {}).get(pct), (base.get("latency_ms") or {}).get(pct)
+            if current and old:
+                metrics.append((f"{pct}_ms", current, old, (current - old) / old > tolerance))
+        current, old = result["requests_per_second"], base.get("requests_per_second")
+        if current and old:
+            metrics.append(("requests_per_second", current, old, (old - current) / old > tolerance))
+        # Error rates are compared in absolute points: a relative change of a tiny rate means little
+        current, old = result["error_rate"], base.get("error_rate", 0.0)
+        metrics.append(("error_rate", current, old, current - old > ERROR_RATE_TOLERANCE))
+
+        for metric, current, old, regressed in metrics:
+            flag = "  REGRESSION" if regressed else ""
+            lines.append(f"{name:<44} {metric:<20} {old:>10} -> {current:<10}{flag}")
+    return lines
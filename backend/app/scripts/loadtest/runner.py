@@ -0,0 +1,122 @@
+"""
+Load test runner
+Ramps a population of virtual users through stages (target users reached linearly over
+each stage's duration); every user loops over weighted flows with exponential think
+time in between, sharing one connection pool
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.scripts.loadtest.flows import DEFAULT_WEIGHTS, FLOWS, ApiClient, FlowOptions
+from app.scripts.loadtest.metrics import Recorder
+
+logger = logging.getLogger(__name__)
+
+# How often the user population is adjusted to the ramp
+TICK_SECONDS = 0.5
+
+
+@dataclass
+class Stage:
+    users: int
+    seconds: float
+
+
+def parse_stages(spec: str) -> List[Stage]:
+    """"10:30,50:60,0:10" -> ramp to 10 users over 30s, to 50 over 60s, down to 0 over 10s"""
+    stages = []
+    for part in spec.split(","):
+        users, _, seconds = part.strip().partition(":")
+        if not seconds:
+            raise ValueError(f"Stage must be USERS:SECONDS, got {part!r}")
+        stages.append(Stage(int(users), float(seconds)))
+    return stages
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """"dashboard=4,search=1" -> flow weights (flows not listed are not run)"""
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in FLOWS:
+            raise ValueError(f"Unknown flow {name!r} (available: {', '.join(FLOWS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def target_users(stages: List[Stage], elapsed: float) -> Tuple[int, int]:
+    """(users, stage index) at `elapsed` seconds; stage index len(stages) once finished"""
+    previous = 0
+    for index, stage in enumerate(stages):
+        if elapsed < stage.seconds:
+            progress = elapsed / stage.seconds if stage.seconds else 1.0
+            return round(previous + (stage.users - previous) * progress), index
+        elapsed -= stage.seconds
+        previous = stage.users
+    return previous, len(stages)
+
+
+@dataclass
+class LoadTest:
+    base_url: str
+    stages: List[Stage]
+    api_prefix: str = "/api/v1"
+    weights: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_WEIGHTS))
+    think_time: float = 1.0
+    timeout: float = 30.0
+    seed: int = 1
+    options: FlowOptions = field(default_factory=FlowOptions)
+
+    def __post_init__(self):
+        self.recorder = Recorder()
+        # (seconds since start, stage index, running users) per tick
+        self.active_users: List[Tuple[float, int, int]] = []
+
+    async def _user(self, user_id: int, client: httpx.AsyncClient):
+        rng = random.Random(f"{self.seed}:user:{user_id}")
+        names, weights = list(self.weights), list(self.weights.values())
+        api = ApiClient(client, self.recorder, self.api_prefix)
+        while True:
+            flow = rng.choices(names, weights=weights)[0]
+            api.failed = False
+            started = time.perf_counter()
+            await FLOWS[flow](api, rng, self.options)
+            self.recorder.record_flow(flow, (time.perf_counter() - started) * 1000, api.failed)
+            if self.think_time:
+                await asyncio.sleep(rng.expovariate(1 / self.think_time))
+
+    async def run(self) -> Recorder:
+        max_users = max(stage.users for stage in self.stages)
+        limits = httpx.Limits(max_connections=max_users, max_keepalive_connections=max_users)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=limits) as client:
+            users: List[asyncio.Task] = []
+            next_user_id = 0
+            self.recorder = Recorder()
+            last_logged: Optional[int] = None
+            while True:
+                target, stage = target_users(self.stages, self.recorder.elapsed())
+                if stage >= len(self.stages):
+                    break
+                self.recorder.stage = stage
+                while len(users) < target:
+                    users.append(asyncio.create_task(self._user(next_user_id, client)))
+                    next_user_id += 1
+                while len(users) > target:
+                    users.pop().cancel()
+                self.active_users.append((round(self.recorder.elapsed(), 1), stage, len(users)))
+                if stage != last_logged:
+                    logger.info(f"Stage {stage + 1}/{len(self.stages)}: ramping to {self.stages[stage].users} users")
+                    last_logged = stage
+                await asyncio.sleep(TICK_SECONDS)
+
+            for task in users:
+                task.cancel()
+            await asyncio.gather(*users, return_exceptions=True)
+        return self.recorder
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Embedding Storage Migration
+Moves TextEmbedding vectors from the JSON column to packed binary (embedding_blob)
+
+Resumable: each batch commits on its own and only rows without embedding_blob are
+picked up, so an interrupted run continues where it stopped. Run --compare before
+--clear-json to measure both formats on the same rows.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.schema_upgrades import upgrade_embedding_schema
+from app.db.session import engine as default_engine
+from app.db.types import VECTOR_DTYPES
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+TABLE = "text_embeddings"
+
+
+def _load_json(value: Any) -> List[float]:
+    # pymysql returns JSON columns as text; other drivers may already decode them
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+def ensure_schema(engine: Engine, dry_run: bool = False):
+    """Add embedding_blob and make the JSON column nullable (idempotent, see app.db.schema_upgrades)"""
+    upgrade_embedding_schema(engine, dry_run=dry_run)
+
+
+def backfill(engine: Engine, batch_size: int = 500, dtype: str = "float32", dry_run: bool = False) -> int:
+    """Convert JSON vectors to binary in id order; returns the number of rows converted"""
+    np_dtype = VECTOR_DTYPES[dtype]
+    with engine.connect() as conn:
+        remaining = conn.execute(text(
+            f"SELECT COUNT(*) FROM {TABLE} WHERE embedding_blob IS NULL AND embedding IS NOT NULL"
+        )).scalar()
+    logger.info(f"{remaining} rows to convert")
+
+    converted = 0
+    last_id = 0
+    started = time.perf_counter()
+
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(text(
+                f"SELECT id, embedding FROM {TABLE} "
+                f"WHERE embedding_blob IS NULL AND embedding IS NOT NULL AND id > :last_id "
+                f"ORDER BY id LIMIT :batch_size"
+            ), {"last_id": last_id, "batch_size": batch_size}).all()
+            if not rows:
+                break
+
+            params = [
+                {"id": row.id, "blob": np.asarray(_load_json(row.embedding), dtype=np_dtype).tobytes()}
+                for row in rows
+            ]
+            if not dry_run:
+                conn.execute(text(f"UPDATE {TABLE} SET embedding_blob = :blob WHERE id = :id"), params)
+
+        last_id = rows[-1].id
+        converted += len(rows)
+        rate = converted / max(time.perf_counter() - started, 1e-9)
+        logger.info(f"Converted {converted}/{remaining} rows (last id {last_id}, {rate:.0f} rows/s)")
+
+    return converted
+
+
+def clear_json(engine: Engine, batch_size: int = 500, dry_run: bool = False) -> int:
+    """NULL the JSON vectors of rows that have binary storage; returns rows cleared"""
+    if dry_run:
+        with engine.connect() as conn:
+            return conn.execute(text(
+                f"SELECT COUNT(*) FROM {TABLE} WHERE embedding_blob IS NOT NULL AND embedding IS NOT NULL"
+            )).scalar()
+
+    cleared = 0
+    while True:
+        with engine.begin() as conn:
+            ids = [row.id for row in conn.execute(text(
+                f"SELECT id FROM {TABLE} WHERE embedding_blob IS NOT NULL AND embedding IS NOT NULL "
+                f"ORDER BY id LIMIT :batch_size"
+            ), {"batch_size": batch_size}).all()]
+            if not ids:
+                break
+            conn.execute(
+                text(f"UPDATE {TABLE} SET embedding = NULL WHERE id = :id"),
+                [{"id": doc_id} for doc_id in ids]
+            )
+        cleared += len(ids)
+        logger.info(f"Cleared JSON vectors of {cleared} rows")
+    return cleared
+
+
+def _timed(fn, repeat: int) -> Tuple[Dict[str, float], Any]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"mean_ms": round(statistics.mean(timings), 2), "min_ms": round(min(timings), 2)}, result
+
+
+def compare(engine: Engine, sample: int = 1000, dtype: str = "float32", repeat: int = 3) -> Dict[str, Any]:
+    """
+    Row size, load time and index build time of both formats over the same rows
+    (rows that still have both columns populated)
+    """
+    np_dtype = VECTOR_DTYPES[dtype]
+    with engine.connect() as conn:
+        ids = [row.id for row in conn.execute(text(
+            f"SELECT id FROM {TABLE} WHERE embedding_blob IS NOT NULL AND embedding IS NOT NULL "
+            f"ORDER BY id LIMIT :sample"
+        ), {"sample": sample}).all()]
+    if not ids:
+        return {"error": "no rows with both JSON and binary vectors; run the backfill before --clear-json"}
+
+    id_list = ",".join(str(i) for i in ids)
+
+    def load_json():
+        with engine.connect() as conn:
+            rows = conn.execute(text(f"SELECT embedding FROM {TABLE} WHERE id IN ({id_list})")).all()
+        return [np.asarray(_load_json(row.embedding), dtype=np.float32) for row in rows]
+
+    def load_blob():
+        with engine.connect() as conn:
+            rows = conn.execute(text(f"SELECT embedding_blob FROM {TABLE} WHERE id IN ({id_list})")).all()
+        return [np.frombuffer(row.embedding_blob, dtype=np_dtype) for row in rows]
+
+    def build_index(vectors):
+        matrix = np.vstack(vectors).astype(np.float32, copy=False)
+        return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+    with engine.connect() as conn:
+        sizes = conn.execute(text(
+            f"SELECT embedding, embedding_blob FROM {TABLE} WHERE id IN ({id_list})"
+        )).all()
+    json_sizes = [len(row.embedding if isinstance(row.embedding, (str, bytes)) else json.dumps(row.embedding))
+                  for row in sizes]
+    blob_sizes = [len(row.embedding_blob) for row in sizes]
+
+    json_load, json_vectors = _timed(load_json, repeat)
+    blob_load, blob_vectors = _timed(load_blob, repeat)
+    json_index, _ = _timed(lambda: build_index(json_vectors), repeat)
+    blob_index, _ = _timed(lambda: build_index(blob_vectors), repeat)
+
+    max_error = float(max(np.abs(a - b).max() for a, b in zip(json_vectors, blob_vectors)))
+
+    return {
+        "rows": len(ids),
+        "dtype": dtype,
+        "dimensions": int(len(blob_vectors[0])),
+        "row_bytes": {
+            "json_mean": round(statistics.mean(json_sizes)),
+            "blob_mean": round(statistics.mean(blob_sizes)),
+            "ratio": round(statistics.mean(json_sizes) / statistics.mean(blob_sizes), 2),
+        },
+        "load": {"json": json_load, "blob": blob_load},
+        "index_build": {"json": json_index, "blob": blob_index},
+        "max_abs_error": max_error,
+    }
+
+
+def main():
+    """Command line interface for the embedding storage migration"""
+    parser = argparse.ArgumentParser(description="Migrate text embeddings from JSON to binary storage")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per committed batch")
+    parser.add_argument("--dtype", choices=sorted(VECTOR_DTYPES), default=settings.EMBEDDING_BLOB_DTYPE,
+                        help="Must match EMBEDDING_BLOB_DTYPE")
+    parser.add_argument("--compare", action="store_true", help="Benchmark both formats after the backfill")
+    parser.add_argument("--sample", type=int, default=1000, help="Rows used by --compare")
+    parser.add_argument("--clear-json", action="store_true", help="NULL the JSON vectors of migrated rows")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+
+    args = parser.parse_args()
+
+    if args.dtype != settings.EMBEDDING_BLOB_DTYPE:
+        logger.warning(f"--dtype {args.dtype} differs from EMBEDDING_BLOB_DTYPE={settings.EMBEDDING_BLOB_DTYPE}")
+
+    ensure_schema(default_engine, dry_run=args.dry_run)
+    backfill(default_engine, batch_size=args.batch_size, dtype=args.dtype, dry_run=args.dry_run)
+
+    if args.compare:
+        print(json.dumps(compare(default_engine, sample=args.sample, dtype=args.dtype), indent=2))
+
+    if args.clear_json:
+        cleared = clear_json(default_engine, batch_size=args.batch_size, dry_run=args.dry_run)
+        logger.info(f"{'Would clear' if args.dry_run else 'Cleared'} JSON vectors of {cleared} rows")
+
+
+if __name__ == "__main__":
+    main()
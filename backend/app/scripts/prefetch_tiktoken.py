@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+tiktoken Cache Seeding
+Downloads the BPE files of the encodings the pipeline uses into TIKTOKEN_CACHE_DIR,
+so containers built with it tokenize (and start their workers) without network access
+"""
+
+import argparse
+import logging
+import os
+
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Encodings loaded by the embedding service and the chunker
+DEFAULT_ENCODINGS = ["cl100k_base"]
+
+
+def prefetch(encodings, cache_dir: str):
+    # tiktoken reads the directory from the environment when it loads an encoding
+    os.environ["TIKTOKEN_CACHE_DIR"] = cache_dir
+    os.makedirs(cache_dir, exist_ok=True)
+
+    from app.services.text_chunker import load_encoding
+
+    for name in encodings:
+        encoding = load_encoding(name)
+        logger.info(f"{name}: {encoding.n_vocab} tokens cached in {cache_dir}")
+
+
+def main():
+    """Command line interface for seeding the tiktoken cache"""
+    parser = argparse.ArgumentParser(description="Download tiktoken encodings into the local cache directory")
+    parser.add_argument("--encoding", action="append", dest="encodings",
+                        help=f"Encoding to cache (repeatable, default: {', '.join(DEFAULT_ENCODINGS)})")
+    parser.add_argument("--cache-dir", type=str, default=settings.TIKTOKEN_CACHE_DIR,
+                        help="Cache directory (default: TIKTOKEN_CACHE_DIR)")
+
+    args = parser.parse_args()
+    prefetch(args.encodings or DEFAULT_ENCODINGS, args.cache_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Re-embedding and Embedding Model Cutover
+Backfills every TextEmbedding row with a new embedding model (or a new `dimensions`
+setting of a text-embedding-3 model) next to the active vectors, then switches
+versions in one transaction
+
+    python -m app.scripts.reembed status --model text-embedding-3-small
+    python -m app.scripts.reembed run --model text-embedding-3-small --dimensions 512
+    python -m app.scripts.reembed cutover --model text-embedding-3-small --dimensions 512
+
+Searches keep using the active version while `run` is in progress; `run` is
+resumable and can be stopped at any time. After the cutover, rows that were
+not re-embedded (only with --force) are still served through the dual read.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.schema_upgrades import upgrade_embedding_schema
+from app.db.session import SessionLocal, engine as default_engine
+from app.services.embedding_versions import (
+    LEGACY_EMBEDDING_MODEL, EmbeddingModelVersion, ReembeddingJob, embedding_version_registry
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+TABLE = "text_embeddings"
+
+
+def ensure_schema(engine: Engine, legacy_key: str = LEGACY_EMBEDDING_MODEL, dry_run: bool = False):
+    """
+    Add the version columns and the embedding_versions table (app.db.schema_upgrades),
+    and tag untagged rows with the model that produced them (idempotent)
+    """
+    upgrade_embedding_schema(engine, dry_run=dry_run)
+    if dry_run:
+        return
+
+    with engine.begin() as conn:
+        tagged = conn.execute(
+            text(f"UPDATE {TABLE} SET embedding_model = :key WHERE embedding_model IS NULL"),
+            {"key": legacy_key}
+        ).rowcount
+    if tagged:
+        logger.info(f"Tagged {tagged} existing rows as {legacy_key}")
+
+
+def _target(args) -> EmbeddingModelVersion:
+    return EmbeddingModelVersion(args.model, args.dimensions)
+
+
+def _job(args) -> ReembeddingJob:
+    return ReembeddingJob(
+        _target(args),
+        embedding_version_registry,
+        batch_size=args.batch_size,
+        requests_per_minute=args.requests_per_minute,
+        tokens_per_minute=args.tokens_per_minute
+    )
+
+
+def main():
+    """Command line interface for re-embedding and model cutover"""
+    parser = argparse.ArgumentParser(description="Re-embed text embeddings with a new model and switch versions")
+    parser.add_argument("command", choices=["status", "run", "cutover"])
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL, help="Target embedding model")
+    parser.add_argument("--dimensions", type=int, default=None,
+                        help="Output dimensions (text-embedding-3 models only)")
+    parser.add_argument("--legacy-model", default=LEGACY_EMBEDDING_MODEL,
+                        help="Model that produced rows written before versions were tracked")
+    parser.add_argument("--batch-size", type=int, default=settings.REEMBED_BATCH_SIZE, help="Texts per request")
+    parser.add_argument("--requests-per-minute", type=int, default=settings.REEMBED_REQUESTS_PER_MINUTE)
+    parser.add_argument("--tokens-per-minute", type=int, default=settings.REEMBED_TOKENS_PER_MINUTE)
+    parser.add_argument("--max-rows", type=int, default=None, help="Stop after this many rows (run)")
+    parser.add_argument("--force", action="store_true",
+                        help="Cut over with rows still pending; they stay searchable on their old version")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the schema changes")
+
+    args = parser.parse_args()
+
+    if args.dimensions and not args.model.startswith("text-embedding-3"):
+        parser.error("--dimensions is only supported by text-embedding-3 models")
+
+    ensure_schema(default_engine, legacy_key=args.legacy_model, dry_run=args.dry_run)
+    if args.dry_run:
+        return
+
+    job = _job(args)
+    if args.command == "run":
+        # Every batch commits on its own, so an interrupted run loses at most one batch
+        result = asyncio.run(job.run(max_rows=args.max_rows))
+    elif args.command == "cutover":
+        db = SessionLocal()
+        try:
+            result = job.cutover(db, force=args.force)
+        except ValueError as e:
+            parser.error(str(e))
+        finally:
+            db.close()
+    else:
+        db = SessionLocal()
+        try:
+            result = job.progress(db)
+        finally:
+            db.close()
+
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
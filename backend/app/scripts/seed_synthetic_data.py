@@ -0,0 +1,784 @@
+#!/usr/bin/env python3
+"""
+Synthetic Dataset Seeder
+Generates a production-shaped dataset - sessions, participants, stakeholders, processed
+TextProcessingJobs with result JSON, GlobalInsights with supporting evidence and
+TextEmbeddings of the job notes - and bulk-loads it with multi-row INSERTs or, on
+MySQL, LOAD DATA LOCAL INFILE, so endpoints can be profiled at 10x/100x production size
+
+Scale 1 is roughly today's production dataset; --scale 100 gives 100k jobs, 50k global
+insights and 1M embeddings. Popularity is Zipf-skewed by --skew (0 = uniform): a few
+pillars, hubs, sessions and insights account for most rows, and recent days for most
+activity. Rows get explicit ids after the current maximum, and the --output report
+records the ranges so --purge can remove exactly what a run added.
+
+    python -m app.scripts.seed_synthetic_data --scale 10 --processes 8 --output results/seed-x10.json
+    python -m app.scripts.seed_synthetic_data --scale 100 --method load-data --batch-size 20000
+    python -m app.scripts.seed_synthetic_data --purge results/seed-x10.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import tempfile
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Table, create_engine, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.types import LargeBinary
+
+from app.core.config import settings
+from app.db.session import engine as default_engine
+from app.db.types import VectorBlob
+from app.enums import ProcessingStatus
+from app.models import GlobalInsight, Participant, Session, Stakeholder, TextEmbedding, TextProcessingJob
+from app.scripts.synthetic_notes import (
+    FIRST_NAMES, HUBS, LAST_NAMES, NOTE_SIZES, ORGANIZATIONS, PILLAR_PROBLEMS, PILLAR_PROPOSALS, generate_note
+)
+from app.services.embedding_versions import embedding_version_registry
+from app.services.llm_provider import LOCAL_EMBEDDING_DIMENSIONS, estimate_tokens, hashed_embedding
+from app.utils.langraph.aggregation_task import PILLAR_NORMALIZATION_MAP
+from app.utils.langraph.canned_outputs import insight_output, network_output
+from app.utils.langraph.llm_usage import LLMUsageCollector
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Row counts at scale 1 (roughly the production dataset)
+BASE_COUNTS = {
+    "sessions": 200,
+    "participants": 2000,
+    "stakeholders": 500,
+    "jobs": 1000,
+    "global_insights": 500,
+    "embeddings": 10000,
+}
+
+# Load order; purging runs it backwards
+TABLES = [
+    ("sessions", Session),
+    ("participants", Participant),
+    ("stakeholders", Stakeholder),
+    ("jobs", TextProcessingJob),
+    ("embeddings", TextEmbedding),
+    ("global_insights", GlobalInsight),
+]
+
+# Share of uploaded documents per synthetic_notes size
+NOTE_SIZE_WEIGHTS = {"small": 0.7, "medium": 0.25, "large": 0.05}
+
+SESSION_TYPES = ["workshop", "interview", "panel", "roundtable"]
+PARTICIPANT_ROLES = ["shaper", "guest", "observer", "facilitator"]
+PIPELINE_STATUSES = ["prospect", "engaged", "committed", "inactive"]
+STAKEHOLDER_TYPES = ["funder", "implementer", "mentor", "policymaker", "researcher", "community_leader"]
+STAKEHOLDER_ROLES = ["Program Director", "Founder", "Policy Advisor", "Investment Manager", "Researcher", "Hub Curator"]
+TAGS = ["youth", "climate", "finance", "education", "health", "policy", "entrepreneurship", "community"]
+
+# Appended to insight templates so canonical texts and aliases vary beyond the template set
+QUALIFIERS = [
+    "",
+    " This is most visible for women-led initiatives.",
+    " Rural members are affected the most.",
+    " It came up again in the latest community session.",
+    " First-time founders feel it the hardest.",
+    " Several hubs reported the same pattern this year.",
+    " Partners confirmed it in follow-up conversations.",
+    " It slows down projects in their first year.",
+]
+
+MAX_EVIDENCE_DOCS = 200
+
+
+@dataclass
+class SeedPlan:
+    """Everything the row generators need, picklable for worker processes"""
+    counts: Dict[str, int]
+    first_ids: Dict[str, int]
+    seed: int
+    skew: float
+    days: int
+    end: datetime
+    failed_rate: float
+    chunk_words: int
+    embedding_version: str
+    embedding_dimensions: int
+
+    def ids(self, name: str) -> range:
+        return range(self.first_ids[name], self.first_ids[name] + self.counts[name])
+
+
+def zipf_cum_weights(n: int, skew: float) -> List[float]:
+    """Cumulative rng.choices weights where rank r (0-based) has weight 1 / (r + 1) ** skew"""
+    return list(accumulate(1.0 / (rank + 1) ** skew for rank in range(n)))
+
+
+class Popularity:
+    """Seeded, Zipf-skewed picks from a population (the popular items are shuffled, not the first ones)"""
+
+    def __init__(self, population: Sequence[Any], skew: float, seed: str):
+        self.skew = skew
+        self.population = list(population)
+        random.Random(seed).shuffle(self.population)
+        self.cum_weights = zipf_cum_weights(len(self.population), skew)
+
+    def pick(self, rng: random.Random) -> Any:
+        return rng.choices(self.population, cum_weights=self.cum_weights)[0]
+
+    def weights(self, order: Sequence[Any]) -> List[float]:
+        """Relative frequency of each item of `order` (for generate_note's pillar_weights)"""
+        ranks = {item: rank for rank, item in enumerate(self.population)}
+        return [1.0 / (ranks[item] + 1) ** self.skew for item in order]
+
+
+class Distributions:
+    """Popularity of pillars, hubs, organizations, days and parent rows for one plan"""
+
+    def __init__(self, plan: SeedPlan):
+        self.plan = plan
+        self.pillars = Popularity(PILLAR_PROBLEMS, plan.skew, f"{plan.seed}:pillars")
+        self.hubs = Popularity(HUBS, plan.skew, f"{plan.seed}:hubs")
+        self.organizations = Popularity(ORGANIZATIONS, plan.skew, f"{plan.seed}:organizations")
+        # Activity decays with age, more gently than item popularity
+        self.days = list(accumulate(1.0 / (day + 1) ** (plan.skew / 2) for day in range(plan.days)))
+        self.sessions = Popularity(plan.ids("sessions"), plan.skew, f"{plan.seed}:sessions")
+        self.pillar_weights = self.pillars.weights(list(PILLAR_PROBLEMS))
+
+    def date(self, rng: random.Random) -> datetime:
+        age = rng.choices(range(self.plan.days), cum_weights=self.days)[0]
+        return self.plan.end - timedelta(days=age, seconds=rng.randint(0, 86399))
+
+    def session_id(self, rng: random.Random) -> Optional[int]:
+        return self.sessions.pick(rng) if self.sessions.population else None
+
+
+_distributions: Dict[str, Distributions] = {}
+
+
+def _distributions_for(plan: SeedPlan) -> Distributions:
+    # Built once per process and plan (workers receive a fresh copy of the plan per batch)
+    key = json.dumps(asdict(plan), default=str, sort_keys=True)
+    if key not in _distributions:
+        _distributions.clear()
+        _distributions[key] = Distributions(plan)
+    return _distributions[key]
+
+
+def _person(rng: random.Random) -> Tuple[str, str]:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return f"{first} {last}", f"{first}.{last}".lower()
+
+
+def session_rows(plan: SeedPlan, ids: range) -> List[Dict[str, Any]]:
+    dist = _distributions_for(plan)
+    rows = []
+    for session_id in ids:
+        rng = random.Random(f"{plan.seed}:session:{session_id}")
+        hub = dist.hubs.pick(rng)
+        scheduled = dist.date(rng)
+        duration = rng.choice([45, 60, 90, 120])
+        pillars = list(dict.fromkeys(dist.pillars.pick(rng) for _ in range(3)))
+        rows.append({
+            "id": session_id,
+            "title": f"{hub} Hub {rng.choice(SESSION_TYPES)} - {scheduled:%B %Y}",
+            "description": f"Community session on {', '.join(p.replace('_', ' ') for p in pillars)}",
+            "session_type": rng.choice(SESSION_TYPES),
+            "scheduled_at": scheduled,
+            "duration_minutes": duration,
+            "is_chatham_house": rng.random() < 0.3,
+            "recording_consent": rng.random() < 0.6,
+            "language": "en",
+            "agenda": [{"topic": pillar, "minutes": duration // len(pillars)} for pillar in pillars],
+            "processing_status": "completed",
+            "recording_started_at": scheduled,
+            "recording_ended_at": scheduled + timedelta(minutes=duration),
+            "status": "completed",
+            "created_at": scheduled - timedelta(days=rng.randint(1, 21)),
+        })
+    return rows
+
+
+def participant_rows(plan: SeedPlan, ids: range) -> List[Dict[str, Any]]:
+    dist = _distributions_for(plan)
+    rows = []
+    for participant_id in ids:
+        rng = random.Random(f"{plan.seed}:participant:{participant_id}")
+        name, handle = _person(rng)
+        hub = dist.hubs.pick(rng)
+        joined = dist.date(rng)
+        interactions = min(200, int(rng.paretovariate(1.5)))
+        rows.append({
+            "id": participant_id,
+            "session_id": dist.session_id(rng),
+            "name": name,
+            "email": f"{handle}.{participant_id}@example.org",
+            "role": rng.choices(PARTICIPANT_ROLES, weights=[0.6, 0.25, 0.1, 0.05])[0],
+            "bio": f"{name} works with the {hub} Hub on youth-led social innovation.",
+            "expertise": dist.pillars.pick(rng).replace("_", " "),
+            "region": f"{hub} Hub",
+            "consent_given": rng.random() < 0.8,
+            "can_be_quoted": rng.random() < 0.7,
+            "preferred_language": "en",
+            "stakeholder_type": "individual",
+            "pipeline_status": rng.choices(PIPELINE_STATUSES, weights=[0.4, 0.3, 0.2, 0.1])[0],
+            "engagement_score": round(rng.uniform(0, 100), 1),
+            "position": rng.choice(STAKEHOLDER_ROLES),
+            "tags": rng.sample(TAGS, rng.randint(0, 3)),
+            "pillars_involved": list(dict.fromkeys(dist.pillars.pick(rng) for _ in range(rng.randint(1, 3)))),
+            "last_interaction_date": joined + timedelta(days=rng.randint(0, 60)) if interactions else None,
+            "interaction_count": interactions,
+            "communication_preferences": {},
+            "created_at": joined,
+        })
+    return rows
+
+
+def stakeholder_rows(plan: SeedPlan, ids: range) -> List[Dict[str, Any]]:
+    dist = _distributions_for(plan)
+    rows = []
+    for stakeholder_id in ids:
+        rng = random.Random(f"{plan.seed}:stakeholder:{stakeholder_id}")
+        name, handle = _person(rng)
+        organization = dist.organizations.pick(rng)
+        created = dist.date(rng)
+        rows.append({
+            "id": stakeholder_id,
+            "name": name,
+            "role": rng.choice(STAKEHOLDER_ROLES),
+            "organization": organization,
+            "type": rng.choice(STAKEHOLDER_TYPES),
+            "region": dist.hubs.pick(rng),
+            "email": f"{handle}.{stakeholder_id}@example.org",
+            "bio": f"{name} represents {organization} in youth and social innovation partnerships.",
+            "tags": rng.sample(TAGS, rng.randint(1, 3)),
+            "links": [{"label": "Website", "url": f"https://example.org/{handle}"}],
+            "created_by": "seed_synthetic_data",
+            "created_at": created,
+            "updated_at": created + timedelta(days=rng.randint(0, 90)) if rng.random() < 0.3 else None,
+        })
+    return rows
+
+
+def _job_profile(plan: SeedPlan, dist: Distributions, job_id: int) -> Tuple[random.Random, str, datetime, bool]:
+    """Per-job rng, hub, upload date and failure flag (recomputed when insights cite the job)"""
+    rng = random.Random(f"{plan.seed}:job:{job_id}")
+    hub = dist.hubs.pick(rng)
+    created = dist.date(rng)
+    failed = rng.random() < plan.failed_rate
+    return rng, hub, created, failed
+
+
+def job_result(text: str, context: str, finished: datetime, processing_seconds: float) -> Dict[str, Any]:
+    """Result JSON shaped like extract_insights_task's (templated by the local provider's outputs)"""
+    insights = insight_output(text)
+    network = network_output(text)
+    usage = LLMUsageCollector()
+    for agent, output in (("insight", insights), ("network", network)):
+        usage.add({
+            "agent": agent,
+            "mode": settings.LLM_STRUCTURED_OUTPUT,
+            "streamed": settings.EXTRACTION_STREAMING,
+            "input_tokens": estimate_tokens(text) + 900,
+            "output_tokens": estimate_tokens(json.dumps(output)),
+            "cached_tokens": 0,
+            "latency_ms": round(processing_seconds * 1000 * 0.9, 2)
+        })
+
+    pillar_analysis = insights.pop("pillar_analysis")
+    structured = {**insights, "pillar_analysis": pillar_analysis, "network_analysis": network}
+    return {
+        "themes_identified": [insights["main_theme"]] + insights["subthemes"],
+        "sentiment_analysis": {
+            "overall_sentiment": insights["general_perception"],
+            "confidence": 0.95,
+            "positive_indicators": 1 if insights["general_perception"] == "positive" else 0,
+            "negative_indicators": 1 if insights["general_perception"] == "negative" else 0
+        },
+        "content_analysis": {
+            "word_count": len(text.split()),
+            "character_count": len(text),
+            "paragraph_count": len(text.split('\n\n'))
+        },
+        "key_points": insights["proposed_actions"][:5],
+        "action_items": insights["proposed_actions"],
+        "participants_mentioned": insights["key_actors"],
+        "challenges": insights["challenges"],
+        "opportunities": insights["opportunities"],
+        "context_provided": context,
+        "processing_timestamp": finished.isoformat(),
+        "processing_time_seconds": processing_seconds,
+        "model_used": "gpt-4o-mini",
+        "extraction_mode": settings.EXTRACTION_MODE,
+        "confidence_score": 0.95,
+        "llm_usage": usage.summary(),
+        "ysi_pillar_analysis": pillar_analysis,
+        "network_analysis": network,
+        "structured_insights": structured
+    }
+
+
+def _chunks(text: str, chunk_words: int) -> List[str]:
+    words = text.split()
+    return [" ".join(words[i:i + chunk_words]) for i in range(0, len(words), chunk_words)]
+
+
+def _vector_columns(text: str, plan: SeedPlan) -> Dict[str, Any]:
+    vector = np.asarray(hashed_embedding(text, plan.embedding_dimensions, plan.seed), dtype=np.float32)
+    # Arrays pickle compactly between processes; the JSON column needs plain floats
+    stored = vector.tolist() if settings.EMBEDDING_STORAGE == "json" else vector
+    return TextEmbedding.vector_columns(stored, plan.embedding_version)
+
+
+def job_rows(plan: SeedPlan, ids: range) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Jobs plus the embeddings of their note chunks (embedding ids are assigned by the caller)"""
+    dist = _distributions_for(plan)
+    jobs, embeddings = [], []
+    sizes, size_weights = list(NOTE_SIZE_WEIGHTS), list(NOTE_SIZE_WEIGHTS.values())
+    for job_id in ids:
+        rng, hub, created, failed = _job_profile(plan, dist, job_id)
+        words = int(NOTE_SIZES[rng.choices(sizes, weights=size_weights)[0]] * rng.uniform(0.8, 1.2))
+        text = generate_note(words, seed=f"{plan.seed}:note:{job_id}", pillar_weights=dist.pillar_weights, hub=hub)
+        context = f"{hub} Hub community session"
+        started = created + timedelta(seconds=rng.uniform(0.1, 3))
+        processing_seconds = round(rng.uniform(4, 12) * (words / 1000) ** 0.5 + 2, 2)
+        finished = started + timedelta(seconds=processing_seconds)
+        session_id = dist.session_id(rng)
+
+        jobs.append({
+            "id": job_id,
+            "input_text": text,
+            "context": context,
+            "status": ProcessingStatus.ERROR if failed else ProcessingStatus.COMPLETED,
+            "result": None if failed else job_result(text, context, finished, processing_seconds),
+            "error_message": "Extraction failed: Request timed out." if failed else None,
+            "started_at": started,
+            "completed_at": None if failed else finished,
+            "created_at": created,
+            "updated_at": finished,
+        })
+
+        if failed:
+            continue
+        chunks = _chunks(text, plan.chunk_words)
+        for index, chunk in enumerate(chunks):
+            embeddings.append({
+                "uuid": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                # Keyed by source and chunk: template sentences repeat across notes
+                "content_hash": TextEmbedding.generate_content_hash(f"{job_id}:{index}:{chunk}"),
+                "source_type": "meeting_transcript",
+                "source_id": job_id,
+                "chunk_index": index,
+                "raw_text": chunk,
+                "processed_text": chunk,
+                "title": f"Meeting Transcript: {context} {created:%Y-%m-%d}",
+                **_vector_columns(chunk, plan),
+                "embedding_metadata": {
+                    "title": context,
+                    "date": created.date().isoformat(),
+                    "chunk_index": index,
+                    "total_chunks": len(chunks)
+                },
+                "language": "EN",
+                "content_type": "transcript",
+                "session_id": session_id,
+                "token_count": estimate_tokens(chunk),
+                "processing_duration_ms": rng.randint(40, 400),
+                "created_at": finished,
+            })
+    return jobs, embeddings
+
+
+def _insight_text(rng: random.Random, dist: Distributions, template: str) -> str:
+    text = template.format(hub=dist.hubs.pick(rng), org=dist.organizations.pick(rng))
+    return text + rng.choice(QUALIFIERS)
+
+
+def _time_decay_weight(age_days: int) -> float:
+    # GlobalInsightsAgent.calculate_time_decay_weight's step function
+    if age_days <= 30:
+        return 1.0
+    if age_days <= 90:
+        return 0.7
+    if age_days <= 365:
+        return 0.5
+    return 0.3
+
+
+def global_insight_rows(plan: SeedPlan, ids: range) -> List[Dict[str, Any]]:
+    """Insights citing the run's completed jobs; documents per insight follow a Zipf tail"""
+    dist = _distributions_for(plan)
+    job_ids = plan.ids("jobs")
+    evidence = zipf_cum_weights(min(MAX_EVIDENCE_DOCS, max(1, len(job_ids))), 1 + plan.skew)
+    rows = []
+    for insight_id in ids:
+        rng = random.Random(f"{plan.seed}:insight:{insight_id}")
+        pillar = dist.pillars.pick(rng)
+        insight_type = "problem" if rng.random() < 0.55 else "proposal"
+        templates = PILLAR_PROBLEMS[pillar] if insight_type == "problem" else PILLAR_PROPOSALS[pillar]
+        template = rng.choice(templates)
+        canonical = _insight_text(rng, dist, template)
+
+        wanted = rng.choices(range(1, len(evidence) + 1), cum_weights=evidence)[0] if job_ids else 0
+        docs = []
+        for job_id in rng.sample(job_ids, min(wanted, len(job_ids))):
+            _, hub, created, failed = _job_profile(plan, dist, job_id)
+            if not failed:
+                docs.append((job_id, hub, created))
+        docs.sort(key=lambda doc: doc[2])
+
+        aliases = list(dict.fromkeys(
+            text for text in (_insight_text(rng, dist, template) for _ in range(min(len(docs) - 1, 5)))
+            if text != canonical
+        ))
+        supporting_docs = [
+            {
+                "doc_id": str(job_id),
+                "doc_title": f"Document {job_id}",
+                "uploader": "System",
+                "date": created.isoformat(),
+                "citations": [{
+                    "cite_id": f"job_{job_id}_{insight_type}_1",
+                    "quote": rng.choice([canonical] + aliases),
+                    "speaker": None,
+                    "timestamp": None,
+                    "context": f"Supporting evidence from {pillar} {insight_type} analysis"
+                }]
+            }
+            for job_id, _, created in docs
+        ]
+        regions: Dict[str, int] = {}
+        years: Dict[int, int] = {}
+        for _, hub, created in docs:
+            regions[hub] = regions.get(hub, 0) + 1
+            years[created.year] = years.get(created.year, 0) + 1
+
+        first_seen = docs[0][2] if docs else dist.date(rng)
+        last_seen = docs[-1][2] if docs else first_seen
+        rows.append({
+            "id": insight_id,
+            "canonical_text": canonical,
+            "type": insight_type,
+            "pillar": PILLAR_NORMALIZATION_MAP[pillar],
+            "count": max(1, len(docs)),
+            "weighted_count": max(1, len(docs)) + _time_decay_weight((plan.end - last_seen).days),
+            "last_seen": last_seen,
+            "aliases_count": len(aliases),
+            "aliases": aliases,
+            "supporting_docs": supporting_docs,
+            "breakdowns": {
+                "by_region": [{"region": region, "count": count} for region, count in regions.items()],
+                "by_year": [{"year": year, "count": count} for year, count in sorted(years.items())],
+                "by_stakeholder": []
+            },
+            "created_at": first_seen,
+            "updated_at": last_seen if len(docs) > 1 else None,
+        })
+    return rows
+
+
+class InsertWriter:
+    """One multi-row INSERT ... VALUES (...), (...) per batch"""
+
+    method = "insert"
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def write(self, table: Table, rows: List[Dict[str, Any]]):
+        with self.engine.begin() as conn:
+            conn.execute(table.insert().values(rows))
+
+
+class LoadDataWriter:
+    """
+    LOAD DATA LOCAL INFILE from a temporary tab-separated file per batch (MySQL only)
+
+    Values go through each column type's bind processor (JSON, enums, vector blobs),
+    so the file holds what an INSERT would have sent; binary columns travel as hex.
+    The server needs local_infile=ON.
+    """
+
+    method = "load-data"
+
+    def __init__(self, database_url: str):
+        self.engine = create_engine(database_url, connect_args={"local_infile": True})
+        if self.engine.dialect.name != "mysql":
+            raise ValueError(f"LOAD DATA LOCAL INFILE needs MySQL, not {self.engine.dialect.name}")
+        self.directory = tempfile.mkdtemp(prefix="seed_synthetic_data_")
+
+    @staticmethod
+    def _field(value: Any) -> str:
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return "1" if value else "0"
+        if isinstance(value, datetime):
+            return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+        if isinstance(value, (bytes, bytearray)):
+            return bytes(value).hex()
+        return (
+            str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r").replace("\0", "\\0")
+        )
+
+    def write(self, table: Table, rows: List[Dict[str, Any]]):
+        dialect = self.engine.dialect
+        columns = [table.c[name] for name in rows[0]]
+        processors = [column.type.bind_processor(dialect) for column in columns]
+        binary = {column.name for column in columns if isinstance(column.type, (LargeBinary, VectorBlob))}
+
+        path = Path(self.directory) / f"{table.name}.tsv"
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            for row in rows:
+                values = [row[column.name] for column in columns]
+                values = [process(value) if process and value is not None else value
+                          for process, value in zip(processors, values)]
+                f.write("\t".join(self._field(value) for value in values) + "\n")
+
+        targets = ", ".join(f"@{column.name}" if column.name in binary else column.name for column in columns)
+        assignments = ", ".join(f"{name} = UNHEX(@{name})" for name in sorted(binary))
+        statement = (
+            f"LOAD DATA LOCAL INFILE '{path.as_posix()}' INTO TABLE {table.name} "
+            f"CHARACTER SET utf8mb4 ({targets})" + (f" SET {assignments}" if assignments else "")
+        )
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(statement)
+        path.unlink()
+
+
+def _next_id(engine: Engine, table: Table) -> int:
+    with engine.connect() as conn:
+        return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def _sync_sequence(engine: Engine, table: Table):
+    # Explicit ids do not advance PostgreSQL sequences; MySQL and SQLite follow max(id)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), (SELECT MAX(id) FROM {table.name}))"
+            )
+
+
+def _batches(ids: range, size: int) -> List[range]:
+    return [ids[i:i + size] for i in range(0, len(ids), size)]
+
+
+def _generate(fn: Callable, plan: SeedPlan, batches: List[range], processes: int) -> Iterator[Any]:
+    """fn(plan, batch) per batch in order; with processes > 1, generated ahead by a worker pool"""
+    if processes <= 1:
+        for batch in batches:
+            yield fn(plan, batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        # Bounded look-ahead keeps memory flat when the database is the bottleneck
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(fn, plan, batch))
+            if len(pending) >= processes * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class _Progress:
+    """Rows written per table, logged at most every few seconds"""
+
+    def __init__(self, name: str, total: int):
+        self.name = name
+        self.total = total
+        self.rows = 0
+        self.started = time.perf_counter()
+        self._logged = self.started
+
+    def add(self, rows: int):
+        self.rows += rows
+        now = time.perf_counter()
+        if now - self._logged >= 5:
+            self._logged = now
+            logger.info(f"{self.name}: {self.rows}/{self.total} rows ({self.rows / (now - self.started):.0f}/s)")
+
+    def summary(self, first_id: int) -> Dict[str, Any]:
+        seconds = time.perf_counter() - self.started
+        logger.info(f"{self.name}: {self.rows} rows in {seconds:.1f}s")
+        return {
+            "rows": self.rows,
+            "first_id": first_id,
+            "last_id": first_id + self.rows - 1 if self.rows else None,
+            "seconds": round(seconds, 2),
+            "rows_per_second": round(self.rows / seconds) if seconds else None
+        }
+
+
+def build_plan(
+    engine: Engine,
+    counts: Dict[str, int],
+    seed: int = 1,
+    skew: float = 1.0,
+    days: int = 730,
+    failed_rate: float = 0.02
+) -> SeedPlan:
+    """Counts, starting ids and the chunk length that spreads the embedding target over the jobs"""
+    first_ids = {name: _next_id(engine, model.__table__) for name, model in TABLES}
+    expected_words = sum(NOTE_SIZES[size] * weight for size, weight in NOTE_SIZE_WEIGHTS.items())
+    completed_jobs = counts["jobs"] * (1 - failed_rate)
+    # Each note's last chunk is partial: about half a chunk per job on top of words / chunk_words
+    spare = counts["embeddings"] - completed_jobs / 2
+    chunk_words = max(20, int(completed_jobs * expected_words / spare)) if spare > 0 else 20
+
+    version = embedding_version_registry.active()
+    return SeedPlan(
+        counts=counts,
+        first_ids=first_ids,
+        seed=seed,
+        skew=skew,
+        days=days,
+        end=datetime.now().replace(microsecond=0),
+        failed_rate=failed_rate,
+        chunk_words=chunk_words,
+        embedding_version=version.key,
+        embedding_dimensions=version.dimensions or LOCAL_EMBEDDING_DIMENSIONS
+    )
+
+
+def seed(plan: SeedPlan, writer, batch_size: int = 1000, processes: int = 1) -> Dict[str, Any]:
+    """Generate and load every table of the plan; returns the id ranges written per table"""
+    tables: Dict[str, Dict[str, Any]] = {}
+
+    for name, generate in (("sessions", session_rows), ("participants", participant_rows),
+                           ("stakeholders", stakeholder_rows)):
+        table = dict(TABLES)[name].__table__
+        progress = _Progress(name, plan.counts[name])
+        for rows in _generate(generate, plan, _batches(plan.ids(name), batch_size), processes):
+            writer.write(table, rows)
+            progress.add(len(rows))
+        tables[name] = progress.summary(plan.first_ids[name])
+
+    # Jobs and the embeddings of their chunks are generated together; embeddings are
+    # buffered to full batches and stop at the target count
+    jobs = _Progress("jobs", plan.counts["jobs"])
+    embeddings = _Progress("embeddings", plan.counts["embeddings"])
+    next_embedding_id = plan.first_ids["embeddings"]
+    buffered: List[Dict[str, Any]] = []
+
+    def flush(rows: List[Dict[str, Any]]):
+        writer.write(TextEmbedding.__table__, rows)
+        embeddings.add(len(rows))
+
+    for job_batch, embedding_batch in _generate(job_rows, plan, _batches(plan.ids("jobs"), batch_size), processes):
+        writer.write(TextProcessingJob.__table__, job_batch)
+        jobs.add(len(job_batch))
+
+        room = plan.counts["embeddings"] - embeddings.rows - len(buffered)
+        for row in embedding_batch[:max(0, room)]:
+            row["id"] = next_embedding_id
+            next_embedding_id += 1
+            buffered.append(row)
+            if len(buffered) >= batch_size:
+                flush(buffered)
+                buffered = []
+    if buffered:
+        flush(buffered)
+    tables["jobs"] = jobs.summary(plan.first_ids["jobs"])
+    tables["embeddings"] = embeddings.summary(plan.first_ids["embeddings"])
+
+    # Evidence lists make insight rows heavy; smaller batches keep statements bounded
+    insights = _Progress("global_insights", plan.counts["global_insights"])
+    insight_batches = _batches(plan.ids("global_insights"), max(1, batch_size // 10))
+    for rows in _generate(global_insight_rows, plan, insight_batches, processes):
+        writer.write(GlobalInsight.__table__, rows)
+        insights.add(len(rows))
+    tables["global_insights"] = insights.summary(plan.first_ids["global_insights"])
+
+    for name, model in TABLES:
+        _sync_sequence(writer.engine, model.__table__)
+    return tables
+
+
+def purge(engine: Engine, report: Dict[str, Any], batch_size: int = 10000) -> Dict[str, int]:
+    """Delete the id ranges a seeding run recorded in its report"""
+    deleted = {}
+    for name, model in reversed(TABLES):
+        written = report["tables"].get(name)
+        if not written or not written["rows"]:
+            continue
+        table = model.__table__
+        deleted[name] = 0
+        for start in range(written["first_id"], written["last_id"] + 1, batch_size):
+            end = min(start + batch_size - 1, written["last_id"])
+            with engine.begin() as conn:
+                deleted[name] += conn.execute(table.delete().where(table.c.id.between(start, end))).rowcount
+        logger.info(f"{name}: deleted {deleted[name]} rows")
+    return deleted
+
+
+def main():
+    """Command line interface for the synthetic dataset seeder"""
+    parser = argparse.ArgumentParser(description="Generate and bulk-load a synthetic dataset")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiple of the production row counts")
+    for name in BASE_COUNTS:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, help=f"Override the number of {name}")
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of popularity (0 = uniform)")
+    parser.add_argument("--days", type=int, default=730, help="Days of history to spread activity over")
+    parser.add_argument("--failed-rate", type=float, default=0.02, help="Share of jobs that ended in error")
+    parser.add_argument("--method", choices=[InsertWriter.method, LoadDataWriter.method], default=InsertWriter.method)
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per INSERT statement or loaded file")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Row generator processes")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without writing")
+    parser.add_argument("--output", type=str, help="Write the JSON report (needed by --purge) to this file")
+    parser.add_argument("--purge", type=str, metavar="REPORT", help="Delete the rows recorded in a report")
+
+    args = parser.parse_args()
+
+    if args.purge:
+        deleted = purge(default_engine, json.loads(Path(args.purge).read_text()))
+        print(json.dumps({"deleted": deleted}, indent=2))
+        return
+
+    counts = {
+        name: getattr(args, name) if getattr(args, name) is not None else math.ceil(base * args.scale)
+        for name, base in BASE_COUNTS.items()
+    }
+    plan = build_plan(default_engine, counts, args.seed, args.skew, args.days, args.failed_rate)
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "database": default_engine.dialect.name,
+        "config": {
+            "scale": args.scale,
+            "method": args.method,
+            "batch_size": args.batch_size,
+            "processes": args.processes,
+            **{key: value for key, value in asdict(plan).items() if key != "end"}
+        }
+    }
+    if args.dry_run:
+        print(json.dumps(report, indent=2))
+        return
+
+    writer = InsertWriter(default_engine) if args.method == InsertWriter.method else LoadDataWriter(settings.DATABASE_URL)
+    started = time.perf_counter()
+    report["tables"] = seed(plan, writer, args.batch_size, args.processes)
+    report["seconds"] = round(time.perf_counter() - started, 2)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Synthetic meeting notes
+Deterministic (seeded) Global Shapers style meeting notes of a target length: a header,
+named participants from hubs and organizations, and speaker turns raising problems and
+proposals across the YSI pillars, with quotable sentences, so extraction and
+aggregation see realistic inputs
+"""
+
+import random
+from datetime import date, timedelta
+from typing import List, Optional
+
+# Approximate word counts of the benchmark document sizes
+NOTE_SIZES = {
+    "small": 250,
+    "medium": 1200,
+    "large": 4000,
+}
+
+FIRST_NAMES = [
+    "Amara", "Lucas", "Priya", "Kwame", "Sofia", "Mateo", "Aisha", "Jonas", "Mei", "Tomas",
+    "Fatima", "Diego", "Leila", "Arjun", "Nadia", "Samuel", "Yuki", "Carmen", "Omar", "Elena",
+]
+LAST_NAMES = [
+    "Chen", "Okafor", "Silva", "Mensah", "Rossi", "Haddad", "Kumar", "Novak", "Garcia", "Tanaka",
+    "Ibrahim", "Moreau", "Costa", "Petrov", "Nakamura", "Osei", "Fernandez", "Yilmaz", "Larsen", "Adeyemi",
+]
+HUBS = [
+    "Lagos", "Nairobi", "Bogota", "Lima", "Jakarta", "Manila", "Accra", "Mumbai", "Sao Paulo",
+    "Mexico City", "Cairo", "Dhaka", "Madrid", "Berlin", "Santiago", "Kampala",
+]
+ORGANIZATIONS = [
+    "Global Climate Fund", "Youth Impact Foundation", "Ministry of Youth Affairs", "Rise Ventures",
+    "City Innovation Hub", "Open Futures Network", "National Development Bank", "Social Enterprise Council",
+    "University Entrepreneurship Lab", "Wellbeing Collective", "Impact Capital Partners", "Civic Tech Alliance",
+]
+
+PILLAR_PROBLEMS = {
+    "access_to_capital": [
+        "Young founders in {hub} lack access to even basic seed funding for their projects.",
+        "Grant applications from {org} take months and most first-time applicants give up halfway.",
+        "Investors rarely fund social enterprises without collateral, which excludes most of our members.",
+        "Funding cycles are too short and we spend more time reporting than building the project.",
+    ],
+    "ecosystem_support": [
+        "The support programs in {hub} overlap and nobody knows which incubator to approach first.",
+        "There is no shared map of mentors, so every new shaper starts the search from zero.",
+        "Partnerships with {org} end when the program officer changes and we lose the relationship.",
+        "Infrastructure for early-stage ventures is concentrated in the capital and rural teams are left out.",
+    ],
+    "mental_health": [
+        "Burnout is common among founders and the pressure to succeed is overwhelming.",
+        "Many members feel isolated and there is no one to talk to when a project fails.",
+        "Financial stress from unpaid volunteer work is affecting the wellbeing of the team.",
+        "Stigma around mental health means people hide anxiety until they drop out completely.",
+    ],
+    "recognition": [
+        "Recognition from policy makers in {hub} remains tokenistic and rarely leads to real influence.",
+        "Youth-led initiatives lack legitimacy when they apply for public contracts.",
+        "Awards give visibility for a week but there is no pathway to scale the work afterwards.",
+        "Our impact data is not taken seriously by {org} because we lack formal credentials.",
+    ],
+}
+
+PILLAR_PROPOSALS = {
+    "access_to_capital": [
+        "We should create micro-grants with a one-page application for first-time founders.",
+        "{org} could launch a blended finance pool that accepts higher risk for social ventures.",
+        "The hub should build a shared pitch calendar with investors from {hub} and the region.",
+    ],
+    "ecosystem_support": [
+        "We need to build an ecosystem map of programs, mentors and funders that stays up to date.",
+        "{org} should establish multi-year capacity support instead of one-off workshops.",
+        "Let's create a mentor rotation so every project in {hub} gets at least one monthly session.",
+    ],
+    "mental_health": [
+        "We should establish peer support circles that meet every two weeks.",
+        "{org} could fund embedded wellbeing services inside the accelerator programs.",
+        "The hub must normalize failure by sharing stories of projects that did not work.",
+    ],
+    "recognition": [
+        "We should propose a youth advisory seat on the city council with a real mandate.",
+        "{org} could showcase evidence-backed projects to policy makers twice a year.",
+        "The community should create a credential that documents the impact of each initiative.",
+    ],
+}
+
+FILLER = [
+    "{speaker} agreed and added an example from the last project cycle.",
+    "The group discussed the timeline for the next quarter and the available volunteers.",
+    "{speaker} asked how the previous pilot in {hub} had been evaluated.",
+    "Several participants shared similar experiences from their own hubs.",
+    "The facilitator summarized the discussion before moving to the next topic.",
+]
+
+
+def _person(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def generate_note(
+    words: int,
+    seed: int = 0,
+    pillar_weights: Optional[List[float]] = None,
+    hub: Optional[str] = None
+) -> str:
+    """
+    Meeting notes of roughly `words` words
+
+    Args:
+        words: Target length in words
+        seed: Seed; the same seed and length always give the same text
+        pillar_weights: Relative frequency of the four pillars (defaults to uniform)
+        hub: Hub the session took place in (defaults to a seeded choice)
+    """
+    rng = random.Random(seed)
+    hub = hub or rng.choice(HUBS)
+    participants = list(dict.fromkeys(_person(rng) for _ in range(rng.randint(4, 8))))
+    organizations = rng.sample(ORGANIZATIONS, 3)
+    meeting_date = date(2024, 1, 1) + timedelta(days=rng.randint(0, 640))
+    pillars = list(PILLAR_PROBLEMS)
+
+    lines = [
+        f"Meeting notes - {hub} Hub community session, {meeting_date.isoformat()}",
+        f"Participants: {', '.join(participants)}. Guests from {', '.join(organizations)}.",
+        ""
+    ]
+    count = sum(len(line.split()) for line in lines)
+
+    while count < words:
+        pillar = rng.choices(pillars, weights=pillar_weights)[0]
+        speaker = rng.choice(participants)
+        org = rng.choice(organizations)
+        roll = rng.random()
+        if roll < 0.45:
+            template = rng.choice(PILLAR_PROBLEMS[pillar])
+        elif roll < 0.8:
+            template = rng.choice(PILLAR_PROPOSALS[pillar])
+        else:
+            template = rng.choice(FILLER)
+        sentence = template.format(hub=hub, org=org, speaker=speaker)
+        line = f"{speaker}: {sentence}" if template not in FILLER else sentence
+        lines.append(line)
+        count += len(line.split())
+
+    return "\n".join(lines)
+
+
+def generate_notes(size: str, count: int, seed: int = 0) -> List[str]:
+    """`count` distinct notes of a named size (see NOTE_SIZES)"""
+    return [generate_note(NOTE_SIZES[size], seed=seed * 100003 + i) for i in range(count)]
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Schema Upgrade (pre-deploy)
+Brings an existing database up to the current models before new code is deployed:
+the text_embeddings storage and version columns, the embedding_versions table and
+any declared model index the database is missing
+
+    python -m app.scripts.upgrade_schema --dry-run
+    python -m app.scripts.upgrade_schema
+
+Idempotent; also run by the Alembic revision 002_embedding_storage_versions.
+"""
+
+import argparse
+import logging
+
+from app.db.schema_upgrades import upgrade_embedding_schema
+from app.db.session import engine as default_engine
+from app.scripts.create_indexes import create_indexes
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Command line interface for the pre-deploy schema upgrade"""
+    parser = argparse.ArgumentParser(description="Add the columns, tables and indexes the current models expect")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the schema changes")
+
+    args = parser.parse_args()
+
+    statements = upgrade_embedding_schema(default_engine, dry_run=args.dry_run)
+    created = create_indexes(default_engine, dry_run=args.dry_run)
+    logger.info(
+        f"{len(statements)} schema changes and {len(created)} indexes "
+        f"{'pending' if args.dry_run else 'applied'}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Shared event loop for background jobs
+Processing jobs run as coroutines on one long-lived loop in a daemon thread instead of
+a new loop per job, so the loop's keep-alive model client and chat models (kept per
+event loop, see llm_http and chat_models) are reused from one job to the next
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Coroutine, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundLoop:
+    """
+    Event loop thread started on first use
+
+    submit() schedules a coroutine from any thread and returns a concurrent future;
+    the caller's context variables are carried over to the job. Blocking calls inside
+    jobs must go through asyncio.to_thread, or they hold up every other job on the loop.
+    """
+
+    def __init__(self, name: str = "background-jobs"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self.submitted = 0
+        self.failed = 0
+        self.running = 0
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+                logger.info(f"Started background job loop ({self.name})")
+            return self._loop
+
+    def _done(self, future: concurrent.futures.Future):
+        with self._lock:
+            self.running -= 1
+            if not future.cancelled() and future.exception() is not None:
+                self.failed += 1
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """Run a coroutine on the shared loop"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        with self._lock:
+            self.submitted += 1
+            self.running += 1
+        future.add_done_callback(self._done)
+        return future
+
+    def stop(self, timeout: float = 10.0):
+        """Close the loop's model client and stop the loop thread"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or loop.is_closed():
+            return
+
+        # Imported here: httpx is only loaded once a job talks to the model
+        from app.services.llm_http import llm_http_pool
+
+        try:
+            asyncio.run_coroutine_threadsafe(llm_http_pool.aclose_loop_client(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Failed to close the background loop's model client: {str(e)}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loop_running": self._loop is not None and not self._loop.is_closed(),
+                "jobs_submitted": self.submitted,
+                "jobs_running": self.running,
+                "jobs_failed": self.failed
+            }
+
+
+# Global loop shared by the text processing jobs
+background_loop = BackgroundLoop()
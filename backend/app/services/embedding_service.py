@@ -6,7 +6,6 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import logging
 
-import openai
 import tiktoken
 import numpy as np
 from sqlalchemy.orm import Session
@@ -17,9 +16,20 @@ from app.models.text_embedding import TextEmbedding
 from app.db.session import get_db
 from app.core.config import settings
 from app.services.logging_service import performance_monitor
+from app.services.text_chunker import chunk_documents, load_encoding, TokenChunker
+from app.services.llm_provider import create_async_openai_client
+from app.services.query_embedding_cache import QueryEmbeddingCache, create_query_embedding_cache
+from app.services.embedding_versions import (
+    LEGACY_EMBEDDING_MODEL, EmbeddingModelVersion, embedding_version_registry, version_filter
+)
+from app.services.search_ranking import fuse_results
+from app.services.vector_index import vector_index_manager, normalize_rows, PRECISION_EXACT
 
 logger = logging.getLogger(__name__)
 
+# Candidate widenings a filtered quantized search tries before scoring the filtered rows exactly
+QUANTIZED_FILTER_ROUNDS = 3
+
 
 class EmbeddingService:
     """
@@ -28,18 +38,54 @@ class EmbeddingService:
     """
     
     def __init__(self):
-        self.openai_client = openai.AsyncOpenAI(
-            api_key=settings.OPENAI_API_KEY
-        )
-        self.embedding_model = "text-embedding-ada-002"
-        self.max_tokens = 8000  # Safe limit for ada-002
-        self.encoding = tiktoken.get_encoding("cl100k_base")
+        self.versions = embedding_version_registry
+        self.max_tokens = 8000  # Safe limit for ada-002 and text-embedding-3
+        self.query_caches: Dict[str, QueryEmbeddingCache] = {}
+        # Rows fetched per query when exact search scans the filtered rows
+        self.scan_batch_size = 2000
+        # Built on first use, so importing the service costs no client setup or tokenizer load
+        self._openai_client = None
+        self._encoding = None
+
+    @property
+    def openai_client(self):
+        if self._openai_client is None:
+            self._openai_client = create_async_openai_client()
+        return self._openai_client
+
+    @property
+    def encoding(self) -> tiktoken.Encoding:
+        if self._encoding is None:
+            self._encoding = load_encoding("cl100k_base")
+        return self._encoding
+    
+    @property
+    def embedding_model(self) -> str:
+        """Model of the active embedding version"""
+        return self.versions.active().model
+    
+    @property
+    def query_cache(self) -> QueryEmbeddingCache:
+        """Query embedding cache of the active version"""
+        return self._query_cache(self.versions.active())
+    
+    def _query_cache(self, version: EmbeddingModelVersion) -> QueryEmbeddingCache:
+        # Vectors of different versions are not comparable, so each gets its own cache
+        cache = self.query_caches.get(version.key)
+        if cache is None:
+            cache = self.query_caches[version.key] = create_query_embedding_cache(version.key)
+        return cache
         
-    async def _get_embedding(self, text: str) -> Tuple[List[float], int, int]:
+    async def _get_embedding(
+        self,
+        text: str,
+        version: Optional[EmbeddingModelVersion] = None
+    ) -> Tuple[List[float], int, int]:
         """
         Get embedding for text with performance tracking
         Returns: (embedding, token_count, processing_time_ms)
         """
+        version = version or self.versions.active()
         start_time = time.time()
         
         # Count tokens
@@ -53,8 +99,8 @@ class EmbeddingService:
         
         try:
             response = await self.openai_client.embeddings.create(
-                model=self.embedding_model,
-                input=text
+                input=text,
+                **version.request_kwargs()
             )
             
             embedding = response.data[0].embedding
@@ -66,49 +112,70 @@ class EmbeddingService:
             logger.error(f"Failed to get embedding: {str(e)}")
             raise
     
+    def _truncate(self, text: str) -> str:
+        tokens = self.encoding.encode(text)
+        if len(tokens) > self.max_tokens:
+            return self.encoding.decode(tokens[:self.max_tokens])
+        return text
+    
+    async def _get_embeddings_batch(
+        self,
+        texts: List[str],
+        version: Optional[EmbeddingModelVersion] = None
+    ) -> List[List[float]]:
+        """
+        Get embeddings for several texts in a single multi-input request
+        Returns vectors in input order
+        """
+        version = version or self.versions.active()
+        try:
+            response = await self.openai_client.embeddings.create(
+                input=[self._truncate(t) for t in texts],
+                **version.request_kwargs()
+            )
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+            
+        except Exception as e:
+            logger.error(f"Failed to get batch embeddings: {str(e)}")
+            raise
+    
+    async def get_query_embedding(
+        self,
+        query: str,
+        version: Optional[EmbeddingModelVersion] = None
+    ) -> List[float]:
+        """
+        Embedding for a search query, served from the query cache when possible
+        Concurrent identical queries share a single request
+        """
+        version = version or self.versions.active()
+        return await self._query_cache(version).get(
+            query, lambda texts: self._get_embeddings_batch(texts, version)
+        )
+    
+    async def get_query_embeddings(
+        self,
+        queries: List[str],
+        version: Optional[EmbeddingModelVersion] = None
+    ) -> List[List[float]]:
+        """Embeddings for several search queries; all cache misses go out in one request"""
+        version = version or self.versions.active()
+        return await self._query_cache(version).get_many(
+            queries, lambda texts: self._get_embeddings_batch(texts, version)
+        )
+    
     def _chunk_text(self, text: str, chunk_size: int = 1000, overlap: int = 100) -> List[Dict[str, Any]]:
         """
-        Intelligent text chunking with overlap
-        Returns chunks with metadata
+        Token-accurate chunking with overlap (see TokenChunker)
+        Returns chunks with exact token and character offsets
         """
-        # Simple sentence-based chunking for now
-        sentences = text.split('. ')
-        chunks = []
-        current_chunk = ""
-        current_tokens = 0
-        chunk_index = 0
-        
-        for sentence in sentences:
-            sentence_tokens = len(self.encoding.encode(sentence))
-            
-            if current_tokens + sentence_tokens > chunk_size and current_chunk:
-                # Save current chunk
-                chunks.append({
-                    'text': current_chunk.strip(),
-                    'chunk_index': chunk_index,
-                    'token_count': current_tokens,
-                    'start_sentence': len(chunks) * (chunk_size // 10),  # Approximate
-                })
-                
-                # Start new chunk with overlap
-                overlap_text = '. '.join(current_chunk.split('. ')[-2:])  # Last 2 sentences
-                current_chunk = overlap_text + '. ' + sentence
-                current_tokens = len(self.encoding.encode(current_chunk))
-                chunk_index += 1
-            else:
-                current_chunk += '. ' + sentence if current_chunk else sentence
-                current_tokens += sentence_tokens
-        
-        # Add final chunk
-        if current_chunk:
-            chunks.append({
-                'text': current_chunk.strip(),
-                'chunk_index': chunk_index,
-                'token_count': current_tokens,
-                'start_sentence': chunk_index * (chunk_size // 10),
-            })
-        
-        return chunks
+        chunker = TokenChunker(
+            chunk_size=chunk_size,
+            overlap=overlap,
+            boundary=settings.EMBEDDING_CHUNK_BOUNDARY,
+            encoding=self.encoding
+        )
+        return chunker.chunk(text)
     
     @performance_monitor.monitor_operation("process_text_chunk")
     async def process_text_chunk(
@@ -138,8 +205,9 @@ class EmbeddingService:
             return existing
         
         try:
-            # Generate embedding
-            embedding, token_count, processing_time = await self._get_embedding(text)
+            # Generate embedding with the active version
+            version = self.versions.active(db)
+            embedding, token_count, processing_time = await self._get_embedding(text, version)
             
             # Create embedding record
             text_embedding = TextEmbedding(
@@ -149,7 +217,7 @@ class EmbeddingService:
                 chunk_index=0,
                 raw_text=text,
                 processed_text=text.strip(),
-                embedding=embedding,
+                **TextEmbedding.vector_columns(embedding, version.key),
                 metadata=metadata or {},
                 token_count=token_count,
                 processing_duration_ms=processing_time,
@@ -188,10 +256,18 @@ class EmbeddingService:
                 batch = documents[i:i + batch_size]
                 batch_embeddings = []
                 
-                for doc in batch:
-                    # Chunk the document
-                    chunks = self._chunk_text(doc['text'], chunk_size)
-                    
+                # Chunk the whole batch off the event loop (large batches use a process pool)
+                batch_chunks = await asyncio.to_thread(
+                    chunk_documents,
+                    [doc['text'] for doc in batch],
+                    chunk_size,
+                    settings.EMBEDDING_CHUNK_OVERLAP,
+                    settings.EMBEDDING_CHUNK_BOUNDARY,
+                    self.encoding.name,
+                    settings.EMBEDDING_CHUNK_PROCESSES
+                )
+                
+                for doc, chunks in zip(batch, batch_chunks):
                     for chunk_data in chunks:
                         # Process each chunk
                         embedding = await self.process_text_chunk(
@@ -202,7 +278,11 @@ class EmbeddingService:
                                 **doc.get('metadata', {}),
                                 'chunk_index': chunk_data['chunk_index'],
                                 'total_chunks': len(chunks),
-                                'chunk_tokens': chunk_data['token_count']
+                                'chunk_tokens': chunk_data['token_count'],
+                                'start_char': chunk_data['start_char'],
+                                'end_char': chunk_data['end_char'],
+                                'start_token': chunk_data['start_token'],
+                                'end_token': chunk_data['end_token']
                             },
                             user_id=doc.get('user_id'),
                             session_id=doc.get('session_id'),
@@ -235,57 +315,358 @@ class EmbeddingService:
         similarity_threshold: float = 0.7,
         source_types: Optional[List[str]] = None,
         metadata_filters: Optional[Dict[str, Any]] = None,
-        db: Optional[Session] = None
+        db: Optional[Session] = None,
+        query_embedding: Optional[List[float]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        precision: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Vector similarity search with metadata filtering
+        Pass query_embedding when it was already computed (e.g. in a batch);
+        created_after/created_before restrict created_at in SQL ([after, before)).
+        precision: "exact" (every filtered row scored in NumPy), or "int8" / "binary" / "float32" to take
+        candidates from the in-memory index and rescore them at full precision
+        
+        Only rows embedded with the active version are compared with the query
+        (query_embedding must come from that version). While a re-embedding is under
+        way, a short result list is topped up from rows still on older versions,
+        each searched with a query embedding of its own model.
         """
         if db is None:
             db = next(get_db())
+        precision = precision or settings.VECTOR_SEARCH_PRECISION
         
         try:
-            # Get query embedding
-            query_embedding, _, _ = await self._get_embedding(query)
+            active = self.versions.active(db)
             
-            # Build base query
-            query_builder = db.query(
-                TextEmbedding,
-                func.cosine_distance(TextEmbedding.embedding, query_embedding).label('distance')
+            # Get query embedding (cached per normalized query)
+            if query_embedding is None:
+                query_embedding = await self.get_query_embedding(query, active)
+            
+            formatted_results = await self._search_version(
+                active, query_embedding, limit, similarity_threshold, source_types,
+                metadata_filters, db, created_after, created_before, precision
             )
             
-            # Apply filters
-            if source_types:
-                query_builder = query_builder.filter(TextEmbedding.source_type.in_(source_types))
+            # Dual read: rows are on exactly one version, so fallbacks never repeat a result
+            for version in self.versions.fallbacks(db):
+                if len(formatted_results) >= limit:
+                    break
+                formatted_results.extend(await self._search_version(
+                    version, await self.get_query_embedding(query, version),
+                    limit - len(formatted_results), similarity_threshold, source_types,
+                    metadata_filters, db, created_after, created_before, precision
+                ))
             
-            if metadata_filters:
-                for key, value in metadata_filters.items():
-                    query_builder = query_builder.filter(
-                        TextEmbedding.metadata[key].astext == str(value)
+            return formatted_results
+            
+        except Exception as e:
+            logger.error(f"Vector search failed: {str(e)}")
+            raise
+    
+    async def _search_version(
+        self,
+        version: EmbeddingModelVersion,
+        query_embedding: List[float],
+        limit: int,
+        similarity_threshold: float,
+        source_types: Optional[List[str]],
+        metadata_filters: Optional[Dict[str, Any]],
+        db: Session,
+        created_after: Optional[datetime],
+        created_before: Optional[datetime],
+        precision: str
+    ) -> List[Dict[str, Any]]:
+        """Vector search over the rows of a single embedding version"""
+        if precision != PRECISION_EXACT:
+            return await self._quantized_search(
+                query_embedding, limit, similarity_threshold, source_types, metadata_filters,
+                db, created_after, created_before, precision, version
+            )
+        
+        # Exact: every row passing the filters is scored against its stored vector
+        query_matrix = normalize_rows(np.atleast_2d(np.asarray(query_embedding, dtype=np.float32)))
+        ids, _, similarities = self._exact_candidates(
+            db, query_matrix, limit, similarity_threshold, source_types, metadata_filters,
+            created_after, created_before, version
+        )
+        
+        return [
+            self._format_result(embedding, float(similarity))
+            for embedding, similarity in zip(self._load_rows(db, ids), similarities)
+        ]
+    
+    @staticmethod
+    def _format_result(embedding: TextEmbedding, similarity: float) -> Dict[str, Any]:
+        return {
+            'id': embedding.id,
+            'text': embedding.raw_text,
+            'source_type': embedding.source_type,
+            'source_id': embedding.source_id,
+            'metadata': embedding.metadata,
+            'similarity': similarity,
+            'created_at': embedding.created_at
+        }
+    
+    @staticmethod
+    def _load_rows(db: Session, ids: np.ndarray) -> List[TextEmbedding]:
+        """Rows for the given ids, in that order"""
+        if len(ids) == 0:
+            return []
+        rows = {row.id: row for row in db.query(TextEmbedding).filter(TextEmbedding.id.in_(ids.tolist())).all()}
+        return [rows[doc_id] for doc_id in ids.tolist() if doc_id in rows]
+    
+    def _filtered_vectors(
+        self,
+        db: Session,
+        source_types: Optional[List[str]],
+        metadata_filters: Optional[Dict[str, Any]],
+        created_after: Optional[datetime],
+        created_before: Optional[datetime],
+        version: Optional[EmbeddingModelVersion]
+    ):
+        """
+        Yield (ids, vectors) batches of the rows passing the filters, paged by id
+        
+        Vectors come from embedding_blob; the JSON column is only read for rows
+        that were never migrated to binary storage (or written with EMBEDDING_STORAGE=json)
+        """
+        for column, extra in (
+            (TextEmbedding.embedding_blob, TextEmbedding.embedding_blob.isnot(None)),
+            (TextEmbedding.embedding, and_(TextEmbedding.embedding_blob.is_(None), TextEmbedding.embedding.isnot(None)))
+        ):
+            base = self._apply_filters(
+                db.query(TextEmbedding.id, column).filter(extra),
+                source_types, metadata_filters, created_after, created_before, version
+            )
+            last_id = 0
+            while True:
+                rows = base.filter(TextEmbedding.id > last_id).order_by(TextEmbedding.id).limit(self.scan_batch_size).all()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                rows = [(doc_id, vector) for doc_id, vector in rows if vector is not None]
+                if rows:
+                    yield (
+                        np.fromiter((doc_id for doc_id, _ in rows), dtype=np.int64, count=len(rows)),
+                        np.vstack([np.asarray(vector, dtype=np.float32) for _, vector in rows])
                     )
+    
+    def _exact_candidates(
+        self,
+        db: Session,
+        query_matrix: np.ndarray,
+        k: int,
+        similarity_threshold: float,
+        source_types: Optional[List[str]],
+        metadata_filters: Optional[Dict[str, Any]],
+        created_after: Optional[datetime],
+        created_before: Optional[datetime],
+        version: Optional[EmbeddingModelVersion]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Exact top-k of the filtered rows by their best similarity to any query row
+        
+        Each batch is scored as one (rows x dim) @ (dim x queries) product and merged into
+        a running top-k, so memory stays bounded by the batch size.
+        Returns (ids, unit vectors, best similarity), best first; only rows above the threshold.
+        """
+        dims = query_matrix.shape[1]
+        pool_ids = np.zeros(0, dtype=np.int64)
+        pool_vectors = np.zeros((0, dims), dtype=np.float32)
+        pool_best = np.zeros(0, dtype=np.float32)
+        
+        for ids, vectors in self._filtered_vectors(
+            db, source_types, metadata_filters, created_after, created_before, version
+        ):
+            if vectors.shape[1] != dims:
+                logger.warning(f"Skipping {len(ids)} stored vectors of {vectors.shape[1]} dims (query has {dims})")
+                continue
+            vectors = normalize_rows(vectors)
+            best = (vectors @ query_matrix.T).max(axis=1)
+            keep = best > similarity_threshold
+            if not keep.any():
+                continue
+            
+            pool_ids = np.concatenate([pool_ids, ids[keep]])
+            pool_vectors = np.concatenate([pool_vectors, vectors[keep]])
+            pool_best = np.concatenate([pool_best, best[keep]])
+            if len(pool_ids) > k:
+                top = np.argpartition(-pool_best, k - 1)[:k]
+                pool_ids, pool_vectors, pool_best = pool_ids[top], pool_vectors[top], pool_best[top]
+        
+        order = np.argsort(-pool_best, kind="stable")
+        return pool_ids[order], pool_vectors[order], pool_best[order]
+    
+    @staticmethod
+    def _apply_filters(
+        query_builder,
+        source_types: Optional[List[str]],
+        metadata_filters: Optional[Dict[str, Any]],
+        created_after: Optional[datetime],
+        created_before: Optional[datetime],
+        version: Optional[EmbeddingModelVersion] = None
+    ):
+        """Embedding version, source type, metadata and created_at filters shared by the vector searches"""
+        if version is not None:
+            query_builder = query_builder.filter(version_filter(version.key))
+        
+        if source_types:
+            query_builder = query_builder.filter(TextEmbedding.source_type.in_(source_types))
+        
+        if metadata_filters:
+            for key, value in metadata_filters.items():
+                query_builder = query_builder.filter(
+                    TextEmbedding.metadata[key].astext == str(value)
+                )
+        
+        if created_after is not None:
+            query_builder = query_builder.filter(TextEmbedding.created_at >= created_after)
+        if created_before is not None:
+            query_builder = query_builder.filter(TextEmbedding.created_at < created_before)
+        return query_builder
+    
+    async def _quantized_search(
+        self,
+        query_embedding: List[float],
+        limit: int,
+        similarity_threshold: float,
+        source_types: Optional[List[str]],
+        metadata_filters: Optional[Dict[str, Any]],
+        db: Session,
+        created_after: Optional[datetime],
+        created_before: Optional[datetime],
+        precision: str,
+        version: EmbeddingModelVersion
+    ) -> List[Dict[str, Any]]:
+        """
+        Candidates from the quantized index of the version, rescored against the
+        full-precision vectors of just those rows (filters are applied in the rescoring query)
+        
+        The index holds every row of the version, so selective filters can leave few
+        candidates: the candidate count is doubled while fewer than `limit` rows pass,
+        and after QUANTIZED_FILTER_ROUNDS the filtered rows are scored exactly instead.
+        """
+        index = await vector_index_manager.get(precision, version.key)
+        query_vector = normalize_rows(query_embedding)
+        filtered = bool(source_types or metadata_filters or created_after or created_before)
+        
+        n = limit * settings.VECTOR_RESCORE_FACTOR
+        for _ in range(QUANTIZED_FILTER_ROUNDS):
+            candidate_ids = index.candidates(query_vector, n)
+            if len(candidate_ids) == 0:
+                return []
+            
+            rows = self._apply_filters(
+                db.query(TextEmbedding).filter(TextEmbedding.id.in_(candidate_ids.tolist())),
+                source_types, metadata_filters, created_after, created_before, version
+            ).all()
+            
+            similarities = (
+                normalize_rows(np.vstack([row.vector for row in rows])) @ query_vector
+                if rows else np.zeros(0, dtype=np.float32)
+            )
+            kept = int((similarities >= similarity_threshold).sum())
+            if kept >= limit or not filtered or len(candidate_ids) >= len(index):
+                order = np.argsort(-similarities)[:limit]
+                return [
+                    self._format_result(rows[i], float(similarities[i]))
+                    for i in order if similarities[i] >= similarity_threshold
+                ]
+            n *= 2
+        
+        return await self._search_version(
+            version, query_embedding, limit, similarity_threshold, source_types, metadata_filters,
+            db, created_after, created_before, PRECISION_EXACT
+        )
+    
+    @performance_monitor.monitor_operation("multi_vector_similarity_search")
+    async def multi_vector_similarity_search(
+        self,
+        queries: List[str],
+        limit: int = 10,
+        similarity_threshold: float = 0.7,
+        source_types: Optional[List[str]] = None,
+        metadata_filters: Optional[Dict[str, Any]] = None,
+        db: Optional[Session] = None,
+        query_embeddings: Optional[List[List[float]]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        fusion: str = "max",
+        rrf_k: int = 60
+    ) -> List[Dict[str, Any]]:
+        """
+        Similarity search for several query variants in one retrieval
+        
+        The filtered rows' stored vectors are scored against all variants at once as a
+        matrix product; candidates are kept by their best similarity to any variant and
+        fused with max-sim ("max") or reciprocal rank fusion ("rrf"). Only rows of the active
+        embedding version are searched.
+        """
+        if db is None:
+            db = next(get_db())
+        if not queries:
+            return []
+        
+        try:
+            active = self.versions.active(db)
+            
+            # One embedding request for all variants (cached per normalized query)
+            if query_embeddings is None:
+                query_embeddings = await self.get_query_embeddings(queries, active)
+            
+            # Candidates by their best similarity to any variant, scored over the stored
+            # vectors as (rows x dim) @ (dim x variants); enough for every variant to
+            # contribute its own top results
+            query_matrix = normalize_rows(np.asarray(query_embeddings, dtype=np.float32))
+            ids, doc_matrix, _ = self._exact_candidates(
+                db, query_matrix, limit * len(queries), similarity_threshold, source_types,
+                metadata_filters, created_after, created_before, active
+            )
+            
+            if len(ids) == 0:
+                return []
+            
+            # candidates x variants cosine similarity
+            similarities = doc_matrix @ query_matrix.T
+            
+            best_variant = similarities.argmax(axis=1)
+            max_similarity = similarities[np.arange(len(ids)), best_variant]
+            
+            if fusion == "rrf":
+                # Rank of each candidate within each variant's ordering (0 = best)
+                ranks = np.empty_like(similarities, dtype=np.int64)
+                order = np.argsort(-similarities, axis=0)
+                ranks[order, np.arange(len(queries))] = np.arange(len(ids))[:, None]
+                scores = (1.0 / (rrf_k + ranks + 1)).sum(axis=1)
+            else:
+                scores = max_similarity
             
-            # Apply similarity threshold and limit
-            results = query_builder.filter(
-                func.cosine_distance(TextEmbedding.embedding, query_embedding) < (1 - similarity_threshold)
-            ).order_by('distance').limit(limit).all()
+            top = np.argsort(-scores, kind="stable")[:limit]
+            rows = {row.id: row for row in self._load_rows(db, ids[top])}
             
-            # Format results
             formatted_results = []
-            for embedding, distance in results:
-                similarity = 1 - distance
+            for i in top:
+                embedding = rows.get(int(ids[i]))
+                if embedding is None:
+                    continue
                 formatted_results.append({
                     'id': embedding.id,
                     'text': embedding.raw_text,
                     'source_type': embedding.source_type,
                     'source_id': embedding.source_id,
                     'metadata': embedding.metadata,
-                    'similarity': float(similarity),
+                    'similarity': float(max_similarity[i]),
+                    'fused_score': float(scores[i]),
+                    'matched_query': queries[int(best_variant[i])],
                     'created_at': embedding.created_at
                 })
             
             return formatted_results
             
         except Exception as e:
-            logger.error(f"Vector search failed: {str(e)}")
+            logger.error(f"Multi-vector search failed: {str(e)}")
             raise
     
     @performance_monitor.monitor_operation("hybrid_search")
@@ -333,50 +714,19 @@ class EmbeddingService:
                         TextEmbedding.metadata[key].astext == str(value)
                     )
             
-            text_results = text_query.limit(limit * 2).all()
-            
-            # Reciprocal Rank Fusion
-            rrf_scores = {}
-            k = 60  # RRF parameter
-            
-            # Score vector results
-            for rank, result in enumerate(vector_results):
-                doc_id = result['id']
-                rrf_scores[doc_id] = rrf_scores.get(doc_id, 0) + vector_weight / (k + rank + 1)
-                if doc_id not in rrf_scores or 'data' not in rrf_scores:
-                    rrf_scores[doc_id] = {'score': rrf_scores[doc_id], 'data': result}
-                else:
-                    rrf_scores[doc_id]['score'] = rrf_scores[doc_id]
-            
-            # Score text results
-            for rank, result in enumerate(text_results):
-                doc_id = result.id
-                score = text_weight / (k + rank + 1)
-                
-                if doc_id in rrf_scores:
-                    rrf_scores[doc_id]['score'] += score
-                else:
-                    rrf_scores[doc_id] = {
-                        'score': score,
-                        'data': {
-                            'id': result.id,
-                            'text': result.raw_text,
-                            'source_type': result.source_type,
-                            'source_id': result.source_id,
-                            'metadata': result.metadata,
-                            'similarity': 0.5,  # Default for text-only matches
-                            'created_at': result.created_at
-                        }
-                    }
-            
-            # Sort by RRF score and return top results
-            sorted_results = sorted(
-                rrf_scores.values(),
-                key=lambda x: x['score'],
-                reverse=True
-            )[:limit]
-            
-            return [result['data'] for result in sorted_results]
+            text_results = [{
+                'id': result.id,
+                'text': result.raw_text,
+                'source_type': result.source_type,
+                'source_id': result.source_id,
+                'metadata': result.metadata,
+                'similarity': 0.5,  # Default for text-only matches
+                'created_at': result.created_at
+            } for result in text_query.limit(limit * 2).all()]
+            
+            # Reciprocal Rank Fusion (k=60)
+            fused = fuse_results([vector_results, text_results], [vector_weight, text_weight], k=60)
+            return fused[:limit]
             
         except Exception as e:
             logger.error(f"Hybrid search failed: {str(e)}")
@@ -433,6 +783,20 @@ class EmbeddingService:
             stats['total_tokens'] = total_tokens
             stats['estimated_cost_usd'] = total_tokens * 0.0001 / 1000  # ada-002 pricing
             
+            # Query embedding cache effectiveness
+            stats['query_cache'] = self.query_cache.stats()
+            
+            # Rows per embedding version (more than one while a re-embedding is under way)
+            version_counts = db.query(
+                TextEmbedding.embedding_model,
+                func.count(TextEmbedding.id)
+            ).group_by(TextEmbedding.embedding_model).all()
+            stats['active_embedding_version'] = self.versions.active(db).key
+            stats['by_embedding_version'] = {key or LEGACY_EMBEDDING_MODEL: count for key, count in version_counts}
+            
+            # Quantized vector indexes held in memory
+            stats['vector_indexes'] = vector_index_manager.stats()
+            
             return stats
             
         except Exception as e:
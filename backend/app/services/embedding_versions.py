@@ -0,0 +1,328 @@
+"""
+Embedding model versioning and zero-downtime re-embedding
+Tracks which model produced each stored vector, backfills a new version next to the
+active one in the background, and switches versions in a single transaction
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import openai
+from sqlalchemy import func, null, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.embedding_version import EmbeddingVersion
+from app.models.text_embedding import TextEmbedding
+
+logger = logging.getLogger(__name__)
+
+# Model of rows written before versions were tracked
+LEGACY_EMBEDDING_MODEL = "text-embedding-ada-002"
+
+
+@dataclass(frozen=True)
+class EmbeddingModelVersion:
+    """An embedding model plus the optional `dimensions` it is called with"""
+    model: str
+    dimensions: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.model}@{self.dimensions}" if self.dimensions else self.model
+
+    @classmethod
+    def from_key(cls, key: str) -> "EmbeddingModelVersion":
+        model, _, dimensions = key.partition("@")
+        return cls(model, int(dimensions) if dimensions else None)
+
+    def request_kwargs(self) -> Dict[str, Any]:
+        """Arguments for embeddings.create"""
+        kwargs: Dict[str, Any] = {"model": self.model}
+        if self.dimensions:
+            kwargs["dimensions"] = self.dimensions
+        return kwargs
+
+
+def version_filter(key: str):
+    """Rows embedded with the version (untagged rows count as the legacy model)"""
+    if key == LEGACY_EMBEDDING_MODEL:
+        return or_(TextEmbedding.embedding_model == key, TextEmbedding.embedding_model.is_(None))
+    return TextEmbedding.embedding_model == key
+
+
+class EmbeddingVersionRegistry:
+    """
+    Active embedding version, read from embedding_versions (falling back to the
+    EMBEDDING_MODEL/EMBEDDING_DIMENSIONS settings) and cached for ttl_seconds
+    """
+
+    def __init__(self, default: EmbeddingModelVersion, ttl_seconds: int = 10):
+        self.default = default
+        self.ttl_seconds = ttl_seconds
+        self._active: Optional[EmbeddingModelVersion] = None
+        self._active_checked_at = 0.0
+        self._fallbacks: List[EmbeddingModelVersion] = []
+        self._fallbacks_checked_at = 0.0
+
+    def _with_session(self, db: Optional[Session], fn):
+        if db is not None:
+            return fn(db)
+        session = SessionLocal()
+        try:
+            return fn(session)
+        finally:
+            session.close()
+
+    def active(self, db: Optional[Session] = None) -> EmbeddingModelVersion:
+        """Version used for new rows and for queries"""
+        if self._active and time.time() - self._active_checked_at < self.ttl_seconds:
+            return self._active
+
+        def read(session: Session) -> EmbeddingModelVersion:
+            row = session.query(EmbeddingVersion).filter(EmbeddingVersion.status == "active").first()
+            return EmbeddingModelVersion(row.model, row.dimensions) if row else self.default
+
+        try:
+            self._active = self._with_session(db, read)
+        except Exception as e:
+            logger.warning(f"Failed to read active embedding version, using {self.default.key}: {str(e)}")
+            self._active = self._active or self.default
+        self._active_checked_at = time.time()
+        return self._active
+
+    def fallbacks(self, db: Optional[Session] = None) -> List[EmbeddingModelVersion]:
+        """Other versions still backing some rows (read as a fallback during a migration)"""
+        if time.time() - self._fallbacks_checked_at < self.ttl_seconds:
+            return self._fallbacks
+        active_key = self.active(db).key
+
+        def read(session: Session) -> List[EmbeddingModelVersion]:
+            keys = session.query(TextEmbedding.embedding_model).filter(
+                TextEmbedding.embedding_model != active_key
+            ).distinct().all()
+            keys = {key for (key,) in keys}
+            if active_key != LEGACY_EMBEDDING_MODEL and session.query(TextEmbedding.id).filter(
+                TextEmbedding.embedding_model.is_(None)
+            ).first():
+                keys.add(LEGACY_EMBEDDING_MODEL)
+            return [EmbeddingModelVersion.from_key(key) for key in sorted(keys)]
+
+        try:
+            self._fallbacks = self._with_session(db, read)
+        except Exception as e:
+            logger.warning(f"Failed to read embedding fallback versions: {str(e)}")
+            self._fallbacks = []
+        self._fallbacks_checked_at = time.time()
+        return self._fallbacks
+
+    def invalidate(self):
+        self._active = None
+        self._active_checked_at = 0.0
+        self._fallbacks_checked_at = 0.0
+
+
+class RateLimiter:
+    """Requests and tokens per minute over a sliding one-minute window"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._events: Deque[Tuple[float, int]] = deque()
+
+    async def acquire(self, tokens: int):
+        while True:
+            now = time.monotonic()
+            while self._events and now - self._events[0][0] >= 60:
+                self._events.popleft()
+            used = sum(t for _, t in self._events)
+            if not self._events or (
+                len(self._events) < self.requests_per_minute and used + tokens <= self.tokens_per_minute
+            ):
+                self._events.append((now, tokens))
+                return
+            await asyncio.sleep(60 - (now - self._events[0][0]) + 0.01)
+
+
+class ReembeddingJob:
+    """
+    Background re-embedding of every row into a target version
+
+    Rows are processed in id order in batches (one embeddings request each) under
+    a request/token rate limit. Until cutover the new vectors go to
+    next_embedding_blob, so searches keep reading the active version; progress lives
+    in the rows themselves, so a stopped job resumes where it left off. Once the
+    target is active (stragglers written during cutover), rows are updated in place.
+    """
+
+    def __init__(
+        self,
+        target: EmbeddingModelVersion,
+        registry: EmbeddingVersionRegistry,
+        batch_size: int = 100,
+        requests_per_minute: int = 300,
+        tokens_per_minute: int = 500000,
+        max_retries: int = 5
+    ):
+        self.target = target
+        self.registry = registry
+        self.batch_size = batch_size
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_retries = max_retries
+
+    def _pending(self, db: Session):
+        key = self.target.key
+        return db.query(TextEmbedding).filter(
+            or_(TextEmbedding.embedding_model.is_(None), TextEmbedding.embedding_model != key),
+            or_(TextEmbedding.next_embedding_model.is_(None), TextEmbedding.next_embedding_model != key)
+        )
+
+    def _version_row(self, db: Session) -> EmbeddingVersion:
+        row = db.query(EmbeddingVersion).filter(EmbeddingVersion.key == self.target.key).first()
+        if row is None:
+            row = EmbeddingVersion(
+                key=self.target.key,
+                model=self.target.model,
+                dimensions=self.target.dimensions,
+                status="building",
+                rows_embedded=0,
+                tokens_used=0
+            )
+            db.add(row)
+            db.commit()
+        return row
+
+    def progress(self, db: Session) -> Dict[str, Any]:
+        total = db.query(func.count(TextEmbedding.id)).scalar() or 0
+        remaining = self._pending(db).with_entities(func.count(TextEmbedding.id)).scalar() or 0
+        version = db.query(EmbeddingVersion).filter(EmbeddingVersion.key == self.target.key).first()
+        return {
+            "target": self.target.key,
+            "active": self.registry.active(db).key,
+            "status": version.status if version else "not_started",
+            "total_rows": total,
+            "remaining_rows": remaining,
+            "completed": round((total - remaining) / total, 4) if total else 1.0,
+            "tokens_used": version.tokens_used if version else 0
+        }
+
+    async def _embed(self, embed_batch, texts: List[str]) -> List[List[float]]:
+        for attempt in range(self.max_retries):
+            try:
+                return await embed_batch(texts, self.target)
+            except (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError) as e:
+                if attempt == self.max_retries - 1:
+                    raise
+                delay = 2 ** attempt
+                logger.warning(f"Re-embedding request failed ({str(e)}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+
+    async def run(self, max_rows: Optional[int] = None, stop: Optional[asyncio.Event] = None) -> Dict[str, Any]:
+        """
+        Re-embed pending rows until none are left, max_rows is reached or stop is set
+        """
+        # Imported here: the embedding service imports this module for its registry
+        from app.services.embedding_service import embedding_service
+
+        db = SessionLocal()
+        try:
+            version = self._version_row(db)
+            in_place = self.registry.active(db).key == self.target.key
+            processed = 0
+            last_id = 0
+            started = time.perf_counter()
+
+            while max_rows is None or processed < max_rows:
+                if stop is not None and stop.is_set():
+                    break
+
+                batch_size = self.batch_size if max_rows is None else min(self.batch_size, max_rows - processed)
+                rows = self._pending(db).filter(TextEmbedding.id > last_id).with_entities(
+                    TextEmbedding.id, TextEmbedding.raw_text
+                ).order_by(TextEmbedding.id).limit(batch_size).all()
+                if not rows:
+                    break
+
+                texts = [embedding_service._truncate(text) for _, text in rows]
+                tokens = sum(len(embedding_service.encoding.encode(text)) for text in texts)
+                await self.limiter.acquire(tokens)
+                vectors = await self._embed(embedding_service._get_embeddings_batch, texts)
+
+                if in_place:
+                    updates = [{"id": doc_id, "embedding_blob": vector, "embedding_model": self.target.key}
+                               for (doc_id, _), vector in zip(rows, vectors)]
+                else:
+                    updates = [{"id": doc_id, "next_embedding_blob": vector, "next_embedding_model": self.target.key}
+                               for (doc_id, _), vector in zip(rows, vectors)]
+                db.bulk_update_mappings(TextEmbedding, updates)
+                if in_place:
+                    # A legacy JSON copy would still hold the old model's vector
+                    db.query(TextEmbedding).filter(
+                        TextEmbedding.id.in_([doc_id for doc_id, _ in rows]),
+                        TextEmbedding.embedding.isnot(None)
+                    ).update({TextEmbedding.embedding: null()}, synchronize_session=False)
+                version.rows_embedded = (version.rows_embedded or 0) + len(rows)
+                version.tokens_used = (version.tokens_used or 0) + tokens
+                db.commit()
+
+                processed += len(rows)
+                last_id = rows[-1][0]
+                rate = processed / max(time.perf_counter() - started, 1e-9)
+                logger.info(f"Re-embedded {processed} rows into {self.target.key} (last id {last_id}, {rate:.1f} rows/s)")
+
+            return {**self.progress(db), "processed": processed}
+        finally:
+            db.close()
+
+    def cutover(self, db: Session, force: bool = False) -> Dict[str, Any]:
+        """
+        Make the target the active version in one transaction: the staged vectors
+        replace the active ones and the version pointer moves together, so readers
+        see either the old or the new version, never a mix
+        """
+        remaining = self._pending(db).with_entities(func.count(TextEmbedding.id)).scalar() or 0
+        if remaining and not force:
+            raise ValueError(f"{remaining} rows have not been re-embedded into {self.target.key} yet")
+
+        version = self._version_row(db)
+        try:
+            moved = db.query(TextEmbedding).filter(
+                TextEmbedding.next_embedding_model == self.target.key
+            ).update({
+                TextEmbedding.embedding_blob: TextEmbedding.next_embedding_blob,
+                # The legacy JSON copy holds the old model's vector
+                TextEmbedding.embedding: null(),
+                TextEmbedding.embedding_model: TextEmbedding.next_embedding_model,
+                TextEmbedding.next_embedding_blob: None,
+                TextEmbedding.next_embedding_model: None,
+                TextEmbedding.updated_at: func.now()
+            }, synchronize_session=False)
+
+            db.query(EmbeddingVersion).filter(
+                EmbeddingVersion.status == "active",
+                EmbeddingVersion.key != self.target.key
+            ).update({EmbeddingVersion.status: "retired"}, synchronize_session=False)
+
+            version.status = "active"
+            version.activated_at = datetime.now(timezone.utc)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        self.registry.invalidate()
+        logger.info(f"Embedding cutover to {self.target.key}: {moved} rows switched, {remaining} left on older versions")
+        return {"active": self.target.key, "rows_switched": moved, "rows_on_fallback": remaining}
+
+
+# Global registry instance
+embedding_version_registry = EmbeddingVersionRegistry(
+    default=EmbeddingModelVersion(settings.EMBEDDING_MODEL, settings.EMBEDDING_DIMENSIONS),
+    ttl_seconds=settings.EMBEDDING_VERSION_TTL_SECONDS
+)
@@ -0,0 +1,289 @@
+"""
+Job progress events for text processing jobs
+In-process pub/sub that feeds the SSE / WebSocket progress stream,
+with an optional Redis channel so several API replicas can share events
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JobPhase:
+    """Phase names emitted on the job progress stream"""
+    QUEUED = "queued"
+    STARTED = "started"
+    EXTRACTING_INSIGHTS = "extracting_insights"
+    EXTRACTING_NETWORK = "extracting_network"
+    PARTIAL_INSIGHT = "partial_insight"
+    PARTIAL_NETWORK = "partial_network"
+    INSIGHTS_READY = "insights_ready"
+    NETWORK_READY = "network_ready"
+    EXTRACTED = "extracted"
+    AGGREGATING = "aggregating"
+    COMPLETED = "completed"
+    ERROR = "error"
+    CANCELLED = "cancelled"
+
+    TERMINAL = {COMPLETED, ERROR, CANCELLED}
+
+
+class JobEventBroker:
+    """
+    Thread-safe in-process pub/sub for job progress events
+
+    Jobs run on the shared background loop thread (see notes.process_job_async)
+    while subscribers live on the API event loop, so publishing hands events over with
+    call_soon_threadsafe. The last few events of each job are kept for replay so a
+    client that connects mid-job still sees the current phase and partial results.
+    """
+
+    def __init__(self, history_size: int = 50, history_ttl_seconds: int = 3600):
+        self.history_size = history_size
+        self.history_ttl_seconds = history_ttl_seconds
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(list)
+        self._history: Dict[int, Deque[Dict[str, Any]]] = {}
+        self._touched: Dict[int, float] = {}
+        self._sequence: Dict[int, int] = defaultdict(int)
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """Call listener(event) for every event published in this process (e.g. benchmarks)"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def publish(self, job_id: int, phase: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Publish a progress event for a job (safe to call from any thread)
+
+        Returns:
+            The event that was published
+        """
+        with self._lock:
+            self._sequence[job_id] += 1
+            event = {
+                "job_id": job_id,
+                "sequence": self._sequence[job_id],
+                "event": phase,
+                "data": data or {},
+                "timestamp": time.time()
+            }
+        self._deliver_local(event)
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logger.warning(f"Job event listener failed: {str(e)}")
+        return event
+
+    def _deliver_local(self, event: Dict[str, Any]):
+        """Record the event and hand it to every local subscriber of the job"""
+        job_id = event["job_id"]
+
+        with self._lock:
+            history = self._history.setdefault(job_id, deque(maxlen=self.history_size))
+            history.append(event)
+            self._touched[job_id] = time.time()
+            subscribers = list(self._subscribers.get(job_id, []))
+            self._expire_history()
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # Subscriber loop already closed
+                pass
+
+    def _expire_history(self):
+        """Drop histories of jobs nobody published to recently (caller holds the lock)"""
+        cutoff = time.time() - self.history_ttl_seconds
+        for job_id in [j for j, touched in self._touched.items() if touched < cutoff]:
+            if not self._subscribers.get(job_id):
+                self._history.pop(job_id, None)
+                self._touched.pop(job_id, None)
+                self._sequence.pop(job_id, None)
+
+    def history(self, job_id: int) -> List[Dict[str, Any]]:
+        """Get the recent events recorded for a job"""
+        with self._lock:
+            return list(self._history.get(job_id, []))
+
+    async def subscribe(self, job_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream events for a job, starting with the recorded history
+        Ends after a terminal event (completed, error, cancelled)
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        with self._lock:
+            replay = list(self._history.get(job_id, []))
+            self._subscribers[job_id].append((loop, queue))
+
+        last_sequence = 0
+        try:
+            for event in replay:
+                last_sequence = event["sequence"]
+                yield event
+                if event["event"] in JobPhase.TERMINAL:
+                    return
+
+            while True:
+                event = await queue.get()
+                # Skip events already delivered through the replay
+                if event["sequence"] <= last_sequence:
+                    continue
+                last_sequence = event["sequence"]
+                yield event
+                if event["event"] in JobPhase.TERMINAL:
+                    return
+        finally:
+            self._unsubscribe(job_id, loop, queue)
+
+    def _unsubscribe(self, job_id: int, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(job_id, [])
+            if (loop, queue) in subscribers:
+                subscribers.remove((loop, queue))
+            if not subscribers:
+                self._subscribers.pop(job_id, None)
+
+    def subscriber_count(self, job_id: Optional[int] = None) -> int:
+        """Number of active subscribers, for one job or overall"""
+        with self._lock:
+            if job_id is not None:
+                return len(self._subscribers.get(job_id, []))
+            return sum(len(subs) for subs in self._subscribers.values())
+
+
+class RedisJobEventBroker(JobEventBroker):
+    """
+    Job event broker that fans events out through Redis pub/sub
+    Lets a client connected to one replica follow a job running on another
+    """
+
+    CHANNEL_PREFIX = "job_events"
+
+    def __init__(self, redis_url: str, **kwargs):
+        super().__init__(**kwargs)
+        import redis
+        import redis.asyncio as redis_asyncio
+
+        self.redis_url = redis_url
+        self._redis = redis.Redis.from_url(redis_url)
+        self._redis_asyncio = redis_asyncio
+
+    def _channel(self, job_id: int) -> str:
+        return f"{self.CHANNEL_PREFIX}:{job_id}"
+
+    def publish(self, job_id: int, phase: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        event = super().publish(job_id, phase, data)
+        try:
+            payload = json.dumps(event, default=str)
+            self._redis.publish(self._channel(job_id), payload)
+            # Keep the latest event so late subscribers on other replicas get the current phase
+            self._redis.set(f"{self._channel(job_id)}:last", payload, ex=self.history_ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Failed to publish job event to Redis: {str(e)}")
+        return event
+
+    async def subscribe(self, job_id: int) -> AsyncIterator[Dict[str, Any]]:
+        client = self._redis_asyncio.Redis.from_url(self.redis_url)
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(self._channel(job_id))
+
+            last_event = await client.get(f"{self._channel(job_id)}:last")
+            replay = self.history(job_id) or ([json.loads(last_event)] if last_event else [])
+
+            last_sequence = 0
+            for event in replay:
+                last_sequence = event["sequence"]
+                yield event
+                if event["event"] in JobPhase.TERMINAL:
+                    return
+
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                event = json.loads(message["data"])
+                if event["sequence"] <= last_sequence:
+                    continue
+                last_sequence = event["sequence"]
+                yield event
+                if event["event"] in JobPhase.TERMINAL:
+                    return
+        finally:
+            await pubsub.unsubscribe(self._channel(job_id))
+            await pubsub.close()
+            await client.close()
+
+
+def create_job_event_broker() -> JobEventBroker:
+    """Create the job event broker configured by JOB_EVENTS_BACKEND"""
+    if settings.JOB_EVENTS_BACKEND == "redis":
+        try:
+            return RedisJobEventBroker(settings.REDIS_URL)
+        except ImportError:
+            logger.warning("redis package not installed, falling back to in-process job events")
+    return JobEventBroker()
+
+
+async def iter_with_keepalive(
+    events: AsyncIterator[Dict[str, Any]],
+    interval_seconds: float
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    Relay events, yielding None whenever no event arrived within interval_seconds
+    Consumers turn None into a keepalive so proxies don't drop idle streams
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async def pump():
+        try:
+            async for event in events:
+                await queue.put(event)
+        finally:
+            await queue.put(done)
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=interval_seconds)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if item is done:
+                break
+            yield item
+        # Surface errors raised inside the subscription
+        await pump_task
+    finally:
+        pump_task.cancel()
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Format a job event as a Server-Sent Events message"""
+    return (
+        f"id: {event['sequence']}\n"
+        f"event: {event['event']}\n"
+        f"data: {json.dumps(event, default=str)}\n\n"
+    )
+
+
+# Global broker instance
+job_event_broker = create_job_event_broker()
@@ -0,0 +1,146 @@
+"""
+Shared HTTP connection pools for the model provider
+One keep-alive httpx client per process for synchronous calls and one per event loop
+for asynchronous ones (async connections belong to the loop that opened them), so
+agent calls reuse connections instead of paying TCP and TLS setup every time.
+Requests and newly opened connections are counted to report the reuse rate
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Connection setup is bounded separately from the (long) completion timeout
+CONNECT_TIMEOUT_SECONDS = 5.0
+
+# httpcore trace events of a newly opened connection
+_CONNECT_EVENTS = ("connection.connect_tcp.complete", "connection.connect_unix_socket.complete")
+
+
+class LLMHttpPool:
+    """
+    httpx clients shared by the OpenAI chat and embedding clients
+
+    Stats:
+        requests: Requests sent through the pools
+        connections_opened: New connections (each one a TCP and usually TLS handshake)
+        reuse_rate: Share of requests sent over an already open connection
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 32,
+        max_keepalive_connections: int = 16,
+        keepalive_seconds: float = 60.0,
+        timeout_seconds: float = 120.0
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_seconds
+        )
+        self.timeout = httpx.Timeout(timeout_seconds, connect=CONNECT_TIMEOUT_SECONDS)
+        self._lock = threading.Lock()
+        self._sync_client: Optional[httpx.Client] = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.requests = 0
+        self.connections_opened = 0
+        self.async_clients_created = 0
+
+    def _trace(self, event: str, info: Dict[str, Any]):
+        if event in _CONNECT_EVENTS:
+            with self._lock:
+                self.connections_opened += 1
+
+    async def _atrace(self, event: str, info: Dict[str, Any]):
+        self._trace(event, info)
+
+    def _on_request(self, request: httpx.Request):
+        with self._lock:
+            self.requests += 1
+        request.extensions.setdefault("trace", self._trace)
+
+    async def _aon_request(self, request: httpx.Request):
+        with self._lock:
+            self.requests += 1
+        request.extensions.setdefault("trace", self._atrace)
+
+    def sync_client(self) -> httpx.Client:
+        """Process-wide client for synchronous calls (thread-safe)"""
+        with self._lock:
+            if self._sync_client is None:
+                self._sync_client = httpx.Client(
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    follow_redirects=True,
+                    event_hooks={"request": [self._on_request]}
+                )
+            return self._sync_client
+
+    def async_client(self) -> Optional[httpx.AsyncClient]:
+        """Client of the running event loop (None outside of one)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    follow_redirects=True,
+                    event_hooks={"request": [self._aon_request]}
+                )
+                self._async_clients[loop] = client
+                self.async_clients_created += 1
+            return client
+
+    async def aclose_loop_client(self):
+        """Close the running loop's client; call before closing a short-lived event loop"""
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def close(self):
+        with self._lock:
+            client, self._sync_client = self._sync_client, None
+        if client is not None:
+            client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests, opened = self.requests, self.connections_opened
+            event_loops = len(self._async_clients)
+        return {
+            "requests": requests,
+            "connections_opened": opened,
+            "reused_requests": max(0, requests - opened),
+            "reuse_rate": round(max(0, requests - opened) / requests, 4) if requests else None,
+            "async_clients_open": event_loops,
+            "async_clients_created": self.async_clients_created,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_seconds": self.limits.keepalive_expiry
+        }
+
+
+# Global pool shared by every provider client in the process
+llm_http_pool = LLMHttpPool(
+    max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_seconds=settings.LLM_HTTP_KEEPALIVE_SECONDS,
+    timeout_seconds=settings.LLM_HTTP_TIMEOUT_SECONDS
+)
@@ -0,0 +1,197 @@
+"""
+Model provider selection
+LLM_PROVIDER=openai talks to the OpenAI API; LLM_PROVIDER=local answers offline with
+deterministic hashed embeddings (and, for chat, canned schema-valid completions from
+app.utils.langraph.chat_models), so the pipeline's own throughput and latency can
+be measured without network calls or API costs
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import re
+import time
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import List, Optional, Sequence, Union
+
+import httpx
+import numpy as np
+import openai
+
+from app.core.config import settings
+from app.services.llm_http import llm_http_pool
+
+logger = logging.getLogger(__name__)
+
+PROVIDER_OPENAI = "openai"
+PROVIDER_LOCAL = "local"
+
+LOCAL_EMBEDDING_DIMENSIONS = 1536
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) that needs no tokenizer download"""
+    return max(1, (len(text) + 3) // 4)
+
+
+@lru_cache(maxsize=65536)
+def _token_slot(token: str, dimensions: int, seed: int):
+    digest = hashlib.blake2b(f"{seed}:{token}".encode(), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % dimensions, 1.0 if value >> 63 else -1.0
+
+
+def hashed_embedding(text: str, dimensions: int = LOCAL_EMBEDDING_DIMENSIONS, seed: int = 0) -> List[float]:
+    """
+    Deterministic unit vector for a text (feature hashing of its lowercased words)
+
+    Texts sharing words get proportionally similar vectors, so similarity search,
+    deduplication and routing behave plausibly; a text without words maps to a
+    pseudo-random vector seeded by its hash.
+    """
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for token in _TOKEN_RE.findall(text.lower()):
+        index, sign = _token_slot(token, dimensions, seed)
+        vector[index] += sign
+
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0:
+        digest = hashlib.blake2b(f"{seed}:{text}".encode(), digest_size=8).digest()
+        vector = np.random.default_rng(int.from_bytes(digest, "little")).normal(size=dimensions).astype(np.float32)
+        norm = float(np.linalg.norm(vector))
+    return (vector / norm).tolist()
+
+
+class LocalProvider:
+    """
+    Simulated provider behaviour shared by the local clients: per-call latency
+    (base plus uniform jitter) and injected errors at a given rate
+
+    Errors are the OpenAI SDK exceptions a real outage raises ("rate_limit",
+    "timeout" or "server"), so the callers' retry and fallback paths are exercised.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error: str = "rate_limit",
+        seed: int = 0
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error = error
+        self.seed = seed
+        self._random = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+
+    def delay_seconds(self) -> float:
+        jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def _error(self) -> Exception:
+        request = httpx.Request("POST", "http://local-provider/v1")
+        if self.error == "timeout":
+            return openai.APITimeoutError(request=request)
+        status = 429 if self.error == "rate_limit" else 500
+        response = httpx.Response(status, request=request)
+        error_class = openai.RateLimitError if status == 429 else openai.InternalServerError
+        return error_class(f"Injected {self.error} error", response=response, body=None)
+
+    def _check(self):
+        self.calls += 1
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            raise self._error()
+
+    def call(self):
+        """Sleep for the simulated latency, then maybe fail"""
+        delay = self.delay_seconds()
+        if delay:
+            time.sleep(delay)
+        self._check()
+
+    async def acall(self):
+        delay = self.delay_seconds()
+        if delay:
+            await asyncio.sleep(delay)
+        self._check()
+
+    def embed(self, texts: Sequence[str], model: str, dimensions: Optional[int] = None) -> SimpleNamespace:
+        """Response shaped like embeddings.create's (data[i].embedding, usage)"""
+        dims = dimensions or LOCAL_EMBEDDING_DIMENSIONS
+        data = [
+            SimpleNamespace(index=i, embedding=hashed_embedding(text, dims, self.seed), object="embedding")
+            for i, text in enumerate(texts)
+        ]
+        tokens = sum(estimate_tokens(text) for text in texts)
+        return SimpleNamespace(
+            data=data,
+            model=model,
+            usage=SimpleNamespace(prompt_tokens=tokens, total_tokens=tokens)
+        )
+
+
+class _LocalEmbeddings:
+    def __init__(self, provider: LocalProvider):
+        self.provider = provider
+
+    def create(self, input: Union[str, List[str]], model: str, dimensions: Optional[int] = None, **kwargs):
+        self.provider.call()
+        return self.provider.embed([input] if isinstance(input, str) else input, model, dimensions)
+
+
+class _AsyncLocalEmbeddings(_LocalEmbeddings):
+    async def create(self, input: Union[str, List[str]], model: str, dimensions: Optional[int] = None, **kwargs):
+        await self.provider.acall()
+        return self.provider.embed([input] if isinstance(input, str) else input, model, dimensions)
+
+
+class LocalOpenAI:
+    """Offline stand-in for openai.OpenAI (embeddings only)"""
+
+    def __init__(self, provider: LocalProvider):
+        self.embeddings = _LocalEmbeddings(provider)
+
+
+class LocalAsyncOpenAI:
+    """Offline stand-in for openai.AsyncOpenAI (embeddings only)"""
+
+    def __init__(self, provider: LocalProvider):
+        self.embeddings = _AsyncLocalEmbeddings(provider)
+
+
+def use_local_provider() -> bool:
+    return settings.LLM_PROVIDER == PROVIDER_LOCAL
+
+
+def create_openai_client():
+    """Synchronous embeddings client for the configured provider"""
+    if use_local_provider():
+        return LocalOpenAI(local_provider)
+    return openai.OpenAI(api_key=settings.OPENAI_API_KEY, http_client=llm_http_pool.sync_client())
+
+
+def create_async_openai_client():
+    """Asynchronous embeddings client for the configured provider"""
+    if use_local_provider():
+        return LocalAsyncOpenAI(local_provider)
+    # Without a running loop (the client is built lazily, normally inside one) openai uses its own client
+    return openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=llm_http_pool.async_client())
+
+
+# Global simulated provider (shared so latency and error counters cover every client)
+local_provider = LocalProvider(
+    latency_ms=settings.LOCAL_PROVIDER_LATENCY_MS,
+    jitter_ms=settings.LOCAL_PROVIDER_JITTER_MS,
+    error_rate=settings.LOCAL_PROVIDER_ERROR_RATE,
+    error=settings.LOCAL_PROVIDER_ERROR,
+    seed=settings.LOCAL_PROVIDER_SEED
+)
@@ -1,4 +1,3 @@
-import psutil
 import time
 import asyncio
 from datetime import datetime, timedelta
@@ -23,6 +22,8 @@ class SystemMonitor:
     def get_system_metrics(self) -> Dict[str, Any]:
         """Get current system resource usage"""
         try:
+            import psutil
+
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
             
@@ -0,0 +1,241 @@
+"""
+Query embedding cache for search
+Normalized query text -> embedding vector, with LRU + TTL in process, an optional
+shared Redis tier and single-flight so concurrent identical queries share one request
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Fetches embeddings for a list of texts in one request, in order
+BatchEmbedFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+def normalize_query(text: str) -> str:
+    """Cache key normalization: case and whitespace don't change a query's meaning"""
+    return _WHITESPACE_RE.sub(" ", text).strip().lower()
+
+
+class QueryEmbeddingCache:
+    """
+    Two-tier query embedding cache with single-flight
+
+    Local tier: OrderedDict LRU with per-entry expiry. Shared tier (optional): Redis
+    keys holding float32 bytes with the same TTL, so replicas and restarts reuse
+    each other's embeddings. Misses for the same key that arrive while a request is
+    in flight wait for that request instead of issuing their own.
+    """
+
+    KEY_PREFIX = "qemb"
+
+    def __init__(
+        self,
+        model: str,
+        max_size: int = 2048,
+        ttl_seconds: int = 86400,
+        redis_url: Optional[str] = None
+    ):
+        self.model = model
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+        self._inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+
+        self._redis = None
+        if redis_url:
+            try:
+                import redis.asyncio as redis_asyncio
+                self._redis = redis_asyncio.Redis.from_url(redis_url)
+            except ImportError:
+                logger.warning("redis package not installed, query embedding cache is process-local")
+
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.requests = 0
+
+    def _redis_key(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return f"{self.KEY_PREFIX}:{self.model}:{digest}"
+
+    def _get_local(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, vector = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return vector
+
+    def _set_local(self, key: str, vector: List[float]):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl_seconds, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def _get_shared(self, keys: List[str]) -> Dict[str, List[float]]:
+        if self._redis is None or not keys:
+            return {}
+        try:
+            values = await self._redis.mget([self._redis_key(k) for k in keys])
+        except Exception as e:
+            logger.warning(f"Shared query embedding cache unavailable: {str(e)}")
+            return {}
+        found = {}
+        for key, value in zip(keys, values):
+            if value:
+                found[key] = np.frombuffer(value, dtype=np.float32).tolist()
+        return found
+
+    async def _set_shared(self, items: Dict[str, List[float]]):
+        if self._redis is None or not items:
+            return
+        try:
+            pipe = self._redis.pipeline()
+            for key, vector in items.items():
+                pipe.set(self._redis_key(key), np.asarray(vector, dtype=np.float32).tobytes(), ex=self.ttl_seconds)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to write shared query embedding cache: {str(e)}")
+
+    async def get_many(self, texts: Sequence[str], fetch: BatchEmbedFn) -> List[List[float]]:
+        """
+        Embeddings for texts, fetching all misses in a single batched request
+
+        Args:
+            texts: Query texts (duplicates and case/whitespace variants are embedded once)
+            fetch: Callable embedding a list of texts in one request
+
+        Returns:
+            One vector per input text, in order
+        """
+        loop = asyncio.get_running_loop()
+        keys = [normalize_query(t) for t in texts]
+        resolved: Dict[str, List[float]] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        to_fetch: List[str] = []
+
+        for key in dict.fromkeys(keys):
+            vector = self._get_local(key)
+            if vector is not None:
+                resolved[key] = vector
+                self.hits += 1
+                continue
+            inflight = self._inflight.get((id(loop), key))
+            if inflight is not None:
+                waiting[key] = inflight
+                self.coalesced += 1
+                continue
+            to_fetch.append(key)
+
+        if to_fetch:
+            # Claim the keys before any await so concurrent callers coalesce onto this request
+            owned = {key: loop.create_future() for key in to_fetch}
+            for key, future in owned.items():
+                self._inflight[(id(loop), key)] = future
+
+            try:
+                shared = await self._get_shared(to_fetch)
+                self.shared_hits += len(shared)
+                missing = [key for key in to_fetch if key not in shared]
+                fetched: Dict[str, List[float]] = {}
+                if missing:
+                    self.misses += len(missing)
+                    self.requests += 1
+                    vectors = await fetch(missing)
+                    fetched = dict(zip(missing, vectors))
+                    await self._set_shared(fetched)
+
+                for key in to_fetch:
+                    vector = shared.get(key) or fetched[key]
+                    self._set_local(key, vector)
+                    resolved[key] = vector
+                    owned[key].set_result(vector)
+            except BaseException as e:
+                # Waiters must never be left on a future nobody will complete
+                for future in owned.values():
+                    if future.done():
+                        continue
+                    if isinstance(e, Exception):
+                        future.set_exception(e)
+                        # Mark retrieved so an error nobody else awaited isn't logged
+                        future.exception()
+                    else:
+                        # This request was cancelled; waiters fetch the keys themselves
+                        future.cancel()
+                raise
+            finally:
+                for key in to_fetch:
+                    self._inflight.pop((id(loop), key), None)
+
+        abandoned = []
+        for key, future in waiting.items():
+            try:
+                # Shielded: a cancelled waiter must not cancel the request it shares
+                resolved[key] = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                abandoned.append(key)
+        if abandoned:
+            for key, vector in zip(abandoned, await self.get_many(abandoned, fetch)):
+                resolved[key] = vector
+
+        return [resolved[key] for key in keys]
+
+    async def get(self, text: str, fetch: BatchEmbedFn) -> List[float]:
+        """Embedding for a single query"""
+        return (await self.get_many([text], fetch))[0]
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.shared_hits + self.misses + self.coalesced
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "shared_backend": self._redis is not None,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "embedding_requests": self.requests,
+            "hit_rate": round((self.hits + self.shared_hits + self.coalesced) / lookups, 4) if lookups else 0.0
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def create_query_embedding_cache(model: str) -> QueryEmbeddingCache:
+    """Create the query embedding cache configured by QUERY_EMBEDDING_CACHE_* settings"""
+    redis_url = settings.REDIS_URL if settings.QUERY_EMBEDDING_CACHE_BACKEND == "redis" else None
+    return QueryEmbeddingCache(
+        model=model,
+        max_size=settings.QUERY_EMBEDDING_CACHE_SIZE,
+        ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+        redis_url=redis_url
+    )
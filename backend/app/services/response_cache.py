@@ -0,0 +1,387 @@
+"""
+Response cache for read-heavy GET endpoints
+Responses are keyed by endpoint and query parameters and carry tags (shapers,
+global_insights:<pillar>, ...). Committing changes to a model bumps the version of its
+tags, which retires every response cached under them. Responses past their TTL are
+served stale for a while and refreshed in the background. Redis (REDIS_URL) shares the
+cache across replicas; without it the cache is process-local
+"""
+
+import functools
+import hashlib
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union, get_args
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import (
+    Action, GlobalInsight, Insight, Organization, Participant, ProcessedFile,
+    Session as SessionModel, Stakeholder, StakeholderNote, User
+)
+from app.schemas.global_insights import PillarType
+
+logger = logging.getLogger(__name__)
+
+# Redis calls fail fast, then Redis is skipped for a while instead of slowing every request
+STORE_TIMEOUT_SECONDS = 0.5
+STORE_RETRY_SECONDS = 30
+
+# One background refresh per stale response at a time (across replicas with Redis)
+REFRESH_CLAIM_SECONDS = 30
+
+PILLARS = get_args(PillarType)
+
+# session.info key of the tags touched by flushed changes, invalidated on commit
+_PENDING_TAGS = "response_cache_tags"
+
+
+def global_insights_tag(pillar: str) -> str:
+    return f"global_insights:{pillar}"
+
+
+def global_insights_tags(pillar: Optional[str] = None) -> List[str]:
+    """Tags of a response built from one pillar's insights, or from all of them"""
+    return [global_insights_tag(p) for p in ([pillar] if pillar else PILLARS)]
+
+
+# Tags retired when rows of a model change (global insights are tagged by pillar)
+MODEL_TAGS: Dict[type, List[str]] = {
+    Participant: ["shapers", "analytics"],
+    Organization: ["shapers", "analytics"],
+    Stakeholder: ["stakeholders"],
+    StakeholderNote: ["stakeholders"],
+    SessionModel: ["analytics"],
+    ProcessedFile: ["analytics"],
+    Insight: ["analytics"],
+    Action: ["analytics"],
+    User: ["analytics"],
+}
+
+
+class MemoryStore:
+    """Process-local store: LRU entries with expiry, tag versions and refresh claims"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._claims: Dict[str, float] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: str, ttl_seconds: int):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def tag_versions(self, tags: List[str]) -> List[int]:
+        with self._lock:
+            return [self._versions.get(tag, 0) for tag in tags]
+
+    def bump(self, tags: Iterable[str]):
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def claim(self, key: str, ttl_seconds: int) -> bool:
+        now = time.time()
+        with self._lock:
+            if self._claims.get(key, 0) > now:
+                return False
+            self._claims[key] = now + ttl_seconds
+            return True
+
+    def release(self, key: str):
+        with self._lock:
+            self._claims.pop(key, None)
+
+
+class RedisStore:
+    """Redis store shared by replicas; tag versions are counters, claims are SET NX keys"""
+
+    KEY_PREFIX = "rcache"
+
+    def __init__(self, redis_url: str):
+        import redis
+
+        self._redis = redis.Redis.from_url(
+            redis_url,
+            socket_timeout=STORE_TIMEOUT_SECONDS,
+            socket_connect_timeout=STORE_TIMEOUT_SECONDS
+        )
+
+    def _key(self, kind: str, key: str) -> str:
+        return f"{self.KEY_PREFIX}:{kind}:{key}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._redis.get(self._key("entry", key))
+
+    def set(self, key: str, value: str, ttl_seconds: int):
+        self._redis.set(self._key("entry", key), value, ex=ttl_seconds)
+
+    def tag_versions(self, tags: List[str]) -> List[int]:
+        if not tags:
+            return []
+        return [int(value or 0) for value in self._redis.mget([self._key("tag", tag) for tag in tags])]
+
+    def bump(self, tags: Iterable[str]):
+        pipe = self._redis.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(self._key("tag", tag))
+        pipe.execute()
+
+    def claim(self, key: str, ttl_seconds: int) -> bool:
+        return bool(self._redis.set(self._key("claim", key), 1, nx=True, ex=ttl_seconds))
+
+    def release(self, key: str):
+        self._redis.delete(self._key("claim", key))
+
+
+class ResponseCache:
+    """
+    Tagged response cache with stale-while-revalidate
+
+    A response is fresh for ttl_seconds, then served stale for up to stale_seconds
+    more while one background refresh recomputes it. The tag versions are part of the
+    key, so after an invalidation the next request misses and recomputes at once.
+    Error responses are never cached.
+    """
+
+    def __init__(
+        self,
+        store: Union[MemoryStore, RedisStore],
+        ttl_seconds: int = 60,
+        stale_seconds: int = 600,
+        enabled: bool = True
+    ):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.enabled = enabled
+
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="response-cache")
+        self._store_down_until = 0.0
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.invalidations = 0
+        self.store_errors = 0
+
+    def _call_store(self, method: str, *args, default: Any = None) -> Any:
+        """Store call that returns `default` while the store is unavailable"""
+        if time.monotonic() < self._store_down_until:
+            return default
+        try:
+            return getattr(self.store, method)(*args)
+        except Exception as e:
+            self.store_errors += 1
+            self._store_down_until = time.monotonic() + STORE_RETRY_SECONDS
+            logger.warning(f"Response cache store unavailable, bypassing for {STORE_RETRY_SECONDS}s: {str(e)}")
+            return default
+
+    @staticmethod
+    def make_key(name: str, params: Dict[str, Any], tags: List[str], versions: List[int]) -> str:
+        signature = json.dumps({"params": params, "tags": dict(zip(tags, versions))}, sort_keys=True, default=str)
+        return f"{name}:{hashlib.sha1(signature.encode('utf-8')).hexdigest()}"
+
+    def fetch(
+        self,
+        name: str,
+        params: Dict[str, Any],
+        tags: List[str],
+        compute: Callable[[], Any],
+        refresh: Callable[[], Any]
+    ) -> Any:
+        """
+        Cached response of endpoint `name` for `params`
+
+        Args:
+            compute: Builds the response in the current request
+            refresh: Builds the response outside any request (background revalidation)
+        """
+        versions = self._call_store("tag_versions", tags)
+        if versions is None:
+            return compute()
+        key = self.make_key(name, params, tags, versions)
+
+        cached = self._call_store("get", key)
+        if cached is not None:
+            entry = json.loads(cached)
+            if time.time() - entry["stored_at"] < self.ttl_seconds:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                if self._call_store("claim", key, REFRESH_CLAIM_SECONDS, default=False):
+                    self._executor.submit(self._refresh, key, refresh)
+            return entry["response"]
+
+        self.misses += 1
+        response = compute()
+        self._save(key, response)
+        return response
+
+    def _save(self, key: str, response: Any):
+        if not isinstance(response, dict) or response.get("success") is False:
+            return
+        payload = json.dumps({"stored_at": time.time(), "response": jsonable_encoder(response)})
+        self._call_store("set", key, payload, self.ttl_seconds + self.stale_seconds)
+
+    def _refresh(self, key: str, refresh: Callable[[], Any]):
+        try:
+            self.refreshes += 1
+            self._save(key, refresh())
+        except Exception as e:
+            logger.warning(f"Response cache refresh of {key} failed: {str(e)}")
+        finally:
+            self._call_store("release", key)
+
+    def invalidate(self, tags: Iterable[str]):
+        """Retire every response cached under any of `tags`"""
+        tags = sorted(set(tags))
+        if not tags:
+            return
+        self.invalidations += 1
+        self._call_store("bump", tags)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": "redis" if isinstance(self.store, RedisStore) else "memory",
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "invalidations": self.invalidations,
+            "store_errors": self.store_errors,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+        }
+
+
+def create_response_cache() -> ResponseCache:
+    """Create the response cache configured by RESPONSE_CACHE_* settings"""
+    store = None
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        try:
+            store = RedisStore(settings.REDIS_URL)
+        except ImportError:
+            logger.warning("redis package not installed, response cache is process-local")
+    return ResponseCache(
+        store=store or MemoryStore(settings.RESPONSE_CACHE_MAX_ENTRIES),
+        ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+        stale_seconds=settings.RESPONSE_CACHE_STALE_SECONDS,
+        enabled=settings.RESPONSE_CACHE_ENABLED
+    )
+
+
+response_cache = create_response_cache()
+
+
+def cached_response(tags: Union[List[str], Callable[..., List[str]]]):
+    """
+    Cache a (sync) GET endpoint's responses by its query parameters
+
+    Args:
+        tags: Tags of the responses, or a callable building them from the endpoint's
+            query parameters (e.g. only the requested pillar)
+    """
+    def decorator(func):
+        name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(**kwargs):
+            if not response_cache.enabled:
+                return func(**kwargs)
+
+            params = {key: value for key, value in kwargs.items() if not isinstance(value, Session)}
+            session_params = [key for key in kwargs if key not in params]
+
+            def refresh():
+                db = SessionLocal()
+                try:
+                    return func(**params, **{key: db for key in session_params})
+                finally:
+                    db.close()
+
+            return response_cache.fetch(
+                name,
+                params,
+                tags(**params) if callable(tags) else list(tags),
+                lambda: func(**kwargs),
+                refresh
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def _model_tags(cls: type) -> List[str]:
+    if cls is GlobalInsight:
+        return global_insights_tags()
+    return MODEL_TAGS.get(cls, [])
+
+
+def _row_tags(obj: Any) -> List[str]:
+    if isinstance(obj, GlobalInsight):
+        # The pillar the insight had before this change as well as the one it has now
+        history = inspect(obj).attrs.pillar.history
+        pillars = set(history.deleted or ()) | {obj.pillar}
+        return [global_insights_tag(p) for p in pillars if p]
+    return MODEL_TAGS.get(type(obj), [])
+
+
+def _pending(session: Session) -> Set[str]:
+    return session.info.setdefault(_PENDING_TAGS, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tags(session: Session, flush_context):
+    tags = _pending(session)
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        tags.update(_row_tags(obj))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_tags(state):
+    # query.update() / query.delete() bypass the flush
+    if (state.is_update or state.is_delete) and state.bind_mapper is not None:
+        _pending(state.session).update(_model_tags(state.bind_mapper.class_))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tags(session: Session):
+    tags = session.info.pop(_PENDING_TAGS, None)
+    if tags:
+        response_cache.invalidate(tags)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_tags(session: Session, previous_transaction):
+    session.info.pop(_PENDING_TAGS, None)
@@ -0,0 +1,343 @@
+"""
+Search result cache backed by the knowledge_query table
+Results are keyed by (query, context, search mode, limit) and tagged with the corpus
+version and the time window they were computed against; a background refresher
+recomputes popular and saved queries whenever the corpus changes
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func, or_, desc
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.knowledge_query import KnowledgeQuery
+from app.models.text_embedding import TextEmbedding
+from app.services.query_embedding_cache import normalize_query
+from app.services.search_planner import time_filter_bounds
+
+logger = logging.getLogger(__name__)
+
+
+class SearchResultCache:
+    """
+    Result cache for AdvancedSearchService.natural_language_query
+
+    One knowledge_query row per distinct search (query_hash is unique). The stored
+    results carry the corpus version and, for relative time filters ("last 7 days"),
+    the day-resolved window; a row whose version or window differs from the current
+    one is a miss and gets overwritten. Every lookup counts towards query_count so the
+    refresher knows which searches are popular; the counts are kept in memory and
+    written back in one batch by flush_executions, so hits never write on the request path.
+    """
+
+    def __init__(self, version_ttl_seconds: int = 10):
+        self.version_ttl_seconds = version_ttl_seconds
+        self._version: Optional[str] = None
+        self._version_checked_at = 0.0
+
+        # query_hash -> (executions since the last flush, last execution)
+        self._executions: Dict[str, Tuple[int, datetime]] = {}
+        self._executions_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def corpus_version(self, db: Session, force: bool = False) -> str:
+        """
+        Fingerprint of the embeddings table (row count, newest id, newest change)
+        Re-read at most every version_ttl_seconds
+        """
+        now = time.time()
+        if not force and self._version and now - self._version_checked_at < self.version_ttl_seconds:
+            return self._version
+
+        count, max_id, last_change = db.query(
+            func.count(TextEmbedding.id),
+            func.max(TextEmbedding.id),
+            func.max(func.coalesce(TextEmbedding.updated_at, TextEmbedding.created_at))
+        ).one()
+
+        fingerprint = f"{count}:{max_id}:{last_change}"
+        self._version = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:16]
+        self._version_checked_at = now
+        return self._version
+
+    @staticmethod
+    def make_key(
+        query: str,
+        context: Optional[Dict[str, Any]],
+        search_mode: str,
+        limit: int
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Cache key for a search
+
+        Returns:
+            (query_hash, params) where params are stored as filters_applied so the
+            refresher can replay the search
+        """
+        params = {
+            "context": context or {},
+            "search_mode": search_mode,
+            "limit": limit
+        }
+        signature = json.dumps(
+            {"query": normalize_query(query), **params},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(signature.encode("utf-8")).hexdigest(), params
+
+    @staticmethod
+    def time_window(time_filters: Optional[Dict[str, Any]]) -> Optional[str]:
+        """
+        The created_at range a search's time filters resolve to today (day granularity)
+        None without time filters; relative windows ("last 7 days") change every day
+        """
+        created_after, created_before = time_filter_bounds(time_filters)
+        if created_after is None and created_before is None:
+            return None
+        return "/".join(bound.strftime("%Y-%m-%d") if bound else "" for bound in (created_after, created_before))
+
+    def lookup(
+        self,
+        db: Session,
+        query_hash: str,
+        corpus_version: str,
+        time_window: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Cached response for a search if it was computed against corpus_version and
+        time_window; records the execution (query_count, last_executed) either way
+        """
+        row = db.query(KnowledgeQuery.results).filter(KnowledgeQuery.query_hash == query_hash).first()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.record_execution(query_hash)
+
+        cached = row.results or {}
+        if (
+            cached.get("corpus_version") != corpus_version
+            or cached.get("time_window") != time_window
+            or "response" not in cached
+        ):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        response = dict(cached["response"])
+        response["cached"] = True
+        response["cached_at"] = cached.get("computed_at")
+        return response
+
+    def store(
+        self,
+        db: Session,
+        query_hash: str,
+        query: str,
+        params: Dict[str, Any],
+        response: Dict[str, Any],
+        corpus_version: str,
+        user_id: Optional[int] = None,
+        count_execution: bool = True,
+        time_window: Optional[str] = None
+    ):
+        """Store a freshly computed response (creating the knowledge_query row if needed)"""
+        payload = {
+            "corpus_version": corpus_version,
+            "time_window": time_window,
+            "computed_at": datetime.now(timezone.utc).isoformat(),
+            # Round-trip through JSON so datetimes and other objects are stored as strings
+            "response": json.loads(json.dumps(response, default=str))
+        }
+
+        try:
+            row = db.query(KnowledgeQuery).filter(KnowledgeQuery.query_hash == query_hash).first()
+            if row is None:
+                row = KnowledgeQuery(
+                    query_text=query,
+                    query_hash=query_hash,
+                    filters_applied=params,
+                    user_id=user_id,
+                    query_count=1 if count_execution else 0,
+                    last_executed=datetime.now(timezone.utc)
+                )
+                db.add(row)
+            row.results = payload
+            db.commit()
+        except IntegrityError:
+            # Another request inserted the same search first; its results are just as fresh
+            db.rollback()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to store cached search results: {str(e)}")
+
+    def record_execution(self, query_hash: str):
+        """Count an execution of a cached search (written back by flush_executions)"""
+        with self._executions_lock:
+            count, _ = self._executions.get(query_hash, (0, None))
+            self._executions[query_hash] = (count + 1, datetime.now(timezone.utc))
+
+    def flush_executions(self, db: Session) -> int:
+        """Add the recorded executions to query_count/last_executed in one transaction"""
+        with self._executions_lock:
+            executions, self._executions = self._executions, {}
+        if not executions:
+            return 0
+
+        try:
+            for query_hash, (count, last_executed) in executions.items():
+                db.query(KnowledgeQuery).filter(KnowledgeQuery.query_hash == query_hash).update({
+                    KnowledgeQuery.query_count: func.coalesce(KnowledgeQuery.query_count, 0) + count,
+                    KnowledgeQuery.last_executed: last_executed
+                }, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to record search query executions: {str(e)}")
+            # Put the counts back for the next flush
+            with self._executions_lock:
+                for query_hash, (count, last_executed) in executions.items():
+                    pending, latest = self._executions.get(query_hash, (0, last_executed))
+                    self._executions[query_hash] = (pending + count, max(latest, last_executed))
+            return 0
+        return len(executions)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        with self._executions_lock:
+            pending = len(self._executions)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "corpus_version": self._version,
+            "pending_executions": pending
+        }
+
+
+class SearchCacheRefresher:
+    """
+    Background task that recomputes the most frequent and all saved searches
+    whenever the corpus version changes, and writes back the cache's execution
+    counts every flush_seconds
+    """
+
+    def __init__(
+        self,
+        cache: SearchResultCache,
+        interval_seconds: int = 300,
+        top_n: int = 50,
+        flush_seconds: int = 30
+    ):
+        self.cache = cache
+        self.interval_seconds = interval_seconds
+        self.top_n = top_n
+        self.flush_seconds = flush_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._last_version: Optional[str] = None
+
+        self.refreshed_queries = 0
+        self.last_refresh_at: Optional[str] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    def flush(self) -> int:
+        db = SessionLocal()
+        try:
+            return self.cache.flush_executions(db)
+        finally:
+            db.close()
+
+    async def _run(self):
+        last_refresh = 0.0
+        while True:
+            try:
+                await asyncio.to_thread(self.flush)
+                if time.time() - last_refresh >= self.interval_seconds:
+                    last_refresh = time.time()
+                    await self.refresh_if_changed()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Search cache refresh failed: {str(e)}")
+            await asyncio.sleep(min(self.flush_seconds, self.interval_seconds))
+
+    async def refresh_if_changed(self) -> int:
+        """Recompute popular/saved searches if the corpus changed; returns how many were refreshed"""
+        # Imported here: the search service imports this module for its cache
+        from app.services.search_service import search_service
+
+        db = SessionLocal()
+        try:
+            version = self.cache.corpus_version(db, force=True)
+            if version == self._last_version:
+                return 0
+
+            # Popularity includes the executions not written back yet
+            self.cache.flush_executions(db)
+
+            rows = db.query(KnowledgeQuery).filter(
+                or_(KnowledgeQuery.is_saved == True, KnowledgeQuery.query_count > 1)  # noqa: E712
+            ).order_by(desc(KnowledgeQuery.is_saved), desc(KnowledgeQuery.query_count)).limit(self.top_n).all()
+
+            refreshed = 0
+            for row in rows:
+                params = row.filters_applied or {}
+                if (row.results or {}).get("corpus_version") == version:
+                    continue
+                try:
+                    await search_service.natural_language_query(
+                        query=row.query_text,
+                        user_id=row.user_id,
+                        context=params.get("context") or None,
+                        limit=params.get("limit", search_service.default_limit),
+                        search_mode=params.get("search_mode", "hybrid"),
+                        db=db,
+                        refresh_cache=True
+                    )
+                    refreshed += 1
+                except Exception as e:
+                    logger.warning(f"Failed to refresh cached search {row.id}: {str(e)}")
+
+            self._last_version = version
+            self.refreshed_queries += refreshed
+            self.last_refresh_at = datetime.now(timezone.utc).isoformat()
+            logger.info(f"Refreshed {refreshed} cached searches for corpus version {version}")
+            return refreshed
+        finally:
+            db.close()
+
+
+# Global cache and refresher instances
+search_result_cache = SearchResultCache(version_ttl_seconds=settings.SEARCH_CACHE_VERSION_TTL_SECONDS)
+search_cache_refresher = SearchCacheRefresher(
+    search_result_cache,
+    interval_seconds=settings.SEARCH_CACHE_REFRESH_INTERVAL_SECONDS,
+    top_n=settings.SEARCH_CACHE_REFRESH_TOP_N,
+    flush_seconds=settings.SEARCH_CACHE_FLUSH_SECONDS
+)
@@ -0,0 +1,218 @@
+"""
+Query planner for filtered search
+Turns time filters into created_at predicates, estimates how selective the filters
+are and picks how the vector retrieval applies them
+"""
+
+import hashlib
+import json
+import logging
+import math
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, Query
+
+from app.core.config import settings
+from app.models.text_embedding import TextEmbedding
+
+logger = logging.getLogger(__name__)
+
+# Strategies
+PRE_FILTER = "pre_filter"      # predicates in SQL, exact scoring of the (small) filtered set
+OVERSAMPLE = "oversample"      # predicates in SQL with an ANN search widened by 1/selectivity
+POST_FILTER = "post_filter"    # unfiltered ANN, filtered in Python (filters keep most rows)
+NO_FILTER = "no_filter"
+
+
+@dataclass
+class SearchPlan:
+    """How a filtered vector retrieval should run"""
+    strategy: str
+    selectivity: float
+    estimated_rows: int
+    candidates: int
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    rounds: int = 0
+
+    @property
+    def sql_filters(self) -> bool:
+        return self.strategy in (PRE_FILTER, OVERSAMPLE)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["created_after"] = self.created_after.isoformat() if self.created_after else None
+        data["created_before"] = self.created_before.isoformat() if self.created_before else None
+        return data
+
+
+def time_filter_bounds(
+    time_filters: Optional[Dict[str, Any]],
+    now: Optional[datetime] = None
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Convert _analyze_query time filters into a [created_after, created_before) range
+    """
+    if not time_filters:
+        return None, None
+    now = now or datetime.utcnow()
+
+    if 'days' in time_filters:
+        return now - timedelta(days=time_filters['days']), None
+    if 'weeks' in time_filters:
+        return now - timedelta(weeks=time_filters['weeks']), None
+    if 'current_month' in time_filters:
+        return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0), None
+    if 'specific_date' in time_filters:
+        day = datetime.strptime(time_filters['specific_date'], '%Y-%m-%d')
+        return day, day + timedelta(days=1)
+    return None, None
+
+
+def apply_time_predicates(
+    query: Query,
+    created_after: Optional[datetime],
+    created_before: Optional[datetime]
+) -> Query:
+    """Add created_at range predicates (served by the created_at index)"""
+    if created_after is not None:
+        query = query.filter(TextEmbedding.created_at >= created_after)
+    if created_before is not None:
+        query = query.filter(TextEmbedding.created_at < created_before)
+    return query
+
+
+class SearchPlanner:
+    """
+    Picks a retrieval strategy from the estimated filter selectivity
+
+    Selectivity comes from two COUNT queries on indexed columns and is cached per
+    filter signature for a short time, so planning costs nothing on repeat searches.
+    """
+
+    def __init__(
+        self,
+        prefilter_max_rows: int = 5000,
+        postfilter_min_selectivity: float = 0.5,
+        max_candidates: int = 1000,
+        max_rounds: int = 3,
+        estimate_ttl_seconds: int = 60
+    ):
+        self.prefilter_max_rows = prefilter_max_rows
+        self.postfilter_min_selectivity = postfilter_min_selectivity
+        self.max_candidates = max_candidates
+        self.max_rounds = max_rounds
+        self.estimate_ttl_seconds = estimate_ttl_seconds
+        self._estimates: Dict[str, Tuple[float, int, int]] = {}
+
+    def _signature(self, source_types, created_after, created_before) -> str:
+        # Day granularity keeps "last N days" estimates reusable within the TTL
+        raw = json.dumps([
+            sorted(source_types or []),
+            created_after.strftime('%Y-%m-%d') if created_after else None,
+            created_before.strftime('%Y-%m-%d') if created_before else None
+        ])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def estimate(
+        self,
+        db: Session,
+        source_types: Optional[List[str]],
+        created_after: Optional[datetime],
+        created_before: Optional[datetime]
+    ) -> Tuple[int, int]:
+        """(rows matching the filters, total rows)"""
+        key = self._signature(source_types, created_after, created_before)
+        cached = self._estimates.get(key)
+        if cached and time.time() - cached[0] < self.estimate_ttl_seconds:
+            return cached[1], cached[2]
+
+        total = db.query(func.count(TextEmbedding.id)).scalar() or 0
+        filtered_query = db.query(func.count(TextEmbedding.id))
+        if source_types:
+            filtered_query = filtered_query.filter(TextEmbedding.source_type.in_(source_types))
+        filtered_query = apply_time_predicates(filtered_query, created_after, created_before)
+        matching = filtered_query.scalar() or 0
+
+        self._estimates[key] = (time.time(), matching, total)
+        return matching, total
+
+    def plan(
+        self,
+        db: Session,
+        limit: int,
+        time_filters: Optional[Dict[str, Any]] = None,
+        source_types: Optional[List[str]] = None,
+        base_candidates: Optional[int] = None
+    ) -> SearchPlan:
+        """
+        Plan a vector retrieval returning `limit` results under the given filters
+
+        Args:
+            db: Database session (used for the selectivity estimate)
+            limit: Results wanted
+            time_filters: Time filters from _analyze_query
+            source_types: Source type filter
+            base_candidates: Candidates an unfiltered search would fetch (defaults to limit)
+        """
+        base_candidates = base_candidates or limit
+        created_after, created_before = time_filter_bounds(time_filters)
+
+        if created_after is None and created_before is None:
+            return SearchPlan(NO_FILTER, 1.0, 0, base_candidates)
+
+        try:
+            matching, total = self.estimate(db, source_types, created_after, created_before)
+        except Exception as e:
+            logger.warning(f"Selectivity estimate failed, pre-filtering: {str(e)}")
+            return SearchPlan(PRE_FILTER, 1.0, 0, base_candidates, created_after, created_before)
+
+        selectivity = matching / total if total else 1.0
+
+        if matching <= self.prefilter_max_rows:
+            strategy = PRE_FILTER
+            candidates = base_candidates
+        elif selectivity >= self.postfilter_min_selectivity:
+            strategy = POST_FILTER
+            candidates = math.ceil(base_candidates / max(selectivity, 0.01))
+        else:
+            strategy = OVERSAMPLE
+            candidates = math.ceil(base_candidates / max(selectivity, 0.01))
+
+        return SearchPlan(
+            strategy=strategy,
+            selectivity=round(selectivity, 4),
+            estimated_rows=matching,
+            candidates=min(candidates, self.max_candidates),
+            created_after=created_after,
+            created_before=created_before
+        )
+
+    def advance(self, plan: SearchPlan, returned: int, kept: int, limit: int) -> bool:
+        """
+        Adjust the plan for another retrieval round; False when the result is final
+
+        Doubles the candidate count while the retrieval still had more to give. A
+        post-filter plan that runs out of budget short of `limit` switches to SQL
+        predicates for a last round, so filtered searches still come back full.
+        """
+        if kept >= limit or returned < plan.candidates:
+            return False
+        if plan.rounds < self.max_rounds and plan.candidates < self.max_candidates:
+            plan.candidates = min(plan.candidates * 2, self.max_candidates)
+            return True
+        if plan.strategy == POST_FILTER:
+            plan.strategy = OVERSAMPLE
+            return True
+        return False
+
+
+# Global planner instance
+search_planner = SearchPlanner(
+    prefilter_max_rows=settings.SEARCH_PREFILTER_MAX_ROWS,
+    max_candidates=settings.SEARCH_MAX_CANDIDATES
+)
@@ -0,0 +1,165 @@
+"""
+Result fusion and re-ranking for search
+Weighted reciprocal rank fusion, recency decay and maximal marginal relevance on
+NumPy arrays, shared by the embedding and search services
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def weighted_rrf(
+    ranked_ids: Sequence[Sequence[int]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = 60
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Weighted reciprocal rank fusion across any number of retrievers
+
+    Args:
+        ranked_ids: One id list per retriever, best first
+        weights: Per-retriever weight (defaults to 1.0 each)
+        k: RRF constant
+
+    Returns:
+        (ids, scores) sorted by fused score, best first
+    """
+    if weights is None:
+        weights = [1.0] * len(ranked_ids)
+
+    id_parts, score_parts = [], []
+    for ids, weight in zip(ranked_ids, weights):
+        if len(ids) == 0:
+            continue
+        id_parts.append(np.asarray(ids, dtype=np.int64))
+        score_parts.append(weight / (k + np.arange(1, len(ids) + 1, dtype=np.float64)))
+
+    if not id_parts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+
+    all_ids = np.concatenate(id_parts)
+    all_scores = np.concatenate(score_parts)
+
+    # Group equal ids (cheaper than np.unique(return_inverse=True), which sorts stably)
+    by_id = np.argsort(all_ids)
+    sorted_ids = all_ids[by_id]
+    first = np.empty(len(sorted_ids), dtype=bool)
+    first[0] = True
+    np.not_equal(sorted_ids[1:], sorted_ids[:-1], out=first[1:])
+    groups = np.cumsum(first) - 1
+
+    unique_ids = sorted_ids[first]
+    scores = np.bincount(groups, weights=all_scores[by_id], minlength=len(unique_ids))
+
+    order = np.argsort(-scores)
+    return unique_ids[order], scores[order]
+
+
+def fuse_results(
+    result_lists: Sequence[List[Dict[str, Any]]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = 60
+) -> List[Dict[str, Any]]:
+    """
+    RRF over result dicts (keyed by 'id'); the first retriever returning a result
+    supplies its data. Each fused result gets 'rrf_score'.
+    """
+    by_id: Dict[int, Dict[str, Any]] = {}
+    for results in result_lists:
+        for result in results:
+            by_id.setdefault(result['id'], result)
+
+    ids, scores = weighted_rrf([[r['id'] for r in results] for results in result_lists], weights, k)
+
+    fused = []
+    for doc_id, score in zip(ids.tolist(), scores.tolist()):
+        result = by_id[doc_id]
+        result['rrf_score'] = score
+        fused.append(result)
+    return fused
+
+
+def to_epoch_seconds(timestamps: Sequence[Any]) -> np.ndarray:
+    """datetimes / ISO strings to UTC epoch seconds (NaN when missing or unparseable)"""
+    values = np.full(len(timestamps), np.nan)
+    for i, ts in enumerate(timestamps):
+        if ts is None:
+            continue
+        if isinstance(ts, str):
+            try:
+                ts = datetime.fromisoformat(ts.replace('Z', '+00:00'))
+            except ValueError:
+                continue
+        if ts.tzinfo is None:
+            # Naive timestamps are UTC throughout the app
+            ts = ts.replace(tzinfo=timezone.utc)
+        values[i] = ts.timestamp()
+    return values
+
+
+def recency_boost(
+    epoch_seconds: np.ndarray,
+    half_life_days: float = 7.0,
+    max_boost: float = 0.1,
+    now: Optional[float] = None
+) -> np.ndarray:
+    """
+    Score multipliers decaying with age: 1 + max_boost for brand-new content,
+    1 + max_boost/2 after one half-life, 1.0 for undated content
+    """
+    now = now if now is not None else datetime.now(timezone.utc).timestamp()
+    age_days = np.maximum(now - epoch_seconds, 0.0) / 86400.0
+    boost = 1.0 + max_boost * np.exp2(-age_days / half_life_days)
+    return np.where(np.isnan(epoch_seconds), 1.0, boost)
+
+
+def mmr(
+    query_embedding: Optional[np.ndarray],
+    doc_embeddings: np.ndarray,
+    relevance: Optional[np.ndarray] = None,
+    top_k: int = 10,
+    lambda_mult: float = 0.7
+) -> List[int]:
+    """
+    Maximal marginal relevance selection
+
+    Greedily picks documents maximizing
+    lambda * relevance - (1 - lambda) * max similarity to the already selected ones.
+    Each step is one matrix-vector product, so the cost is O(top_k * n * dim).
+
+    Args:
+        query_embedding: Query vector (dim,); only needed when relevance isn't given
+        doc_embeddings: Candidate vectors (n, dim); all-zero rows never count as redundant
+        relevance: Relevance per candidate (defaults to cosine similarity to the query)
+        top_k: Number of documents to select
+        lambda_mult: 1.0 is pure relevance, 0.0 pure diversity
+
+    Returns:
+        Indices of the selected candidates, in selection order
+    """
+    n = len(doc_embeddings)
+    if n == 0:
+        return []
+
+    docs = np.asarray(doc_embeddings, dtype=np.float32)
+    docs = docs / np.maximum(np.linalg.norm(docs, axis=1, keepdims=True), 1e-12)
+    if relevance is None:
+        query = np.asarray(query_embedding, dtype=np.float32)
+        relevance = docs @ (query / max(float(np.linalg.norm(query)), 1e-12))
+    relevance = np.asarray(relevance, dtype=np.float32)
+
+    selected: List[int] = []
+    max_redundancy = np.zeros(n, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+
+    for _ in range(min(top_k, n)):
+        marginal = lambda_mult * relevance - (1.0 - lambda_mult) * max_redundancy
+        marginal[~available] = -np.inf
+        best = int(np.argmax(marginal))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_redundancy, docs @ docs[best], out=max_redundancy)
+
+    return selected
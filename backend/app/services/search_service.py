@@ -1,8 +1,10 @@
 from typing import List, Dict, Any, Optional, Tuple
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import re
 
+import numpy as np
+
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, text, func, desc, asc
 from sqlalchemy.dialects.postgresql import insert
@@ -13,6 +15,11 @@ from app.models.session import Session as YSISession
 from app.models.participant import Participant
 from app.services.embedding_service import embedding_service
 from app.services.logging_service import performance_monitor, session_logger
+from app.services.search_cache import search_result_cache
+from app.services.search_ranking import fuse_results, mmr, recency_boost, to_epoch_seconds
+from app.services.search_planner import search_planner, apply_time_predicates, time_filter_bounds, POST_FILTER, PRE_FILTER
+from app.services.vector_index import PRECISION_EXACT
+from app.core.config import settings
 from app.db.session import get_db
 
 logger = logging.getLogger(__name__)
@@ -37,30 +44,44 @@ class AdvancedSearchService:
         context: Optional[Dict[str, Any]] = None,
         limit: int = 10,
         search_mode: str = "hybrid",  # hybrid, vector, text, semantic
-        db: Optional[Session] = None
+        db: Optional[Session] = None,
+        use_cache: bool = True,
+        refresh_cache: bool = False
     ) -> Dict[str, Any]:
         """
         Process natural language query with intelligent context and filtering
+        Served from the knowledge_query result cache while the corpus is unchanged;
+        refresh_cache recomputes and stores the result without counting an execution
         """
         if db is None:
             db = next(get_db())
         
         try:
-            # Parse query for intent and filters
+            # Parse query for intent and filters (regex only, so also done before a cache lookup)
             query_analysis = await self._analyze_query(query, context)
             
+            cache_enabled = use_cache and settings.SEARCH_CACHE_ENABLED
+            if cache_enabled:
+                corpus_version = search_result_cache.corpus_version(db)
+                query_hash, cache_params = search_result_cache.make_key(query, context, search_mode, limit)
+                # Relative windows ("last 7 days") move every day even when the corpus does not
+                time_window = search_result_cache.time_window(query_analysis.get('time_filters'))
+                if not refresh_cache:
+                    cached = search_result_cache.lookup(db, query_hash, corpus_version, time_window)
+                    if cached is not None:
+                        await self._log_search_query(
+                            query, cached.get('query_analysis', {}), cached.get('total_results', 0), user_id
+                        )
+                        return cached
+            
             # Apply search based on mode
             if search_mode == "hybrid":
                 results = await self._hybrid_search_with_context(
                     query, query_analysis, user_id, limit, db
                 )
             elif search_mode == "vector":
-                results = await embedding_service.vector_similarity_search(
-                    query=query,
-                    limit=limit,
-                    source_types=query_analysis.get('source_types'),
-                    metadata_filters=query_analysis.get('filters', {}),
-                    db=db
+                results = await self._planned_vector_search(
+                    query, query_analysis, limit, similarity_threshold=0.7, db=db
                 )
             elif search_mode == "semantic":
                 results = await self._semantic_search_with_reasoning(
@@ -77,7 +98,7 @@ class AdvancedSearchService:
             # Log query for analytics
             await self._log_search_query(query, query_analysis, len(enriched_results), user_id)
             
-            return {
+            response = {
                 'query': query,
                 'query_analysis': query_analysis,
                 'results': enriched_results,
@@ -86,6 +107,14 @@ class AdvancedSearchService:
                 'timestamp': datetime.utcnow().isoformat()
             }
             
+            if cache_enabled:
+                search_result_cache.store(
+                    db, query_hash, query, cache_params, response, corpus_version,
+                    user_id=user_id, count_execution=not refresh_cache, time_window=time_window
+                )
+            
+            return response
+            
         except Exception as e:
             logger.error(f"Natural language query failed: {str(e)}")
             raise
@@ -189,24 +218,14 @@ class AdvancedSearchService:
         """
         Enhanced hybrid search with contextual understanding
         """
-        # Get vector results
-        vector_results = await embedding_service.vector_similarity_search(
-            query=query,
-            limit=limit * 2,
-            source_types=query_analysis.get('source_types'),
-            metadata_filters=query_analysis.get('filters', {}),
-            similarity_threshold=0.6,
-            db=db
+        # Get vector results (time filters applied as planned, so the candidate pool stays full)
+        vector_results = await self._planned_vector_search(
+            query, query_analysis, limit * 2, similarity_threshold=0.6, db=db
         )
         
-        # Get text search results
+        # Get text search results (time filters are SQL predicates)
         text_results = await self._enhanced_text_search(query, query_analysis, limit * 2, db)
         
-        # Apply time filtering if specified
-        if query_analysis.get('time_filters'):
-            vector_results = self._apply_time_filters(vector_results, query_analysis['time_filters'])
-            text_results = self._apply_time_filters(text_results, query_analysis['time_filters'])
-        
         # Reciprocal Rank Fusion
         fused_results = self._reciprocal_rank_fusion(
             vector_results, 
@@ -220,7 +239,8 @@ class AdvancedSearchService:
             fused_results, query_analysis, user_id, db
         )
         
-        return reranked_results[:limit]
+        # Diversify the top of the ranking
+        return self._diversify(reranked_results[:limit * settings.SEARCH_MMR_POOL_FACTOR], limit, db)
     
     async def _enhanced_text_search(
         self,
@@ -253,6 +273,10 @@ class AdvancedSearchService:
                     TextEmbedding.metadata[key].astext == str(value)
                 )
         
+        # Apply time filters as created_at predicates
+        created_after, created_before = time_filter_bounds(query_analysis.get('time_filters'))
+        search_query = apply_time_predicates(search_query, created_after, created_before)
+        
         # Text search using ILIKE for now (can be enhanced with ts_vector)
         search_terms = query.split()
         for term in search_terms:
@@ -310,30 +334,80 @@ class AdvancedSearchService:
             expanded_queries.append("meeting discussion")
             expanded_queries.append("session transcript")
         
-        # Search with multiple query variations
-        all_results = []
-        for expanded_query in expanded_queries:
-            results = await embedding_service.vector_similarity_search(
-                query=expanded_query,
-                limit=limit,
+        # Embed all query variations in a single request (cached per normalized query)
+        query_embeddings = await embedding_service.get_query_embeddings(expanded_queries)
+        
+        # One retrieval for all variations, fused by each result's best similarity
+        return await self._planned_vector_search(
+            query, query_analysis, limit, similarity_threshold=0.5, db=db,
+            expanded_queries=expanded_queries, query_embeddings=query_embeddings
+        )
+    
+    async def _planned_vector_search(
+        self,
+        query: str,
+        query_analysis: Dict[str, Any],
+        limit: int,
+        similarity_threshold: float,
+        db: Session,
+        query_embedding: Optional[List[float]] = None,
+        expanded_queries: Optional[List[str]] = None,
+        query_embeddings: Optional[List[List[float]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Vector search with time filters applied the way the search planner chose
+        (SQL pre-filter, oversampled filtered search or post-filter), widening the
+        candidate count until `limit` results pass the filters
+        
+        With several expanded_queries the variants are retrieved together in a single
+        multi-vector search instead of one search per variant
+        """
+        time_filters = query_analysis.get('time_filters')
+        plan = search_planner.plan(
+            db, limit, time_filters=time_filters, source_types=query_analysis.get('source_types')
+        )
+        
+        multi_query = expanded_queries is not None and len(expanded_queries) > 1
+        if multi_query:
+            if query_embeddings is None:
+                query_embeddings = await embedding_service.get_query_embeddings(expanded_queries)
+        elif query_embedding is None:
+            if query_embeddings:
+                query_embedding = query_embeddings[0]
+            else:
+                query_embedding = await embedding_service.get_query_embedding(query)
+        
+        while True:
+            plan.rounds += 1
+            search_kwargs = dict(
+                limit=plan.candidates,
                 source_types=query_analysis.get('source_types'),
                 metadata_filters=query_analysis.get('filters', {}),
-                similarity_threshold=0.5,
-                db=db
+                similarity_threshold=similarity_threshold,
+                db=db,
+                created_after=plan.created_after if plan.sql_filters else None,
+                created_before=plan.created_before if plan.sql_filters else None
             )
-            all_results.extend(results)
-        
-        # Deduplicate and score
-        seen_ids = set()
-        unique_results = []
-        for result in all_results:
-            if result['id'] not in seen_ids:
-                seen_ids.add(result['id'])
-                unique_results.append(result)
-        
-        # Sort by similarity and limit
-        unique_results.sort(key=lambda x: x['similarity'], reverse=True)
-        return unique_results[:limit]
+            if multi_query:
+                results = await embedding_service.multi_vector_similarity_search(
+                    queries=expanded_queries, query_embeddings=query_embeddings, **search_kwargs
+                )
+            else:
+                # The pre-filtered set is small: score it exactly rather than through the index
+                results = await embedding_service.vector_similarity_search(
+                    query=query, query_embedding=query_embedding,
+                    precision=PRECISION_EXACT if plan.strategy == PRE_FILTER else None,
+                    **search_kwargs
+                )
+            returned = len(results)
+            if plan.strategy == POST_FILTER:
+                results = self._apply_time_filters(results, time_filters)
+            
+            if not search_planner.advance(plan, returned, len(results), limit):
+                break
+        
+        query_analysis['retrieval_plan'] = plan.to_dict()
+        return results[:limit]
     
     def _apply_time_filters(self, results: List[Dict[str, Any]], time_filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Apply time-based filtering to results"""
@@ -355,6 +429,10 @@ class AdvancedSearchService:
                 except:
                     continue
             
+            # created_at is timezone-aware in the database; compare in naive UTC like `now`
+            if created_at.tzinfo is not None:
+                created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+            
             # Apply filters
             if 'days' in time_filters:
                 cutoff = now - timedelta(days=time_filters['days'])
@@ -390,36 +468,7 @@ class AdvancedSearchService:
         """
         Combine results using Reciprocal Rank Fusion
         """
-        rrf_scores = {}
-        
-        # Score vector results
-        for rank, result in enumerate(vector_results):
-            doc_id = result['id']
-            score = vector_weight / (self.rrf_k + rank + 1)
-            
-            if doc_id not in rrf_scores:
-                rrf_scores[doc_id] = {'score': score, 'data': result}
-            else:
-                rrf_scores[doc_id]['score'] += score
-        
-        # Score text results
-        for rank, result in enumerate(text_results):
-            doc_id = result['id']
-            score = text_weight / (self.rrf_k + rank + 1)
-            
-            if doc_id not in rrf_scores:
-                rrf_scores[doc_id] = {'score': score, 'data': result}
-            else:
-                rrf_scores[doc_id]['score'] += score
-        
-        # Sort by combined score
-        sorted_results = sorted(
-            rrf_scores.values(),
-            key=lambda x: x['score'],
-            reverse=True
-        )
-        
-        return [item['data'] for item in sorted_results]
+        return fuse_results([vector_results, text_results], [vector_weight, text_weight], k=self.rrf_k)
     
     async def _contextual_reranking(
         self,
@@ -433,38 +482,80 @@ class AdvancedSearchService:
         """
         # For now, simple reranking based on query type
         # In future, could use ML models for personalized ranking
+        if not results:
+            return results
         
-        for result in results:
-            base_score = result.get('similarity', 0.5)
-            
-            # Boost based on query type alignment
-            if query_analysis['query_type'] == 'stakeholder':
-                if any(entity['value'].lower() in result['text'].lower() 
-                      for entity in query_analysis.get('entities', [])):
-                    base_score *= 1.2
-            
-            elif query_analysis['query_type'] == 'meeting':
-                if result.get('source_type') == 'meeting_transcript':
-                    base_score *= 1.1
-            
-            # Boost recent content slightly
-            if result.get('created_at'):
-                try:
-                    created_at = result['created_at']
-                    if isinstance(created_at, str):
-                        created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                    
-                    days_old = (datetime.utcnow() - created_at).days
-                    if days_old < 7:
-                        base_score *= 1.05
-                except:
-                    pass
-            
-            result['contextual_score'] = base_score
+        scores = np.array([result.get('similarity', 0.5) for result in results], dtype=np.float64)
+        
+        # Boost based on query type alignment
+        if query_analysis['query_type'] == 'stakeholder':
+            names = [entity['value'].lower() for entity in query_analysis.get('entities', [])]
+            if names:
+                mentioned = np.array([
+                    any(name in result['text'].lower() for name in names) for result in results
+                ])
+                scores[mentioned] *= 1.2
+        
+        elif query_analysis['query_type'] == 'meeting':
+            transcripts = np.array([result.get('source_type') == 'meeting_transcript' for result in results])
+            scores[transcripts] *= 1.1
+        
+        # Boost recent content, decaying with age
+        scores *= recency_boost(
+            to_epoch_seconds([result.get('created_at') for result in results]),
+            half_life_days=settings.SEARCH_RECENCY_HALF_LIFE_DAYS,
+            max_boost=settings.SEARCH_RECENCY_BOOST
+        )
+        
+        for result, score in zip(results, scores.tolist()):
+            result['contextual_score'] = score
         
         # Sort by contextual score
-        results.sort(key=lambda x: x.get('contextual_score', 0), reverse=True)
-        return results
+        return [results[i] for i in np.argsort(-scores, kind='stable')]
+    
+    def _diversify(
+        self,
+        results: List[Dict[str, Any]],
+        limit: int,
+        db: Session
+    ) -> List[Dict[str, Any]]:
+        """
+        MMR over the re-ranked pool using the stored embeddings, so near-duplicate
+        chunks don't crowd out other relevant results
+        """
+        lambda_mult = settings.SEARCH_MMR_LAMBDA
+        if lambda_mult >= 1.0 or len(results) <= 1:
+            return results[:limit]
+        
+        ids = [result['id'] for result in results]
+        stored = {
+            doc_id: vector
+            for doc_id, vector in db.query(TextEmbedding.id, TextEmbedding.embedding_blob).filter(
+                TextEmbedding.id.in_(ids)
+            ).all()
+            if vector is not None
+        }
+        # Rows not yet migrated to binary storage
+        legacy_ids = [doc_id for doc_id in ids if doc_id not in stored]
+        if legacy_ids:
+            for doc_id, vector in db.query(TextEmbedding.id, TextEmbedding.embedding).filter(
+                TextEmbedding.id.in_(legacy_ids), TextEmbedding.embedding.isnot(None)
+            ).all():
+                stored[doc_id] = vector
+        dims = next((len(v) for v in stored.values() if v is not None), 0)
+        if not dims:
+            return results[:limit]
+        
+        # Results without a stored embedding get a zero vector (never redundant)
+        doc_embeddings = np.zeros((len(results), dims), dtype=np.float32)
+        for i, doc_id in enumerate(ids):
+            vector = stored.get(doc_id)
+            if vector is not None and len(vector) == dims:
+                doc_embeddings[i] = vector
+        
+        relevance = np.array([result.get('contextual_score', result.get('similarity', 0.5)) for result in results])
+        selected = mmr(None, doc_embeddings, relevance=relevance, top_k=limit, lambda_mult=lambda_mult)
+        return [results[i] for i in selected]
     
     async def _enrich_search_results(
         self,
@@ -474,85 +565,126 @@ class AdvancedSearchService:
     ) -> List[Dict[str, Any]]:
         """
         Enrich search results with additional context
+        Source contexts are fetched with one IN query per source type, and each
+        result's text is lowercased and scanned once for snippet and explanation
         """
+        source_contexts = await self._get_source_contexts(
+            [(r.get('source_type'), r.get('source_id')) for r in results],
+            db
+        )
+        
+        # Query terms and entity names are prepared once for the whole result set
+        term_pattern = self._compile_term_pattern(query_analysis['original_query'])
+        entity_names = [
+            (entity['value'], entity['value'].lower())
+            for entity in query_analysis.get('entities', [])
+        ]
+        
         enriched_results = []
         
         for result in results:
             enriched_result = result.copy()
+            text = result['text']
+            text_lower = text.lower()
             
             # Add source context
             if result.get('source_id') and result.get('source_type'):
-                source_context = await self._get_source_context(
-                    result['source_type'], result['source_id'], db
+                enriched_result['source_context'] = source_contexts.get(
+                    (result['source_type'], result['source_id']), {}
                 )
-                enriched_result['source_context'] = source_context
             
             # Add snippet highlighting
-            snippet = self._create_highlighted_snippet(
-                result['text'], 
-                query_analysis['original_query']
+            match = term_pattern.search(text_lower) if term_pattern else None
+            enriched_result['highlighted_snippet'] = self._snippet_at(
+                text, match.start() if match else -1
             )
-            enriched_result['highlighted_snippet'] = snippet
             
             # Add relevance explanation
-            enriched_result['relevance_explanation'] = self._generate_relevance_explanation(
-                result, query_analysis
-            )
+            mentioned = [name for name, name_lower in entity_names if name_lower in text_lower]
+            enriched_result['relevance_explanation'] = self._relevance_explanation(result, mentioned)
             
             enriched_results.append(enriched_result)
         
         return enriched_results
     
-    async def _get_source_context(self, source_type: str, source_id: int, db: Session) -> Dict[str, Any]:
-        """Get context information about the source"""
-        context = {}
+    async def _get_source_contexts(
+        self,
+        sources: List[Tuple[Optional[str], Optional[int]]],
+        db: Session
+    ) -> Dict[Tuple[str, int], Dict[str, Any]]:
+        """
+        Context information for many sources, one query per source type
+        Returns {(source_type, source_id): context}
+        """
+        ids_by_type: Dict[str, set] = {}
+        for source_type, source_id in sources:
+            if source_type and source_id:
+                ids_by_type.setdefault(source_type, set()).add(source_id)
+        
+        contexts: Dict[Tuple[str, int], Dict[str, Any]] = {}
         
         try:
-            if source_type == 'meeting_transcript' and source_id:
-                session = db.query(YSISession).filter(YSISession.id == source_id).first()
-                if session:
-                    context = {
-                        'session_title': session.title,
-                        'session_date': session.created_at.isoformat() if session.created_at else None,
-                        'session_type': getattr(session, 'session_type', 'Unknown')
+            session_ids = ids_by_type.get('meeting_transcript')
+            if session_ids:
+                rows = db.query(
+                    YSISession.id,
+                    YSISession.title,
+                    YSISession.created_at,
+                    YSISession.session_type
+                ).filter(YSISession.id.in_(session_ids)).all()
+                
+                for row in rows:
+                    contexts[('meeting_transcript', row.id)] = {
+                        'session_title': row.title,
+                        'session_date': row.created_at.isoformat() if row.created_at else None,
+                        'session_type': row.session_type or 'Unknown'
                     }
         except Exception as e:
             logger.error(f"Error getting source context: {str(e)}")
         
-        return context
+        return contexts
     
-    def _create_highlighted_snippet(self, text: str, query: str, max_length: int = 300) -> str:
-        """Create highlighted snippet around query matches"""
-        query_terms = query.lower().split()
-        text_lower = text.lower()
-        
-        # Find first occurrence of any query term
-        best_pos = -1
-        for term in query_terms:
-            if len(term) > 2:
-                pos = text_lower.find(term)
-                if pos != -1 and (best_pos == -1 or pos < best_pos):
-                    best_pos = pos
-        
-        if best_pos == -1:
+    async def _get_source_context(self, source_type: str, source_id: int, db: Session) -> Dict[str, Any]:
+        """Get context information about the source"""
+        contexts = await self._get_source_contexts([(source_type, source_id)], db)
+        return contexts.get((source_type, source_id), {})
+    
+    @staticmethod
+    def _compile_term_pattern(query: str) -> Optional[re.Pattern]:
+        """Regex matching any query term longer than 2 characters (lowercase)"""
+        terms = [term for term in query.lower().split() if len(term) > 2]
+        if not terms:
+            return None
+        return re.compile("|".join(re.escape(term) for term in terms))
+    
+    @staticmethod
+    def _snippet_at(text: str, match_pos: int, max_length: int = 300) -> str:
+        """Snippet centered on match_pos (or the beginning when there is no match)"""
+        if match_pos == -1:
             # No match found, return beginning
-            snippet = text[:max_length]
-        else:
-            # Center snippet around match
-            start = max(0, best_pos - max_length // 2)
-            end = min(len(text), start + max_length)
-            snippet = text[start:end]
-            
-            # Add ellipsis if truncated
-            if start > 0:
-                snippet = "..." + snippet
-            if end < len(text):
-                snippet = snippet + "..."
+            return text[:max_length]
+        
+        # Center snippet around match
+        start = max(0, match_pos - max_length // 2)
+        end = min(len(text), start + max_length)
+        snippet = text[start:end]
+        
+        # Add ellipsis if truncated
+        if start > 0:
+            snippet = "..." + snippet
+        if end < len(text):
+            snippet = snippet + "..."
         
         return snippet
     
-    def _generate_relevance_explanation(self, result: Dict[str, Any], query_analysis: Dict[str, Any]) -> str:
-        """Generate explanation of why this result is relevant"""
+    def _create_highlighted_snippet(self, text: str, query: str, max_length: int = 300) -> str:
+        """Create highlighted snippet around query matches"""
+        pattern = self._compile_term_pattern(query)
+        match = pattern.search(text.lower()) if pattern else None
+        return self._snippet_at(text, match.start() if match else -1, max_length)
+    
+    @staticmethod
+    def _relevance_explanation(result: Dict[str, Any], mentioned_entities: List[str]) -> str:
         explanations = []
         
         similarity = result.get('similarity', 0)
@@ -564,13 +696,20 @@ class AdvancedSearchService:
         if result.get('search_method') == 'text':
             explanations.append("Contains exact text matches")
         
-        if query_analysis.get('entities'):
-            for entity in query_analysis['entities']:
-                if entity['value'].lower() in result['text'].lower():
-                    explanations.append(f"Mentions {entity['value']}")
+        for name in mentioned_entities:
+            explanations.append(f"Mentions {name}")
         
         return "; ".join(explanations) if explanations else "Relevant to query"
     
+    def _generate_relevance_explanation(self, result: Dict[str, Any], query_analysis: Dict[str, Any]) -> str:
+        """Generate explanation of why this result is relevant"""
+        text_lower = result['text'].lower()
+        mentioned = [
+            entity['value'] for entity in query_analysis.get('entities', [])
+            if entity['value'].lower() in text_lower
+        ]
+        return self._relevance_explanation(result, mentioned)
+    
     async def _log_search_query(
         self,
         query: str,
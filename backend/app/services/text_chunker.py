@@ -0,0 +1,243 @@
+"""
+Token-accurate text chunking for the embedding pipeline
+Encodes each document once, walks the token array with a fixed size/overlap and
+snaps chunk edges to sentence or speaker-turn boundaries
+"""
+
+import bisect
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import tiktoken
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BOUNDARY_SENTENCE = "sentence"
+BOUNDARY_SPEAKER = "speaker"
+
+# End of a sentence: terminal punctuation (optionally closing quote/bracket) followed by whitespace
+SENTENCE_BOUNDARY_RE = re.compile(r"[.!?][\"')\]]?\s+")
+
+# Start of a speaker turn: "Name:" or "[00:12:34] Name:" at the beginning of a line
+SPEAKER_TURN_RE = re.compile(r"^[ \t]*(?:\[[\d:.]+\][ \t]*)?[A-Z][^\n:]{0,40}:", re.MULTILINE)
+
+# Documents smaller than this are chunked in-process even in batch mode
+PARALLEL_MIN_CHARS = 1_000_000
+
+# Byte length of every token id, per encoding (built once, then offsets are a vectorized lookup)
+_token_length_tables: Dict[str, np.ndarray] = {}
+
+
+def load_encoding(name: str = "cl100k_base") -> tiktoken.Encoding:
+    """
+    tiktoken encoding, loaded on first use from TIKTOKEN_CACHE_DIR
+
+    The directory is pre-seeded when the image is built, so workers tokenize without
+    network access; an encoding missing from it is still downloaded (and cached).
+    """
+    if settings.TIKTOKEN_CACHE_DIR:
+        os.environ.setdefault("TIKTOKEN_CACHE_DIR", settings.TIKTOKEN_CACHE_DIR)
+    try:
+        return tiktoken.get_encoding(name)
+    except ValueError:
+        # Unknown encoding name
+        raise
+    except Exception as e:
+        raise RuntimeError(
+            f"tiktoken encoding {name} is not cached in {os.environ.get('TIKTOKEN_CACHE_DIR')} and could not be "
+            f"downloaded (run python -m app.scripts.prefetch_tiktoken): {str(e)}"
+        ) from e
+
+
+def _token_byte_lengths(encoding: tiktoken.Encoding) -> np.ndarray:
+    table = _token_length_tables.get(encoding.name)
+    if table is None:
+        table = np.zeros(encoding.max_token_value + 1, dtype=np.int64)
+        for token in range(encoding.n_vocab):
+            try:
+                table[token] = len(encoding.decode_single_token_bytes(token))
+            except KeyError:
+                # Unused ids between the ranks and the special tokens
+                pass
+        _token_length_tables[encoding.name] = table
+    return table
+
+
+class TokenChunker:
+    """
+    Single-pass token chunker
+
+    Each document is encoded once; chunk text is the exact slice of the original
+    document, so start_char/end_char and start_token/end_token always point back at
+    the source. Chunks are yielded lazily.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        overlap: int = 100,
+        boundary: str = BOUNDARY_SENTENCE,
+        encoding_name: str = "cl100k_base",
+        encoding: Optional[tiktoken.Encoding] = None
+    ):
+        if overlap >= chunk_size:
+            raise ValueError("overlap must be smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.boundary = boundary
+        self.encoding_name = encoding_name
+        self._encoding = encoding
+
+    @property
+    def encoding(self) -> tiktoken.Encoding:
+        if self._encoding is None:
+            self._encoding = load_encoding(self.encoding_name)
+        return self._encoding
+
+    def _token_char_offsets(self, text: str, tokens: List[int]) -> np.ndarray:
+        """Character offset where each token starts, plus len(text) as a sentinel"""
+        raw = text.encode("utf-8")
+        token_bytes = _token_byte_lengths(self.encoding)[np.asarray(tokens, dtype=np.int64)]
+        byte_starts = np.concatenate(([0], np.cumsum(token_bytes)[:-1])) if len(tokens) else np.zeros(0, np.int64)
+
+        # Map byte offsets to character offsets (continuation bytes belong to the preceding character)
+        data = np.frombuffer(raw, dtype=np.uint8)
+        char_of_byte = np.cumsum((data & 0xC0) != 0x80) - 1
+        offsets = char_of_byte[np.minimum(byte_starts, max(len(raw) - 1, 0))] if len(raw) else byte_starts
+        return np.append(offsets, len(text)).astype(np.int64)
+
+    def _boundary_tokens(self, pattern: re.Pattern, text: str, offsets: np.ndarray, at_end: bool) -> List[int]:
+        """Token indices where a boundary falls (sorted, unique)"""
+        positions = [m.end() if at_end else m.start() for m in pattern.finditer(text)]
+        if not positions:
+            return []
+        indices = np.searchsorted(offsets[:-1], np.asarray(positions), side="left")
+        return sorted(set(int(i) for i in indices if 0 < i < len(offsets) - 1))
+
+    @staticmethod
+    def _last_in(boundaries: Sequence[int], low: int, high: int) -> Optional[int]:
+        """Largest boundary in (low, high]"""
+        i = bisect.bisect_right(boundaries, high)
+        if i and boundaries[i - 1] > low:
+            return boundaries[i - 1]
+        return None
+
+    @staticmethod
+    def _first_in(boundaries: Sequence[int], low: int, high: int) -> Optional[int]:
+        """Smallest boundary in [low, high)"""
+        i = bisect.bisect_left(boundaries, low)
+        if i < len(boundaries) and boundaries[i] < high:
+            return boundaries[i]
+        return None
+
+    def iter_chunks(self, text: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield chunks of at most chunk_size tokens with overlap tokens of shared context
+
+        Each chunk: text, chunk_index, token_count, start_token, end_token, start_char, end_char
+        """
+        tokens = self.encoding.encode_ordinary(text)
+        total = len(tokens)
+        if total == 0:
+            return
+
+        offsets = self._token_char_offsets(text, tokens)
+        sentence_bounds = self._boundary_tokens(SENTENCE_BOUNDARY_RE, text, offsets, at_end=True)
+        boundary_sets = [sentence_bounds]
+        if self.boundary == BOUNDARY_SPEAKER:
+            boundary_sets.insert(0, self._boundary_tokens(SPEAKER_TURN_RE, text, offsets, at_end=False))
+
+        # Don't let boundary snapping shrink a chunk below half its size
+        min_span = self.chunk_size // 2
+        start = 0
+        chunk_index = 0
+
+        while start < total:
+            end = min(start + self.chunk_size, total)
+            if end < total:
+                for boundaries in boundary_sets:
+                    snapped = self._last_in(boundaries, start + min_span, end)
+                    if snapped is not None:
+                        end = snapped
+                        break
+
+            start_char, end_char = int(offsets[start]), int(offsets[end])
+            chunk_text = text[start_char:end_char]
+            stripped = chunk_text.strip()
+            if stripped:
+                leading = len(chunk_text) - len(chunk_text.lstrip())
+                yield {
+                    "text": stripped,
+                    "chunk_index": chunk_index,
+                    "token_count": end - start,
+                    "start_token": start,
+                    "end_token": end,
+                    "start_char": start_char + leading,
+                    "end_char": start_char + leading + len(stripped),
+                }
+                chunk_index += 1
+
+            if end >= total:
+                break
+
+            # Overlap window, started at a boundary inside it when there is one
+            next_start = max(end - self.overlap, start + 1)
+            for boundaries in boundary_sets:
+                snapped = self._first_in(boundaries, next_start, end)
+                if snapped is not None:
+                    next_start = snapped
+                    break
+            start = next_start
+
+    def chunk(self, text: str) -> List[Dict[str, Any]]:
+        """All chunks of a document"""
+        return list(self.iter_chunks(text))
+
+
+def _chunk_worker(args) -> List[Dict[str, Any]]:
+    """Process pool entry point (the chunker and its encoding are rebuilt per worker)"""
+    text, chunk_size, overlap, boundary, encoding_name = args
+    return TokenChunker(chunk_size, overlap, boundary, encoding_name).chunk(text)
+
+
+def chunk_documents(
+    texts: Sequence[str],
+    chunk_size: int = 1000,
+    overlap: int = 100,
+    boundary: str = BOUNDARY_SENTENCE,
+    encoding_name: str = "cl100k_base",
+    processes: Optional[int] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Chunk several documents, fanning out to a process pool for large batches
+
+    Args:
+        texts: Documents to chunk
+        chunk_size: Maximum tokens per chunk
+        overlap: Tokens shared between consecutive chunks
+        boundary: "sentence" or "speaker" (speaker turns first, then sentences)
+        encoding_name: tiktoken encoding
+        processes: Pool size (0 disables the pool, None picks from the CPU count)
+
+    Returns:
+        One list of chunks per document, in input order
+    """
+    total_chars = sum(len(t) for t in texts)
+    workers = processes if processes is not None else min(len(texts), os.cpu_count() or 1)
+
+    if workers > 1 and len(texts) > 1 and total_chars >= PARALLEL_MIN_CHARS:
+        args = [(text, chunk_size, overlap, boundary, encoding_name) for text in texts]
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(_chunk_worker, args))
+        except Exception as e:
+            logger.warning(f"Process pool chunking failed, chunking in-process: {str(e)}")
+
+    chunker = TokenChunker(chunk_size, overlap, boundary, encoding_name)
+    return [chunker.chunk(text) for text in texts]
@@ -0,0 +1,247 @@
+"""
+Quantized in-memory vector index
+Scalar int8 or 1-bit binary codes of every stored embedding for candidate
+generation; full-precision vectors are only read from the database for the few
+candidates that get rescored
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.text_embedding import TextEmbedding
+from app.services.embedding_versions import version_filter
+
+logger = logging.getLogger(__name__)
+
+PRECISION_EXACT = "exact"
+PRECISION_FLOAT32 = "float32"   # in-memory full precision (benchmark baseline)
+PRECISION_INT8 = "int8"
+PRECISION_BINARY = "binary"
+QUANTIZED_PRECISIONS = (PRECISION_FLOAT32, PRECISION_INT8, PRECISION_BINARY)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        return matrix / max(float(np.linalg.norm(matrix)), 1e-12)
+    return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+
+def int8_scale(matrix: np.ndarray) -> np.ndarray:
+    """Symmetric per-dimension scale mapping the observed range onto [-127, 127]"""
+    return np.maximum(np.abs(matrix).max(axis=0), 1e-12).astype(np.float32) / 127.0
+
+
+def quantize_int8(matrix: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    return np.clip(np.rint(matrix / scale), -127, 127).astype(np.int8)
+
+
+def quantize_binary(matrix: np.ndarray) -> np.ndarray:
+    """Sign bits packed 8 per byte (1536 dims -> 192 bytes)"""
+    return np.packbits(np.atleast_2d(matrix) > 0, axis=1)
+
+
+def hamming_distances(codes: np.ndarray, query_bits: np.ndarray) -> np.ndarray:
+    return np.bitwise_count(np.bitwise_xor(codes, query_bits)).sum(axis=1, dtype=np.int32)
+
+
+class QuantizedIndex:
+    """
+    Codes for a set of unit vectors plus their ids
+
+    candidates() scores the query against every code (int8 dot products with a
+    scaled float query, or Hamming distance over packed bits) and returns the ids of the
+    best n, unordered beyond that.
+    """
+
+    def __init__(self, precision: str, version_key: Optional[str] = None):
+        if precision not in QUANTIZED_PRECISIONS:
+            raise ValueError(f"Unsupported index precision: {precision}")
+        self.precision = precision
+        self.version_key = version_key
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.codes: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+        self.fingerprint: Optional[Tuple[int, int, Any]] = None
+        self.built_at = 0.0
+        self.checked_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        if self.precision == PRECISION_INT8:
+            return quantize_int8(vectors, self.scale)
+        if self.precision == PRECISION_BINARY:
+            return quantize_binary(vectors)
+        return vectors.astype(np.float32)
+
+    def build(self, ids: np.ndarray, vectors: np.ndarray):
+        """Replace the index contents (vectors are normalized here)"""
+        vectors = normalize_rows(vectors)
+        if self.precision == PRECISION_INT8:
+            self.scale = int8_scale(vectors) if len(vectors) else None
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.codes = self._encode(vectors) if len(vectors) else None
+        self.built_at = time.time()
+
+    def append(self, ids: np.ndarray, vectors: np.ndarray):
+        """Add vectors (int8 keeps the build-time scale; outliers are clipped)"""
+        if self.codes is None:
+            self.build(ids, vectors)
+            return
+        codes = self._encode(normalize_rows(vectors))
+        self.ids = np.concatenate([self.ids, np.asarray(ids, dtype=np.int64)])
+        self.codes = np.concatenate([self.codes, codes])
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """Approximate similarity of every indexed vector to the query (higher is closer)"""
+        query = normalize_rows(query)
+        if self.precision == PRECISION_BINARY:
+            return -hamming_distances(self.codes, quantize_binary(query)[0]).astype(np.float32)
+        if self.precision == PRECISION_INT8:
+            # einsum casts in small buffers instead of materializing a float copy of the codes
+            scaled_query = (query * self.scale).astype(np.float32)
+            return np.einsum('ij,j->i', self.codes, scaled_query, dtype=np.float32, casting='unsafe')
+        return self.codes @ query
+
+    def candidates(self, query: np.ndarray, n: int) -> np.ndarray:
+        """Ids of the n best-scoring vectors"""
+        if self.codes is None or n <= 0:
+            return np.zeros(0, dtype=np.int64)
+        scores = self.scores(query)
+        if n >= len(scores):
+            return self.ids
+        return self.ids[np.argpartition(-scores, n - 1)[:n]]
+
+    def memory_bytes(self) -> int:
+        total = self.ids.nbytes
+        if self.codes is not None:
+            total += self.codes.nbytes
+        if self.scale is not None:
+            total += self.scale.nbytes
+        return total
+
+
+class VectorIndexManager:
+    """
+    Keeps one QuantizedIndex per precision and embedding version in sync with the
+    embeddings table
+
+    Every refresh_seconds the fingerprint of the version's rows (row count, newest id,
+    newest update) is checked: new rows are appended, anything else (deletes,
+    updates, a re-embedding cutover) rebuilds. Only rows with binary storage are indexed.
+    """
+
+    def __init__(self, refresh_seconds: int = 60, batch_size: int = 2000):
+        self.refresh_seconds = refresh_seconds
+        self.batch_size = batch_size
+        self._indexes: Dict[Tuple[str, str], QuantizedIndex] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    async def get(self, precision: str, version_key: str) -> QuantizedIndex:
+        key = (precision, version_key)
+        index = self._indexes.get(key)
+        if index is not None and time.time() - index.checked_at < self.refresh_seconds:
+            return index
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            index = self._indexes.get(key) or QuantizedIndex(precision, version_key)
+            if time.time() - index.checked_at >= self.refresh_seconds:
+                await asyncio.to_thread(self._sync, index)
+                self._indexes[key] = index
+            return index
+
+    @staticmethod
+    def _rows(db, *columns, version_key: str):
+        return db.query(*columns).filter(
+            TextEmbedding.embedding_blob.isnot(None),
+            version_filter(version_key)
+        )
+
+    def _fingerprint(self, db, version_key: str) -> Tuple[int, int, Any]:
+        count, max_id, last_update = self._rows(
+            db,
+            func.count(TextEmbedding.id),
+            func.max(TextEmbedding.id),
+            func.max(TextEmbedding.updated_at),
+            version_key=version_key
+        ).one()
+        return count or 0, max_id or 0, last_update
+
+    def _load(self, db, version_key: str, after_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        ids, vectors = [], []
+        last_id = after_id
+        while True:
+            rows = self._rows(
+                db, TextEmbedding.id, TextEmbedding.embedding_blob, version_key=version_key
+            ).filter(TextEmbedding.id > last_id).order_by(TextEmbedding.id).limit(self.batch_size).all()
+            if not rows:
+                break
+            for doc_id, vector in rows:
+                ids.append(doc_id)
+                vectors.append(vector)
+            last_id = rows[-1][0]
+
+        if not ids:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, 0), dtype=np.float32)
+        return np.asarray(ids, dtype=np.int64), np.vstack(vectors).astype(np.float32)
+
+    def _sync(self, index: QuantizedIndex):
+        db = SessionLocal()
+        try:
+            fingerprint = self._fingerprint(db, index.version_key)
+            previous = index.fingerprint
+            index.checked_at = time.time()
+            if fingerprint == previous:
+                return
+
+            started = time.perf_counter()
+            appendable = (
+                previous is not None
+                and fingerprint[2] == previous[2]
+                and fingerprint[1] > previous[1]
+                and fingerprint[0] - previous[0] > 0
+            )
+            if appendable:
+                ids, vectors = self._load(db, index.version_key, after_id=previous[1])
+                index.append(ids, vectors)
+            else:
+                ids, vectors = self._load(db, index.version_key, after_id=0)
+                index.build(ids, vectors)
+
+            if len(index) != fingerprint[0]:
+                # Rows were deleted or filled in behind the newest id; start over
+                index.build(*self._load(db, index.version_key, after_id=0))
+
+            index.fingerprint = fingerprint
+            logger.info(
+                f"{'Extended' if appendable else 'Built'} {index.precision} vector index for {index.version_key}: "
+                f"{len(index)} vectors, {index.memory_bytes() / 1e6:.1f}MB, "
+                f"{(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            f"{precision}:{version_key}": {
+                "vectors": len(index),
+                "memory_bytes": index.memory_bytes(),
+                "bytes_per_vector": round(index.memory_bytes() / len(index), 1) if len(index) else 0,
+                "built_at": index.built_at
+            }
+            for (precision, version_key), index in self._indexes.items()
+        }
+
+
+# Global index manager
+vector_index_manager = VectorIndexManager(refresh_seconds=settings.VECTOR_INDEX_REFRESH_SECONDS)
@@ -0,0 +1,204 @@
+"""
+Startup warm-up
+Does right after startup what a new replica would otherwise do on its first requests:
+open database connections, configure the mappers, load the tokenizer, build the agents
+and graphs, and optionally prime the in-memory caches. /ready reports ready once it
+has finished, so a scaled-out pod only receives traffic when it is warm
+"""
+
+import asyncio
+import gc
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_READY = "ready"
+
+
+def _names(value: str) -> List[str]:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+class StartupWarmup:
+    """
+    Runs the warm-up steps in order, each timed and reported
+
+    A failing step is logged and reported but does not hold back readiness: the replica
+    then serves as it would have without warm-up, paying that cost on first use.
+    """
+
+    def __init__(self):
+        self.status = STATUS_PENDING
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.duration_ms: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == STATUS_READY
+
+    def start(self, app=None):
+        """Run the warm-up in the background of the running loop (startup and /health are not held up)"""
+        self._task = asyncio.get_running_loop().create_task(self.run(app))
+
+    def skip(self):
+        """Report ready without warming up (WARMUP_ENABLED=false)"""
+        self.status = STATUS_READY
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run(self, app=None):
+        self.status = STATUS_RUNNING
+        self.started_at = datetime.utcnow().isoformat()
+        started = time.perf_counter()
+
+        # Synchronous steps run in a worker thread so the loop keeps answering /health and /ready
+        await self._step("db_connections", lambda: asyncio.to_thread(self.open_db_connections))
+        await self._step("mappers", lambda: asyncio.to_thread(self.configure_mappers))
+        await self._step("encodings", lambda: asyncio.to_thread(self.load_encodings))
+        await self._step("graphs", lambda: asyncio.to_thread(self.build_graphs))
+        if settings.WARMUP_PRIME_CACHES:
+            await self._step("caches", lambda: self.prime_caches(app))
+        await self._step("gc", self.freeze_heap)
+
+        self.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        self.finished_at = datetime.utcnow().isoformat()
+        self.status = STATUS_READY
+        failed = [name for name, step in self.steps.items() if step["status"] == "error"]
+        logger.info(
+            f"Warm-up finished in {self.duration_ms:.0f}ms"
+            + (f" ({', '.join(failed)} failed)" if failed else "")
+        )
+
+    async def _step(self, name: str, step: Callable[[], Any]):
+        started = time.perf_counter()
+        try:
+            details = await step()
+            self.steps[name] = {"status": "ok", **(details or {})}
+        except Exception as e:
+            logger.warning(f"Warm-up step {name} failed: {str(e)}")
+            self.steps[name] = {"status": "error", "error": str(e)}
+        self.steps[name]["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    def open_db_connections(self) -> Dict[str, Any]:
+        """Fill the connection pool, so the first requests do not each pay a connect"""
+        from app.db.session import engine
+
+        # Connections beyond the pool size would be discarded when returned
+        size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+        count = max(0, min(settings.WARMUP_DB_CONNECTIONS, size))
+        connections = []
+        try:
+            for _ in range(count):
+                connection = engine.connect()
+                connections.append(connection)
+                connection.exec_driver_sql("SELECT 1")
+        finally:
+            for connection in connections:
+                connection.close()
+        return {"connections": len(connections)}
+
+    def configure_mappers(self) -> Dict[str, Any]:
+        import app.models  # noqa: F401  (registers every mapper)
+        from sqlalchemy.orm import configure_mappers
+
+        from app.db.base_class import Base
+
+        configure_mappers()
+        return {"mappers": len(Base.registry.mappers)}
+
+    def load_encodings(self) -> Dict[str, Any]:
+        """Load the tokenizer and the chunker's per-encoding tables"""
+        from app.services.text_chunker import TokenChunker, load_encoding
+
+        names = _names(settings.WARMUP_ENCODINGS)
+        for name in names:
+            TokenChunker(chunk_size=64, overlap=0, encoding=load_encoding(name)).chunk("Warm-up. Done.")
+        return {"encodings": names}
+
+    def build_graphs(self) -> Dict[str, Any]:
+        """Build the shared extraction agents and compile the configured LangGraph graphs"""
+        from app.utils.langraph.global_insights_agent import get_global_insights_agent
+        from app.utils.langraph.insight_agent import get_insight_agent
+        from app.utils.langraph.network_agent import get_network_agent
+        from app.utils.langraph.pillar_fanout_agent import get_pillar_agent
+
+        for use_expanded_schema in (True, False):
+            get_insight_agent(use_expanded_schema).get_system_prompt()
+        get_network_agent().get_system_prompt()
+        get_pillar_agent()
+        get_global_insights_agent()
+        details: Dict[str, Any] = {"agents": ["insight", "network", "pillar", "global_insights"]}
+
+        graph_names = _names(settings.WARMUP_GRAPHS)
+        if graph_names:
+            from app.utils.LangGraph.service import LangGraphService
+
+            service = LangGraphService()
+            if graph_names == ["*"]:
+                graph_names = list(service.list_graphs())
+            errors = service.preload(graph_names)
+            details["graphs"] = [name for name in graph_names if name not in errors]
+            if errors:
+                raise RuntimeError(f"graphs failed to compile: {errors}")
+        return details
+
+    async def prime_caches(self, app=None) -> Dict[str, Any]:
+        """Load the quantized vector index and fill the response cache of WARMUP_PRIME_PATHS"""
+        details: Dict[str, Any] = {}
+
+        from app.services.vector_index import PRECISION_EXACT
+
+        if settings.VECTOR_SEARCH_PRECISION != PRECISION_EXACT:
+            from app.services.embedding_versions import embedding_version_registry
+            from app.services.vector_index import vector_index_manager
+
+            version = await asyncio.to_thread(embedding_version_registry.active)
+            index = await vector_index_manager.get(settings.VECTOR_SEARCH_PRECISION, version.key)
+            details["vector_index"] = len(index)
+
+        paths = _names(settings.WARMUP_PRIME_PATHS)
+        if app is not None and paths:
+            import httpx
+
+            # Requests go through the app in-process, so the responses land in the response cache
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+                details["paths"] = {path: (await client.get(path)).status_code for path in paths}
+        return details
+
+    async def freeze_heap(self) -> Dict[str, Any]:
+        """Collect once and move what is left out of the collector's reach"""
+        # Warm-up leaves a few hundred thousand long-lived objects (agents, schemas, tokenizer);
+        # unfrozen, every full collection rescans them and the first requests pay ~100ms pauses
+        collected = gc.collect()
+        gc.freeze()
+        return {"collected": collected, "frozen": gc.get_freeze_count()}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_ms": self.duration_ms,
+            "steps": self.steps
+        }
+
+
+# Global warm-up state, started by the application's startup event
+startup_warmup = StartupWarmup()
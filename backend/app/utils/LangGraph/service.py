@@ -7,7 +7,7 @@ from pathlib import Path
 from types import ModuleType
 from typing import Any, Dict, Generator, Iterable
 
-from langgraph.graph import CompiledGraph
+from langgraph.graph.graph import CompiledGraph
 
 from app.utils.LangGraph.models import GraphInput, GraphOutput, StreamEvent
 from app.utils.LangGraph.utils.logging_config import setup_logging
@@ -60,6 +60,17 @@ class LangGraphService:
             )
         return graph
 
+    def preload(self, graph_names: Iterable[str]) -> Dict[str, str]:
+        """Carga (y compila) los grafos indicados por adelantado; devuelve el error de cada grafo que falle."""
+        errors: Dict[str, str] = {}
+        for graph_name in graph_names:
+            try:
+                self._load_graph(graph_name)
+            except Exception as exc:
+                logger.warning("No se pudo precargar el grafo '%s': %s", graph_name, exc)
+                errors[graph_name] = str(exc)
+        return errors
+
     def run(self, graph_name: str, payload: GraphInput) -> GraphOutput:
         """Ejecuta un grafo de manera síncrona y devuelve el estado final."""
         graph = self._load_graph(graph_name)
@@ -113,7 +124,8 @@ class LangGraphService:
 
     def list_graphs(self) -> Iterable[str]:
         """Enumera los grafos disponibles dentro del paquete configurado."""
-        package_path = Path(importlib.import_module(f"{self.root_package}.graphs").__file__).parent
+        # El paquete de grafos no tiene __init__.py (paquete de espacio de nombres): se usa __path__
+        package_path = Path(next(iter(importlib.import_module(f"{self.root_package}.graphs").__path__)))
         return (
             module.stem
             for module in package_path.glob("*.py")
@@ -3,14 +3,16 @@ Global Insights Aggregation Task
 Processes pillar analysis and updates global insights database
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 from datetime import datetime
 from sqlalchemy.orm import Session
 
 from app.models.global_insight import GlobalInsight
 from app.schemas.global_insights import NewInsightInput, Citation
-from app.utils.langraph.global_insights_agent import create_global_insights_agent
+from app.utils.langraph.global_insights_agent import get_global_insights_agent
+from app.services.job_events import JobPhase
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +30,8 @@ async def process_global_insights_aggregation(
     job_id: int,
     pillar_analysis: dict,
     doc_metadata: dict,
-    db: Session
+    db: Session,
+    progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
 ):
     """
     Process pillar analysis and aggregate insights into GlobalInsight table
@@ -38,22 +41,30 @@ async def process_global_insights_aggregation(
         pillar_analysis: The pillar_analysis dict from the extraction result
         doc_metadata: Document metadata (title, date, uploader, etc.)
         db: Database session
+        progress_callback: Optional callable(phase, data) notified before each pillar
     """
 
     if not pillar_analysis:
         logger.info(f"No pillar analysis found for job {job_id}, skipping aggregation")
         return
 
-    agent = create_global_insights_agent()
+    agent = get_global_insights_agent()
 
-    # Process each pillar
-    for pillar_key, pillar_data in pillar_analysis.items():
-        if not isinstance(pillar_data, dict):
-            continue
+    pillar_items = [(key, data) for key, data in pillar_analysis.items() if isinstance(data, dict)]
 
+    # Process each pillar
+    for pillar_index, (pillar_key, pillar_data) in enumerate(pillar_items, 1):
         # Normalize pillar name to canonical form
         normalized_pillar = PILLAR_NORMALIZATION_MAP.get(pillar_key, pillar_key)
 
+        if progress_callback:
+            progress_callback(JobPhase.AGGREGATING, {
+                "pillar": pillar_key,
+                "normalized_pillar": normalized_pillar,
+                "pillar_index": pillar_index,
+                "pillar_total": len(pillar_items)
+            })
+
         logger.debug(f"Processing pillar: {pillar_key} -> {normalized_pillar}")
 
         # Process problems (now with evidence structure)
@@ -174,80 +185,91 @@ async def process_single_insight(
             stakeholder=doc_metadata.get("stakeholder")
         )
 
-        # Get existing insights for this pillar and type
-        existing_insights = db.query(GlobalInsight).filter(
-            GlobalInsight.pillar == pillar,
-            GlobalInsight.type == insight_type
-        ).all()
-
-        # Convert to dicts
-        existing_dicts = [insight.to_dict() for insight in existing_insights]
+        # The session is only used from worker threads, one call at a time, so the
+        # queries and commits never block the job loop
+        existing_dicts = await asyncio.to_thread(_load_existing_insights, db, pillar, insight_type)
 
         # Find matching insight
-        match_result = agent.find_matching_insight(
+        # The comparisons call the model synchronously; keep them off the job loop
+        match_result = await asyncio.to_thread(
+            agent.find_matching_insight,
             new_insight=new_insight,
             existing_insights=existing_dicts,
             similarity_threshold=0.7
         )
 
-        if match_result:
-            # Update existing insight
-            existing_insight_dict = match_result["insight"]
-            decision = match_result["decision"]
+        await asyncio.to_thread(_save_insight, db, agent, new_insight, match_result)
 
-            logger.info(
-                f"Merging insight into existing ID {existing_insight_dict['id']}: "
-                f"{decision.reasoning} (confidence: {decision.confidence})"
-            )
+    except Exception as e:
+        logger.error(f"Error processing insight '{insight_text[:50]}...': {str(e)}")
+        await asyncio.to_thread(db.rollback)
+        # Continue processing other insights
 
-            # Get the database record
-            db_insight = db.query(GlobalInsight).filter(
-                GlobalInsight.id == int(existing_insight_dict['id'])
-            ).first()
-
-            if db_insight:
-                # Merge the insight
-                updated_data = agent.merge_insight(
-                    existing_insight=existing_insight_dict,
-                    new_insight=new_insight,
-                    decision=decision
-                )
 
-                # Update database record
-                db_insight.canonical_text = updated_data["canonical_text"]
-                db_insight.count = updated_data["count"]
-                db_insight.weighted_count = updated_data["weighted_count"]
-                db_insight.last_seen = datetime.fromisoformat(updated_data["last_seen"].replace("Z", "+00:00"))
-                db_insight.aliases = updated_data["aliases"]
-                db_insight.aliases_count = updated_data["aliases_count"]
-                db_insight.supporting_docs = updated_data["supporting_docs"]
-                db_insight.breakdowns = updated_data["breakdowns"]
+def _load_existing_insights(db: Session, pillar: str, insight_type: str) -> list:
+    """Existing insights of this pillar and type, as dicts"""
+    existing_insights = db.query(GlobalInsight).filter(
+        GlobalInsight.pillar == pillar,
+        GlobalInsight.type == insight_type
+    ).all()
+    return [insight.to_dict() for insight in existing_insights]
 
-                db.commit()
 
-        else:
-            # Create new insight
-            logger.info(f"Creating new global insight: {insight_text[:50]}...")
-
-            new_insight_data = agent.create_new_insight(new_insight)
-
-            db_insight = GlobalInsight(
-                canonical_text=new_insight_data["canonical_text"],
-                type=new_insight_data["type"],
-                pillar=new_insight_data["pillar"],
-                count=new_insight_data["count"],
-                weighted_count=new_insight_data["weighted_count"],
-                last_seen=datetime.fromisoformat(new_insight_data["last_seen"].replace("Z", "+00:00")),
-                aliases=new_insight_data["aliases"],
-                aliases_count=new_insight_data["aliases_count"],
-                supporting_docs=new_insight_data["supporting_docs"],
-                breakdowns=new_insight_data["breakdowns"]
+def _save_insight(db: Session, agent, new_insight: NewInsightInput, match_result: Optional[dict]):
+    """Merge the insight into its match, or store it as a new global insight"""
+    if match_result:
+        # Update existing insight
+        existing_insight_dict = match_result["insight"]
+        decision = match_result["decision"]
+
+        logger.info(
+            f"Merging insight into existing ID {existing_insight_dict['id']}: "
+            f"{decision.reasoning} (confidence: {decision.confidence})"
+        )
+
+        # Get the database record
+        db_insight = db.query(GlobalInsight).filter(
+            GlobalInsight.id == int(existing_insight_dict['id'])
+        ).first()
+
+        if db_insight:
+            # Merge the insight
+            updated_data = agent.merge_insight(
+                existing_insight=existing_insight_dict,
+                new_insight=new_insight,
+                decision=decision
             )
 
-            db.add(db_insight)
+            # Update database record
+            db_insight.canonical_text = updated_data["canonical_text"]
+            db_insight.count = updated_data["count"]
+            db_insight.weighted_count = updated_data["weighted_count"]
+            db_insight.last_seen = datetime.fromisoformat(updated_data["last_seen"].replace("Z", "+00:00"))
+            db_insight.aliases = updated_data["aliases"]
+            db_insight.aliases_count = updated_data["aliases_count"]
+            db_insight.supporting_docs = updated_data["supporting_docs"]
+            db_insight.breakdowns = updated_data["breakdowns"]
+
             db.commit()
 
-    except Exception as e:
-        logger.error(f"Error processing insight '{insight_text[:50]}...': {str(e)}")
-        db.rollback()
-        # Continue processing other insights
+    else:
+        # Create new insight
+        logger.info(f"Creating new global insight: {new_insight.text[:50]}...")
+
+        new_insight_data = agent.create_new_insight(new_insight)
+
+        db_insight = GlobalInsight(
+            canonical_text=new_insight_data["canonical_text"],
+            type=new_insight_data["type"],
+            pillar=new_insight_data["pillar"],
+            count=new_insight_data["count"],
+            weighted_count=new_insight_data["weighted_count"],
+            last_seen=datetime.fromisoformat(new_insight_data["last_seen"].replace("Z", "+00:00")),
+            aliases=new_insight_data["aliases"],
+            aliases_count=new_insight_data["aliases_count"],
+            supporting_docs=new_insight_data["supporting_docs"],
+            breakdowns=new_insight_data["breakdowns"]
+        )
+
+        db.add(db_insight)
+        db.commit()
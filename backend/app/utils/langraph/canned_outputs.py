@@ -0,0 +1,248 @@
+"""
+Canned structured outputs for the local model provider
+Deterministic, schema-valid completions templated from the analyzed text: sentences
+become verbatim quotes, capitalized names become actors/stakeholders and keyword
+lists assign pillars, so downstream merging, deduplication and storage see
+realistic shapes
+"""
+
+import json
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from app.schemas.global_insights import ComparisonDecision
+from app.schemas.insights import ExtractedInsightSchema, ExtractedInsightSchemaExpanded, YSIPillarAnalysis
+from app.schemas.networks import NetworkAnalysisSchema
+from app.utils.langraph.model_router import lexical_similarity
+from app.utils.langraph.structured_output import YSI_PILLAR_KEYS
+
+PILLAR_KEYWORDS = {
+    "access_to_capital": ("fund", "funding", "capital", "grant", "investor", "investment", "finance", "loan", "money"),
+    "ecosystem_support": ("ecosystem", "network", "program", "mentor", "partner", "infrastructure", "support", "incubator"),
+    "mental_health": ("burnout", "stress", "wellbeing", "mental", "health", "isolation", "anxiety", "pressure"),
+    "recognition": ("recognition", "visibility", "award", "legitimacy", "policy", "showcase", "credibility"),
+}
+
+_PROBLEM_MARKERS = ("lack", "struggle", "barrier", "difficult", "challenge", "problem", "cannot", "can't", "hard", "limited")
+_PROPOSAL_MARKERS = ("should", "need", "propose", "recommend", "could", "must", "create", "launch", "build", "establish")
+_OPPORTUNITY_MARKERS = ("opportunit", "potential", "promising", "growth", "success")
+_POSITIVE = ("success", "opportunit", "progress", "growth", "promising", "excited", "improve", "achieve")
+_NEGATIVE = ("lack", "struggle", "barrier", "fail", "burnout", "difficult", "problem", "stress", "cannot")
+
+_STOPWORDS = {
+    "about", "after", "also", "because", "been", "being", "could", "from", "have", "into", "more", "most",
+    "need", "other", "should", "some", "such", "than", "that", "their", "them", "there", "these", "they",
+    "this", "those", "very", "were", "what", "when", "where", "which", "while", "will", "with", "would", "your"
+}
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_WORD_RE = re.compile(r"[a-z][a-z'-]+")
+_NAME_RE = re.compile(r"\b[A-Z][a-zA-Z]+(?:\s+(?:of|for|the|de|[A-Z][a-zA-Z]+))*\s+[A-Z][a-zA-Z]+\b")
+_TEXT_RE = re.compile(
+    r"TEXT TO ANALYZE:\n(.*?)(?:\n\nPILLAR TO ANALYZE:|\n\nProvide |\n\nFocus ONLY|\Z)", re.DOTALL
+)
+_PILLAR_RE = re.compile(r"PILLAR TO ANALYZE:\s*(\w+)")
+_COMPARISON_RE = re.compile(r'EXISTING \w+: "(.*?)"\s*\n\s*NEW \w+: "(.*?)"', re.DOTALL)
+
+
+def _clip_words(text: str, max_words: int, max_chars: int) -> str:
+    words = text.split()
+    return " ".join(words[:max_words])[:max_chars].strip()
+
+
+def _has(text: str, markers) -> bool:
+    lowered = text.lower()
+    return any(marker in lowered for marker in markers)
+
+
+def _sentences(text: str) -> List[str]:
+    """Sentences of at least five words, clipped to 50 words (quotes stay verbatim prefixes)"""
+    return [
+        _clip_words(sentence, 50, 300)
+        for sentence in _SENTENCE_RE.split(" ".join(text.split()))
+        if len(sentence.split()) >= 5
+    ]
+
+
+def _keywords(text: str, count: int) -> List[str]:
+    words = [w for w in _WORD_RE.findall(text.lower()) if len(w) > 3 and w not in _STOPWORDS]
+    return [word for word, _ in Counter(words).most_common(count)]
+
+
+def _names(text: str, count: int) -> List[str]:
+    names = []
+    for match in _NAME_RE.findall(text):
+        if match not in names and 2 <= len(match) <= 100:
+            names.append(match)
+    return names[:count]
+
+
+def _pillar_of(text: str) -> Optional[str]:
+    lowered = text.lower()
+    scores = {pillar: sum(lowered.count(k) for k in keywords) for pillar, keywords in PILLAR_KEYWORDS.items()}
+    best = max(scores, key=scores.get)
+    return best if scores[best] else None
+
+
+def _evidence(sentence: str) -> Dict[str, Any]:
+    return {
+        "insight_text": _clip_words(sentence, 40, 300).ljust(10, "."),
+        "supporting_quotes": [sentence],
+        "context": ""
+    }
+
+
+def _pillar_analysis(sentences: List[str], pillar: str) -> Dict[str, List[Dict[str, Any]]]:
+    relevant = [s for s in sentences if _pillar_of(s) == pillar]
+    proposals = [s for s in relevant if _has(s, _PROPOSAL_MARKERS)]
+    problems = [s for s in relevant if s not in proposals]
+    return {
+        "problems": [_evidence(s) for s in problems[:3]],
+        "proposals": [_evidence(s) for s in proposals[:3]]
+    }
+
+
+def insight_output(text: str, expanded: bool = True) -> Dict[str, Any]:
+    sentences = _sentences(text)
+    keywords = _keywords(_NAME_RE.sub(" ", text), 8)
+    positive = sum(_has(s, _POSITIVE) for s in sentences)
+    negative = sum(_has(s, _NEGATIVE) for s in sentences)
+
+    output = {
+        "main_theme": " ".join(keywords[:3]).title() or "General discussion",
+        "subthemes": [k.title() for k in keywords[3:8]],
+        "key_actors": _names(text, 15),
+        "general_perception": "positive" if positive > negative else "negative" if negative > positive else "neutral",
+        "proposed_actions": [_clip_words(s, 40, 300) for s in sentences if _has(s, _PROPOSAL_MARKERS)][:10],
+        "challenges": [_clip_words(s, 40, 300) for s in sentences if _has(s, _PROBLEM_MARKERS)][:10],
+        "opportunities": [_clip_words(s, 40, 300) for s in sentences if _has(s, _OPPORTUNITY_MARKERS)][:10]
+    }
+    if expanded:
+        output["pillar_analysis"] = {pillar: _pillar_analysis(sentences, pillar) for pillar in YSI_PILLAR_KEYS}
+    return output
+
+
+def _stakeholder_type(name: str) -> str:
+    lowered = name.lower()
+    if _has(lowered, ("fund", "bank", "capital", "ventures", "foundation")):
+        return "funder"
+    if _has(lowered, ("ministry", "government", "council", "parliament")):
+        return "policymaker"
+    if _has(lowered, ("university", "institute", "lab", "research")):
+        return "researcher"
+    if _has(lowered, ("forum", "hub", "network", "organization", "association", "community")):
+        return "organization"
+    return "implementer"
+
+
+def _relationship_type(sentence: str) -> str:
+    for markers, kind in (
+        (("fund", "grant", "invest"), "funding"),
+        (("mentor", "coach"), "mentorship"),
+        (("partner",), "partnership"),
+        (("policy", "regulat"), "policy"),
+        (("advis",), "advisory"),
+    ):
+        if _has(sentence, markers):
+            return kind
+    return "collaboration"
+
+
+def network_output(text: str) -> Dict[str, Any]:
+    sentences = _sentences(text)
+    names = _names(text, 20)
+
+    stakeholders = []
+    for name in names:
+        mentions = [s for s in sentences if name in s]
+        stakeholders.append({
+            "name": name,
+            "type": _stakeholder_type(name),
+            "location": None,
+            "context": (mentions[0] if mentions else f"Mentioned in the text: {name}")[:200],
+            "mentioned_frequency": max(1, text.count(name))
+        })
+
+    relationships = []
+    degree: Counter = Counter()
+    for sentence in sentences:
+        present = [name for name in names if name in sentence]
+        for source, target in zip(present, present[1:]):
+            relationships.append({
+                "from_stakeholder": source,
+                "to_stakeholder": target,
+                "type": _relationship_type(sentence),
+                "strength": "strong" if text.count(source) > 2 and text.count(target) > 2 else "moderate",
+                "description": _clip_words(sentence, 25, 150),
+                "evidence": sentence[:300]
+            })
+            degree.update([source, target])
+    relationships = relationships[:25]
+
+    topic_networks = []
+    for rank, keyword in enumerate(_keywords(text, 5)):
+        connected = [name for name in names if any(name in s and keyword in s.lower() for s in sentences)]
+        topic_networks.append({
+            "topic": keyword.title(),
+            "connected_stakeholders": connected[:10],
+            "pillar_alignment": _pillar_of(keyword) or "general",
+            "centrality": "high" if rank == 0 else "medium" if rank < 3 else "low"
+        })
+
+    return {
+        "stakeholders": stakeholders,
+        "relationships": relationships,
+        "topic_networks": topic_networks,
+        "geographic_clusters": [],
+        "network_density": "sparse" if len(relationships) < 3 else "moderate" if len(relationships) < 8 else "dense",
+        "primary_connectors": [name for name, _ in degree.most_common(5)]
+    }
+
+
+def comparison_output(existing_text: str, new_text: str) -> Dict[str, Any]:
+    score = lexical_similarity(new_text, existing_text)
+    is_similar = score >= 0.5
+    return {
+        "is_similar": is_similar,
+        "confidence": round(min(0.95, 0.55 + abs(score - 0.5) * 0.8), 3),
+        "reasoning": f"Local provider: lexical similarity {score:.2f} is "
+                     f"{'above' if is_similar else 'below'} 0.50",
+        "suggested_canonical": max(new_text, existing_text, key=len) if is_similar else None
+    }
+
+
+def _analyzed_text(prompt: str) -> str:
+    match = _TEXT_RE.search(prompt)
+    return match.group(1).strip() if match else prompt
+
+
+def canned_output(schema: Optional[Type[BaseModel]], prompt: str) -> Tuple[str, Optional[BaseModel]]:
+    """
+    Completion for a prompt expected to produce schema (the last human message)
+
+    Returns:
+        (JSON text, validated model) - or plain text and None when there is no schema
+    """
+    if schema is None:
+        return f"Local provider response ({len(prompt)} characters received)", None
+
+    if schema is ExtractedInsightSchemaExpanded or schema is ExtractedInsightSchema:
+        output = insight_output(_analyzed_text(prompt), expanded=schema is ExtractedInsightSchemaExpanded)
+    elif schema is YSIPillarAnalysis:
+        match = _PILLAR_RE.search(prompt)
+        pillar = match.group(1) if match else YSI_PILLAR_KEYS[0]
+        output = _pillar_analysis(_sentences(_analyzed_text(prompt)), pillar)
+    elif schema is NetworkAnalysisSchema:
+        output = network_output(_analyzed_text(prompt))
+    elif schema is ComparisonDecision:
+        match = _COMPARISON_RE.search(prompt)
+        existing_text, new_text = match.groups() if match else (prompt, prompt)
+        output = comparison_output(existing_text, new_text)
+    else:
+        raise ValueError(f"No canned output for {schema.__name__}")
+
+    validated = schema.model_validate(output)
+    return json.dumps(validated.model_dump(mode="json")), validated
@@ -0,0 +1,144 @@
+"""
+Chat model factory for the LangGraph agents
+ChatOpenAI for LLM_PROVIDER=openai, or an offline LocalChatModel returning canned
+schema-valid completions (with the local provider's simulated latency and errors).
+Agents share models through get_chat_model, backed by the process-wide connection pools
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Type
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel
+
+from app.services.llm_http import llm_http_pool
+from app.services.llm_provider import estimate_tokens, local_provider, use_local_provider
+from app.utils.langraph.canned_outputs import canned_output
+
+
+class LocalChatModel(BaseChatModel):
+    """
+    Offline chat model answering with canned_output(response_schema, last human message)
+
+    Works with invoke/ainvoke/stream/astream and bind(response_format=...), which it
+    ignores. Streaming waits the simulated latency once (time to first token), then
+    emits the completion in chunk_size pieces with usage on the last chunk.
+    """
+
+    model_name: str = "local"
+    response_schema: Optional[Type[BaseModel]] = None
+    chunk_size: int = 48
+
+    @property
+    def _llm_type(self) -> str:
+        return "local"
+
+    def _respond(self, messages: List[BaseMessage]) -> Tuple[str, dict]:
+        prompt = next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), "")
+        content, _ = canned_output(self.response_schema, prompt if isinstance(prompt, str) else str(prompt))
+        input_tokens = sum(estimate_tokens(str(m.content)) for m in messages)
+        output_tokens = estimate_tokens(content)
+        usage = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens
+        }
+        return content, usage
+
+    def _chunks(self, content: str, usage: dict) -> Iterator[ChatGenerationChunk]:
+        for start in range(0, len(content), self.chunk_size):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=content[start:start + self.chunk_size]))
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=usage))
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        local_provider.call()
+        content, usage = self._respond(messages)
+        message = AIMessage(content=content, usage_metadata=usage, response_metadata={"model_name": self.model_name})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        await local_provider.acall()
+        content, usage = self._respond(messages)
+        message = AIMessage(content=content, usage_metadata=usage, response_metadata={"model_name": self.model_name})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        local_provider.call()
+        yield from self._chunks(*self._respond(messages))
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        await local_provider.acall()
+        for chunk in self._chunks(*self._respond(messages)):
+            yield chunk
+            # Let other coroutines run between chunks, as a network stream would
+            await asyncio.sleep(0)
+
+
+def create_chat_model(
+    model: str,
+    temperature: float = 0.1,
+    response_schema: Optional[Type[BaseModel]] = None,
+    stream_usage: bool = False
+) -> BaseChatModel:
+    """
+    Chat model for the configured provider
+
+    Args:
+        model: Model name
+        temperature: Sampling temperature (OpenAI only)
+        response_schema: Schema the callers parse the completion into (used by the local provider)
+        stream_usage: Report token usage on streamed completions
+    """
+    if use_local_provider():
+        return LocalChatModel(model_name=model, response_schema=response_schema)
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        stream_usage=stream_usage,
+        http_client=llm_http_pool.sync_client(),
+        http_async_client=llm_http_pool.async_client()
+    )
+
+
+_models_lock = threading.Lock()
+_models: Dict[tuple, BaseChatModel] = {}
+_loop_models: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, BaseChatModel]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_chat_model(
+    model: str,
+    temperature: float = 0.1,
+    response_schema: Optional[Type[BaseModel]] = None,
+    stream_usage: bool = False
+) -> BaseChatModel:
+    """
+    Shared chat model for the configured provider (same arguments as create_chat_model)
+
+    OpenAI models are kept per event loop, since their async client's connections
+    cannot move between loops; local models are shared by the whole process.
+    """
+    key = (model, temperature, response_schema, stream_usage)
+    try:
+        loop = None if use_local_provider() else asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    with _models_lock:
+        models = _models if loop is None else _loop_models.setdefault(loop, {})
+        chat_model = models.get(key)
+        if chat_model is None:
+            chat_model = models[key] = create_chat_model(model, temperature, response_schema, stream_usage)
+        return chat_model
@@ -5,13 +5,17 @@ Integrates with the job system for async processing
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 from datetime import datetime
 
 from app.utils.langraph.insight_agent import extract_insights_from_text
 from app.utils.langraph.network_agent import extract_network_from_text
+from app.utils.langraph.pillar_fanout_agent import extract_insights_fanout
+from app.core.config import settings
 from app.schemas.insights import ExtractedInsightSchema, ExtractedInsightSchemaExpanded
 from app.schemas.networks import NetworkAnalysisSchema
+from app.services.job_events import JobPhase
+from app.utils.langraph.llm_usage import collect_llm_usage
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -64,11 +68,43 @@ class InsightExtractionTask:
 
         return result
 
+    async def _run_with_progress(
+        self,
+        coro,
+        ready_phase: str,
+        serialize: Callable[[Any], Dict[str, Any]],
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ):
+        """Await an agent call and report its partial result as soon as it is available"""
+        result = await coro
+        if progress_callback:
+            try:
+                progress_callback(ready_phase, serialize(result))
+            except Exception as e:
+                logger.warning(f"Progress callback failed for {ready_phase}: {str(e)}")
+        return result
+
+    def _item_reporter(
+        self,
+        phase: str,
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Optional[Callable[[tuple, Any], None]]:
+        """Turn sub-objects completed while streaming into progress events"""
+        if not progress_callback:
+            return None
+
+        def report(path: tuple, value: Any):
+            progress_callback(phase, {"path": list(path), "item": value})
+
+        return report
+
     async def process_text(
         self,
         text: str,
         context: str = "",
-        job_id: Optional[int] = None
+        job_id: Optional[int] = None,
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        extraction_mode: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Process text and extract insights
@@ -77,33 +113,68 @@ class InsightExtractionTask:
             text: The text to analyze
             context: Additional context about the text
             job_id: Optional job ID for logging/tracking
+            progress_callback: Optional callable(phase, data) notified of phase changes and partial results
+            extraction_mode: "single" (one expanded call) or "fanout" (core + one call per pillar);
+                defaults to settings.EXTRACTION_MODE
 
         Returns:
             Dict containing the extracted insights and metadata
         """
         start_time = datetime.now()
+        extraction_mode = extraction_mode or settings.EXTRACTION_MODE
 
         try:
-            logger.info(f"Starting parallel analysis (insights + network) for job {job_id}")
+            logger.info(f"Starting parallel analysis (insights + network, {extraction_mode} mode) for job {job_id}")
+
+            if progress_callback:
+                progress_callback(JobPhase.EXTRACTING_INSIGHTS, {})
+                progress_callback(JobPhase.EXTRACTING_NETWORK, {})
+
+            # Fan-out mode splits the expanded extraction into a core call plus one call per pillar
+            insight_item_reporter = self._item_reporter(JobPhase.PARTIAL_INSIGHT, progress_callback)
+            if extraction_mode == "fanout":
+                insights_call = extract_insights_fanout(
+                    text=text,
+                    context=context,
+                    on_item=insight_item_reporter
+                )
+            else:
+                insights_call = extract_insights_from_text(
+                    text=text,
+                    context=context,
+                    use_expanded=True,
+                    on_item=insight_item_reporter
+                )
 
             # Execute both agents in parallel for faster processing
-            insights_task = extract_insights_from_text(
-                text=text,
-                context=context,
-                use_expanded=True
+            insights_task = self._run_with_progress(
+                insights_call,
+                JobPhase.INSIGHTS_READY,
+                lambda insights: {
+                    "structured_insights": insights.model_dump(),
+                    "ysi_pillar_analysis": self._convert_pillar_analysis_to_dict(insights.pillar_analysis) if hasattr(insights, 'pillar_analysis') else {}
+                },
+                progress_callback
             )
 
-            network_task = extract_network_from_text(
-                text=text,
-                context=context
+            network_task = self._run_with_progress(
+                extract_network_from_text(
+                    text=text,
+                    context=context,
+                    on_item=self._item_reporter(JobPhase.PARTIAL_NETWORK, progress_callback)
+                ),
+                JobPhase.NETWORK_READY,
+                lambda network: {"network_analysis": network.model_dump()},
+                progress_callback
             )
 
-            # Wait for both analyses to complete
-            insights, network_analysis = await asyncio.gather(
-                insights_task,
-                network_task,
-                return_exceptions=True
-            )
+            # Wait for both analyses to complete (tokens and latency are collected per job)
+            with collect_llm_usage() as llm_usage:
+                insights, network_analysis = await asyncio.gather(
+                    insights_task,
+                    network_task,
+                    return_exceptions=True
+                )
 
             # Handle potential errors from parallel execution
             if isinstance(insights, Exception):
@@ -142,7 +213,10 @@ class InsightExtractionTask:
                 "processing_timestamp": end_time.isoformat(),
                 "processing_time_seconds": processing_time,
                 "model_used": "gpt-4o-mini",
+                "extraction_mode": extraction_mode,
                 "confidence_score": 0.95,
+                # Prompt/completion/cached tokens and latency of the LLM calls
+                "llm_usage": llm_usage.summary(),
                 # Enhanced YSI pillar analysis - convert Pydantic objects to dicts
                 "ysi_pillar_analysis": self._convert_pillar_analysis_to_dict(insights.pillar_analysis) if hasattr(insights, 'pillar_analysis') else {},
                 # Network analysis from specialized agent
@@ -185,14 +259,15 @@ class InsightExtractionTask:
         self,
         text: str,
         context: str = "",
-        job_id: Optional[int] = None
+        job_id: Optional[int] = None,
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """
         Process text with fallback to simple analysis if LangGraph fails
         """
         try:
             # Try the full LangGraph processing
-            return await self.process_text(text, context, job_id)
+            return await self.process_text(text, context, job_id, progress_callback)
 
         except Exception as e:
             logger.warning(f"LangGraph processing failed for job {job_id}, using fallback: {str(e)}")
@@ -280,7 +355,8 @@ async def extract_insights_task(
     text: str,
     context: str = "",
     job_id: Optional[int] = None,
-    use_fallback: bool = True
+    use_fallback: bool = True,
+    progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
 ) -> Dict[str, Any]:
     """
     High-level function to extract insights using the task system
@@ -290,6 +366,7 @@ async def extract_insights_task(
         context: Additional context
         job_id: Job ID for tracking
         use_fallback: Whether to use fallback if LangGraph fails
+        progress_callback: Optional callable(phase, data) for progress events
 
     Returns:
         Dict with extracted insights
@@ -302,6 +379,6 @@ async def extract_insights_task(
 
     # Process with or without fallback
     if use_fallback:
-        return await task.process_with_fallback(text, context, job_id)
+        return await task.process_with_fallback(text, context, job_id, progress_callback)
     else:
-        return await task.process_text(text, context, job_id)
\ No newline at end of file
+        return await task.process_text(text, context, job_id, progress_callback)
\ No newline at end of file
@@ -3,13 +3,21 @@ Global Insights Aggregation Agent
 Uses LLM prompts with structured outputs to compare and aggregate insights
 """
 
-import os
+import time
 import logging
+from functools import lru_cache
 from typing import List, Optional
 from datetime import datetime
-from langchain_openai import ChatOpenAI
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.output_parsers import PydanticOutputParser
+from app.core.config import settings
+from app.utils.langraph.structured_output import json_schema_response_format
+from app.utils.langraph.llm_usage import record_llm_call
+from app.utils.langraph.chat_models import get_chat_model
+from app.utils.langraph.model_router import (
+    comparison_router, TIER_SMALL_MODEL, TIER_LARGE_MODEL, TIER_ERROR
+)
 from app.schemas.global_insights import (
     ComparisonDecision, NewInsightInput, DocEvidence, Citation,
     RegionBreakdown, YearBreakdown, StakeholderBreakdown, Breakdowns
@@ -24,46 +32,132 @@ class GlobalInsightsAggregationAgent:
     """
 
     def __init__(self):
-        self.model = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.1,
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
         self.parser = PydanticOutputParser(pydantic_object=ComparisonDecision)
+        self.router = comparison_router
 
-    def compare_insights(self, new_text: str, existing_text: str, insight_type: str) -> ComparisonDecision:
-        """
-        Use LLM to compare two insights and determine if they are semantically similar
+        # Native structured outputs: the schema travels as response_format instead of prompt text
+        self.structured_output_mode = settings.LLM_STRUCTURED_OUTPUT
+        if self.structured_output_mode == "json_schema":
+            self.response_format = json_schema_response_format(ComparisonDecision)
+        else:
+            self.response_format = None
 
-        Args:
-            new_text: The newly extracted insight text
-            existing_text: An existing canonical insight text
-            insight_type: 'problem' or 'proposal'
+        # The system prompt does not depend on the comparison, so every call shares a cacheable prefix
+        self.system_prompt = self.create_system_prompt()
 
-        Returns:
-            ComparisonDecision with similarity verdict
-        """
+    def _with_response_format(self, model: BaseChatModel):
+        if self.response_format is None:
+            return model
+        return model.bind(response_format=self.response_format)
+
+    @property
+    def llm(self):
+        """Small model for the ambiguous band (shared chat model of the running event loop)"""
+        return self._with_response_format(get_chat_model(
+            settings.LLM_SMALL_MODEL, temperature=0.1, response_schema=ComparisonDecision
+        ))
 
-        system_prompt = f"""You are an expert analyst comparing insights from Global Shapers community discussions.
+    @property
+    def large_llm(self):
+        """Large model used for escalated comparisons (only built once a decision escalates)"""
+        return self._with_response_format(get_chat_model(
+            settings.LLM_LARGE_MODEL, temperature=0.1, response_schema=ComparisonDecision
+        ))
 
-Your task is to determine if two {insight_type}s are semantically similar - meaning they refer to the SAME core issue or solution, even if worded differently.
+    def create_system_prompt(self) -> str:
+        """Create the static system prompt for insight comparison"""
+
+        system_prompt = """You are an expert analyst comparing insights from Global Shapers community discussions.
+
+Your task is to determine if two insights of the given type (problem or proposal) are semantically similar - meaning they refer to the SAME core issue or solution, even if worded differently.
 
 IMPORTANT GUIDELINES:
 1. Focus on the CORE MEANING, not exact wording
-2. Two {insight_type}s are similar if they describe the same fundamental concept
+2. Two insights are similar if they describe the same fundamental concept
 3. Minor wording differences, synonyms, or phrasing variations should be considered SIMILAR
 4. Only mark as DIFFERENT if they address truly distinct issues/solutions
 5. When similar, suggest the clearest, most comprehensive canonical text
 
-Examples of SIMILAR {insight_type}s:
+Examples of SIMILAR insights:
 - "Youth lack seed funding" vs "Young entrepreneurs cannot access early-stage capital"
 - "Grant applications too complex" vs "Application processes overwhelming for first-timers"
 
-Examples of DIFFERENT {insight_type}s:
+Examples of DIFFERENT insights:
 - "Lack of mentorship" vs "Insufficient funding" (different core issues)
-- "Create micro-grants" vs "Simplify application forms" (different solutions)
+- "Create micro-grants" vs "Simplify application forms" (different solutions)"""
 
-{self.parser.get_format_instructions()}"""
+        if self.structured_output_mode != "json_schema":
+            system_prompt += "\n\n" + self.parser.get_format_instructions()
+
+        return system_prompt
+
+    def compare_insights(
+        self,
+        new_text: str,
+        existing_text: str,
+        insight_type: str,
+        embedding_score: Optional[float] = None
+    ) -> ComparisonDecision:
+        """
+        Compare two insights and determine if they are semantically similar
+
+        Routed through three tiers: local heuristics settle clear-cut pairs without an
+        LLM call, the small model handles the rest and decisions below the escalation
+        confidence are re-asked to the large model.
+
+        Args:
+            new_text: The newly extracted insight text
+            existing_text: An existing canonical insight text
+            insight_type: 'problem' or 'proposal'
+            embedding_score: Optional precomputed embedding similarity of the pair
+
+        Returns:
+            ComparisonDecision with similarity verdict
+        """
+
+        route = self.router.route(new_text, existing_text, embedding_score)
+        if route.tier is not None:
+            self.router.record(route.tier)
+            score = min(1.0, max(0.0, route.score))
+            return ComparisonDecision(
+                is_similar=route.is_similar,
+                confidence=round(score if route.is_similar else 1.0 - score, 3),
+                reasoning=route.reasoning,
+                suggested_canonical=None
+            )
+
+        decision = self._llm_compare(self.llm, "global_insights", new_text, existing_text, insight_type)
+        tier = TIER_SMALL_MODEL
+
+        if decision is not None and self.router.should_escalate(decision.confidence):
+            escalated = self._llm_compare(
+                self.large_llm, "global_insights_large", new_text, existing_text, insight_type
+            )
+            if escalated is not None:
+                decision, tier = escalated, TIER_LARGE_MODEL
+
+        if decision is None:
+            self.router.record(TIER_ERROR)
+            # Fallback: assume not similar
+            return ComparisonDecision(
+                is_similar=False,
+                confidence=0.5,
+                reasoning="Error during comparison",
+                suggested_canonical=new_text
+            )
+
+        self.router.record(tier)
+        return decision
+
+    def _llm_compare(
+        self,
+        llm,
+        agent_name: str,
+        new_text: str,
+        existing_text: str,
+        insight_type: str
+    ) -> Optional[ComparisonDecision]:
+        """Ask one model tier for a comparison decision (None on failure)"""
 
         human_prompt = f"""Compare these two {insight_type}s:
 
@@ -74,23 +168,21 @@ NEW {insight_type.upper()}: "{new_text}"
 Are these semantically similar (same core meaning)?"""
 
         messages = [
-            SystemMessage(content=system_prompt),
+            SystemMessage(content=self.system_prompt),
             HumanMessage(content=human_prompt)
         ]
 
         try:
-            response = self.model.invoke(messages)
-            decision = self.parser.parse(response.content)
-            return decision
-        except Exception as e:
-            logger.error(f"Error comparing insights: {str(e)}")
-            # Fallback: assume not similar
-            return ComparisonDecision(
-                is_similar=False,
-                confidence=0.5,
-                reasoning=f"Error during comparison: {str(e)}",
-                suggested_canonical=new_text
+            started = time.perf_counter()
+            response = llm.invoke(messages)
+            record_llm_call(
+                agent_name, response.usage_metadata,
+                (time.perf_counter() - started) * 1000, self.structured_output_mode
             )
+            return self.parser.parse(response.content)
+        except Exception as e:
+            logger.error(f"Error comparing insights ({agent_name}): {str(e)}")
+            return None
 
     def find_matching_insight(
         self,
@@ -101,6 +193,9 @@ Are these semantically similar (same core meaning)?"""
         """
         Find if the new insight matches any existing insight
 
+        Candidates are scored with one batched embedding request and compared in
+        descending similarity order; pairs the heuristics rule out never reach a model.
+
         Args:
             new_insight: The new insight to match
             existing_insights: List of existing GlobalInsight records (as dicts)
@@ -113,12 +208,31 @@ Are these semantically similar (same core meaning)?"""
         best_match = None
         best_confidence = 0.0
 
-        for existing in existing_insights:
+        scores = None
+        if existing_insights:
+            scores = self.router.embedding_similarities(
+                new_insight.text, [existing["canonical_text"] for existing in existing_insights]
+            )
+
+        candidates = list(zip(existing_insights, scores or [None] * len(existing_insights)))
+        if scores is not None:
+            candidates.sort(key=lambda pair: pair[1], reverse=True)
+
+        model_comparisons = 0
+        for existing, embedding_score in candidates:
+            route = self.router.route(new_insight.text, existing["canonical_text"], embedding_score)
+            if route.tier is None:
+                # Only the most similar ambiguous candidates are worth a model call
+                if scores is not None and model_comparisons >= settings.ROUTING_MAX_MODEL_CANDIDATES:
+                    continue
+                model_comparisons += 1
+
             # Compare against canonical text
             decision = self.compare_insights(
                 new_text=new_insight.text,
                 existing_text=existing["canonical_text"],
-                insight_type=new_insight.type
+                insight_type=new_insight.type,
+                embedding_score=embedding_score
             )
 
             if decision.is_similar and decision.confidence > best_confidence:
@@ -128,6 +242,10 @@ Are these semantically similar (same core meaning)?"""
                     "decision": decision
                 }
 
+            # A heuristic match is the strongest candidate left
+            if route.tier is not None and route.is_similar:
+                break
+
         # Return match only if confidence exceeds threshold
         if best_match and best_confidence >= similarity_threshold:
             return best_match
@@ -348,3 +466,9 @@ Are these semantically similar (same core meaning)?"""
 def create_global_insights_agent() -> GlobalInsightsAggregationAgent:
     """Create an instance of the global insights aggregation agent"""
     return GlobalInsightsAggregationAgent()
+
+
+@lru_cache(maxsize=None)
+def get_global_insights_agent() -> GlobalInsightsAggregationAgent:
+    """Process-wide aggregation agent, so the parser and system prompt are built once"""
+    return create_global_insights_agent()
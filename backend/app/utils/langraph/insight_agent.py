@@ -3,70 +3,24 @@ LangGraph Agent for Insight Extraction
 Global Shapers Platform - YSI
 """
 
-import os
-from typing import Any, Dict
-from langchain_openai import ChatOpenAI
+import asyncio
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.output_parsers import PydanticOutputParser
+from app.core.config import settings
 from app.schemas.insights import ExtractedInsightSchema, ExtractedInsightSchemaExpanded
+from app.utils.langraph.streaming_parser import (
+    IncrementalJSONParser, INSIGHT_STREAM_PATHS, parse_structured_output
+)
+from app.utils.langraph.structured_output import json_schema_response_format, YSI_PILLAR_KEYS
+from app.utils.langraph.llm_usage import record_llm_call
+from app.utils.langraph.chat_models import get_chat_model
 
 
-class InsightExtractionAgent:
-    """
-    LangGraph agent specialized in extracting insights from Global Shapers meeting notes and documents
-    """
-
-    def __init__(self, use_expanded_schema: bool = True):
-        self.model = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.1,
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
-        self.use_expanded_schema = use_expanded_schema
-        schema_class = ExtractedInsightSchemaExpanded if use_expanded_schema else ExtractedInsightSchema
-        self.parser = PydanticOutputParser(pydantic_object=schema_class)
-
-    def create_system_prompt(self) -> str:
-        """Create the system prompt for the insight extraction agent"""
-
-        base_prompt = """You are an expert analyst for the Global Shapers Community, part of the World Economic Forum's Young Global Leaders initiative.
-
-Your role is to analyze meeting notes, workshop summaries, and discussion documents to extract key insights that help Global Shapers understand:
-
-1. MAIN THEMES: What are the primary topics being discussed?
-2. SUBTHEMES: What specific aspects or subtopics are being explored?
-3. KEY ACTORS: Who are the important people, organizations, or stakeholders mentioned?
-4. SENTIMENT: What is the overall tone - positive, neutral, or negative?
-5. PROPOSED ACTIONS: What concrete steps, solutions, or recommendations are suggested?
-6. CHALLENGES: What problems, obstacles, or difficulties are identified?
-7. OPPORTUNITIES: What positive possibilities, openings, or potential benefits are discussed?
-
-CONTEXT ABOUT GLOBAL SHAPERS:
-- Young leaders (20-30 years old) working on local and global challenges
-- Focus areas include: Climate Action, Education, Innovation, Capital Access, Recognition, Wellbeing
-- Work in hubs around the world, collaborating on community-driven initiatives
-- Often discuss funding challenges, mentorship needs, and scaling social impact
-
-ANALYSIS GUIDELINES:
-- Be concise but comprehensive in your analysis
-- Focus on actionable insights that can help Global Shapers improve their work
-- Identify both explicit and implicit themes
-- Pay attention to regional/cultural contexts when mentioned
-- Look for patterns around funding, mentorship, policy, and community building
-- Extract specific names of people and organizations when mentioned
-- Be objective in sentiment analysis
-
-CRITICAL SECURITY GUIDELINES:
-- ONLY extract information that is explicitly mentioned or clearly implied in the text
-- If a field cannot be substantiated with evidence from the text, leave it empty rather than making assumptions
-- Do NOT fill in gaps with generic or fabricated content
-- For pillar analysis: ONLY include problems and proposals that are directly supported by the text
-- If insufficient information exists for a pillar, leave that pillar's analysis empty
-- Use phrases like "not mentioned", "insufficient information", or "not addressed" when appropriate
-- Prioritize accuracy over completeness - empty fields are better than inaccurate ones"""
-
-        if self.use_expanded_schema:
-            expanded_instructions = """
+# Pillar guidance and evidence rules for the expanded schema (shared with the per-pillar fan-out agent)
+YSI_PILLAR_INSTRUCTIONS = """
 
 YSI FRAMEWORK - DETAILED PILLAR ANALYSIS:
 When generating the pillar_analysis section, categorize insights into these 4 core YSI pillars:
@@ -135,7 +89,82 @@ EXAMPLE FORMAT for each insight:
   "context": "Discussed by multiple participants from emerging markets"
 }"""
 
-            base_prompt += expanded_instructions
+
+class InsightExtractionAgent:
+    """
+    LangGraph agent specialized in extracting insights from Global Shapers meeting notes and documents
+    """
+
+    def __init__(self, use_expanded_schema: bool = True):
+        self.use_expanded_schema = use_expanded_schema
+        self.schema_class = ExtractedInsightSchemaExpanded if use_expanded_schema else ExtractedInsightSchema
+        self.parser = PydanticOutputParser(pydantic_object=self.schema_class)
+
+        # Native structured outputs: the schema travels as response_format instead of prompt text
+        self.structured_output_mode = settings.LLM_STRUCTURED_OUTPUT
+        if self.structured_output_mode == "json_schema":
+            self.response_format = json_schema_response_format(
+                self.schema_class,
+                fixed_keys={"pillar_analysis": YSI_PILLAR_KEYS},
+                exclude=["network_analysis"]
+            )
+        else:
+            self.response_format = None
+
+        # Built once so every call shares a byte-identical (cacheable) prefix
+        self._system_prompt = None
+
+    @property
+    def llm(self):
+        """Shared chat model (of the running event loop) with the response format bound"""
+        model = get_chat_model(
+            "gpt-4o-mini", temperature=0.1, response_schema=self.schema_class, stream_usage=True
+        )
+        if self.response_format is None:
+            return model
+        return model.bind(response_format=self.response_format)
+
+    def create_system_prompt(self) -> str:
+        """Create the system prompt for the insight extraction agent"""
+
+        base_prompt = """You are an expert analyst for the Global Shapers Community, part of the World Economic Forum's Young Global Leaders initiative.
+
+Your role is to analyze meeting notes, workshop summaries, and discussion documents to extract key insights that help Global Shapers understand:
+
+1. MAIN THEMES: What are the primary topics being discussed?
+2. SUBTHEMES: What specific aspects or subtopics are being explored?
+3. KEY ACTORS: Who are the important people, organizations, or stakeholders mentioned?
+4. SENTIMENT: What is the overall tone - positive, neutral, or negative?
+5. PROPOSED ACTIONS: What concrete steps, solutions, or recommendations are suggested?
+6. CHALLENGES: What problems, obstacles, or difficulties are identified?
+7. OPPORTUNITIES: What positive possibilities, openings, or potential benefits are discussed?
+
+CONTEXT ABOUT GLOBAL SHAPERS:
+- Young leaders (20-30 years old) working on local and global challenges
+- Focus areas include: Climate Action, Education, Innovation, Capital Access, Recognition, Wellbeing
+- Work in hubs around the world, collaborating on community-driven initiatives
+- Often discuss funding challenges, mentorship needs, and scaling social impact
+
+ANALYSIS GUIDELINES:
+- Be concise but comprehensive in your analysis
+- Focus on actionable insights that can help Global Shapers improve their work
+- Identify both explicit and implicit themes
+- Pay attention to regional/cultural contexts when mentioned
+- Look for patterns around funding, mentorship, policy, and community building
+- Extract specific names of people and organizations when mentioned
+- Be objective in sentiment analysis
+
+CRITICAL SECURITY GUIDELINES:
+- ONLY extract information that is explicitly mentioned or clearly implied in the text
+- If a field cannot be substantiated with evidence from the text, leave it empty rather than making assumptions
+- Do NOT fill in gaps with generic or fabricated content
+- For pillar analysis: ONLY include problems and proposals that are directly supported by the text
+- If insufficient information exists for a pillar, leave that pillar's analysis empty
+- Use phrases like "not mentioned", "insufficient information", or "not addressed" when appropriate
+- Prioritize accuracy over completeness - empty fields are better than inaccurate ones"""
+
+        if self.use_expanded_schema:
+            base_prompt += YSI_PILLAR_INSTRUCTIONS
 
         base_prompt += """
 
@@ -146,20 +175,18 @@ All fields are required, but arrays can be empty if no relevant information is f
 
         return base_prompt
 
-    def extract_insights(self, text: str, context: str = ""):
-        """
-        Extract insights from the provided text using the LangGraph agent
-
-        Args:
-            text: The input text to analyze
-            context: Additional context about the text source
-
-        Returns:
-            ExtractedInsightSchema or ExtractedInsightSchemaExpanded: Structured insights extracted from the text
-        """
+    def get_system_prompt(self) -> str:
+        """System prompt for the configured structured output mode (static per agent)"""
+        if self._system_prompt is None:
+            system_prompt = self.create_system_prompt()
+            if self.response_format is None:
+                # Append format instructions (avoid .format() due to JSON braces)
+                system_prompt += "\n\n" + self.parser.get_format_instructions()
+            self._system_prompt = system_prompt
+        return self._system_prompt
 
-        # Create the system prompt and append format instructions (avoid .format() due to JSON braces)
-        system_prompt = self.create_system_prompt() + "\n\n" + self.parser.get_format_instructions()
+    def build_messages(self, text: str, context: str = "") -> list:
+        """Build the system and human messages for an extraction call"""
 
         # Create the human prompt with text and context
         human_prompt = f"""Please analyze the following text and extract insights according to your role:
@@ -171,18 +198,35 @@ TEXT TO ANALYZE:
 
 Provide your analysis in the specified JSON format."""
 
-        # Create messages
-        messages = [
-            SystemMessage(content=system_prompt),
+        return [
+            SystemMessage(content=self.get_system_prompt()),
             HumanMessage(content=human_prompt)
         ]
 
+    def extract_insights(self, text: str, context: str = ""):
+        """
+        Extract insights from the provided text using the LangGraph agent
+
+        Args:
+            text: The input text to analyze
+            context: Additional context about the text source
+
+        Returns:
+            ExtractedInsightSchema or ExtractedInsightSchemaExpanded: Structured insights extracted from the text
+        """
+        messages = self.build_messages(text, context)
+
         # Get response from the model
         try:
-            response = self.model.invoke(messages)
+            started = time.perf_counter()
+            response = self.llm.invoke(messages)
+            record_llm_call(
+                "insight", response.usage_metadata,
+                (time.perf_counter() - started) * 1000, self.structured_output_mode
+            )
 
-            # Parse the response using the Pydantic parser
-            insights = self.parser.parse(response.content)
+            # Parse the response, repairing a truncated tail instead of failing
+            insights, _ = parse_structured_output(response.content, self.schema_class, self.parser)
 
             return insights
 
@@ -190,6 +234,48 @@ Provide your analysis in the specified JSON format."""
             # Fallback in case of parsing errors
             raise ValueError(f"Failed to extract insights: {str(e)}")
 
+    async def extract_insights_streaming(
+        self,
+        text: str,
+        context: str = "",
+        on_item: Optional[Callable[[tuple, Any], None]] = None
+    ):
+        """
+        Extract insights while streaming the completion
+
+        Token deltas are parsed incrementally; the main theme, sentiment and each
+        pillar problem/proposal are passed to on_item(path, value) as soon as they close.
+
+        Args:
+            text: The input text to analyze
+            context: Additional context about the text source
+            on_item: Optional callback for completed sub-objects
+
+        Returns:
+            ExtractedInsightSchema or ExtractedInsightSchemaExpanded: Structured insights extracted from the text
+        """
+        messages = self.build_messages(text, context)
+        stream_parser = IncrementalJSONParser(INSIGHT_STREAM_PATHS, on_item)
+
+        try:
+            started = time.perf_counter()
+            usage = None
+            async for chunk in self.llm.astream(messages):
+                if isinstance(chunk.content, str):
+                    stream_parser.feed(chunk.content)
+                if chunk.usage_metadata:
+                    usage = chunk.usage_metadata
+            record_llm_call(
+                "insight", usage, (time.perf_counter() - started) * 1000,
+                self.structured_output_mode, streamed=True
+            )
+
+            insights, _ = parse_structured_output(stream_parser.buffer, self.schema_class, self.parser)
+            return insights
+
+        except Exception as e:
+            raise ValueError(f"Failed to extract insights: {str(e)}")
+
     def validate_text_length(self, text: str) -> bool:
         """Validate that text is within acceptable length limits"""
         return 10 <= len(text) <= 50000
@@ -211,8 +297,20 @@ def create_insight_agent(use_expanded_schema: bool = True) -> InsightExtractionA
     return InsightExtractionAgent(use_expanded_schema=use_expanded_schema)
 
 
+@lru_cache(maxsize=None)
+def get_insight_agent(use_expanded_schema: bool = True) -> InsightExtractionAgent:
+    """Process-wide agent, so the parser, format instructions and prompt are built once"""
+    return create_insight_agent(use_expanded_schema=use_expanded_schema)
+
+
 # Convenience function for direct usage
-async def extract_insights_from_text(text: str, context: str = "", use_expanded: bool = True):
+async def extract_insights_from_text(
+    text: str,
+    context: str = "",
+    use_expanded: bool = True,
+    on_item: Optional[Callable[[tuple, Any], None]] = None,
+    stream: Optional[bool] = None
+):
     """
     High-level function to extract insights from text
 
@@ -220,11 +318,13 @@ async def extract_insights_from_text(text: str, context: str = "", use_expanded:
         text: Text to analyze
         context: Additional context
         use_expanded: Whether to use the expanded schema with pillar analysis
+        on_item: Optional callback for sub-objects completed while streaming
+        stream: Stream the completion (defaults to settings.EXTRACTION_STREAMING)
 
     Returns:
         ExtractedInsightSchema or ExtractedInsightSchemaExpanded: Extracted insights
     """
-    agent = create_insight_agent(use_expanded_schema=use_expanded)
+    agent = get_insight_agent(use_expanded_schema=use_expanded)
 
     # Validate input
     if not agent.validate_text_length(text):
@@ -234,6 +334,11 @@ async def extract_insights_from_text(text: str, context: str = "", use_expanded:
     clean_text = agent.preprocess_text(text)
 
     # Extract insights
-    insights = agent.extract_insights(clean_text, context)
+    use_stream = settings.EXTRACTION_STREAMING if stream is None else stream
+    if use_stream:
+        insights = await agent.extract_insights_streaming(clean_text, context, on_item)
+    else:
+        # The agent calls the model synchronously; keep it off the (shared) event loop
+        insights = await asyncio.to_thread(agent.extract_insights, clean_text, context)
 
     return insights
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""
+LLM usage accounting for the LangGraph agents
+Records prompt/completion/cached tokens and latency per call, both per job
+(through a context-local collector) and process-wide per structured output mode
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.services.logging_service import StructuredLogger
+
+usage_logger = StructuredLogger("llm_usage")
+
+
+class LLMUsageCollector:
+    """
+    Collects the LLM calls made while processing one job
+    Calls are also reported to the enclosing collector, so nested blocks all see them
+    """
+
+    def __init__(self, parent: Optional["LLMUsageCollector"] = None):
+        self.calls: List[Dict[str, Any]] = []
+        self.parent = parent
+
+    def add(self, call: Dict[str, Any]):
+        self.calls.append(call)
+        if self.parent is not None:
+            self.parent.add(call)
+
+    def summary(self) -> Dict[str, Any]:
+        """Token and latency totals, overall and per agent"""
+        by_agent: Dict[str, Dict[str, Any]] = {}
+        for call in self.calls:
+            agent = by_agent.setdefault(call["agent"], {
+                "calls": 0, "input_tokens": 0, "output_tokens": 0,
+                "cached_tokens": 0, "latency_ms": 0.0
+            })
+            agent["calls"] += 1
+            agent["input_tokens"] += call["input_tokens"]
+            agent["output_tokens"] += call["output_tokens"]
+            agent["cached_tokens"] += call["cached_tokens"]
+            agent["latency_ms"] = round(agent["latency_ms"] + call["latency_ms"], 2)
+
+        input_tokens = sum(c["input_tokens"] for c in self.calls)
+        cached_tokens = sum(c["cached_tokens"] for c in self.calls)
+        return {
+            "calls": len(self.calls),
+            "input_tokens": input_tokens,
+            "output_tokens": sum(c["output_tokens"] for c in self.calls),
+            "cached_tokens": cached_tokens,
+            "cache_hit_ratio": round(cached_tokens / input_tokens, 3) if input_tokens else 0.0,
+            "latency_ms": round(sum(c["latency_ms"] for c in self.calls), 2),
+            "by_agent": by_agent
+        }
+
+
+_current_collector: ContextVar[Optional[LLMUsageCollector]] = ContextVar("llm_usage_collector", default=None)
+
+# Process-wide totals keyed by structured output mode, to compare modes side by side
+_totals_lock = threading.Lock()
+_totals: Dict[str, Dict[str, float]] = {}
+
+
+@contextmanager
+def collect_llm_usage() -> Iterator[LLMUsageCollector]:
+    """Collect the LLM calls made inside the block (tasks created inside inherit it)"""
+    collector = LLMUsageCollector(parent=_current_collector.get())
+    token = _current_collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _current_collector.reset(token)
+
+
+def record_llm_call(
+    agent: str,
+    usage_metadata: Optional[Dict[str, Any]],
+    latency_ms: float,
+    mode: str,
+    streamed: bool = False
+) -> Dict[str, Any]:
+    """
+    Record one LLM call
+
+    Args:
+        agent: Agent name (insight, network, global_insights)
+        usage_metadata: LangChain usage_metadata from the response message
+        latency_ms: Wall-clock latency of the call
+        mode: Structured output mode used (json_schema or parser)
+        streamed: Whether the completion was streamed
+
+    Returns:
+        The recorded call
+    """
+    usage = usage_metadata or {}
+    input_details = usage.get("input_token_details") or {}
+    call = {
+        "agent": agent,
+        "mode": mode,
+        "streamed": streamed,
+        "input_tokens": int(usage.get("input_tokens") or 0),
+        "output_tokens": int(usage.get("output_tokens") or 0),
+        "cached_tokens": int(input_details.get("cache_read") or 0),
+        "latency_ms": round(latency_ms, 2)
+    }
+
+    collector = _current_collector.get()
+    if collector is not None:
+        collector.add(call)
+
+    with _totals_lock:
+        totals = _totals.setdefault(mode, {
+            "calls": 0, "input_tokens": 0, "output_tokens": 0, "cached_tokens": 0, "latency_ms": 0.0
+        })
+        totals["calls"] += 1
+        totals["input_tokens"] += call["input_tokens"]
+        totals["output_tokens"] += call["output_tokens"]
+        totals["cached_tokens"] += call["cached_tokens"]
+        totals["latency_ms"] += call["latency_ms"]
+
+    usage_logger.info("LLM_CALL", **call)
+    return call
+
+
+def get_llm_usage_totals() -> Dict[str, Dict[str, float]]:
+    """Process-wide usage per structured output mode, with per-call averages"""
+    with _totals_lock:
+        report = {}
+        for mode, totals in _totals.items():
+            calls = totals["calls"] or 1
+            report[mode] = {
+                **totals,
+                "avg_input_tokens": round(totals["input_tokens"] / calls, 1),
+                "avg_cached_tokens": round(totals["cached_tokens"] / calls, 1),
+                "avg_latency_ms": round(totals["latency_ms"] / calls, 2)
+            }
+        return report
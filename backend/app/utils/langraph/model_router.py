@@ -0,0 +1,203 @@
+"""
+Tiered model routing for insight comparison
+Local heuristics settle clear-cut pairs, a small model handles the ambiguous
+middle band and only low-confidence decisions escalate to the large model
+"""
+
+import re
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TIER_HEURISTIC_SIMILAR = "heuristic_similar"
+TIER_HEURISTIC_DIFFERENT = "heuristic_different"
+TIER_SMALL_MODEL = "small_model"
+TIER_LARGE_MODEL = "large_model"
+TIER_ERROR = "error"
+
+TIERS = [TIER_HEURISTIC_SIMILAR, TIER_HEURISTIC_DIFFERENT, TIER_SMALL_MODEL, TIER_LARGE_MODEL, TIER_ERROR]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "their", "to", "with"
+}
+
+
+def _tokens(text: str) -> set:
+    return {t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS}
+
+
+def lexical_similarity(a: str, b: str) -> float:
+    """
+    Lexical similarity in [0, 1]: Jaccard overlap of the content words
+    Only 1.0 (the same words) is safe to act on - a character ratio or a high partial
+    overlap also matches opposites ("Increase ..." / "Decrease ...", rural / urban)
+    """
+    tokens_a, tokens_b = _tokens(a), _tokens(b)
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+@dataclass
+class RouteDecision:
+    """Outcome of the heuristic tier for one pair (score in [0, 1])"""
+    tier: Optional[str]
+    is_similar: Optional[bool]
+    score: float
+    reasoning: str
+
+
+def _unit(score: float) -> float:
+    # Cosine similarity can be negative; decisions derive a [0, 1] confidence from the score
+    return min(1.0, max(0.0, float(score)))
+
+
+class ComparisonRouter:
+    """
+    Heuristic tier and routing statistics for insight comparison
+
+    Embedding similarity (when enabled) can settle a pair either way and always takes
+    precedence; without it, lexical overlap can only settle pairs worded with the same
+    words, since low overlap says nothing about paraphrases.
+    """
+
+    def __init__(self):
+        self.similar_threshold = settings.ROUTING_EMBEDDING_SIMILAR_THRESHOLD
+        self.different_threshold = settings.ROUTING_EMBEDDING_DIFFERENT_THRESHOLD
+        self.lexical_threshold = settings.ROUTING_LEXICAL_SIMILAR_THRESHOLD
+        self.escalation_confidence = settings.ROUTING_ESCALATION_CONFIDENCE
+        self.use_embeddings = settings.ROUTING_USE_EMBEDDINGS
+        self.embedding_model = settings.ROUTING_EMBEDDING_MODEL
+
+        self._client = None
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._embedding_cache_size = 5000
+
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {tier: 0 for tier in TIERS}
+
+    def _get_client(self):
+        if self._client is None:
+            from app.services.llm_provider import create_openai_client
+            self._client = create_openai_client()
+        return self._client
+
+    def embed(self, texts: Sequence[str]) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Normalized embeddings for texts, fetched in one batched request for cache misses
+
+        Returns:
+            text -> unit vector, or None when embeddings are disabled or unavailable
+        """
+        if not self.use_embeddings:
+            return None
+
+        with self._lock:
+            missing = list(dict.fromkeys(t for t in texts if t not in self._embedding_cache))
+
+        if missing:
+            try:
+                response = self._get_client().embeddings.create(model=self.embedding_model, input=missing)
+            except Exception as e:
+                logger.warning(f"Routing embeddings unavailable, using lexical heuristics only: {str(e)}")
+                return None
+
+            with self._lock:
+                for text, item in zip(missing, response.data):
+                    vector = np.asarray(item.embedding, dtype=np.float32)
+                    norm = np.linalg.norm(vector)
+                    self._embedding_cache[text] = vector / norm if norm else vector
+                while len(self._embedding_cache) > self._embedding_cache_size:
+                    self._embedding_cache.popitem(last=False)
+
+        with self._lock:
+            result = {}
+            for text in texts:
+                vector = self._embedding_cache.get(text)
+                if vector is not None:
+                    self._embedding_cache.move_to_end(text)
+                    result[text] = vector
+            return result
+
+    def embedding_similarities(self, new_text: str, existing_texts: List[str]) -> Optional[List[float]]:
+        """Cosine similarity of new_text against each existing text (one matrix product)"""
+        vectors = self.embed([new_text] + existing_texts)
+        if not vectors or new_text not in vectors or any(t not in vectors for t in existing_texts):
+            return None
+        if not existing_texts:
+            return []
+        matrix = np.stack([vectors[t] for t in existing_texts])
+        return (matrix @ vectors[new_text]).astype(float).tolist()
+
+    def route(self, new_text: str, existing_text: str, embedding_score: Optional[float] = None) -> RouteDecision:
+        """
+        Try to settle a pair with local heuristics
+
+        Returns:
+            RouteDecision with tier set when settled, tier None when a model is needed
+        """
+        if embedding_score is not None:
+            if embedding_score >= self.similar_threshold:
+                return RouteDecision(
+                    TIER_HEURISTIC_SIMILAR, True, _unit(embedding_score),
+                    f"High semantic similarity (embedding similarity {embedding_score:.2f})"
+                )
+            if embedding_score <= self.different_threshold:
+                return RouteDecision(
+                    TIER_HEURISTIC_DIFFERENT, False, _unit(embedding_score),
+                    f"Low semantic similarity (embedding similarity {embedding_score:.2f})"
+                )
+            # Middle band: a model decides, however similar the wording
+            return RouteDecision(None, None, _unit(embedding_score), "")
+
+        lexical = lexical_similarity(new_text, existing_text)
+        if lexical >= self.lexical_threshold:
+            return RouteDecision(
+                TIER_HEURISTIC_SIMILAR, True, lexical,
+                f"Same wording (lexical similarity {lexical:.2f})"
+            )
+        return RouteDecision(None, None, lexical, "")
+
+    def should_escalate(self, confidence: float) -> bool:
+        return confidence < self.escalation_confidence
+
+    def record(self, tier: str):
+        with self._lock:
+            self._counts[tier] = self._counts.get(tier, 0) + 1
+
+    def stats(self) -> Dict[str, object]:
+        """Per-tier counts and hit rates since process start"""
+        with self._lock:
+            counts = dict(self._counts)
+        total = sum(counts.values())
+        return {
+            "total_comparisons": total,
+            "counts": counts,
+            "hit_rates": {tier: round(count / total, 4) if total else 0.0 for tier, count in counts.items()},
+            "llm_calls_avoided": counts[TIER_HEURISTIC_SIMILAR] + counts[TIER_HEURISTIC_DIFFERENT],
+            "thresholds": {
+                "embedding_similar": self.similar_threshold,
+                "embedding_different": self.different_threshold,
+                "lexical_similar": self.lexical_threshold,
+                "escalation_confidence": self.escalation_confidence
+            }
+        }
+
+
+# Global router instance (shared so statistics cover every aggregation job)
+comparison_router = ComparisonRouter()
+
+
+def get_routing_stats() -> Dict[str, object]:
+    """Per-tier routing statistics for insight comparison"""
+    return comparison_router.stats()
@@ -4,12 +4,20 @@ Specialized in extracting stakeholder networks and relationships
 Global Shapers Platform - YSI
 """
 
-import os
-from typing import Any, Dict
-from langchain_openai import ChatOpenAI
+import asyncio
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.output_parsers import PydanticOutputParser
+from app.core.config import settings
 from app.schemas.networks import NetworkAnalysisSchema
+from app.utils.langraph.streaming_parser import (
+    IncrementalJSONParser, NETWORK_STREAM_PATHS, parse_structured_output
+)
+from app.utils.langraph.structured_output import json_schema_response_format
+from app.utils.langraph.llm_usage import record_llm_call
+from app.utils.langraph.chat_models import get_chat_model
 
 
 class NetworkAnalysisAgent:
@@ -19,13 +27,28 @@ class NetworkAnalysisAgent:
     """
 
     def __init__(self):
-        self.model = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.1,
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
         self.parser = PydanticOutputParser(pydantic_object=NetworkAnalysisSchema)
 
+        # Native structured outputs: the schema travels as response_format instead of prompt text
+        self.structured_output_mode = settings.LLM_STRUCTURED_OUTPUT
+        if self.structured_output_mode == "json_schema":
+            self.response_format = json_schema_response_format(NetworkAnalysisSchema)
+        else:
+            self.response_format = None
+
+        # Built once so every call shares a byte-identical (cacheable) prefix
+        self._system_prompt = None
+
+    @property
+    def llm(self):
+        """Shared chat model (of the running event loop) with the response format bound"""
+        model = get_chat_model(
+            "gpt-4o-mini", temperature=0.1, response_schema=NetworkAnalysisSchema, stream_usage=True
+        )
+        if self.response_format is None:
+            return model
+        return model.bind(response_format=self.response_format)
+
     def create_network_prompt(self) -> str:
         """Create the system prompt for network analysis"""
 
@@ -106,22 +129,18 @@ Quality over quantity - only include well-supported network elements.
 
         return prompt
 
-    def extract_network(self, text: str, context: str = "") -> NetworkAnalysisSchema:
-        """
-        Extract network analysis from the provided text
+    def get_system_prompt(self) -> str:
+        """System prompt for the configured structured output mode (static per agent)"""
+        if self._system_prompt is None:
+            # Format instructions are only needed when the schema is not sent as response_format
+            format_instructions = self.parser.get_format_instructions() if self.response_format is None else ""
+            self._system_prompt = self.create_network_prompt().format(
+                format_instructions=format_instructions
+            ).rstrip()
+        return self._system_prompt
 
-        Args:
-            text: The input text to analyze
-            context: Additional context about the text source
-
-        Returns:
-            NetworkAnalysisSchema: Structured network analysis extracted from the text
-        """
-
-        # Create the system prompt with format instructions
-        system_prompt = self.create_network_prompt().format(
-            format_instructions=self.parser.get_format_instructions()
-        )
+    def build_messages(self, text: str, context: str = "") -> list:
+        """Build the system and human messages for a network extraction call"""
 
         # Create the human prompt with text and context
         human_prompt = f"""Please analyze the following text and extract network relationships according to your role:
@@ -133,18 +152,35 @@ TEXT TO ANALYZE:
 
 Focus ONLY on extracting stakeholders, relationships, and networks that are explicitly mentioned in the text. Provide your analysis in the specified JSON format."""
 
-        # Create messages
-        messages = [
-            SystemMessage(content=system_prompt),
+        return [
+            SystemMessage(content=self.get_system_prompt()),
             HumanMessage(content=human_prompt)
         ]
 
+    def extract_network(self, text: str, context: str = "") -> NetworkAnalysisSchema:
+        """
+        Extract network analysis from the provided text
+
+        Args:
+            text: The input text to analyze
+            context: Additional context about the text source
+
+        Returns:
+            NetworkAnalysisSchema: Structured network analysis extracted from the text
+        """
+        messages = self.build_messages(text, context)
+
         # Get response from the model
         try:
-            response = self.model.invoke(messages)
+            started = time.perf_counter()
+            response = self.llm.invoke(messages)
+            record_llm_call(
+                "network", response.usage_metadata,
+                (time.perf_counter() - started) * 1000, self.structured_output_mode
+            )
 
-            # Parse the response using the Pydantic parser
-            network_analysis = self.parser.parse(response.content)
+            # Parse the response, repairing a truncated tail instead of failing
+            network_analysis, _ = parse_structured_output(response.content, NetworkAnalysisSchema, self.parser)
 
             return network_analysis
 
@@ -152,6 +188,47 @@ Focus ONLY on extracting stakeholders, relationships, and networks that are expl
             # Fallback in case of parsing errors
             raise ValueError(f"Failed to extract network analysis: {str(e)}")
 
+    async def extract_network_streaming(
+        self,
+        text: str,
+        context: str = "",
+        on_item: Optional[Callable[[tuple, Any], None]] = None
+    ) -> NetworkAnalysisSchema:
+        """
+        Extract network analysis while streaming the completion
+        Each stakeholder, relationship, topic network and geographic cluster is passed
+        to on_item(path, value) as soon as it closes
+
+        Args:
+            text: The input text to analyze
+            context: Additional context about the text source
+            on_item: Optional callback for completed sub-objects
+
+        Returns:
+            NetworkAnalysisSchema: Structured network analysis extracted from the text
+        """
+        messages = self.build_messages(text, context)
+        stream_parser = IncrementalJSONParser(NETWORK_STREAM_PATHS, on_item)
+
+        try:
+            started = time.perf_counter()
+            usage = None
+            async for chunk in self.llm.astream(messages):
+                if isinstance(chunk.content, str):
+                    stream_parser.feed(chunk.content)
+                if chunk.usage_metadata:
+                    usage = chunk.usage_metadata
+            record_llm_call(
+                "network", usage, (time.perf_counter() - started) * 1000,
+                self.structured_output_mode, streamed=True
+            )
+
+            network_analysis, _ = parse_structured_output(stream_parser.buffer, NetworkAnalysisSchema, self.parser)
+            return network_analysis
+
+        except Exception as e:
+            raise ValueError(f"Failed to extract network analysis: {str(e)}")
+
     def validate_text_length(self, text: str) -> bool:
         """Validate that text is within acceptable length limits"""
         return 10 <= len(text) <= 50000
@@ -173,19 +250,32 @@ def create_network_agent() -> NetworkAnalysisAgent:
     return NetworkAnalysisAgent()
 
 
+@lru_cache(maxsize=None)
+def get_network_agent() -> NetworkAnalysisAgent:
+    """Process-wide agent, so the parser, format instructions and prompt are built once"""
+    return create_network_agent()
+
+
 # Convenience function for direct usage
-async def extract_network_from_text(text: str, context: str = "") -> NetworkAnalysisSchema:
+async def extract_network_from_text(
+    text: str,
+    context: str = "",
+    on_item: Optional[Callable[[tuple, Any], None]] = None,
+    stream: Optional[bool] = None
+) -> NetworkAnalysisSchema:
     """
     High-level function to extract network analysis from text
 
     Args:
         text: Text to analyze
         context: Additional context
+        on_item: Optional callback for sub-objects completed while streaming
+        stream: Stream the completion (defaults to settings.EXTRACTION_STREAMING)
 
     Returns:
         NetworkAnalysisSchema: Extracted network analysis
     """
-    agent = create_network_agent()
+    agent = get_network_agent()
 
     # Validate input
     if not agent.validate_text_length(text):
@@ -195,6 +285,11 @@ async def extract_network_from_text(text: str, context: str = "") -> NetworkAnal
     clean_text = agent.preprocess_text(text)
 
     # Extract network analysis
-    network_analysis = agent.extract_network(clean_text, context)
+    use_stream = settings.EXTRACTION_STREAMING if stream is None else stream
+    if use_stream:
+        network_analysis = await agent.extract_network_streaming(clean_text, context, on_item)
+    else:
+        # The agent calls the model synchronously; keep it off the (shared) event loop
+        network_analysis = await asyncio.to_thread(agent.extract_network, clean_text, context)
 
     return network_analysis
\ No newline at end of file
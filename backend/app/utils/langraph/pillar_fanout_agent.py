@@ -0,0 +1,232 @@
+"""
+Per-pillar fan-out insight extraction
+Runs a small "core" extraction and one extraction per YSI pillar concurrently,
+then merges them into ExtractedInsightSchemaExpanded
+Global Shapers Platform - YSI
+"""
+
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.output_parsers import PydanticOutputParser
+
+from app.core.config import settings
+from app.schemas.insights import ExtractedInsightSchemaExpanded, YSIPillarAnalysis
+from app.utils.langraph.insight_agent import get_insight_agent, YSI_PILLAR_INSTRUCTIONS
+from app.utils.langraph.streaming_parser import IncrementalJSONParser, WILDCARD, parse_structured_output
+from app.utils.langraph.structured_output import json_schema_response_format, YSI_PILLAR_KEYS
+from app.utils.langraph.llm_usage import record_llm_call
+from app.utils.langraph.chat_models import get_chat_model
+
+logger = logging.getLogger(__name__)
+
+# Sub-objects reported while a single pillar streams in
+PILLAR_STREAM_PATHS = [("problems", WILDCARD), ("proposals", WILDCARD)]
+
+
+class PillarAnalysisAgent:
+    """
+    Agent that extracts the problems and proposals of one YSI pillar
+
+    The system prompt covers all pillars and is identical for every call; the pillar
+    to analyze is named at the end of the human message, so the four concurrent calls
+    for a document share the same prompt prefix.
+    """
+
+    def __init__(self):
+        self.parser = PydanticOutputParser(pydantic_object=YSIPillarAnalysis)
+
+        self.structured_output_mode = settings.LLM_STRUCTURED_OUTPUT
+        if self.structured_output_mode == "json_schema":
+            self.response_format = json_schema_response_format(YSIPillarAnalysis)
+        else:
+            self.response_format = None
+
+        self.system_prompt = self.create_system_prompt()
+
+    @property
+    def llm(self):
+        """Shared chat model (of the running event loop) with the response format bound"""
+        model = get_chat_model(
+            "gpt-4o-mini", temperature=0.1, response_schema=YSIPillarAnalysis, stream_usage=True
+        )
+        if self.response_format is None:
+            return model
+        return model.bind(response_format=self.response_format)
+
+    def create_system_prompt(self) -> str:
+        """Create the static system prompt for single-pillar analysis"""
+
+        prompt = """You are an expert analyst for the Global Shapers Community, part of the World Economic Forum's Young Global Leaders initiative.
+
+Your role is to analyze meeting notes, workshop summaries, and discussion documents and extract the problems and proposals of ONE YSI pillar, named at the end of the request.
+
+CRITICAL SECURITY GUIDELINES:
+- ONLY extract information that is explicitly mentioned or clearly implied in the text
+- Do NOT fill in gaps with generic or fabricated content
+- Ignore problems and proposals that belong to other pillars
+- If the text does not address the requested pillar, return empty problems and proposals
+- Prioritize accuracy over completeness - empty fields are better than inaccurate ones"""
+
+        prompt += YSI_PILLAR_INSTRUCTIONS
+
+        prompt += """
+
+RESPONSE FORMAT:
+You must respond with a JSON object with "problems" and "proposals" arrays for the requested pillar only."""
+
+        if self.structured_output_mode != "json_schema":
+            prompt += "\n\n" + self.parser.get_format_instructions()
+
+        return prompt
+
+    def build_messages(self, text: str, context: str, pillar: str) -> list:
+        """Build the messages for one pillar (document first, pillar last)"""
+
+        human_prompt = f"""CONTEXT: {context if context else "No additional context provided"}
+
+TEXT TO ANALYZE:
+{text}
+
+PILLAR TO ANALYZE: {pillar}
+
+Provide the problems and proposals for this pillar in the specified JSON format."""
+
+        return [
+            SystemMessage(content=self.system_prompt),
+            HumanMessage(content=human_prompt)
+        ]
+
+    async def extract_pillar(
+        self,
+        text: str,
+        context: str,
+        pillar: str,
+        on_item: Optional[Callable[[tuple, Any], None]] = None,
+        stream: bool = False
+    ) -> YSIPillarAnalysis:
+        """
+        Extract the analysis of a single pillar
+
+        Args:
+            text: The input text to analyze
+            context: Additional context about the text source
+            pillar: Pillar key (one of YSI_PILLAR_KEYS)
+            on_item: Optional callback for problems/proposals completed while streaming
+            stream: Stream the completion
+
+        Returns:
+            YSIPillarAnalysis for the pillar
+        """
+        messages = self.build_messages(text, context, pillar)
+        started = time.perf_counter()
+
+        if stream:
+            stream_parser = IncrementalJSONParser(PILLAR_STREAM_PATHS, on_item)
+            usage = None
+            async for chunk in self.llm.astream(messages):
+                if isinstance(chunk.content, str):
+                    stream_parser.feed(chunk.content)
+                if chunk.usage_metadata:
+                    usage = chunk.usage_metadata
+            content = stream_parser.buffer
+        else:
+            response = await self.llm.ainvoke(messages)
+            usage = response.usage_metadata
+            content = response.content
+
+        record_llm_call(
+            "insight_pillar", usage, (time.perf_counter() - started) * 1000,
+            self.structured_output_mode, streamed=stream
+        )
+
+        analysis, _ = parse_structured_output(content, YSIPillarAnalysis, self.parser)
+        return analysis
+
+
+@lru_cache(maxsize=None)
+def get_pillar_agent() -> PillarAnalysisAgent:
+    """Process-wide agent, so the parser, format instructions and prompt are built once"""
+    return PillarAnalysisAgent()
+
+
+def _pillar_item_reporter(
+    pillar: str,
+    on_item: Optional[Callable[[tuple, Any], None]]
+) -> Optional[Callable[[tuple, Any], None]]:
+    """Re-root pillar item paths under pillar_analysis.<pillar> to match the single-call stream"""
+    if on_item is None:
+        return None
+
+    def report(path: tuple, value: Any):
+        on_item(("pillar_analysis", pillar) + tuple(path), value)
+
+    return report
+
+
+async def extract_insights_fanout(
+    text: str,
+    context: str = "",
+    on_item: Optional[Callable[[tuple, Any], None]] = None,
+    stream: Optional[bool] = None
+) -> ExtractedInsightSchemaExpanded:
+    """
+    Extract expanded insights with one core call and one call per pillar, run concurrently
+
+    A failed pillar call leaves that pillar empty; a failed core call fails the extraction.
+
+    Args:
+        text: Text to analyze
+        context: Additional context
+        on_item: Optional callback for sub-objects completed while streaming
+        stream: Stream the completions (defaults to settings.EXTRACTION_STREAMING)
+
+    Returns:
+        ExtractedInsightSchemaExpanded: Merged insights
+    """
+    core_agent = get_insight_agent(use_expanded_schema=False)
+
+    # Validate input
+    if not core_agent.validate_text_length(text):
+        raise ValueError("Text length must be between 10 and 50,000 characters")
+
+    clean_text = core_agent.preprocess_text(text)
+    use_stream = settings.EXTRACTION_STREAMING if stream is None else stream
+
+    if use_stream:
+        core_task = core_agent.extract_insights_streaming(clean_text, context, on_item)
+    else:
+        # The core agent calls the model synchronously; keep it off the event loop
+        core_task = asyncio.to_thread(core_agent.extract_insights, clean_text, context)
+
+    pillar_agent = get_pillar_agent()
+    pillar_tasks = [
+        pillar_agent.extract_pillar(
+            clean_text, context, pillar,
+            on_item=_pillar_item_reporter(pillar, on_item),
+            stream=use_stream
+        )
+        for pillar in YSI_PILLAR_KEYS
+    ]
+
+    results = await asyncio.gather(core_task, *pillar_tasks, return_exceptions=True)
+    core, pillar_results = results[0], results[1:]
+
+    if isinstance(core, Exception):
+        raise ValueError(f"Failed to extract insights: {str(core)}")
+
+    pillar_analysis: Dict[str, YSIPillarAnalysis] = {}
+    for pillar, result in zip(YSI_PILLAR_KEYS, pillar_results):
+        if isinstance(result, Exception):
+            logger.warning(f"Pillar extraction failed for {pillar}: {str(result)}")
+            result = YSIPillarAnalysis()
+        pillar_analysis[pillar] = result
+
+    return ExtractedInsightSchemaExpanded(
+        **core.model_dump(),
+        pillar_analysis=pillar_analysis
+    )
@@ -0,0 +1,267 @@
+"""
+Incremental JSON parsing for streamed structured outputs
+Consumes token deltas, reports sub-objects as soon as they close and
+repairs a truncated trailing structure instead of discarding the response
+"""
+
+import json
+import logging
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Type, Union
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+PathPart = Union[str, int]
+JSONPath = Tuple[PathPart, ...]
+
+WILDCARD = "*"
+
+# Sub-objects reported while an insight extraction streams in
+INSIGHT_STREAM_PATHS: List[JSONPath] = [
+    ("main_theme",),
+    ("general_perception",),
+    ("pillar_analysis", WILDCARD, "problems", WILDCARD),
+    ("pillar_analysis", WILDCARD, "proposals", WILDCARD),
+]
+
+# Sub-objects reported while a network analysis streams in
+NETWORK_STREAM_PATHS: List[JSONPath] = [
+    ("stakeholders", WILDCARD),
+    ("relationships", WILDCARD),
+    ("topic_networks", WILDCARD),
+    ("geographic_clusters", WILDCARD),
+]
+
+
+class IncrementalJSONParser:
+    """
+    Single-pass, resumable JSON scanner
+
+    Each character is looked at once across all feed() calls. Values whose path
+    matches one of emit_paths are decoded and handed to on_item(path, value) the
+    moment they close. The scanner also remembers the last point where the
+    document was structurally complete so repaired() can close a truncated stream.
+    """
+
+    def __init__(
+        self,
+        emit_paths: Optional[Sequence[JSONPath]] = None,
+        on_item: Optional[Callable[[JSONPath, Any], None]] = None
+    ):
+        self.emit_paths = [tuple(p) for p in (emit_paths or [])]
+        self.on_item = on_item
+
+        self.buffer = ""
+        self._pos = 0
+        self._root_start = -1
+        self._done = False
+
+        # Container stack: [type ('{' or '['), start index, key or index of the current child]
+        self._stack: List[list] = []
+        self._expect_key = False
+
+        # String state
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+
+        # Bare scalar (number / true / false / null) start index
+        self._scalar_start = -1
+
+        # Last structurally complete prefix and the closers it needs
+        self._safe_end = 0
+        self._safe_closers = ""
+
+        self.items_emitted = 0
+
+    @property
+    def complete(self) -> bool:
+        """True once the root value has closed"""
+        return self._done
+
+    def feed(self, chunk: str):
+        """Consume the next piece of streamed text"""
+        if not chunk:
+            return
+        self.buffer += chunk
+        buffer = self.buffer
+
+        while self._pos < len(buffer) and not self._done:
+            i = self._pos
+            ch = buffer[i]
+            self._pos += 1
+
+            if self._root_start < 0:
+                # Skip anything before the root object (e.g. markdown fences)
+                if ch == "{" or ch == "[":
+                    self._root_start = i
+                    self._open(ch, i)
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._close_string(i)
+                continue
+
+            if self._scalar_start >= 0:
+                if ch in ",}] \t\r\n":
+                    self._close_scalar(i)
+                else:
+                    continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch == "{" or ch == "[":
+                self._open(ch, i)
+            elif ch == "}" or ch == "]":
+                self._close_container(i)
+            elif ch == ":":
+                self._expect_key = False
+            elif ch == ",":
+                self._next_child()
+            elif ch in " \t\r\n":
+                pass
+            else:
+                self._scalar_start = i
+
+    def _current_path(self) -> JSONPath:
+        return tuple(frame[2] for frame in self._stack)
+
+    def _open(self, ch: str, index: int):
+        child = None if ch == "{" else 0
+        self._stack.append([ch, index, child])
+        self._expect_key = ch == "{"
+        if len(self._stack) == 1:
+            # Only the root is safe to close empty; nested partial containers are dropped
+            self._mark_safe(index + 1)
+
+    def _next_child(self):
+        if not self._stack:
+            return
+        frame = self._stack[-1]
+        if frame[0] == "[":
+            frame[2] += 1
+        else:
+            self._expect_key = True
+
+    def _close_string(self, end: int):
+        raw = self.buffer[self._string_start:end + 1]
+        frame = self._stack[-1] if self._stack else None
+
+        if frame is not None and frame[0] == "{" and self._expect_key:
+            try:
+                frame[2] = json.loads(raw)
+            except ValueError:
+                frame[2] = raw.strip('"')
+            return
+
+        self._value_completed(raw, end + 1)
+
+    def _close_scalar(self, end: int):
+        raw = self.buffer[self._scalar_start:end].strip()
+        self._scalar_start = -1
+        self._value_completed(raw, end)
+
+    def _close_container(self, end: int):
+        if self._scalar_start >= 0:
+            self._close_scalar(end)
+        if not self._stack:
+            return
+
+        _, start, _ = self._stack.pop()
+        raw = self.buffer[start:end + 1]
+
+        if not self._stack:
+            self._done = True
+            self._mark_safe(end + 1)
+            return
+
+        self._value_completed(raw, end + 1)
+
+    def _value_completed(self, raw: str, end: int):
+        """A value finished at the current path: emit it if requested and mark a safe point"""
+        path = self._current_path()
+        if self.on_item and self._matches(path):
+            try:
+                value = json.loads(raw)
+            except ValueError:
+                value = None
+            if value is not None:
+                self.items_emitted += 1
+                try:
+                    self.on_item(path, value)
+                except Exception as e:
+                    logger.warning(f"Streaming item callback failed for {path}: {str(e)}")
+        self._mark_safe(end)
+
+    def _matches(self, path: JSONPath) -> bool:
+        for pattern in self.emit_paths:
+            if len(pattern) != len(path):
+                continue
+            if all(p == WILDCARD or p == part for p, part in zip(pattern, path)):
+                return True
+        return False
+
+    def _mark_safe(self, end: int):
+        self._safe_end = end
+        self._safe_closers = "".join("}" if frame[0] == "{" else "]" for frame in reversed(self._stack))
+
+    def repaired(self) -> Optional[str]:
+        """
+        JSON text of the last structurally complete prefix with open containers closed
+        Drops a trailing half-written key/value rather than guessing its content
+        """
+        if self._root_start < 0:
+            return None
+        if self._done:
+            return self.buffer[self._root_start:self._safe_end]
+
+        prefix = self.buffer[self._root_start:self._safe_end].rstrip()
+        if prefix.endswith(","):
+            prefix = prefix[:-1]
+        return prefix + self._safe_closers
+
+
+def repair_truncated_json(text: str) -> Optional[str]:
+    """Repair a possibly truncated JSON document (see IncrementalJSONParser.repaired)"""
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.repaired()
+
+
+def parse_structured_output(text: str, schema: Type[BaseModel], parser=None) -> Tuple[BaseModel, bool]:
+    """
+    Parse a model response into schema, repairing it when the strict parse fails
+
+    Args:
+        text: Raw model output
+        schema: Pydantic model to validate against
+        parser: Optional PydanticOutputParser tried first
+
+    Returns:
+        (parsed object, whether repair was needed)
+    """
+    try:
+        if parser is not None:
+            return parser.parse(text), False
+        return schema.model_validate_json(text.strip()), False
+    except Exception as strict_error:
+        repaired = repair_truncated_json(text)
+        if not repaired:
+            raise strict_error
+        try:
+            result = schema.model_validate(json.loads(repaired))
+        except Exception:
+            raise strict_error
+        logger.warning(
+            f"Repaired malformed {schema.__name__} output "
+            f"({len(text)} chars received, {len(repaired)} chars kept)"
+        )
+        return result, True
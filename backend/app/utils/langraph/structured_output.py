@@ -0,0 +1,122 @@
+"""
+Native structured outputs for the LangGraph agents
+Builds OpenAI json_schema response formats from the Pydantic schemas once per
+process so every call sends a byte-identical schema and prompt prefix
+"""
+
+import copy
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+# Pillars the insight agent fills in (pillar_analysis is an open dict in the Pydantic schema)
+YSI_PILLAR_KEYS = ["access_to_capital", "ecosystem_support", "mental_health", "recognition"]
+
+# Keywords OpenAI strict mode rejects; Pydantic still enforces them after parsing
+_UNSUPPORTED_STRICT_KEYWORDS = {
+    "default", "minLength", "maxLength", "minItems", "maxItems",
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "examples"
+}
+
+_response_format_cache: Dict[Tuple[str, Tuple, Tuple[str, ...]], Dict[str, Any]] = {}
+
+
+def _inline_refs(node: Any, defs: Dict[str, Any]) -> Any:
+    """Replace $ref nodes with their definitions (keeping sibling descriptions)"""
+    if isinstance(node, dict):
+        if "$ref" in node:
+            target = copy.deepcopy(defs[node["$ref"].split("/")[-1]])
+            siblings = {k: v for k, v in node.items() if k != "$ref"}
+            target.update(siblings)
+            return _inline_refs(target, defs)
+        return {k: _inline_refs(v, defs) for k, v in node.items() if k != "$defs"}
+    if isinstance(node, list):
+        return [_inline_refs(item, defs) for item in node]
+    return node
+
+
+def _make_strict(node: Any) -> Any:
+    """Close every object and mark all of its properties required"""
+    if isinstance(node, dict):
+        node = {k: _make_strict(v) for k, v in node.items() if k not in _UNSUPPORTED_STRICT_KEYWORDS}
+        if node.get("type") == "object" and "properties" in node:
+            node["required"] = list(node["properties"].keys())
+            node["additionalProperties"] = False
+        return node
+    if isinstance(node, list):
+        return [_make_strict(item) for item in node]
+    return node
+
+
+def to_strict_json_schema(
+    schema: Type[BaseModel],
+    fixed_keys: Optional[Dict[str, List[str]]] = None,
+    exclude: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """
+    Convert a Pydantic model into a JSON schema accepted by OpenAI strict mode
+
+    Args:
+        schema: Pydantic model class
+        fixed_keys: Top-level dict fields to expose as objects with these fixed keys
+        exclude: Top-level fields the model should not generate
+
+    Returns:
+        JSON schema dict
+    """
+    raw = schema.model_json_schema()
+    inlined = _inline_refs(raw, raw.get("$defs", {}))
+
+    properties = inlined.get("properties", {})
+    for field in exclude or []:
+        properties.pop(field, None)
+
+    for field, keys in (fixed_keys or {}).items():
+        field_schema = properties.get(field)
+        if not field_schema or not isinstance(field_schema.get("additionalProperties"), dict):
+            continue
+        value_schema = field_schema["additionalProperties"]
+        properties[field] = {
+            "type": "object",
+            "description": field_schema.get("description", ""),
+            "properties": {key: copy.deepcopy(value_schema) for key in keys}
+        }
+
+    return _make_strict(inlined)
+
+
+def json_schema_response_format(
+    schema: Type[BaseModel],
+    fixed_keys: Optional[Dict[str, List[str]]] = None,
+    exclude: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """
+    OpenAI response_format for a schema, built once and reused
+
+    The dict is cached per schema and options so repeated calls serialize
+    identically, which keeps the request prefix eligible for provider-side
+    prompt caching.
+    """
+    exclude = tuple(sorted(set(exclude or ())))
+    # Key order within a field is kept: it is the property order of the schema
+    cache_key = (
+        f"{schema.__module__}.{schema.__name__}",
+        tuple(sorted((field, tuple(keys)) for field, keys in (fixed_keys or {}).items())),
+        exclude
+    )
+    if cache_key not in _response_format_cache:
+        _response_format_cache[cache_key] = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": schema.__name__,
+                "strict": True,
+                "schema": to_strict_json_schema(schema, fixed_keys, exclude)
+            }
+        }
+    return _response_format_cache[cache_key]
+
+
+def schema_size_chars(response_format: Dict[str, Any]) -> int:
+    """Serialized size of a response format, for prompt size reporting"""
+    return len(json.dumps(response_format, separators=(",", ":")))
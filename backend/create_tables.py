@@ -13,7 +13,7 @@ from app.models import (
     Interaction, KnowledgeQuery, MetricsSnapshot,
     NextStep, ProcessedFile, Quote, TextEmbedding,
     GlobalInsight, TextProcessingJob, Stakeholder,
-    StakeholderNote, ChangeLog
+    StakeholderNote, ChangeLog, EmbeddingVersion
 )
 
 def create_tables():
@@ -0,0 +1,116 @@
+"""
+Single-flight behaviour of QueryEmbeddingCache.get_many
+Concurrent callers of the same query share one request; they must never be left
+waiting on it when it fails or the request that owns it is cancelled
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.query_embedding_cache import QueryEmbeddingCache
+
+# Long enough for a hung waiter to show up as a timeout rather than a slow test
+HANG_TIMEOUT_SECONDS = 2.0
+
+
+class SlowFetch:
+    """Batch embed function that blocks until released and records its calls"""
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.calls = []
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self, texts):
+        self.calls.append(list(texts))
+        self.started.set()
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def make_cache() -> QueryEmbeddingCache:
+    return QueryEmbeddingCache("test-model", max_size=16, ttl_seconds=60)
+
+
+def test_concurrent_identical_queries_share_one_request():
+    async def scenario():
+        cache, fetch = make_cache(), SlowFetch()
+        owner = asyncio.create_task(cache.get("Funding gaps", fetch))
+        await fetch.started.wait()
+        waiter = asyncio.create_task(cache.get("  funding GAPS ", fetch))
+        await asyncio.sleep(0)
+        fetch.release.set()
+
+        results = await asyncio.wait_for(asyncio.gather(owner, waiter), HANG_TIMEOUT_SECONDS)
+        assert results[0] == results[1]
+        assert fetch.calls == [["funding gaps"]]
+        assert cache.coalesced == 1
+
+    asyncio.run(scenario())
+
+
+def test_waiter_fetches_itself_when_owner_is_cancelled():
+    async def scenario():
+        cache, fetch = make_cache(), SlowFetch()
+        owner = asyncio.create_task(cache.get("funding gaps", fetch))
+        await fetch.started.wait()
+        waiter = asyncio.create_task(cache.get("funding gaps", fetch))
+        await asyncio.sleep(0)
+
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        fetch.release.set()
+
+        vector = await asyncio.wait_for(waiter, HANG_TIMEOUT_SECONDS)
+        assert vector == [12.0, 1.0]
+        assert len(fetch.calls) == 2
+        assert not cache._inflight
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_request():
+    async def scenario():
+        cache, fetch = make_cache(), SlowFetch()
+        owner = asyncio.create_task(cache.get("funding gaps", fetch))
+        await fetch.started.wait()
+        waiter = asyncio.create_task(cache.get("funding gaps", fetch))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        fetch.release.set()
+
+        assert await asyncio.wait_for(owner, HANG_TIMEOUT_SECONDS) == [12.0, 1.0]
+        assert fetch.calls == [["funding gaps"]]
+
+    asyncio.run(scenario())
+
+
+def test_fetch_error_reaches_every_waiter_and_is_not_cached():
+    async def scenario():
+        cache, fetch = make_cache(), SlowFetch(error=RuntimeError("provider down"))
+        owner = asyncio.create_task(cache.get("funding gaps", fetch))
+        await fetch.started.wait()
+        waiter = asyncio.create_task(cache.get("funding gaps", fetch))
+        await asyncio.sleep(0)
+        fetch.release.set()
+
+        results = await asyncio.wait_for(
+            asyncio.gather(owner, waiter, return_exceptions=True), HANG_TIMEOUT_SECONDS
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert not cache._inflight
+
+        # The failure is not remembered: the next call asks again
+        fetch.error = None
+        assert await asyncio.wait_for(cache.get("funding gaps", fetch), HANG_TIMEOUT_SECONDS) == [12.0, 1.0]
+        assert len(fetch.calls) == 2
+
+    asyncio.run(scenario())
@@ -124,6 +124,27 @@ export function ProcessedDocuments({ documents, loading, error }: ProcessedDocum
     });
   };
 
+  // The list holds summary documents; the full insights are loaded when one is opened
+  const openDocument = async (doc: ProcessedDocument) => {
+    const type = doc.documentType ?? 'text_processing_job';
+    setSelectedDocument({
+      ...doc,
+      insights: { keyActors: [], proposedActions: [], challenges: [], opportunities: [], ...doc.insights },
+    });
+    setDocumentType(type);
+    setViewMode('analytics');
+    if (type !== 'text_processing_job') return;
+
+    try {
+      const response = await api.documents.getFromJob(doc.id);
+      if (response.success && response.data) {
+        setSelectedDocument((prev) => (prev && prev.id === doc.id ? { ...prev, ...response.data } : prev));
+      }
+    } catch (error) {
+      console.error('Error loading document details:', error);
+    }
+  };
+
   // Edit handlers
   const handleUpdateDocument = async (documentId: string, updates: DocumentEdit) => {
     if (!selectedDocument) return;
@@ -1564,11 +1585,7 @@ export function ProcessedDocuments({ documents, loading, error }: ProcessedDocum
           <Card
             key={doc.id}
             className="p-5 bg-white hover:shadow-lg transition-all duration-300 cursor-pointer hover:border-[#0077B6] border-2"
-            onClick={() => {
-              setSelectedDocument(doc);
-              setDocumentType(doc.documentType ?? 'text_processing_job');
-              setViewMode('analytics');
-            }}
+            onClick={() => openDocument(doc)}
           >
             <div className="flex items-start gap-4">
               <div className="p-3 bg-gradient-to-br from-[#E8F1F9] to-[#89CFF0]/30 rounded-lg">
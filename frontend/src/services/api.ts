@@ -273,6 +273,15 @@ export const documentsApi = {
       method: 'GET',
     });
   },
+
+  /**
+   * GET /notes/jobs/documents/{id} - Obtener un documento completo (insights, texto y análisis)
+   */
+  getFromJob: async (id: string) => {
+    return apiRequest<ApiResponse<any>>(`/notes/jobs/documents/${id}`, {
+      method: 'GET',
+    });
+  },
 };
 
 // ==========================================
@@ -333,6 +342,8 @@ export const notesApi = {
     skip?: number;
     limit?: number;
     status?: 'received' | 'processing' | 'cancelled' | 'error' | 'completed';
+    view?: 'summary' | 'full';
+    fields?: string;
   }) => {
     const queryParams = new URLSearchParams();
     if (params) {
@@ -129,7 +129,6 @@ export interface ExtractedInsight {
   // Network analysis from specialized agent
   networkAnalysis?: NetworkAnalysis;
   // Raw backend data fields for compatibility
-  ysiPillarAnalysis?: any;
   structuredInsights?: any;
 }
 